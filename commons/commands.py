@@ -247,6 +247,10 @@ CMD_OS_REL = "cat /etc/redhat-release"
 CMD_KRNL_VER = "uname -r"
 CMD_PRVSNR_VER = "provisioner --version"
 CMD_LIST_DEVICES = "lsblk -nd -o NAME -e 11|grep -v sda|sed 's|sd|/dev/sd|g'|paste -s -d, -"
+CMD_HW_INVENTORY = "echo '##disks'; lsblk -b -n -P -o NAME,SIZE,TYPE,ROTA,MOUNTPOINT,PKNAME " \
+                   "-e 11; " \
+                   "echo '##cpus'; nproc; echo '##memory'; grep MemTotal /proc/meminfo; " \
+                   "echo '##nics'; ip -o -4 addr show"
 CMD_SETUP_PRVSNR = "provisioner setup_provisioner --logfile " \
                    "--logfile-filename /var/log/seagate/provisioner/setup.log --source rpm " \
                    "--config-path {0} " \
@@ -337,6 +341,7 @@ CMD_AWSCLI_CONF = "aws configure"
 CMD_AWSCLI_UPLOAD_DIR_TO_BUCKET = "aws s3 sync {0} s3://{1}"
 CMD_AWSCLI_LIST_OBJECTS_V2_BUCKETS = "aws s3api list-objects-v2 --bucket {0}"
 CMD_AWSCLI_LIST_OBJECTS_V2_OPTIONS_BUCKETS = "aws s3api list-objects-v2 --bucket {0} {1}"
+CMD_AWSCLI_S3API_OBJECT = "aws s3api {0} --bucket {1} --key {2}"
 
 # jCloud commands.
 CMD_KEYTOOL1 = "`keytool -delete -alias s3server -keystore /etc/pki/java/cacerts -storepass " \
@@ -636,4 +641,4 @@ CHANGE_DISK_STATE_USING_HCTL = "hctl drive-state --json $(jq --null-input --comp
                                 " device : \"device_val\", state : \"status_val\"}')"
 # Procpath Collection
 PROC_CMD = "pid=$(echo $(pgrep m0d; pgrep radosgw; pgrep hax) | sed -z 's/ /,/g'); procpath " \
-           "record -i 45 -d {} -p $pid"
+           "record -i 45 -f stat,cmdline,fd -d {} -p $pid"
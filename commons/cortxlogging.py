@@ -18,37 +18,71 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 """
-Extended log rotation class for cortx log files
+Extended log rotation class for cortx log files, asynchronous queue based logging,
+JSON structured records correlated by test id, thread, host and operation id and a
+query helper slicing one test's or one operation's records out of a session log.
 """
 import os
 import inspect
+import glob
 import gzip
+import json
+import queue
 import shutil
 import datetime
 import logging
+import argparse
+import contextlib
+import contextvars
+import threading
+import uuid
 from logging import handlers
 from commons import params
 
 LOG_FILE = 'cortx-test.log'
+JSON_LOG_FILE = 'cortx-test.jsonl'
+CONTEXT_FIELDS = ('test_id', 'host', 'op_id')
 
+_TEST_ID = None
+_CONTEXT = contextvars.ContextVar('cortx_log_context', default={})
 
-def init_loghandler(log, level=logging.DEBUG) -> None:
-    """Initialize logging with stream and file handlers."""
+
+def init_loghandler(log, level=logging.DEBUG, async_mode=False, structured=False,
+                    console=True):
+    """
+    Initialize logging with stream and file handlers.
+    :param log: logger to initialize, the root logger covers records of all libraries
+    :param level: logger level
+    :param async_mode: emit through a queue so file and console IO happen in a
+    background listener thread instead of the logging thread
+    :param structured: also write JSON records to JSON_LOG_FILE
+    :param console: add the stream handler, off when pytest already shows the records
+    :return: QueueListener when async_mode else None
+    """
     log.setLevel(level)
-    make_log_dir(params.LOG_DIR_NAME)
-    fh = logging.FileHandler(os.path.join(os.getcwd(),
-                                          params.LOG_DIR_NAME,
-                                          'latest',
-                                          LOG_FILE),
-                             mode='w')
+    log_dir = os.path.join(os.getcwd(), params.LOG_DIR_NAME, 'latest')
+    make_log_dir(log_dir)
+    fh = logging.FileHandler(os.path.join(log_dir, LOG_FILE), mode='w')
     fh.setLevel(logging.DEBUG)
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(formatter)
-    ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    targets = [fh]
+    if console:
+        ch = logging.StreamHandler()
+        ch.setLevel(logging.DEBUG)
+        ch.setFormatter(formatter)
+        targets.append(ch)
+    if structured:
+        jh = CortxRotatingFileHandler(os.path.join(log_dir, JSON_LOG_FILE))
+        jh.setLevel(logging.DEBUG)
+        jh.setFormatter(JsonFormatter())
+        targets.append(jh)
+    if async_mode:
+        return start_async_logging(log, targets)
+    for handler in targets:
+        handler.addFilter(ContextFilter())
+        log.addHandler(handler)
+    return None
 
 
 def set_log_handlers(log, name, mode='w', level=logging.DEBUG):
@@ -81,11 +115,18 @@ class CortxRotatingFileHandler(handlers.RotatingFileHandler):
     when the current file reaches a certain size.
     """
 
-    def __init__(self, filename="cortx-test.log", maxBytes=10485760, backupCount=5):
+    def __init__(self, filename="cortx-test.log", maxBytes=10485760, backupCount=5,
+                 compress_async=True, compresslevel=6):
         """
         Initialization for cortx rotating file handler
+        :param compress_async: compress rotated logs in a background thread instead of
+        the thread which triggered the rollover
+        :param compresslevel: gzip compression level of rotated logs
         """
         self.baseFilename = filename
+        self.compress_async = compress_async
+        self.compresslevel = compresslevel
+        self._compressor = None
         super().__init__(filename=self.baseFilename, maxBytes=maxBytes, backupCount=backupCount)
         self.namer = self.log_namer
         self.rotator = self.log_rotator
@@ -104,7 +145,226 @@ class CortxRotatingFileHandler(handlers.RotatingFileHandler):
         :param source: current log file path
         :param dest: destination path for rotated file
         """
+        if not self.compress_async:
+            self.compress(source, dest, self.compresslevel)
+            return
+        pending = dest + ".pending"
+        os.rename(source, pending)
+        self._compressor = threading.Thread(target=self.compress,
+                                            args=(pending, dest, self.compresslevel),
+                                            name="log-compressor", daemon=True)
+        self._compressor.start()
+
+    @staticmethod
+    def compress(source, dest, compresslevel=6):
+        """
+        Gzip source into dest and remove source.
+        :param source: file to compress
+        :param dest: gzip file path
+        :param compresslevel: gzip compression level
+        """
         with open(source, "rb") as sf:
-            with gzip.open(dest, "wb", 9) as df:
+            with gzip.open(dest + ".part", "wb", compresslevel) as df:
                 shutil.copyfileobj(sf, df)
+        os.replace(dest + ".part", dest)
         os.remove(source)
+
+    def wait_compression(self, timeout=None):
+        """Wait for the background compression of the last rotated log."""
+        if self._compressor:
+            self._compressor.join(timeout)
+
+    def doRollover(self):
+        """
+        Rollover after the previous compression finished, rotated files are shifted by
+        name so a compression still writing the first backup would be overwritten.
+        """
+        self.wait_compression()
+        super().doRollover()
+
+    def close(self):
+        """Close the stream and let a pending compression finish."""
+        self.wait_compression()
+        super().close()
+
+
+def set_test_id(test_id):
+    """
+    Set the test id carried by records of all threads, set at test start.
+    :param test_id: test id e.g. TEST-17413 or None at test end
+    """
+    global _TEST_ID  # pylint: disable=global-statement
+    _TEST_ID = test_id
+
+
+def get_context() -> dict:
+    """Correlation fields of the current thread."""
+    return dict(_CONTEXT.get(), test_id=_CONTEXT.get().get('test_id', _TEST_ID))
+
+
+@contextlib.contextmanager
+def log_context(op_id=None, **fields):
+    """
+    Correlate records logged inside the block, e.g. of one operation on one host.
+    Threads started inside the block inherit it through bind_context.
+    :param op_id: operation correlation id, generated if None
+    :param fields: other fields e.g. host
+    :return: op_id
+    """
+    op_id = op_id or uuid.uuid4().hex[:12]
+    token = _CONTEXT.set(dict(_CONTEXT.get(), op_id=op_id, **fields))
+    try:
+        yield op_id
+    finally:
+        _CONTEXT.reset(token)
+
+
+def bind_context(func):
+    """
+    Bind the current correlation fields to a callable run in another thread.
+    :param func: thread target or executor task
+    :return: callable running func with the caller's context
+    """
+    ctx = contextvars.copy_context()
+
+    def _run(*args, **kwargs):
+        return ctx.run(func, *args, **kwargs)
+    return _run
+
+
+class ContextFilter(logging.Filter):
+    """
+    Add correlation fields to records in the logging thread. Fields passed with extra
+    are kept.
+    """
+
+    def filter(self, record):
+        for field, value in get_context().items():
+            if getattr(record, field, None) is None:
+                setattr(record, field, value)
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, None)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {"time": datetime.datetime.fromtimestamp(record.created).isoformat(
+                     timespec="milliseconds"),
+                 "level": record.levelname, "logger": record.name,
+                 "thread": record.threadName, "file": record.filename,
+                 "line": record.lineno}
+        for field in CONTEXT_FIELDS:
+            entry[field] = getattr(record, field, None)
+        entry["msg"] = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def start_async_logging(log, targets, maxsize=0):
+    """
+    Route records of log through a queue to targets served by a background listener.
+    Correlation fields are captured in the logging thread before queuing.
+    :param log: logger
+    :param targets: handlers doing the file and console IO
+    :param maxsize: queue size, unbounded if 0
+    :return: started QueueListener, pass to stop_async_logging at session end
+    """
+    log_queue = queue.Queue(maxsize)
+    queue_handler = handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    log.addHandler(queue_handler)
+    listener = handlers.QueueListener(log_queue, *targets, respect_handler_level=True)
+    listener.start()
+    listener.queue_handler = queue_handler
+    listener.logger = log
+    return listener
+
+
+def stop_async_logging(listener):
+    """
+    Flush queued records and close the target handlers.
+    :param listener: listener returned by start_async_logging
+    """
+    listener.stop()
+    listener.logger.removeHandler(listener.queue_handler)
+    for handler in listener.handlers:
+        handler.close()
+
+
+def _rotation_key(name):
+    """Sort key of rotated logs <base>-<date>-<index>.gz, oldest first."""
+    stem, _, index = name.split(".gz")[0].rpartition("-")
+    return stem, -int(index) if index.isdigit() else 0
+
+
+def _log_files(path):
+    """Rotated gzip files oldest first followed by path."""
+    rotated = glob.glob(f"{glob.escape(path)}-*.gz") + \
+        glob.glob(f"{glob.escape(path)}-*.gz.pending")
+    return sorted(rotated, key=_rotation_key) + ([path] if os.path.exists(path) else [])
+
+
+def query_logs(path, rotated=True, level=None, **fields):
+    """
+    Yield JSON records of a structured log matching all given fields, e.g. one test's
+    or one operation's records. Lines are checked for the serialized values before
+    being parsed so unrelated records are skipped cheaply.
+    :param path: JSON log file
+    :param rotated: include rotated gzip files of path
+    :param level: minimum level name
+    :param fields: field values to match e.g. test_id, op_id, host, thread
+    :return: generator of record dicts
+    """
+    needles = [json.dumps(value) for value in fields.values() if value is not None]
+    fields = {key: value for key, value in fields.items() if value is not None}
+    min_level = logging.getLevelName(level) if level else 0
+    for fpath in _log_files(path) if rotated else [path]:
+        opener = gzip.open if fpath.endswith(".gz") else open
+        with opener(fpath, "rt", encoding="utf-8", errors="replace") as fptr:
+            for line in fptr:
+                if not all(needle in line for needle in needles):
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if all(record.get(key) == value for key, value in fields.items()) and \
+                        logging.getLevelName(record.get("level", "NOTSET")) >= min_level:
+                    yield record
+
+
+def main(argv=None):
+    """Print records of a structured session log matching the given fields."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("path", nargs="?", default=os.path.join(
+        params.LOG_DIR_NAME, "latest", JSON_LOG_FILE))
+    for field in CONTEXT_FIELDS + ("thread",):
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field)
+    parser.add_argument("--level")
+    parser.add_argument("--json", action="store_true", help="print raw JSON records")
+    parser.add_argument("--no-rotated", action="store_true")
+    args = parser.parse_args(argv)
+    fields = {field: getattr(args, field) for field in CONTEXT_FIELDS + ("thread",)}
+    count = 0
+    for record in query_logs(args.path, not args.no_rotated, args.level, **fields):
+        count += 1
+        if args.json:
+            print(json.dumps(record))
+        else:
+            print(f"{record['time']} {record['level']} [{record['thread']}] "
+                  f"[{record.get('test_id') or '-'} {record.get('op_id') or '-'} "
+                  f"{record.get('host') or '-'}] {record['msg']}")
+            if record.get("exc"):
+                print(record["exc"])
+    return count
+
+
+if __name__ == "__main__":
+    main()
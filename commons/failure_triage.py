@@ -0,0 +1,335 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Failure signature clustering and triage of test runs.
+
+Failures are reduced to a signature of exception type, assertion message and top frames,
+with volatile tokens (timestamps, ids, addresses, numbers) masked. Failures with equal or
+similar signatures are clustered, clusters are matched against a history of earlier runs
+and known defects and reported ranked by the number of affected tests.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+
+LOGGER = logging.getLogger(__name__)
+
+# Order matters, longer volatile tokens are masked before plain numbers
+MASKS = (
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"),
+     "<TS>"),
+    (re.compile(r"\b\d{2}:\d{2}:\d{2}(?:\.\d+)?\b"), "<TS>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+                r"[0-9a-fA-F]{12}\b"), "<UUID>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<ADDR>"),
+    (re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b"), "<IP>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b"), "<HEX>"),
+    (re.compile(r"/tmp/\S+"), "<TMP>"),
+    (re.compile(r"(?<![A-Za-z_])\d+"), "<N>"),
+)
+PYTEST_FRAME = re.compile(r"^(?P<file>[\w./-]+\.py):\d+:(?: in (?P<func>\w+)| (?P<exc>[\w.]+))?$")
+PYTHON_FRAME = re.compile(r'^\s*File "(?P<file>[^"]+)", line \d+, in (?P<func>\S+)')
+EXCEPTION_LINE = re.compile(r"^(?P<exc>(?:[\w]+\.)*\w*(?:Error|Exception|Exit|Interrupt|"
+                            r"Failed|Timeout|Warning))(?::\s*(?P<msg>.*))?$")
+LOG_ERROR = re.compile(r"ERROR|CRITICAL|Traceback|Exception|failed", re.IGNORECASE)
+WORD = re.compile(r"<\w+>|\w+")
+
+
+def mask(text: str) -> str:
+    """
+    Mask volatile tokens of text.
+
+    :param text: Message, frame or log line.
+    :return: Masked text with collapsed whitespace.
+    """
+    for pattern, token in MASKS:
+        text = pattern.sub(token, text)
+    return " ".join(text.split())
+
+
+def extract_signature(text: str, log_tail: str = None, max_frames: int = 5,
+                      log_lines: int = 200) -> dict:
+    """
+    Extract a normalised signature from a pytest report or python traceback.
+
+    :param text: Failure text, e.g. report.longreprtext.
+    :param log_tail: Captured log of the test, its error lines are used when the
+        exception message alone is not distinctive.
+    :param max_frames: Innermost frames kept.
+    :param log_lines: Trailing log lines searched for error lines.
+    :return: {key, exc_type, message, frames, log}
+    """
+    exc_type, message, frames, details = "", "", [], []
+    for line in (text or "").splitlines():
+        frame = PYTEST_FRAME.match(line.strip()) or PYTHON_FRAME.match(line)
+        if frame:
+            name = os.path.basename(frame.group("file"))
+            func = frame.groupdict().get("func")
+            frames.append(f"{name}:{func}" if func else name)
+            if frame.groupdict().get("exc"):
+                exc_type = exc_type or frame.group("exc").rsplit(".", 1)[-1]
+            continue
+        body = line[1:].strip() if line.startswith("E ") else None
+        if body is None:
+            found = EXCEPTION_LINE.match(line.strip())
+            if found and not line.startswith(" "):
+                exc_type = found.group("exc").rsplit(".", 1)[-1]
+                message = found.group("msg") or message
+            continue
+        found = EXCEPTION_LINE.match(body)
+        if found and not message:
+            exc_type = found.group("exc").rsplit(".", 1)[-1]
+            message = found.group("msg") or ""
+        elif len(details) < 3 and body:
+            details.append(body)
+    message = mask(message or " ".join(details))
+    frames = [mask(frame) for frame in dict.fromkeys(frames)][-max_frames:]
+    log = []
+    if log_tail and len(WORD.findall(message)) < 3:
+        log = [mask(line) for line in log_tail.splitlines()[-log_lines:]
+               if LOG_ERROR.search(line)][-3:]
+    digest = hashlib.sha1("|".join([exc_type, message] + frames + log).encode())  # nosec
+    return {"key": digest.hexdigest()[:12], "exc_type": exc_type, "message": message,
+            "frames": frames, "log": log}
+
+
+def tokens(signature: dict) -> set:
+    """Tokens of a signature used for similarity."""
+    words = set(WORD.findall(" ".join([signature["message"]] + signature["log"])))
+    return words | {f"exc:{signature['exc_type']}"} | {
+        f"frame:{frame}" for frame in signature["frames"]}
+
+
+def similarity(first: dict, second: dict) -> float:
+    """Jaccard similarity of two signatures, 0 when exception types differ."""
+    if first["exc_type"] != second["exc_type"]:
+        return 0.0
+    set1, set2 = tokens(first), tokens(second)
+    return len(set1 & set2) / len(set1 | set2) if set1 | set2 else 1.0
+
+
+class FailureTriage:
+    """Collect failures of a run, cluster them and match clusters with history."""
+
+    def __init__(self, history_path: str = None, threshold: float = 0.75,
+                 known_defects: list = None):
+        """
+        :param history_path: JSON file of clusters of earlier runs, None for no history.
+        :param threshold: Minimum similarity to join a cluster or match history.
+        :param known_defects: [{"defect": "CORTX-123", "pattern": regex}] matched against
+            exception type and masked message of clusters.
+        """
+        self.history_path = history_path
+        self.threshold = threshold
+        self.known_defects = [(entry["defect"], re.compile(entry["pattern"]))
+                              for entry in known_defects or []]
+        self.failures = []
+        self.history = {}
+        if history_path and os.path.exists(history_path):
+            with open(history_path, encoding="utf-8") as fptr:
+                self.history = json.load(fptr)
+
+    def add(self, test: str, text: str, log_tail: str = None, phase: str = "call") -> dict:
+        """
+        Add a failure.
+
+        :param test: Test id or node id.
+        :param text: Failure text, e.g. report.longreprtext.
+        :param log_tail: Captured log of the test.
+        :param phase: setup, call or teardown.
+        :return: Signature of the failure.
+        """
+        signature = extract_signature(text, log_tail)
+        self.failures.append({"test": test, "phase": phase, "signature": signature})
+        return signature
+
+    def dump_failures(self, path: str) -> str:
+        """
+        Write failures collected by this process, e.g. an xdist worker, to path.
+
+        :return: path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fptr:
+            json.dump(self.failures, fptr)
+        return path
+
+    def merge_failures(self, paths: list) -> int:
+        """
+        Add failures written by dump_failures of other processes.
+
+        :param paths: Files written by dump_failures.
+        :return: Number of failures added.
+        """
+        added = 0
+        for path in paths:
+            with open(path, encoding="utf-8") as fptr:
+                failures = json.load(fptr)
+            self.failures.extend(failures)
+            added += len(failures)
+        return added
+
+    def clusters(self) -> list:
+        """
+        Cluster failures, equal keys first and then similar signatures.
+
+        :return: [{key, exc_type, message, frames, log, tests, count}]
+        """
+        clusters = []
+        by_key = {}
+        for failure in self.failures:
+            signature = failure["signature"]
+            cluster = by_key.get(signature["key"])
+            if cluster is None:
+                scored = [(similarity(signature, each), each) for each in clusters]
+                best = max(scored, key=lambda item: item[0], default=(0.0, None))
+                cluster = best[1] if best[0] >= self.threshold else None
+            if cluster is None:
+                cluster = dict(signature, tests=[], count=0, keys=[signature["key"]])
+                clusters.append(cluster)
+            elif signature["key"] not in cluster["keys"]:
+                cluster["keys"].append(signature["key"])
+            by_key[signature["key"]] = cluster
+            cluster["count"] += 1
+            if failure["test"] not in cluster["tests"]:
+                cluster["tests"].append(failure["test"])
+        return clusters
+
+    def match(self, cluster: dict) -> tuple:
+        """
+        Match a cluster with history and known defects.
+
+        :return: (history key or None, defect or None)
+        """
+        best_key, best = None, 0.0
+        for key, entry in self.history.items():
+            score = 1.0 if key in cluster["keys"] else similarity(cluster, entry)
+            if score > best:
+                best_key, best = key, score
+        if best < self.threshold:
+            best_key = None
+        defect = self.history[best_key].get("defect") if best_key else None
+        if not defect:
+            text = f"{cluster['exc_type']}: {cluster['message']}"
+            defect = next((defect for defect, pattern in self.known_defects
+                           if pattern.search(text)), None)
+        return best_key, defect
+
+    def report(self, build: str = None) -> dict:
+        """
+        Triage report of the run. Clusters are ranked by affected tests, then new
+        clusters before recurring ones and clusters without a defect first.
+
+        :param build: Build of the run.
+        :return: {build, failures, clusters: [cluster + rank, new, history_key, defect,
+            first_seen, builds]}
+        """
+        ranked = []
+        for cluster in self.clusters():
+            history_key, defect = self.match(cluster)
+            entry = self.history.get(history_key, {})
+            ranked.append(dict(cluster, new=history_key is None, history_key=history_key,
+                               defect=defect, first_seen=entry.get("first_seen", build),
+                               builds=entry.get("builds", [])))
+        ranked.sort(key=lambda item: (-len(item["tests"]), not item["new"],
+                                      item["defect"] is not None, item["key"]))
+        for rank, cluster in enumerate(ranked, 1):
+            cluster["rank"] = rank
+        return {"build": build, "failures": len(self.failures), "clusters": ranked}
+
+    def save_history(self, report: dict) -> dict:
+        """
+        Merge the clusters of a report into the history file.
+
+        :param report: Output of report().
+        :return: Updated history.
+        """
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        for cluster in report["clusters"]:
+            key = cluster["history_key"] or cluster["key"]
+            entry = self.history.setdefault(key, {
+                "exc_type": cluster["exc_type"], "message": cluster["message"],
+                "frames": cluster["frames"], "log": cluster["log"], "defect": None,
+                "first_seen": report["build"] or now, "builds": [], "count": 0})
+            entry["count"] += cluster["count"]
+            entry["last_seen"] = now
+            entry["defect"] = entry["defect"] or cluster["defect"]
+            if report["build"] and report["build"] not in entry["builds"]:
+                entry["builds"].append(report["build"])
+        if self.history_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.history_path)), exist_ok=True)
+            with open(self.history_path, "w", encoding="utf-8") as fptr:
+                json.dump(self.history, fptr, indent=1)
+        return self.history
+
+    def link_defect(self, key: str, defect: str) -> bool:
+        """
+        Link a history cluster to a defect, later matches report it.
+
+        :return: False if key is not in history.
+        """
+        if key not in self.history:
+            return False
+        self.history[key]["defect"] = defect
+        if self.history_path:
+            with open(self.history_path, "w", encoding="utf-8") as fptr:
+                json.dump(self.history, fptr, indent=1)
+        return True
+
+
+def report_text(report: dict, max_tests: int = 5) -> str:
+    """Render a triage report as text."""
+    lines = [f"Failure triage of build {report['build']}: {report['failures']} failure(s) "
+             f"in {len(report['clusters'])} cluster(s)"]
+    for cluster in report["clusters"]:
+        state = "NEW" if cluster["new"] else f"seen since {cluster['first_seen']}"
+        tests = ", ".join(cluster["tests"][:max_tests]) + (
+            f" +{len(cluster['tests']) - max_tests}" if len(cluster["tests"]) > max_tests
+            else "")
+        lines.append(f"#{cluster['rank']} [{cluster['key']}] {len(cluster['tests'])} test(s) "
+                     f"{state} defect={cluster['defect'] or '-'}")
+        lines.append(f"    {cluster['exc_type']}: {cluster['message']}")
+        if cluster["frames"]:
+            lines.append(f"    at {' < '.join(reversed(cluster['frames']))}")
+        for log in cluster["log"]:
+            lines.append(f"    log: {log}")
+        lines.append(f"    tests: {tests}")
+    return "\n".join(lines)
+
+
+def write_report(report: dict, dir_path: str, name: str = "triage_report") -> tuple:
+    """
+    Write a triage report as json and text.
+
+    :return: (json path, text path)
+    """
+    os.makedirs(dir_path, exist_ok=True)
+    json_path = os.path.join(dir_path, f"{name}.json")
+    text_path = os.path.join(dir_path, f"{name}.txt")
+    with open(json_path, "w", encoding="utf-8") as fptr:
+        json.dump(report, fptr, indent=1)
+    with open(text_path, "w", encoding="utf-8") as fptr:
+        fptr.write(report_text(report) + "\n")
+    LOGGER.info("Failure triage report written to %s", text_path)
+    return json_path, text_path
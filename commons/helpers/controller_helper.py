@@ -23,6 +23,8 @@ import logging
 from typing import Tuple
 import requests
 from commons.helpers.node_helper import Node
+from commons.helpers.enclosure_cli import EnclosureCli
+from commons.helpers.enclosure_cli import SshTransport
 from commons import constants as cons
 from commons import commands as common_cmd
 from commons import errorcodes as cterr
@@ -71,11 +73,14 @@ class ControllerLib:
                              password=self.h_pwd)
 
         self.copy = False
+        self._cli = None
 
     def copy_telnet_operations_file(self):
         """
-        Function to copy telnet operations file
+        Function to copy telnet operations file, once per ControllerLib object.
         """
+        if self.copy:
+            return
         runner_path = cons.REMOTE_TELNET_PATH
         local_path = cons.TELNET_OP_PATH
         LOGGER.info("Copying file %s to %s", local_path, runner_path)
@@ -96,6 +101,16 @@ class ControllerLib:
         if self.node_obj.path_exists(path=runner_path):
             self.copy = True
 
+    def enclosure_cli(self) -> EnclosureCli:
+        """
+        Structured enclosure CLI client reusing one ssh session from the node.
+        :return: EnclosureCli object
+        """
+        if self._cli is None:
+            self._cli = EnclosureCli(SshTransport(
+                self.node_obj, self.enclosure_ip, self.enclosure_user, self.enclosure_pwd))
+        return self._cli
+
     def get_mc_ver_sr(self) -> Tuple[str, str, str]:
         """
         Function to get the version and serial number of the management controller.
@@ -0,0 +1,584 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Structured client for the enclosure management controller CLI.
+
+Commands go through a transport: SshTransport runs them from a node over one multiplexed
+ssh session to the controller, EnclosureSimulator answers them locally from an in memory
+enclosure. Every show command has its own parser turning the XML API output into dicts
+keyed like the ControllerLib get_show_* results (see common_destructive.yaml).
+"""
+
+import logging
+import random
+import re
+import shlex
+import time
+from xml.etree import ElementTree
+
+from commons import commands as common_cmd
+from commons import errorcodes as cterr
+from commons.exceptions import CTException
+
+LOGGER = logging.getLogger(__name__)
+
+# Output field name: XML property name, same maps as common_destructive.yaml.
+SHOW_DISKS = {"pool": "durable-id", "location": "location", "serial_number": "serial-number",
+              "vendor": "vendor", "rev": "revision", "description": "description",
+              "usage": "usage", "size": "size", "disk_group": "disk-group",
+              "tier": "storage-tier", "health": "health", "reason": "health-reason",
+              "action": "health-recommendation"}
+SHOW_DISK_GROUPS = {"name": "name", "size": "size", "created": "create-date",
+                    "job": "current-job", "job_percent": "current-job-completion",
+                    "raidtype": "raidtype", "health": "health", "reason": "health-reason",
+                    "action": "health-recommendation"}
+SHOW_VOLUMES = {"pool": "storage-pool-name", "name": "volume-name", "total_size": "total-size",
+                "alloc_size": "allocated-size", "type": "storage-type", "health": "health",
+                "reason": "health-reason", "action": "health-recommendation"}
+SHOW_EXPANDER_STATUS = {"encl": "enclosure-id", "ctlr": "controller", "phy": "wide-port-index",
+                        "type": "type", "status": "status", "disabled": "elem-disabled",
+                        "reason": "elem-reason"}
+
+SET_PHY_RE = re.compile(r"set expander-phy encl (\S+) controller (\S+) type drive phy (\d+) "
+                        r"(enabled|disabled)$", re.I)
+CLEAR_METADATA_RE = re.compile(r"clear disk-metadata (\S+)$", re.I)
+ADD_SPARES_RE = re.compile(r"add spares (\S+) disk-group (\S+)$", re.I)
+# Commands asking "Are you sure you want to continue? (y/n)" on the controller.
+CONFIRM_RES = (re.compile(r"set expander-phy .* disabled$", re.I),)
+CONFIRM_PROMPT = "Are you sure you want to continue? (y/n)"
+
+
+def needs_confirmation(cmd: str) -> bool:
+    """True if the controller prompts for a confirmation before running cmd."""
+    cmd = " ".join(cmd.split())
+    return any(regex.match(cmd) for regex in CONFIRM_RES)
+
+
+def parse_response(output) -> tuple:
+    """
+    Parse XML API output of one command.
+
+    :param output: Command output, text around the RESPONSE element is ignored.
+    :return: (list of {property: value} per OBJECT, status {response-type, response,
+        return-code})
+    """
+    if isinstance(output, bytes):
+        output = output.decode(errors="replace")
+    start, end = output.find("<RESPONSE"), output.rfind("</RESPONSE>")
+    if start < 0 or end < 0:
+        raise CTException(cterr.CONTROLLER_ERROR, f"No XML response in output: {output[:200]}")
+    root = ElementTree.fromstring(output[start:end + len("</RESPONSE>")])
+    objects, status = [], {}
+    for obj in root.iter("OBJECT"):
+        props = {prop.get("name"): (prop.text or "").strip() for prop in obj.iter("PROPERTY")}
+        if obj.get("basetype") == "status":
+            status = props
+        else:
+            objects.append(props)
+    return objects, status
+
+
+def _records(objects: list, fields: dict, key: str) -> list:
+    """Objects having the key property, renamed to output field names."""
+    return [{name: obj[prop] for name, prop in fields.items() if obj.get(prop)}
+            for obj in objects if obj.get(key)]
+
+
+def parse_show_disks(output, fields: dict = None) -> dict:
+    """
+    Parse "show disks".
+
+    :return: {durable-id: {pool, location, usage, disk_group, health, ...}}
+    """
+    fields = fields or SHOW_DISKS
+    return {disk["pool"]: disk for disk in
+            _records(parse_response(output)[0], fields, fields["pool"])}
+
+
+def parse_show_disk_groups(output, fields: dict = None) -> dict:
+    """
+    Parse "show disk-groups", job_percent is converted to int.
+
+    :return: {name: {name, size, job, job_percent, raidtype, health, ...}}
+    """
+    fields = fields or SHOW_DISK_GROUPS
+    groups = {}
+    for group in _records(parse_response(output)[0], fields, fields["raidtype"]):
+        if "job_percent" in group:
+            group["job_percent"] = int(group["job_percent"].rstrip("%") or 0)
+        groups[group["name"]] = group
+    return groups
+
+
+def parse_show_volumes(output, fields: dict = None) -> dict:
+    """
+    Parse "show volumes".
+
+    :return: {pool: {volume name: {pool, name, total_size, health, ...}}}
+    """
+    fields = fields or SHOW_VOLUMES
+    volumes = {}
+    for volume in _records(parse_response(output)[0], fields, fields["name"]):
+        volumes.setdefault(volume.get("pool"), {})[volume["name"]] = volume
+    return volumes
+
+
+def parse_show_expander_status(output, fields: dict = None) -> dict:
+    """
+    Parse "show expander-status", only drive phys are kept and phy is converted to int.
+
+    :return: {controller: {phy: {encl, ctlr, phy, type, status, disabled, reason}}}
+    """
+    fields = fields or SHOW_EXPANDER_STATUS
+    phys = {}
+    for phy in _records(parse_response(output)[0], fields, fields["phy"]):
+        if phy.get("type", "").lower() != "drive":
+            continue
+        phy["phy"] = int(phy["phy"])
+        phys.setdefault(phy.get("ctlr"), {})[phy["phy"]] = phy
+    return phys
+
+
+class SshTransport:
+    """Run enclosure commands from a node over a reused ssh session."""
+
+    def __init__(self, node_obj, enclosure_ip: str, enclosure_user: str, enclosure_pwd: str,
+                 persist: int = 600, timeout: int = 120):
+        """
+        :param node_obj: Node (or Host) object of the node reaching the enclosure.
+        :param enclosure_ip: Management controller IP.
+        :param enclosure_user: Controller user.
+        :param enclosure_pwd: Controller password.
+        :param persist: Seconds the master ssh connection stays open after the last
+            command, 0 opens a connection per command.
+        :param timeout: Command timeout in seconds.
+        """
+        self.node_obj = node_obj
+        self.enclosure_ip = enclosure_ip
+        self.enclosure_user = enclosure_user
+        self.enclosure_pwd = enclosure_pwd
+        self.persist = persist
+        self.timeout = timeout
+        self.control_path = f"/tmp/.encl-ssh-{enclosure_user}@{enclosure_ip}"
+        self._ready = False
+
+    def ssh_command(self, cmd: str, answer: str = None) -> str:
+        """
+        Command line run on the node for one enclosure command.
+
+        :param cmd: Enclosure command.
+        :param answer: Answer to the confirmation prompt of cmd, sent on its stdin.
+        """
+        options = "-o StrictHostKeyChecking=no"
+        if self.persist:
+            options += f" -o ControlMaster=auto -o ControlPath={self.control_path} " \
+                       f"-o ControlPersist={self.persist}"
+        stdin = f"echo {shlex.quote(answer)} | " if answer else ""
+        return f"{stdin}sshpass -p {shlex.quote(self.enclosure_pwd)} ssh {options} " \
+               f"{self.enclosure_user}@{self.enclosure_ip} {shlex.quote(cmd)}"
+
+    def run(self, cmd: str, answer: str = None) -> str:
+        """
+        Run one command on the enclosure.
+
+        :param cmd: Enclosure command.
+        :param answer: Answer to the confirmation prompt of cmd, e.g. y.
+        :return: Command output.
+        """
+        try:
+            if not self._ready:
+                self.node_obj.execute_cmd(cmd="command -v sshpass || yum -y install sshpass",
+                                          read_lines=False)
+                self._ready = True
+            LOGGER.debug("Running enclosure command: %s", cmd)
+            output = self.node_obj.execute_cmd(cmd=self.ssh_command(cmd, answer),
+                                               read_lines=False, timeout=self.timeout)
+        except (IOError, TimeoutError, RuntimeError) as error:
+            raise CTException(cterr.CONTROLLER_ERROR,
+                              f"Enclosure command '{cmd}' failed: {error}") from error
+        return output.decode(errors="replace") if isinstance(output, bytes) else output
+
+    def close(self) -> None:
+        """Close the master ssh connection."""
+        if self.persist and self._ready:
+            self.node_obj.execute_cmd(
+                cmd=f"ssh -o ControlPath={self.control_path} -O exit "
+                    f"{self.enclosure_user}@{self.enclosure_ip}", read_lines=False, exc=False)
+        self._ready = False
+
+
+class EnclosureCli:
+    """Typed enclosure management commands over a transport."""
+
+    def __init__(self, transport, clock=time.time, sleep=time.sleep):
+        """
+        :param transport: Object with run(cmd, answer) -> XML output, e.g. SshTransport or
+            EnclosureSimulator.
+        :param clock: Time source used when polling.
+        :param sleep: Sleep function used when polling.
+        """
+        self.transport = transport
+        self.clock = clock
+        self.sleep = sleep
+
+    def execute(self, cmd: str) -> tuple:
+        """
+        Run a command and check its status, commands prompting for a confirmation are
+        confirmed.
+
+        :return: (bool, output or response message on error)
+        """
+        output = self.transport.run(cmd, "y" if needs_confirmation(cmd) else None)
+        status = parse_response(output)[1]
+        if status.get("response-type") == "Error" or status.get("return-code", "0") != "0":
+            LOGGER.error("Enclosure command '%s' failed: %s", cmd, status.get("response"))
+            return False, status.get("response", "")
+        return True, output
+
+    def _show(self, cmd: str, parser) -> dict:
+        """Run a show command, raise CTException on error."""
+        result, output = self.execute(cmd)
+        if not result:
+            raise CTException(cterr.CONTROLLER_ERROR, f"{cmd}: {output}")
+        return parser(output)
+
+    def show_disks(self) -> dict:
+        """:return: parse_show_disks output."""
+        return self._show(common_cmd.SHOW_DISKS_CMD, parse_show_disks)
+
+    def show_disk_groups(self) -> dict:
+        """:return: parse_show_disk_groups output."""
+        return self._show(common_cmd.CMD_SHOW_DISK_GROUP, parse_show_disk_groups)
+
+    def show_volumes(self) -> dict:
+        """:return: parse_show_volumes output."""
+        return self._show(common_cmd.CMD_SHOW_VOLUMES, parse_show_volumes)
+
+    def show_expander_status(self) -> dict:
+        """:return: parse_show_expander_status output."""
+        return self._show(common_cmd.CMD_SHOW_XP_STATUS, parse_show_expander_status)
+
+    def set_drive_status(self, location: str, status: str, controllers: tuple = ("a", "b"),
+                         enclosure_id: str = "0") -> tuple:
+        """
+        Enable or disable the phys of a drive on all controllers, i.e. insert or remove it.
+
+        :param location: Drive location like 0.5.
+        :param status: enabled or disabled.
+        :param controllers: Controllers whose phy is changed.
+        :param enclosure_id: Enclosure ID.
+        :return: (bool, response)
+        """
+        phy = location.split(".")[-1]
+        for ctlr in controllers:
+            result, resp = self.execute(common_cmd.SET_DRIVE_STATUS_CMD.format(
+                enclosure_id, ctlr, phy, status))
+            if not result:
+                return result, resp
+        return True, f"Drive {location} {status}"
+
+    def remove_drive(self, location: str, **kwargs) -> tuple:
+        """Disable the drive phys, see set_drive_status."""
+        return self.set_drive_status(location, "disabled", **kwargs)
+
+    def insert_drive(self, location: str, **kwargs) -> tuple:
+        """Enable the drive phys, see set_drive_status."""
+        return self.set_drive_status(location, "enabled", **kwargs)
+
+    def clear_metadata(self, location: str) -> tuple:
+        """:return: (bool, response) of clearing the drive metadata."""
+        return self.execute(common_cmd.CMD_CLEAR_METADATA.format(location))
+
+    def add_spares(self, locations: list, disk_group: str) -> tuple:
+        """
+        Add drives to a disk group, clearing leftover metadata first.
+
+        :return: (bool, response)
+        """
+        usage = {disk["location"]: disk.get("usage") for disk in self.show_disks().values()}
+        for location in locations:
+            if usage.get(location) is None:
+                return False, f"Drive {location} not found"
+            if usage[location] not in ("AVAIL", "LINEAR POOL"):
+                result, resp = self.clear_metadata(location)
+                if not result:
+                    return result, resp
+        result, resp = self.execute(common_cmd.ADD_SPARES_CMD.format(",".join(locations),
+                                                                     disk_group))
+        return result, resp if not result else \
+            f"Added drives {locations} to disk group {disk_group}"
+
+    def group_drives(self, disk_group: str) -> list:
+        """:return: Locations of the drives in a disk group."""
+        return sorted(disk["location"] for disk in self.show_disks().values()
+                      if disk.get("disk_group") == disk_group)
+
+    def poll_recon(self, disk_group: str, percent: int = 100, timeout: float = 7200,
+                   interval: float = 30) -> tuple:
+        """
+        Poll a disk group until its job reaches percent, it is healthy without a job, or
+        timeout elapses.
+
+        :return: (bool, disk group dict of the last poll)
+        """
+        deadline = self.clock() + timeout
+        while True:
+            group = self.show_disk_groups().get(disk_group)
+            if group is None:
+                raise CTException(cterr.CONTROLLER_ERROR, f"Disk group {disk_group} not found")
+            LOGGER.info("Disk group %s health %s job %s %s%%", disk_group, group.get("health"),
+                        group.get("job"), group.get("job_percent"))
+            if group.get("job") and group.get("job_percent", 0) >= percent:
+                return True, group
+            if not group.get("job"):
+                return group.get("health") == "OK", group
+            if self.clock() >= deadline:
+                LOGGER.error("Disk group %s job %s not done in %ss", disk_group,
+                             group.get("job"), timeout)
+                return False, group
+            self.sleep(interval)
+
+
+class EnclosureSimulator:
+    """
+    Deterministic in memory enclosure answering the CLI commands with XML API output.
+
+    Drives are 0.0 .. 0.<drives-1>, the first groups * group_size drives make the disk
+    groups dg01, dg02, ... each with one volume, the others are spares (AVAIL). Disabling
+    the phys of a drive on all controllers removes it and degrades its disk group, enabling
+    them inserts it back with leftover metadata. Adding a spare to a degraded group starts a
+    reconstruction job progressing linearly over recon_seconds of the clock. Commands which
+    prompt for a confirmation on the controller are canceled unless answered with y.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, drives: int = 12, groups: int = 2, group_size: int = 5,
+                 raidtype: str = "RAID6", recon_seconds: float = 600, seed: int = 0,
+                 clock=time.time, controllers: tuple = ("A", "B")):
+        """
+        :param drives: Number of drive slots.
+        :param groups: Number of disk groups.
+        :param group_size: Drives per disk group.
+        :param raidtype: RAID level reported for the groups, RAID6 tolerates 2 missing drives,
+            others 1.
+        :param recon_seconds: Seconds a reconstruction takes.
+        :param seed: Seed for serial numbers.
+        :param clock: Time source for reconstruction progress.
+        :param controllers: Controller names.
+        """
+        if groups * group_size > drives:
+            raise ValueError(f"{groups} groups of {group_size} drives need more than {drives}")
+        rng = random.Random(seed)
+        self.raidtype = raidtype
+        self.recon_seconds = recon_seconds
+        self.clock = clock
+        self.controllers = [ctlr.upper() for ctlr in controllers]
+        self.drives = {}
+        for num in range(drives):
+            group = f"dg{num // group_size + 1:02d}" if num < groups * group_size else None
+            self.drives[f"0.{num}"] = {
+                "durable-id": f"disk_01.{num:02d}", "location": f"0.{num}",
+                "serial-number": f"ZA{rng.randrange(16 ** 6):06X}", "vendor": "SEAGATE",
+                "revision": "E004", "description": "SAS", "size": "16.0TB",
+                "usage": "LINEAR POOL" if group else "AVAIL", "disk-group": group or "N/A",
+                "storage-tier": "Archive" if group else "N/A"}
+        self.groups = {f"dg{num + 1:02d}": {"job": None, "started": None, "missing": 0,
+                                            "rebuild": 0} for num in range(groups)}
+        self.disabled = set()
+        self.phys_disabled = set()
+        self.commands = []
+
+    def _group_state(self, name: str) -> dict:
+        """Reconstruction progress and health of a disk group."""
+        group = self.groups[name]
+        percent = 0
+        if group["job"]:
+            percent = int(min(100.0, (self.clock() - group["started"]) * 100 /
+                              self.recon_seconds))
+            if percent >= 100:
+                group["missing"] -= group["rebuild"]
+                group.update({"job": None, "started": None, "rebuild": 0})
+        missing = group["missing"]
+        tolerance = 2 if self.raidtype == "RAID6" else 1
+        if not missing:
+            health, reason = "OK", ""
+        elif missing < tolerance:
+            health, reason = "Degraded", "The disk group is not fault tolerant."
+        elif missing == tolerance:
+            health, reason = "Fault", "The disk group is critical."
+        else:
+            health, reason = "Fault", "The disk group is offline."
+        return {"health": health, "reason": reason, "job": group["job"], "percent": percent}
+
+    def _drive_rows(self) -> list:
+        rows = []
+        for location, drive in self.drives.items():
+            if location in self.disabled:
+                continue
+            row = dict(drive)
+            group = drive["disk-group"]
+            degraded = group in self.groups and self._group_state(group)["job"]
+            row.update({"health": "Degraded" if degraded else "OK",
+                        "health-reason": "Reconstruction in progress." if degraded else "",
+                        "health-recommendation": "- No action is required." if not degraded
+                        else "- Wait for the reconstruction to finish."})
+            if drive["usage"] == "LEFTOVR":
+                row.update({"health": "Degraded", "health-reason": "The disk has leftover "
+                            "metadata.", "health-recommendation": "- Clear the disk metadata."})
+            rows.append(row)
+        return rows
+
+    def _group_rows(self) -> list:
+        rows = []
+        for name in self.groups:
+            state = self._group_state(name)
+            rows.append({"name": name, "size": "48.0TB", "create-date": "2022-01-01 00:00:00",
+                         "current-job": state["job"] or "",
+                         "current-job-completion": f"{state['percent']}%" if state["job"]
+                         else "", "raidtype": self.raidtype, "health": state["health"],
+                         "health-reason": state["reason"],
+                         "health-recommendation": "- No action is required."
+                         if state["health"] == "OK" else "- Replace the missing disks."})
+        return rows
+
+    def _volume_rows(self) -> list:
+        rows = []
+        for name in self.groups:
+            state = self._group_state(name)
+            rows.append({"storage-pool-name": name, "volume-name": f"vol-{name}",
+                         "total-size": "47.9TB", "allocated-size": "47.9TB",
+                         "storage-type": "Linear", "health": "OK" if state["health"] == "OK"
+                         else "Degraded", "health-reason": state["reason"],
+                         "health-recommendation": "- No action is required."})
+        return rows
+
+    def _expander_rows(self) -> list:
+        rows = []
+        for ctlr in self.controllers:
+            for location in self.drives:
+                phy = location.split(".")[-1]
+                disabled = f"{ctlr}:{phy}" in self.phys_disabled
+                rows.append({"enclosure-id": "0", "controller": ctlr, "wide-port-index": phy,
+                             "type": "Drive", "status": "Disabled" if disabled else "OK",
+                             "elem-disabled": "Disabled" if disabled else "Enabled",
+                             "elem-reason": "PHY disabled by the user" if disabled else ""})
+            rows.append({"enclosure-id": "0", "controller": ctlr, "wide-port-index": "0",
+                         "type": "Egress", "status": "OK", "elem-disabled": "Enabled",
+                         "elem-reason": ""})
+        return rows
+
+    def _set_phy(self, ctlr: str, phy: str, status: str) -> str:
+        location = f"0.{phy}"
+        if location not in self.drives or ctlr.upper() not in self.controllers:
+            raise ValueError(f"No phy {phy} on controller {ctlr}")
+        phys = self.phys_disabled
+        key = f"{ctlr.upper()}:{phy}"
+        if status.lower() == "disabled":
+            phys.add(key)
+        else:
+            phys.discard(key)
+        gone = all(f"{each}:{phy}" in phys for each in self.controllers)
+        drive = self.drives[location]
+        if gone and location not in self.disabled:
+            self.disabled.add(location)
+            group = drive["disk-group"]
+            if group in self.groups:
+                self.groups[group]["missing"] += 1
+                drive.update({"usage": "LEFTOVR", "disk-group": "N/A", "storage-tier": "N/A"})
+        elif not gone:
+            self.disabled.discard(location)
+        return f"Drive phy {phy} on controller {ctlr} {status.lower()}."
+
+    def _clear_metadata(self, location: str) -> str:
+        drive = self.drives.get(location)
+        if drive is None or location in self.disabled:
+            raise ValueError(f"Disk {location} not found")
+        if drive["usage"] == "LINEAR POOL":
+            raise ValueError(f"Disk {location} is in use by disk group {drive['disk-group']}")
+        drive["usage"] = "AVAIL"
+        return f"Metadata of disk {location} cleared."
+
+    def _add_spares(self, locations: str, name: str) -> str:
+        if name not in self.groups:
+            raise ValueError(f"Disk group {name} not found")
+        drives = [self.drives.get(location) for location in locations.split(",")]
+        if any(drive is None or drive["usage"] != "AVAIL" or drive["location"] in
+               self.disabled for drive in drives):
+            raise ValueError(f"Disks {locations} are not all available")
+        group = self.groups[name]
+        self._group_state(name)
+        for drive in drives:
+            drive.update({"usage": "LINEAR POOL", "disk-group": name,
+                          "storage-tier": "Archive"})
+        if group["missing"] and not group["job"]:
+            group.update({"job": "RCON", "started": self.clock(),
+                          "rebuild": min(group["missing"], len(drives))})
+        return f"Spares {locations} added to disk group {name}."
+
+    @staticmethod
+    def response(cmd: str, basetype: str = None, rows: list = (), message: str = None,
+                 error: str = None) -> str:
+        """XML API output of one command."""
+        root = ElementTree.Element("RESPONSE", {"VERSION": "L100", "REQUEST": cmd})
+        for oid, row in enumerate(rows, start=1):
+            obj = ElementTree.SubElement(root, "OBJECT", {"basetype": basetype,
+                                                          "name": basetype, "oid": str(oid)})
+            for name, value in row.items():
+                ElementTree.SubElement(obj, "PROPERTY", {"name": name}).text = str(value)
+        status = ElementTree.SubElement(root, "OBJECT", {"basetype": "status", "name": "status",
+                                                         "oid": str(len(rows) + 1)})
+        for name, value in (("response-type", "Error" if error else "Success"),
+                            ("response", error or message or "Command completed successfully."),
+                            ("return-code", "-1" if error else "0")):
+            ElementTree.SubElement(status, "PROPERTY", {"name": name}).text = value
+        return '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' + \
+            ElementTree.tostring(root, encoding="unicode")
+
+    def run(self, cmd: str, answer: str = None) -> str:
+        """
+        Answer one command like the controller does.
+
+        :param cmd: Enclosure command.
+        :param answer: Answer to the confirmation prompt of cmd.
+        :return: XML API output.
+        """
+        cmd = " ".join(cmd.split())
+        self.commands.append(cmd)
+        if needs_confirmation(cmd) and str(answer).strip().lower() not in ("y", "yes"):
+            return f"{CONFIRM_PROMPT}\n" + self.response(
+                cmd, error="Error: The command was canceled.")
+        shows = {common_cmd.SHOW_DISKS_CMD: ("drives", self._drive_rows),
+                 common_cmd.CMD_SHOW_DISK_GROUP: ("disk-groups", self._group_rows),
+                 common_cmd.CMD_SHOW_VOLUMES: ("volumes", self._volume_rows),
+                 common_cmd.CMD_SHOW_XP_STATUS: ("sas-status-controller", self._expander_rows)}
+        if cmd in shows:
+            basetype, rows = shows[cmd]
+            return self.response(cmd, basetype, rows())
+        actions = ((SET_PHY_RE, lambda match: self._set_phy(*match.groups()[1:])),
+                   (CLEAR_METADATA_RE, lambda match: self._clear_metadata(match.group(1))),
+                   (ADD_SPARES_RE, lambda match: self._add_spares(*match.groups())))
+        for regex, action in actions:
+            match = regex.match(cmd)
+            if match:
+                try:
+                    return self.response(cmd, message=action(match))
+                except ValueError as error:
+                    return self.response(cmd, error=f"Error: {error}")
+        return self.response(cmd, error=f"Error: The command is not recognized. ({cmd})")
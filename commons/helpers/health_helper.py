@@ -20,6 +20,7 @@
 import json
 import logging
 import re
+import shlex
 import time
 from typing import Tuple, List, Any
 
@@ -29,6 +30,8 @@ from commons import commands
 from commons import constants as const
 from commons.helpers.host import Host
 from commons.helpers.pods_helper import LogicalNode
+from commons.helpers.resource_sampler import ResourceSampler
+from commons.helpers.resource_sampler import collect_script
 from commons.utils.assert_utils import assert_true
 from commons.utils.system_utils import check_ping
 from commons.utils.system_utils import run_remote_cmd
@@ -169,6 +172,27 @@ class Health(Host):
         mem_usage = float(res.replace('\n', ''))
         return mem_usage
 
+    def resource_sampler(self, interval: float = 10, namespace: str = const.NAMESPACE,
+                         pod_prefix: str = None, max_points: int = 720) -> ResourceSampler:
+        """
+        Background sampler of cpu, memory, fd, network and disk stats of every container.
+        Each tick is a single ssh round-trip on its own connection to this (master) node.
+        :param interval: Seconds between samples
+        :param namespace: namespace name
+        :param pod_prefix: Sample only pods with this prefix, all pods if None
+        :param max_points: Samples kept per container and metric
+        :return: ResourceSampler, call start() and stop() or use it as context manager
+        """
+        host = Host(hostname=self.hostname, username=self.username, password=self.password)
+        cmd = f"bash -c {shlex.quote(collect_script(namespace, pod_prefix))}"
+
+        def collect():
+            res = host.execute_cmd(cmd, timeout=max(interval * 3, 60), exc=False)
+            res = res[0] if isinstance(res, tuple) else res
+            return res.decode("utf-8") if isinstance(res, bytes) else res
+
+        return ResourceSampler(collect, interval=interval, max_points=max_points)
+
     def get_pcs_service_systemd(self, service: str) -> Any:
         """
         Function to return pcs service systemd service name.
@@ -200,7 +200,7 @@ class Host(AbsHost):
         exc = kwargs.get('exc', True)
         if 'exc' in kwargs.keys():
             kwargs.pop('exc')
-        LOGGER.debug("Executing %s", cmd)
+        LOGGER.debug("Executing %s", cmd, extra={"host": self.hostname})
         self.connect(**kwargs)  # fn will raise an exception
         stdin, stdout, stderr = self.host_obj.exec_command(cmd, timeout=timeout)  # nosec
         # above is non blocking call and timeout is set for SSL handshake and command
@@ -210,11 +210,11 @@ class Host(AbsHost):
             if time.time() - timer >= timeout:  # as per request by CFT Deployment team
                 raise TimeoutError('The script or command was not completed within estimated time')
         exit_status = stdout.channel.recv_exit_status()
-        LOGGER.debug(exit_status)
+        LOGGER.debug(exit_status, extra={"host": self.hostname})
         if exit_status != 0:
             err = stderr.readlines()
             err = [r.strip().strip("\n").strip() for r in err]
-            LOGGER.debug("Error: %s", str(err))
+            LOGGER.debug("Error: %s", str(err), extra={"host": self.hostname})
             if exc:
                 if err:
                     raise IOError(err)
@@ -0,0 +1,277 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Background resource sampler of all pods and containers of a namespace.
+
+Every tick runs one script over ssh on the master node. The script reads cgroup cpu, memory
+and io counters, open file descriptors and network counters of every container with
+parallel kubectl exec and prints one line per container. Counters are turned into rates
+and kept in bounded in-memory time series with export and assertion helpers.
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+import shlex
+import threading
+import time
+from collections import deque
+
+from commons.utils.assert_utils import assert_true
+
+LOG = logging.getLogger(__name__)
+
+SAMPLE_RE = re.compile(r"^SAMPLE (\S+) (\S+) (.*)$")
+METRICS = ("cpu_pct", "mem_bytes", "fds", "net_rx_bps", "net_tx_bps", "disk_read_bps",
+           "disk_write_bps")
+# Cumulative counters of the probe and the rate metric derived from them
+RATES = {"cpu_usec": ("cpu_pct", 1e-4), "net_rx": ("net_rx_bps", 1),
+         "net_tx": ("net_tx_bps", 1), "disk_read": ("disk_read_bps", 1),
+         "disk_write": ("disk_write_bps", 1)}
+
+PROBE = r"""
+cpu=$(awk '/^usage_usec/{print $2}' /sys/fs/cgroup/cpu.stat 2>/dev/null)
+[ -z "$cpu" ] && cpu=$(( $(cat /sys/fs/cgroup/cpuacct/cpuacct.usage 2>/dev/null || echo 0) / 1000 ))
+mem=$(cat /sys/fs/cgroup/memory.current 2>/dev/null || \
+      cat /sys/fs/cgroup/memory/memory.usage_in_bytes 2>/dev/null || echo 0)
+fds=$(find /proc/[0-9]*/fd -mindepth 1 -maxdepth 1 2>/dev/null | wc -l)
+net=$(awk 'NR>2 && $1!="lo:" {rx+=$2; tx+=$10} END {print rx+0, tx+0}' /proc/net/dev)
+if [ -f /sys/fs/cgroup/io.stat ]; then
+  io=$(awk '{for(i=2;i<=NF;i++){split($i,a,"="); if(a[1]=="rbytes")r+=a[2];
+       if(a[1]=="wbytes")w+=a[2]}} END {print r+0, w+0}' /sys/fs/cgroup/io.stat)
+else
+  io=$(awk '$2=="Read"{r+=$3} $2=="Write"{w+=$3} END {print r+0, w+0}' \
+       /sys/fs/cgroup/blkio/blkio.throttle.io_service_bytes 2>/dev/null)
+fi
+set -- $net $io
+echo "cpu_usec=$cpu mem_bytes=$mem fds=$fds net_rx=$1 net_tx=$2 disk_read=$3 disk_write=$4"
+"""
+
+
+def collect_script(namespace: str, pod_prefix: str = None) -> str:
+    """
+    Script printing 'SAMPLE <pod> <container> key=value...' for every container.
+
+    :param namespace: Namespace of the pods.
+    :param pod_prefix: Only pods starting with the prefix, all pods if None.
+    :return: Script text to run with bash on the master node.
+    """
+    probe = shlex.quote(PROBE)
+    prefix = f" | grep '^{pod_prefix}'" if pod_prefix else ""
+    return (f"for p in $(kubectl get pods -n {namespace} --no-headers --field-selector="
+            f"status.phase=Running -o custom-columns=:metadata.name{prefix}); do\n"
+            f"  for c in $(kubectl get pod $p -n {namespace} -o "
+            f"jsonpath='{{.spec.containers[*].name}}'); do\n"
+            f"    (out=$(kubectl exec -n {namespace} $p -c $c -- sh -c {probe} 2>/dev/null) "
+            f"&& echo \"SAMPLE $p $c $out\") &\n"
+            "  done\ndone\nwait")
+
+
+def parse_samples(output: str) -> dict:
+    """
+    Parse collect_script output.
+
+    :param output: Script output.
+    :return: {(pod, container): {counter: int}}
+    """
+    samples = {}
+    for line in output.splitlines():
+        match = SAMPLE_RE.match(line.strip())
+        if not match:
+            continue
+        counters = {}
+        for pair in match.group(3).split():
+            key, _, value = pair.partition("=")
+            if value.isdigit():
+                counters[key] = int(value)
+        samples[(match.group(1), match.group(2))] = counters
+    return samples
+
+
+def slope(points: list) -> float:
+    """Least squares slope of (time, value) points per minute."""
+    if len(points) < 2:
+        return 0.0
+    mean_t = sum(point[0] for point in points) / len(points)
+    mean_v = sum(point[1] for point in points) / len(points)
+    var = sum((point[0] - mean_t) ** 2 for point in points)
+    if not var:
+        return 0.0
+    return sum((point[0] - mean_t) * (point[1] - mean_v) for point in points) / var * 60
+
+
+STATS = {"peak": lambda points: max(point[1] for point in points),
+         "mean": lambda points: sum(point[1] for point in points) / len(points),
+         "slope": slope}
+
+
+class ResourceSampler:
+    """Sample resources of all containers in the background into bounded time series."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, collect, interval: float = 10, max_points: int = 720, clock=time.time):
+        """
+        :param collect: Callable returning collect_script output of one tick.
+        :param interval: Seconds between ticks.
+        :param max_points: Points kept per container and metric.
+        :param clock: Time source, epoch seconds.
+        """
+        self.collect = collect
+        self.interval = interval
+        self.max_points = max_points
+        self.clock = clock
+        self.series = {}
+        self.ticks = 0
+        self.errors = 0
+        self._last = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample_once(self) -> int:
+        """
+        Collect one tick.
+
+        :return: Number of containers sampled.
+        """
+        now = self.clock()
+        try:
+            samples = parse_samples(self.collect())
+        except Exception as error:  # pylint: disable=broad-except
+            self.errors += 1
+            LOG.warning("Resource sampling failed: %s", error)
+            return 0
+        with self._lock:
+            for key, counters in samples.items():
+                values = {"mem_bytes": counters.get("mem_bytes"), "fds": counters.get("fds")}
+                last = self._last.get(key)
+                if last and now > last[0]:
+                    for counter, (metric, scale) in RATES.items():
+                        if counter in counters and counter in last[1] and \
+                                counters[counter] >= last[1][counter]:
+                            values[metric] = (counters[counter] - last[1][counter]) / \
+                                (now - last[0]) * scale
+                self._last[key] = (now, counters)
+                for metric, value in values.items():
+                    if value is not None:
+                        self.series.setdefault(key, {}).setdefault(
+                            metric, deque(maxlen=self.max_points)).append((now, value))
+            self.ticks += 1
+        return len(samples)
+
+    def _run(self):
+        """Tick until stopped, keeping the interval independent of collection time."""
+        while not self._stop.is_set():
+            start = time.monotonic()
+            self.sample_once()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def start(self):
+        """Start background sampling."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler",
+                                        daemon=True)
+        self._thread.start()
+        LOG.info("Started resource sampler, interval %ss", self.interval)
+        return self
+
+    def stop(self, timeout: float = None):
+        """Stop background sampling."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout if timeout is not None else self.interval * 2)
+        LOG.info("Stopped resource sampler after %s ticks, %s failed", self.ticks, self.errors)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def points(self, metric: str, pod: str = None, container: str = None) -> dict:
+        """
+        Points of a metric per container.
+
+        :param metric: One of METRICS.
+        :param pod: Pod name prefix filter.
+        :param container: Container name filter.
+        :return: {(pod, container): [(time, value)]}
+        """
+        with self._lock:
+            return {key: list(series[metric]) for key, series in self.series.items()
+                    if metric in series and series[metric]
+                    and (pod is None or key[0].startswith(pod))
+                    and (container is None or key[1] == container)}
+
+    def stat(self, metric: str, stat: str, pod: str = None, container: str = None) -> dict:
+        """
+        Statistic (peak, mean or slope per minute) of a metric per container.
+
+        :return: {(pod, container): value}
+        """
+        return {key: STATS[stat](points)
+                for key, points in self.points(metric, pod, container).items()}
+
+    def check(self, metric: str, stat: str, limit: float, pod: str = None,
+              container: str = None) -> tuple:
+        """
+        Check a statistic of a metric is at most limit for every container.
+
+        :return: (bool, {(pod, container): value} of offenders)
+        """
+        offenders = {key: value for key, value in self.stat(metric, stat, pod,
+                                                            container).items()
+                     if value > limit}
+        return not offenders, offenders
+
+    def assert_within(self, metric: str, stat: str, limit: float, pod: str = None,
+                      container: str = None):
+        """Assert a statistic of a metric is at most limit, e.g. at teardown."""
+        result, offenders = self.check(metric, stat, limit, pod, container)
+        assert_true(result, f"{stat} of {metric} above {limit}: " +
+                    ", ".join(f"{pod_name}/{cname}={value:.2f}"
+                              for (pod_name, cname), value in offenders.items()))
+
+    def export(self, path: str) -> str:
+        """
+        Export all points as csv (time, pod, container, metric, value) or json by extension.
+
+        :param path: File path ending with .csv or .json.
+        :return: path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            rows = [(point[0], key[0], key[1], metric, point[1])
+                    for key, series in sorted(self.series.items())
+                    for metric, points in sorted(series.items()) for point in points]
+        with open(path, "w", newline="", encoding="utf-8") as fptr:
+            if path.endswith(".json"):
+                json.dump([dict(zip(("time", "pod", "container", "metric", "value"), row))
+                           for row in rows], fptr, indent=1)
+            else:
+                writer = csv.writer(fptr)
+                writer.writerow(("time", "pod", "container", "metric", "value"))
+                writer.writerows(rows)
+        LOG.info("Exported %s resource samples to %s", len(rows), path)
+        return path
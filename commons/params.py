@@ -79,6 +79,7 @@ TEST_ABORT_TOPIC = 'cortx-test-abort-topic'
 CSM_DIR = os.path.join(CONFIG_DIR, 'csm')
 CSM_CONFIG = os.path.join(CSM_DIR, 'csm_config.yaml')
 SETUPS_FPATH = os.path.join(LOG_DIR_NAME, "setups.json")
+TRIAGE_HISTORY = os.path.join(LOG_DIR_NAME, "triage_history.json")
 
 NFS_SERVER_DIR = "cftic2.pun.seagate.com:/cftshare_temp"
 NFS_BASE_DIR = "automation"
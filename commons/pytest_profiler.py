@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Opt-in pytest plugin recording where the time of every test goes.
+
+Host.execute_cmd, boto3 (botocore) API calls, HTTP requests, time.sleep, fixture setup,
+the logstart health check and the setup/call/teardown phases are timed as nested frames.
+Exclusive time of every frame is attributed to a category (remote, io, waiting, other),
+so the per test breakdown never double counts e.g. sleeps inside execute_cmd.
+
+Enabled with --profile=True. Output in <log_path>/profile:
+    tests.json      per test wall, waiting, remote, io, cpu and other seconds
+    profile.folded  collapsed stacks for flamegraph.pl / speedscope, values in microseconds
+    summary.json    helpers ranked by total time across the session
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import pytest
+
+LOGGER = logging.getLogger(__name__)
+
+REMOTE = "remote"
+IO = "io"
+WAITING = "waiting"
+OTHER = "other"
+CATEGORIES = (WAITING, REMOTE, IO, OTHER)
+
+
+class _Frame:
+    """Timed frame of the profiler stack."""
+
+    __slots__ = ("name", "category", "start", "children")
+
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.children = 0.0
+
+
+class ProfilerPlugin:
+    """Per test resource and latency profiler."""
+
+    def __init__(self, out_dir: str, top: int = 25):
+        """
+        :param out_dir: Directory for tests.json, profile.folded and summary.json.
+        :param top: Number of helpers shown in the session summary.
+        """
+        self.out_dir = out_dir
+        self.top = top
+        self.suffix = ""
+        self.tests = {}
+        self.folded = defaultdict(float)
+        self.helpers = defaultdict(lambda: {"calls": 0, "total": 0.0, "max": 0.0})
+        self.current = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._patched = []
+
+    # Instrumentation
+
+    def _stack(self) -> list:
+        """Frame stack of the calling thread."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def push(self, name: str, category: str = OTHER) -> None:
+        """Open a frame on the calling thread."""
+        self._stack().append(_Frame(name, category))
+
+    def pop(self) -> None:
+        """Close the last frame and account its inclusive and exclusive time."""
+        stack = self._stack()
+        frame = stack.pop()
+        duration = time.perf_counter() - frame.start
+        exclusive = max(duration - frame.children, 0.0)
+        if stack:
+            stack[-1].children += duration
+        main = threading.current_thread() is threading.main_thread()
+        path = [item.name for item in stack] + [frame.name]
+        if not main:
+            path.insert(0, f"thread:{threading.current_thread().name}")
+        with self._lock:
+            record = self.current
+            if record is not None:
+                path.insert(0, record["nodeid"])
+                if main:
+                    record["breakdown"][frame.category] += exclusive
+                elif len(stack) == 0:
+                    record["background"] += duration
+            self.folded[";".join(path)] += exclusive
+            helper = self.helpers[frame.name]
+            helper["calls"] += 1
+            helper["total"] += duration
+            helper["max"] = max(helper["max"], duration)
+
+    def wrap(self, owner, attr: str, category: str, namer) -> None:
+        """
+        Replace owner.attr with a timed wrapper.
+
+        :param owner: Class or module.
+        :param attr: Attribute name.
+        :param category: Category of the exclusive time.
+        :param namer: Callable(args, kwargs) returning the frame name.
+        """
+        original = getattr(owner, attr)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            self.push(namer(args, kwargs), category)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.pop()
+
+        setattr(owner, attr, wrapper)
+        self._patched.append((owner, attr, original))
+
+    def instrument(self) -> None:
+        """Patch remote command, S3, HTTP and sleep helpers."""
+        self.wrap(time, "sleep", WAITING, lambda args, kwargs: "time.sleep")
+        try:
+            from commons.helpers.host import Host  # pylint: disable=import-outside-toplevel
+            self.wrap(Host, "execute_cmd", REMOTE, _cmd_name)
+        except ImportError as error:
+            LOGGER.warning("Host.execute_cmd not profiled: %s", error)
+        try:
+            from botocore import client  # pylint: disable=import-outside-toplevel
+            self.wrap(client.BaseClient, "_make_api_call", IO,
+                      lambda args, kwargs: f"boto3.{args[1]}")
+        except ImportError:
+            LOGGER.warning("botocore not installed, boto3 calls not profiled")
+        try:
+            from requests import sessions  # pylint: disable=import-outside-toplevel
+            self.wrap(sessions.Session, "request", IO, _http_name)
+        except ImportError:
+            LOGGER.warning("requests not installed, HTTP calls not profiled")
+
+    def restore(self) -> None:
+        """Undo patches."""
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched = []
+
+    # Pytest hooks
+
+    def pytest_configure(self, config):
+        """Instrument helpers, xdist workers write their own files."""
+        worker = getattr(config, "workerinput", {}).get("workerid")
+        self.suffix = f"_{worker}" if worker else ""
+        self.instrument()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):  # pylint: disable=unused-argument
+        """Time a test from logstart till teardown."""
+        record = {"nodeid": item.nodeid, "breakdown": dict.fromkeys(CATEGORIES, 0.0),
+                  "phases": {}, "fixtures": {}, "background": 0.0}
+        with self._lock:
+            self.current = record
+        cpu = time.process_time()
+        start = time.perf_counter()
+        yield
+        record["wall"] = time.perf_counter() - start
+        record["cpu"] = time.process_time() - cpu
+        with self._lock:
+            self.current = None
+            self.tests[item.nodeid] = record
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_logstart(self, nodeid, location):  # pylint: disable=unused-argument
+        """Health check runs in logstart."""
+        yield from self._timed("logstart", "logstart")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):  # pylint: disable=unused-argument
+        """Time setup phase."""
+        yield from self._timed("setup", "setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):  # pylint: disable=unused-argument
+        """Time call phase."""
+        yield from self._timed("call", "call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):  # pylint: disable=unused-argument
+        """Time teardown phase."""
+        yield from self._timed("teardown", "teardown")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):  # pylint: disable=unused-argument
+        """Time fixture setup."""
+        yield from self._timed(f"fixture:{fixturedef.argname}", fixturedef.argname,
+                               "fixtures")
+
+    def _timed(self, name: str, key: str, section: str = "phases"):
+        """Hookwrapper body timing a frame and storing its duration in the test record."""
+        start = time.perf_counter()
+        self.push(name)
+        try:
+            yield
+        finally:
+            self.pop()
+            with self._lock:
+                if self.current is not None:
+                    values = self.current[section]
+                    values[key] = values.get(key, 0.0) + time.perf_counter() - start
+
+    def summary(self) -> list:
+        """Helpers ranked by total inclusive time."""
+        ranked = sorted(self.helpers.items(), key=lambda item: item[1]["total"], reverse=True)
+        return [{"helper": name, "calls": stats["calls"], "total": round(stats["total"], 3),
+                 "mean": round(stats["total"] / stats["calls"], 3),
+                 "max": round(stats["max"], 3)} for name, stats in ranked]
+
+    def write(self) -> None:
+        """Write tests.json, profile.folded and summary.json."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        tests = {}
+        for nodeid, record in self.tests.items():
+            breakdown = {key: round(value, 3) for key, value in record["breakdown"].items()}
+            accounted = sum(breakdown[key] for key in (WAITING, REMOTE, IO))
+            breakdown[OTHER] = round(max(record["wall"] - accounted, 0.0), 3)
+            tests[nodeid] = {"wall": round(record["wall"], 3), "cpu": round(record["cpu"], 3),
+                             **breakdown, "background": round(record["background"], 3),
+                             "phases": {key: round(value, 3) for key, value in
+                                        record["phases"].items()},
+                             "fixtures": {key: round(value, 3) for key, value in
+                                          record["fixtures"].items()}}
+        with open(os.path.join(self.out_dir, f"tests{self.suffix}.json"), "w",
+                  encoding="utf-8") as fptr:
+            json.dump(tests, fptr, indent=2)
+        with open(os.path.join(self.out_dir, f"profile{self.suffix}.folded"), "w",
+                  encoding="utf-8") as fptr:
+            for path, seconds in sorted(self.folded.items()):
+                micros = int(seconds * 1e6)
+                if micros:
+                    fptr.write(f"{path.replace(' ', '_')} {micros}\n")
+        with open(os.path.join(self.out_dir, f"summary{self.suffix}.json"), "w",
+                  encoding="utf-8") as fptr:
+            json.dump(self.summary(), fptr, indent=2)
+
+    def pytest_sessionfinish(self, session, exitstatus):  # pylint: disable=unused-argument
+        """Write profile files and undo patches."""
+        self.restore()
+        self.write()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Print most expensive helpers."""
+        terminalreporter.section("profile: most expensive helpers")
+        terminalreporter.write_line(f"{'helper':<50} {'calls':>7} {'total s':>10} "
+                                    f"{'mean s':>9} {'max s':>9}")
+        for row in self.summary()[:self.top]:
+            terminalreporter.write_line(f"{row['helper'][:50]:<50} {row['calls']:>7} "
+                                        f"{row['total']:>10.2f} {row['mean']:>9.3f} "
+                                        f"{row['max']:>9.3f}")
+        terminalreporter.write_line(f"Per test breakdown and flame graph stacks in "
+                                    f"{self.out_dir}")
+
+
+def _cmd_name(args: tuple, kwargs: dict) -> str:
+    """Frame name of Host.execute_cmd from the command binary."""
+    cmd = kwargs.get("cmd", args[1] if len(args) > 1 else "")
+    words = str(cmd).split()
+    binary = next((word for word in words if "=" not in word and word != "sudo"), "")
+    return f"execute_cmd:{os.path.basename(binary)}"
+
+
+def _http_name(args: tuple, kwargs: dict) -> str:
+    """Frame name of HTTP request from method and first path segment."""
+    method = kwargs.get("method", args[1] if len(args) > 1 else "")
+    url = kwargs.get("url", args[2] if len(args) > 2 else "")
+    segment = urlparse(str(url)).path.strip("/").split("/")[0]
+    return f"http.{str(method).upper()} /{segment}"
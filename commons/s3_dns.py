@@ -17,32 +17,346 @@
 #
 # -*- coding: utf-8 -*-
 # !/usr/bin/python
-""" Module to configure s3 dns"""
-import threading
+"""
+Module to configure s3 dns and balance requests over s3 endpoints.
 
-import pytest
+EndpointBalancer keeps latency, error rate and in-flight requests of every endpoint and
+picks one with the round_robin, least_outstanding or latency_weighted policy. Endpoints
+failing repeatedly are ejected for a cooldown and then re-probed with a single request.
+One shared balancer per process is configured with configure_balancer and attached to
+boto3 clients (S3Rest, locust, DI) so they spread load over the same endpoints.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
 
 from commons.utils import system_utils
 
+LOGGER = logging.getLogger(__name__)
+
+POLICIES = ("round_robin", "least_outstanding", "latency_weighted")
+CONTEXT_KEY = "s3_endpoint_balancer"
+
+_DEFAULT = {"balancer": None}
+_DEFAULT_LOCK = threading.Lock()
+
+
+class EndpointStats:
+    """Health and load of one endpoint, guarded by the lock of the balancer."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, url: str, window: int):
+        self.url = url
+        self.inflight = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.latency = None
+        self.outcomes = deque(maxlen=window)
+        self.ejected_until = None
+        self.ejections = 0
+        self.probing = False
+
+    @property
+    def error_rate(self) -> float:
+        """Error rate over the sliding window."""
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def as_dict(self) -> dict:
+        """Snapshot of the stats."""
+        return {"url": self.url, "inflight": self.inflight, "requests": self.requests,
+                "errors": self.errors, "error_rate": round(self.error_rate, 3),
+                "latency": round(self.latency, 6) if self.latency is not None else None,
+                "ejected": self.ejected_until is not None, "ejections": self.ejections}
+
+
+class EndpointBalancer:
+    """Thread safe, health aware selection of s3 endpoints."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, endpoints: list, policy: str = "round_robin", **kwargs):
+        """
+        :param endpoints: Endpoint urls e.g. ['https://s3.node1', 'https://s3.node2'].
+        :param policy: One of round_robin, least_outstanding or latency_weighted.
+        :keyword eject_failures: Consecutive failures ejecting an endpoint.
+        :keyword eject_error_rate: Error rate over the window ejecting an endpoint.
+        :keyword window: Requests in the error rate window.
+        :keyword min_requests: Requests in the window before the error rate is used.
+        :keyword cooldown: Seconds an endpoint stays ejected, doubled on a failed probe.
+        :keyword max_cooldown: Upper bound of the cooldown.
+        :keyword alpha: Smoothing factor of the latency moving average.
+        :keyword seed: Seed of the latency_weighted policy.
+        """
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        if policy not in POLICIES:
+            raise ValueError(f"Policy must be one of {POLICIES}")
+        self.policy = policy
+        self.eject_failures = kwargs.get("eject_failures", 5)
+        self.eject_error_rate = kwargs.get("eject_error_rate", 0.5)
+        self.min_requests = kwargs.get("min_requests", 10)
+        self.cooldown = kwargs.get("cooldown", 30)
+        self.max_cooldown = kwargs.get("max_cooldown", 300)
+        self.alpha = kwargs.get("alpha", 0.2)
+        self.clock = kwargs.get("clock", time.monotonic)
+        self._random = random.Random(kwargs.get("seed"))
+        window = kwargs.get("window", 50)
+        self.stats = {url: EndpointStats(url, window) for url in dict.fromkeys(endpoints)}
+        self._order = list(self.stats)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def endpoints(self) -> list:
+        """Endpoint urls."""
+        return list(self._order)
+
+    def _available(self) -> list:
+        """Healthy endpoints plus ejected endpoints whose cooldown is over and not probing."""
+        now = self.clock()
+        return [stats for stats in map(self.stats.get, self._order)
+                if stats.ejected_until is None
+                or (stats.ejected_until <= now and not stats.probing)]
+
+    def _round_robin(self, candidates: list) -> EndpointStats:
+        """Next candidate after the previously picked endpoint."""
+        urls = [stats.url for stats in candidates]
+        for offset in range(len(self._order)):
+            url = self._order[(self._next + offset) % len(self._order)]
+            if url in urls:
+                self._next = (self._order.index(url) + 1) % len(self._order)
+                return self.stats[url]
+        return candidates[0]
+
+    def _latency_weighted(self, candidates: list) -> EndpointStats:
+        """Random candidate weighted by inverse latency, unmeasured ones get the mean."""
+        known = [stats.latency for stats in candidates if stats.latency is not None]
+        default = sum(known) / len(known) if known else 1.0
+        weights = [1.0 / max(stats.latency if stats.latency is not None else default, 1e-6)
+                   / (stats.inflight + 1) for stats in candidates]
+        return self._random.choices(candidates, weights=weights)[0]
+
+    def _select(self) -> EndpointStats:
+        """Pick an endpoint, caller holds the lock."""
+        candidates = self._available()
+        if not candidates:
+            stats = min(self.stats.values(), key=lambda each: each.ejected_until)
+            LOGGER.warning("All s3 endpoints are ejected, using %s", stats.url)
+            return stats
+        probes = [stats for stats in candidates if stats.ejected_until is not None]
+        if probes:
+            probes[0].probing = True
+            LOGGER.info("Re-probing ejected s3 endpoint %s", probes[0].url)
+            return probes[0]
+        if self.policy == "least_outstanding":
+            low = min(stats.inflight for stats in candidates)
+            return self._round_robin([stats for stats in candidates if stats.inflight == low])
+        if self.policy == "latency_weighted":
+            return self._latency_weighted(candidates)
+        return self._round_robin(candidates)
+
+    def choose(self) -> str:
+        """Pick an endpoint without tracking a request on it."""
+        with self._lock:
+            stats = self._select()
+            stats.probing = False
+            return stats.url
+
+    def acquire(self) -> str:
+        """Pick an endpoint for a request, release must be called when it completes."""
+        with self._lock:
+            stats = self._select()
+            stats.inflight += 1
+            return stats.url
+
+    def release(self, url: str, latency: float = None, success: bool = True) -> None:
+        """
+        Record completion of a request acquired on url.
+
+        :param url: Endpoint returned by acquire.
+        :param latency: Seconds taken by the request.
+        :param success: False if the endpoint failed (connection error, 5xx).
+        """
+        with self._lock:
+            stats = self.stats[url]
+            stats.inflight = max(stats.inflight - 1, 0)
+            stats.requests += 1
+            stats.outcomes.append(success)
+            if latency is not None and success:
+                stats.latency = latency if stats.latency is None else \
+                    self.alpha * latency + (1 - self.alpha) * stats.latency
+            if success:
+                stats.consecutive_failures = 0
+                if stats.ejected_until is not None:
+                    LOGGER.info("s3 endpoint %s is healthy again", url)
+                    stats.ejected_until, stats.ejections = None, 0
+                    stats.outcomes.clear()
+                stats.probing = False
+                return
+            stats.errors += 1
+            stats.consecutive_failures += 1
+            if stats.probing or (stats.ejected_until is None and (
+                    stats.consecutive_failures >= self.eject_failures
+                    or (len(stats.outcomes) >= self.min_requests
+                        and stats.error_rate >= self.eject_error_rate))):
+                self._eject(stats)
+
+    def _eject(self, stats: EndpointStats) -> None:
+        """Eject endpoint with exponential cooldown, caller holds the lock."""
+        cooldown = min(self.cooldown * 2 ** stats.ejections, self.max_cooldown)
+        stats.ejected_until = self.clock() + cooldown
+        stats.ejections += 1
+        stats.probing = False
+        LOGGER.warning("Ejected s3 endpoint %s for %ss, error rate %.2f, %s consecutive "
+                       "failures", stats.url, cooldown, stats.error_rate,
+                       stats.consecutive_failures)
+
+    @contextmanager
+    def request(self):
+        """Context manager yielding an endpoint, an exception marks the request failed."""
+        url = self.acquire()
+        start = time.perf_counter()
+        try:
+            yield url
+        except Exception:
+            self.release(url, time.perf_counter() - start, False)
+            raise
+        self.release(url, time.perf_counter() - start, True)
+
+    def probe_ejected(self, probe) -> dict:
+        """
+        Actively re-probe ejected endpoints whose cooldown is over.
+
+        :param probe: Callable(url) returning True if the endpoint is healthy.
+        :return: Dict of probed url and result.
+        """
+        with self._lock:
+            due = [stats for stats in self._available() if stats.ejected_until is not None]
+            for stats in due:
+                stats.probing = True
+                stats.inflight += 1
+        results = {}
+        for stats in due:
+            start = time.perf_counter()
+            try:
+                results[stats.url] = bool(probe(stats.url))
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.warning("Probe of %s failed: %s", stats.url, error)
+                results[stats.url] = False
+            self.release(stats.url, time.perf_counter() - start, results[stats.url])
+        return results
+
+    def snapshot(self) -> list:
+        """Stats of all endpoints."""
+        with self._lock:
+            return [self.stats[url].as_dict() for url in self._order]
+
+    def attach(self, client) -> bool:
+        """
+        Route requests of a botocore client through the balancer.
+
+        Every attempt is sent to the picked endpoint before signing and its outcome recorded
+        when botocore decides on retries, so retries move to other endpoints.
+
+        :param client: boto3/botocore s3 client created with one of the endpoints.
+        :return: False if the client endpoint is not balanced by this balancer.
+        """
+        base = client.meta.endpoint_url.rstrip("/")
+        if base not in self.stats:
+            LOGGER.debug("Endpoint %s is not balanced, client not attached", base)
+            return False
+        client.meta.events.register("before-sign.s3", self._before_sign(base))
+        client.meta.events.register("needs-retry.s3", self._after_attempt)
+        return True
+
+    def _before_sign(self, base: str):
+        """botocore handler pointing the request at the picked endpoint."""
+        def handler(request, signature_version=None, **_kwargs):
+            pending = request.context.pop(CONTEXT_KEY, None)
+            if pending:
+                self.release(pending[0], None, True)
+            if signature_version and "query" in str(signature_version):
+                request.url = rewrite_url(request.url, base, self.choose())
+                return
+            url = self.acquire()
+            request.url = rewrite_url(request.url, base, url)
+            request.context[CONTEXT_KEY] = (url, time.perf_counter())
+        return handler
+
+    def _after_attempt(self, response=None, caught_exception=None, request_dict=None,
+                       **_kwargs):
+        """botocore handler recording the outcome of an attempt."""
+        pending = (request_dict or {}).get("context", {}).pop(CONTEXT_KEY, None)
+        if not pending:
+            return
+        success = caught_exception is None and response is not None \
+            and response[0].status_code < 500
+        self.release(pending[0], time.perf_counter() - pending[1], success)
+
+
+def rewrite_url(url: str, base: str, target: str) -> str:
+    """Replace endpoint base of a request url (path or virtual host style) by target."""
+    parts, base_parts, target_parts = urlsplit(url), urlsplit(base), urlsplit(target)
+    netloc = parts.netloc
+    if netloc == base_parts.netloc:
+        netloc = target_parts.netloc
+    elif netloc.endswith("." + base_parts.netloc):
+        netloc = netloc[:-len(base_parts.netloc)] + target_parts.netloc
+    else:
+        return url
+    return urlunsplit((target_parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+
+
+def configure_balancer(endpoints: list, policy: str = "round_robin", **kwargs):
+    """
+    Configure the balancer shared by all s3 clients of the process.
+
+    The existing balancer and its stats are kept if endpoints and policy are unchanged.
+
+    :param endpoints: Endpoint urls.
+    :param policy: Selection policy.
+    :return: Shared EndpointBalancer.
+    """
+    endpoints = [url.rstrip("/") for url in endpoints]
+    with _DEFAULT_LOCK:
+        current = _DEFAULT["balancer"]
+        if current is None or current.endpoints != list(dict.fromkeys(endpoints)) \
+                or current.policy != policy:
+            _DEFAULT["balancer"] = EndpointBalancer(endpoints, policy, **kwargs)
+            LOGGER.info("s3 endpoint balancer: %s over %s", policy, endpoints)
+        return _DEFAULT["balancer"]
+
+
+def get_balancer():
+    """Shared balancer of the process, None if not configured."""
+    return _DEFAULT["balancer"]
+
 
-def dns_rr_counter():
-    """Increments round robin global counter """
-    with threading.Lock():
-        pytest.dns_rr_counter += 1
-        return pytest.dns_rr_counter
+def attach(client) -> bool:
+    """Attach the shared balancer to a boto3 client if one is configured."""
+    balancer = get_balancer()
+    return balancer.attach(client) if balancer else False
 
 
-def dns_rr(S3_CFG, node_count, setup_details):
+def dns_rr(S3_CFG, node_count, setup_details, policy="round_robin"):
     """Method to configure s3 and iam_url
 
     :param S3_CFG: S3 configure files
     :param node_count: Number of nodes in cluster
     :param setup_details: setup database
+    :param policy: Selection policy of the shared balancer
     :return: None
     """
-    node_index = dns_rr_counter()
-    counter = int(node_index) % node_count
-    res_url = system_utils.get_s3_url(setup_details, counter)
+    urls = {}
+    for idx in range(node_count):
+        res_url = system_utils.get_s3_url(setup_details, idx)
+        urls.setdefault(res_url["s3_url"], res_url)
+    res_url = urls[configure_balancer(list(urls), policy).choose()]
     if "s3_url" in S3_CFG.keys():
         S3_CFG["s3_url"] = res_url["s3_url"]
         S3_CFG["iam_url"] = res_url["iam_url"]
@@ -17,15 +17,19 @@
 #
 
 """S3 utility Library."""
+import abc
 import base64
 import datetime
 import hashlib
 import hmac
 import json
 import logging
+import mmap
 import os
+import random as rand
 import time
 import urllib
+from collections.abc import Mapping
 from hashlib import md5
 from hashlib import sha256
 from random import shuffle
@@ -253,7 +257,10 @@ def get_multipart_etag(parts):
     Calculate expected ETag for a multipart upload.
 
     :param parts: List of dict with the format {part_number: (data_bytes, content_md5), ...}
+        or a PartSource
     """
+    if isinstance(parts, PartSource):
+        return parts.multipart_etag()
     md5_digests = []
     for part_number in sorted(parts.keys()):
         # comparing ETag with s3 response so calculating it based on md5.
@@ -262,11 +269,185 @@ def get_multipart_etag(parts):
     return f'"{multipart_etag}"'
 
 
-def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False) -> dict:
+class PartSource(Mapping, abc.ABC):
+    """
+    Lazy multipart part source.
+
+    Behaves like the parts dict returned by get_aligned_parts and friends, i.e.
+    {part_number: [data, content_md5]}, but part data is only materialized when a part is
+    accessed. Only the parts being uploaded are resident in memory at any point of time, so
+    objects larger than the available RAM can be uploaded.
+    """
+
+    def __init__(self, layout: list):
+        """
+        Initialize part source.
+
+        :param layout: List of (part_number, offset, size) tuples in iteration order.
+        """
+        self.layout = {part_number: (offset, size) for part_number, offset, size in layout}
+        self.order = [part_number for part_number, _, _ in layout]
+
+    @abc.abstractmethod
+    def part_view(self, part_number: int) -> memoryview:
+        """Return a read only view over data of a part."""
+
+    def part_size(self, part_number: int) -> int:
+        """Return size of a part in bytes."""
+        return self.layout[part_number][1]
+
+    @property
+    def total_size(self) -> int:
+        """Total object size in bytes."""
+        return sum(size for _, size in self.layout.values())
+
+    def close(self) -> None:
+        """Release resources held by source."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getitem__(self, part_number: int) -> list:
+        view = self.part_view(part_number)
+        return [bytes(view), calc_contentmd5(view)]
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def part_checksums(self, part_number: int) -> dict:
+        """
+        Calculate checksums of a part without copying its data.
+
+        :param part_number: Part number.
+        :return: dict with content_md5, md5 and sha256 of the part.
+        """
+        view = self.part_view(part_number)
+        md5_obj = md5(view)  # nosec - s3 ETag based on md5.
+        return {"content_md5": base64.b64encode(md5_obj.digest()).decode("utf-8"),
+                "md5": md5_obj.hexdigest(), "sha256": sha256(view).hexdigest()}
+
+    def multipart_etag(self) -> str:
+        """Calculate expected multipart ETag one part at a time."""
+        md5_digests = [md5(self.part_view(part_number)).digest()  # nosec
+                       for part_number in sorted(self.layout)]
+        return f'"{md5(b"".join(md5_digests)).hexdigest()}-{len(md5_digests)}"'  # nosec
+
+    def object_sha256(self) -> str:
+        """Calculate sha256 of the assembled object one part at a time."""
+        sha_obj = sha256()
+        for part_number in sorted(self.layout):
+            sha_obj.update(self.part_view(part_number))
+        return sha_obj.hexdigest()
+
+
+class FilePartSource(PartSource):
+    """Part source backed by a memory-mapped file."""
+
+    def __init__(self, file_path: str, layout: list):
+        """
+        Memory-map the file.
+
+        :param file_path: Path of object file.
+        :param layout: List of (part_number, offset, size) tuples in iteration order.
+        """
+        super().__init__(layout)
+        self.file_path = file_path
+        self._fptr = open(file_path, "rb")  # pylint: disable=consider-using-with
+        self._mmap = mmap.mmap(self._fptr.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.fstat(self._fptr.fileno()).st_size else b''
+        self._view = memoryview(self._mmap)
+
+    def part_view(self, part_number: int) -> memoryview:
+        """Return a zero copy view over data of a part."""
+        offset, size = self.layout[part_number]
+        return self._view[offset:offset + size]
+
+    def close(self) -> None:
+        """Unmap and close file, views returned by part_view must be released before."""
+        self._view.release()
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._fptr.close()
+
+
+class GeneratedPartSource(PartSource):
+    """
+    Part source producing deterministic pseudo random data without any backing file.
+
+    Each part is built by repeating a block seeded with (seed, part_number), so the same seed
+    always regenerates the same object and multi-TB objects need no local disk.
+    """
+
+    def __init__(self, layout: list, seed: int = 0, block_size: int = 1048576):
+        """
+        Initialize generated part source.
+
+        :param layout: List of (part_number, offset, size) tuples in iteration order.
+        :param seed: Seed used to generate data.
+        :param block_size: Size of random block repeated to build a part.
+        """
+        super().__init__(layout)
+        self.seed = seed
+        self.block_size = block_size
+
+    def part_view(self, part_number: int) -> memoryview:
+        """Generate data of a part."""
+        _, size = self.layout[part_number]
+        rng = rand.Random(f"{self.seed}-{part_number}")  # nosec
+        block_size = min(self.block_size, size)
+        block = rng.getrandbits(8 * block_size).to_bytes(block_size, "little") \
+            if block_size else b""
+        repeat, remainder = divmod(size, len(block)) if block else (0, 0)
+        return memoryview(block * repeat + block[:remainder])
+
+
+def build_part_layout(part_sizes: list, obj_size: int = None, random: bool = False) -> list:
+    """
+    Build part layout from list of part sizes.
+
+    :param part_sizes: Part sizes in bytes in object order.
+    :param obj_size: Object size, parts are clamped to it if given.
+    :param random: Shuffle the iteration order of parts.
+    :return: List of (part_number, offset, size).
+    """
+    layout = []
+    offset = 0
+    for part_number, size in enumerate(part_sizes, 1):
+        if obj_size is not None:
+            size = max(0, min(size, obj_size - offset))
+        layout.append((part_number, offset, size))
+        offset += size
+    if random:
+        shuffle(layout)
+    return layout
+
+
+def _split_sizes(obj_size: int, size_func) -> list:
+    """Split obj_size into consecutive part sizes returned by size_func until exhausted."""
+    sizes = []
+    remaining = obj_size
+    while remaining > 0:
+        size = size_func()
+        if size <= 0:
+            break
+        sizes.append(min(size, remaining))
+        remaining -= size
+    return sizes
+
+
+def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False,
+                      lazy=False) -> dict:
     r"""
     Get aligned parts.
 
-    Create the upload parts dict with aligned part size(limitation: not supported more than 10G).
+    Create the upload parts dict with aligned part size. Eagerly read parts are limited by
+    available memory, use lazy=True to get a memory-mapped PartSource for large objects.
     https://www.gbmb.org/mb-to-bytes
     Megabytes (MB)	Bytes (B) decimal	Bytes (B) binary
     1 MB	        1,000,000 Bytes	    1,048,576 Bytes
@@ -275,35 +456,32 @@ def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False
     :param file_path: Path of object file.
     :param chunk_size: chunk size used to read each check default is 5MB.
     :param random: Generate random else sequential part order.
+    :param lazy: Return lazy memory-mapped PartSource instead of dict.
     :return: Parts details with data, checksum.
     """
     try:
         obj_size = os.stat(file_path).st_size
-        parts = {}
         part_size = int(int(obj_size) / int(chunk_size)) // int(total_parts)
-        with open(file_path, "rb") as fptr:
-            i = 1
-            while True:
-                data = fptr.read(chunk_size * part_size)
-                if not data:
-                    break
-                LOGGER.info("data length %s", str(len(data)))
-                parts[i] = [data, calc_contentmd5(data)]
-                i += 1
-        if random:
-            keys = list(parts.keys())
-            shuffle(keys)
-            parts = {k: parts[k] for k in keys}
-        return parts
+        sizes = _split_sizes(obj_size, lambda: chunk_size * part_size)
+        source = FilePartSource(file_path, build_part_layout(sizes, obj_size, random))
+        if lazy:
+            return source
+        with source:
+            for part_number in source:
+                LOGGER.info("data length %s", source.part_size(part_number))
+            return dict(source.items())
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
 
 
-def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False) -> dict:
+def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False,
+                        lazy=False) -> dict:
     """
-    Create the upload parts dict with unaligned part size(limitation: not supported more than 10G).
+    Create the upload parts dict with unaligned part size.
 
+    Eagerly read parts are limited by available memory, use lazy=True to get a memory-mapped
+    PartSource for large objects.
     https://www.gbmb.org/mb-to-bytes
     Megabytes (MB)	Bytes (B) decimal	Bytes (B) binary
     1.2 MB          1,200,000 bytes     1,258,291 bytes
@@ -315,59 +493,71 @@ def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=Fal
     :param file_path: Path of object file.
     :param chunk_size: chunk size used to read each check default is 5MB.
     :param random: Generate random else sequential part order.
+    :param lazy: Return lazy memory-mapped PartSource instead of dict.
     :return: Parts details with data, checksum.
     """
     try:
         obj_size = os.stat(file_path).st_size
-        parts = {}
         part_size = int(int(obj_size) / int(chunk_size)) // int(total_parts)
         unaligned = [104857, 209715, 314572, 419430, 524288,
                      629145, 734003, 838860, 943718, 1048576]
-        with open(file_path, "rb") as file_pointer:
-            j = 1
-            while True:
-                shuffle(unaligned)
-                data = file_pointer.read((chunk_size + unaligned[0]) * part_size)
-                if not data:
-                    break
-                LOGGER.info("data_len %s", str(len(data)))
-                parts[j] = [data, calc_contentmd5(data)]
-                j += 1
-        if random:
-            keys = list(parts.keys())
-            shuffle(keys)
-            parts = {e: parts[e] for e in keys}
-        return parts
+        sizes = _split_sizes(
+            obj_size, lambda: (chunk_size + rand.choice(unaligned)) * part_size)  # nosec
+        source = FilePartSource(file_path, build_part_layout(sizes, obj_size, random))
+        if lazy:
+            return source
+        with source:
+            for part_number in source:
+                LOGGER.info("data_len %s", source.part_size(part_number))
+            return dict(source.items())
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
 
 
-def get_precalculated_parts(file_path, part_list, chunk_size=1048576) -> dict:
+def get_precalculated_parts(file_path, part_list, chunk_size=1048576, lazy=False) -> dict:
     """
     Split the source file into the specified part sizes.
 
     :param file_path: Path of object file.
     :param part_list: List of dict with keys 'part_size' (in bytes) and 'count'
     :param chunk_size: chunk size used to read each check default is 1MB.
+    :param lazy: Return lazy memory-mapped PartSource instead of dict.
     :return: Parts details with data, checksum.
     """
     total_part_list = []
     for part in part_list:
         total_part_list.extend([part['part_size']] * part['count'])
     shuffle(total_part_list)
-    parts = {}
     try:
-        with open(file_path, "rb") as file_pointer:
-            for i, part_size in enumerate(total_part_list, 1):
-                data = file_pointer.read(int(part_size * chunk_size))
-                parts[i] = [data, calc_contentmd5(data)]
-        return parts
+        obj_size = os.stat(file_path).st_size
+        sizes = [int(part_size * chunk_size) for part_size in total_part_list]
+        source = FilePartSource(file_path, build_part_layout(sizes, obj_size))
+        if lazy:
+            return source
+        with source:
+            return dict(source.items())
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
 
 
+def get_generated_parts(part_list, chunk_size=1048576, seed=0, random=False) -> PartSource:
+    """
+    Create a lazy part source of generated data, no local file is needed.
+
+    :param part_list: List of dict with keys 'part_size' (in chunks) and 'count'
+    :param chunk_size: chunk size multiplied with each part size, default is 1MB.
+    :param seed: Seed used to generate deterministic data.
+    :param random: Generate random else sequential part order.
+    :return: GeneratedPartSource.
+    """
+    sizes = []
+    for part in part_list:
+        sizes.extend([int(part['part_size'] * chunk_size)] * part['count'])
+    return GeneratedPartSource(build_part_layout(sizes, random=random), seed=seed)
+
+
 def create_multipart_json(json_path, parts_list) -> tuple:
     """
     Create json file with all multipart upload details in sorted order.
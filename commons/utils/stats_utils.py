@@ -0,0 +1,54 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Statistical helpers shared by the long running test analysers."""
+
+import math
+
+import numpy as np
+
+
+def mann_kendall(values) -> tuple:
+    """
+    Mann-Kendall trend test using the normal approximation with ties correction.
+
+    :param values: Sequence of values ordered by time.
+    :return: (S statistic, Z score, two sided p-value)
+    """
+    data = np.asarray(values, dtype=float)
+    count = len(data)
+    if count < 3:
+        return 0, 0.0, 1.0
+    signs = np.sign(data[None, :] - data[:, None])
+    stat = int(np.triu(signs, k=1).sum())
+    _, ties = np.unique(data, return_counts=True)
+    variance = (count * (count - 1) * (2 * count + 5) -
+                np.sum(ties * (ties - 1) * (2 * ties + 5))) / 18.0
+    if variance <= 0:
+        return stat, 0.0, 1.0
+    if stat > 0:
+        z_score = (stat - 1) / math.sqrt(variance)
+    elif stat < 0:
+        z_score = (stat + 1) / math.sqrt(variance)
+    else:
+        z_score = 0.0
+    p_value = math.erfc(abs(z_score) / math.sqrt(2))
+
+    return stat, z_score, p_value
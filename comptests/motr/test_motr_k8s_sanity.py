@@ -32,6 +32,7 @@ import time
 import json
 import logging
 import multiprocessing
+import threading
 import pytest
 from commons.utils import assert_utils
 from commons.utils import config_utils
@@ -242,21 +243,35 @@ class TestExecuteK8Sanity:
         This test will run the motr io on all the nodes in parallel and
         verify the services after cluster shutdown
         """
-        return_dict = multiprocessing.Manager().dict()
-        for node in self.motr_obj.cortx_node_list:
-            node_process = multiprocessing.Process(target=self.motr_obj.run_io_in_parallel,
-                args=[node, BSIZE_LAYOUT_MAP, [4], False, True, return_dict])
-            node_process.start()
+        return_dict, io_errors = {}, []
+
+        def run_io():
+            """Run motr IO and keep per object results, exceptions are kept for the test."""
+            try:
+                return_dict.update(self.motr_obj.run_motr_io_concurrent(
+                    block_count=[4], run_m0cat=False, exc=False)[0])
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception("Motr IO failed")
+                io_errors.append(error)
+
+        io_thread = threading.Thread(target=run_io)
+        io_thread.start()
         logger.info("Let the motr IO run on all the nodes for 120 sec")
         time.sleep(120)
         self.motr_obj.shutdown_cluster()
-        for exc in return_dict.values():
-            if isinstance(exc, Exception):
-                ex_str = ''.join(traceback.format_exception(etype=type(exc), value=exc,
-                            tb=exc.__traceback__))
-                logger.exception("Exception occured:: %s", ex_str)
-                if 'm0_panic' in ex_str:
-                    raise exc
+        io_thread.join()
+        assert_utils.assert_false(io_errors, f"Motr IO raised {io_errors}")
+        expected = len(self.motr_obj.cortx_node_list) * len(BSIZE_LAYOUT_MAP)
+        assert_utils.assert_equal(len(return_dict), expected,
+                                  f"Results of {len(return_dict)} out of {expected} objects")
+        for obj, result in return_dict.items():
+            assert_utils.assert_in(result["status"], ("ok", "failed"),
+                                   f"Object {obj} on {result['node']}: {result['error']}")
+            if result["error"]:
+                logger.error("Object %s on %s failed: %s", obj, result["node"],
+                             result["error"])
+                assert_utils.assert_not_in('m0_panic', result["error"],
+                                           f"m0_panic during IO of object {obj}")
 
     @pytest.mark.tags("TEST-29706")
     @pytest.mark.motr_sanity
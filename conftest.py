@@ -44,8 +44,11 @@ from strip_ansi import strip_ansi
 
 from commons import Globals
 from commons import cortxlogging
+from commons import failure_triage
 from commons import params
+from commons import pytest_profiler
 from commons import report_client
+from commons import s3_dns
 from commons import constants as const
 from commons.helpers.health_helper import Health
 from commons.utils import assert_utils
@@ -53,6 +56,7 @@ from commons.utils import config_utils
 from commons.utils import jira_utils
 from commons.utils import system_utils
 from config import CMN_CFG
+from config import S3_CFG
 from core.runner import LRUCache
 from core.runner import get_db_credential
 from core.runner import get_jira_credential
@@ -63,6 +67,7 @@ from libs.di.fi_adapter import S3FailureInjection
 FAILURES_FILE = "failures.txt"
 LOG_DIR = 'log'
 CACHE = LRUCache(1024 * 10)
+TRIAGE = failure_triage.FailureTriage(params.TRIAGE_HISTORY)
 CACHE_JSON = 'nodes-cache.yaml'
 REPORT_CLIENT = None
 DT_PATTERN = '%Y-%m-%d_%H:%M:%S'
@@ -104,12 +109,11 @@ def formatter():
 def logger():
     """
     Gets session scoped logger which can be used in test methods or functions.
+    Its records reach the session handlers installed on the root logger in pytest_configure.
     :return: logger instance
     """
-    logging.basicConfig(format='%(asctime)s - %(message)s', datefmt='%d-%b-%y %H:%M:%S')
     logger = logging.getLogger(__name__)
     logger.setLevel(Globals.LOG_LEVEL)
-    cortxlogging.init_loghandler(logger)
     return logger
 
 
@@ -247,6 +251,18 @@ def pytest_addoption(parser):
         "--use_ssl", action="store", default=True,
         help="Decide whether to use HTTPS/SSL connection for S3 endpoint."
     )
+    parser.addoption(
+        "--profile", action="store", default=False,
+        help="Record per test time breakdown, flame graph stacks and expensive helpers."
+    )
+    parser.addoption(
+        "--log_async", action="store", default=False,
+        help="Write session logs from a background thread through a queue."
+    )
+    parser.addoption(
+        "--log_structured", action="store", default=False,
+        help="Also write session logs as JSON records correlated by test id."
+    )
 
 
 def read_test_list_csv() -> List:
@@ -300,6 +316,22 @@ def pytest_sessionfinish(session, exitstatus):
     except Exception as fault:
         print("Exception occurred while unmounting directory")
     filter_report_session_finish(session)
+    if hasattr(session.config, 'workerinput'):
+        # xdist workers hand their failures to the controller which writes the report
+        if TRIAGE.failures:
+            TRIAGE.dump_failures(os.path.join(
+                session.config.workerinput['shared_dir'],
+                f"triage_{session.config.workerinput['workerid']}.json"))
+        return
+    TRIAGE.merge_failures(glob.glob(os.path.join(session.config.shared_directory,
+                                                 'triage_*.json')))
+    if TRIAGE.failures:
+        try:
+            report = TRIAGE.report(Globals.BUILD)
+            failure_triage.write_report(report, os.path.join(LOG_DIR, 'latest'))
+            TRIAGE.save_history(report)
+        except (OSError, ValueError) as fault:
+            print(f"Failure triage report could not be written: {fault}")
 
 
 def get_test_metadata_from_tp_meta(item):
@@ -430,6 +462,25 @@ def pytest_configure(config):
     # Handle parallel execution.
     if not hasattr(config, 'workerinput'):
         config.shared_directory = tempfile.mkdtemp()
+    if ast.literal_eval(str(config.option.profile)):
+        log_path = config.option.log_path or os.path.join(os.getcwd(), params.LOG_DIR_NAME,
+                                                          params.LATEST_LOG_FOLDER)
+        config.pluginmanager.register(
+            pytest_profiler.ProfilerPlugin(os.path.join(log_path, 'profile')), 'profiler')
+    # Session handlers on the root logger so records of library loggers are queued,
+    # JSON structured and carry test id and host like the test's own records.
+    config.log_listener = cortxlogging.init_loghandler(
+        logging.getLogger(), level=config.option.log_cli_level or logging.DEBUG,
+        async_mode=ast.literal_eval(str(config.option.log_async)),
+        structured=ast.literal_eval(str(config.option.log_structured)), console=False)
+
+
+def pytest_unconfigure(config):
+    """Flush queued log records and stop the log listener."""
+    listener = getattr(config, 'log_listener', None)
+    if listener:
+        cortxlogging.stop_async_logging(listener)
+        config.log_listener = None
 
 
 def pytest_configure_node(node):
@@ -442,7 +493,6 @@ def pytest_configure_node(node):
         else:
             Globals.JIRA_UPDATE = False
     node.workerinput['shared_dir'] = node.config.shared_directory
-    pytest.dns_rr_counter = 0
 
 
 def pytest_sessionstart(session: Session) -> None:
@@ -457,6 +507,17 @@ def pytest_sessionstart(session: Session) -> None:
     report_client.ReportClient.init_instance()
     REPORT_CLIENT = report_client.ReportClient.get_instance()
     reset_imported_module_log_level(session)
+    configure_s3_balancer()
+
+
+def configure_s3_balancer():
+    """Balance s3 requests of the process over the s3_dns endpoints of the setup."""
+    s3_dns_names = CMN_CFG.get("s3_dns")
+    if not s3_dns_names:
+        return
+    s3_dns.dns_rr(S3_CFG, len(s3_dns_names), CMN_CFG,
+                  CMN_CFG.get("s3_endpoint_policy", "round_robin"))
+    LOGGER.info("s3 requests are balanced over %s", s3_dns.get_balancer().endpoints)
 
 
 def reset_imported_module_log_level(session):
@@ -634,6 +695,9 @@ def pytest_runtest_makereport(item, call):
     jira_update = ast.literal_eval(str(item.config.option.jira_update))
     db_update = ast.literal_eval(str(item.config.option.db_update))
     test_id = CACHE.lookup(report.nodeid)
+    if report.failed:
+        TRIAGE.add(test_id or report.nodeid, report.longreprtext, report.caplog,
+                   phase=report.when)
     if report.when == 'setup':
         Globals.CSM_LOGS = f"{LOG_DIR}/latest/{test_id}_Gui_Logs/"
         if os.path.exists(Globals.CSM_LOGS):
@@ -817,6 +881,7 @@ def pytest_runtest_logstart(nodeid, location):
     :return:
     """
     current_suite = None
+    cortxlogging.set_test_id(CACHE.table.get(nodeid) or nodeid)
     skip_health_check = False  # Skip health check for provisioner.
     breadcrumbs = os.path.split(location[0])
     for prefix in params.PROV_SKIP_TEST_FILES_HEALTH_CHECK_PREFIX:
@@ -852,6 +917,11 @@ def pytest_runtest_logstart(nodeid, location):
         check_health(target)
 
 
+def pytest_runtest_logfinish():
+    """Hook called after teardown of a test, records after it carry no test id."""
+    cortxlogging.set_test_id(None)
+
+
 def check_health(target):
     try:
         check_cortx_cluster_health()
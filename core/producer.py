@@ -107,7 +107,8 @@ def delivery_report(err, msg):
         msg.key(), msg.topic(), msg.partition(), msg.offset()))
 
 
-def produce(producer, topic, uuid=None, value=None, on_delivery=delivery_report):
+def produce(producer, topic, uuid=None, value=None, on_delivery=delivery_report,
+            partition=-1):
     """
     Produce the ticket message i.e. value to topic.
     :param producer:
@@ -115,11 +116,14 @@ def produce(producer, topic, uuid=None, value=None, on_delivery=delivery_report)
     :param uuid:
     :param value:
     :param on_delivery:
+    :param partition: Partition of the test runner, -1 uses the key hash.
     """
     # Serve on_delivery callbacks from previous calls to produce()
     producer.poll(0.0)
-    producer.produce(topic=topic, key=uuid, value=value,
+    producer.produce(topic=topic, key=uuid, value=value, partition=partition,
                      on_delivery=on_delivery)
+    # Scheduled tickets must reach the partition before its runner gets idle
+    producer.flush()
     print("\nFlushing records...")
 
 
@@ -205,7 +209,8 @@ def server(*args: Any) -> None:
             LOGGER.info("Ticket picked up for execution is  %s", test_set)
             print(f"Ticket picked up for execution is {test_set}")
             produce(producer, topic=topic, uuid=str(uuid4()), value=ticket,
-                    on_delivery=delivery_report)
+                    on_delivery=delivery_report,
+                    partition=getattr(work_item, "partition", -1))
             work_item.task_done()
             work_queue.task_done()
         except ValueError:
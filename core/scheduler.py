@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Duration aware ticket scheduler for distributed test runs.
+
+   Historical test durations and results are read from the report DB. Parallel test
+   groups are split into tickets of balanced predicted duration (LPT packing), tickets
+   are ordered historically failing first and then longest first, and the predicted
+   makespan over the available test runners is simulated.
+
+   Tickets are not pushed all at once. The dispatcher keeps every Kafka partition (one
+   per test runner) a single ticket ahead of its runner and hands the remaining work to
+   whichever runner drains its partition first, so idle runners steal the tail of the run.
+"""
+import heapq
+import json
+import logging
+import math
+import statistics
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import requests
+
+from commons import params
+
+LOGGER = logging.getLogger(__name__)
+
+AGGREGATE_EP = params.REPORT_SRV + "reportsdb/aggregate"
+SEARCH_EP = params.REPORT_SRV + "reportsdb/search"
+HISTORY_RUNS = 10  # Latest executions per test used for prediction
+DEFAULT_DURATION = 600  # Seconds assumed for tests without history
+CHUNKS_PER_RUNNER = 4  # Parallel groups are split to get this many tickets per runner
+FAIL_PRIORITY = 0.3  # Tests failing at least this ratio of runs are scheduled first
+
+
+def fetch_history(tests: List[str], db_user: str, db_pass: str,
+                  runs: int = HISTORY_RUNS) -> Dict[str, dict]:
+    """
+    Get duration and failure history of tests from report DB with one aggregate request.
+    :param tests: Test IDs.
+    :param db_user: Report DB user.
+    :param db_pass: Report DB password.
+    :param runs: Latest executions per test considered.
+    :return: Dict of test id: {duration, fail_rate, runs}, empty if DB is not reachable.
+    """
+    payload = {"aggregate": [
+        {"$match": {"testID": {"$in": list(tests)}, "testExecutionTime": {"$gt": 0}}},
+        {"$sort": {"testStartTime": -1}},
+        {"$group": {"_id": "$testID", "durations": {"$push": "$testExecutionTime"},
+                    "results": {"$push": "$testResult"}}},
+        {"$project": {"durations": {"$slice": ["$durations", runs]},
+                      "results": {"$slice": ["$results", runs]}}}],
+        "db_username": db_user, "db_password": db_pass}
+    try:
+        response = requests.request("GET", AGGREGATE_EP, data=json.dumps(payload),
+                                    headers={"Content-Type": "application/json"}, timeout=120)
+        response.raise_for_status()
+        rows = response.json()["result"]
+    except (requests.exceptions.RequestException, KeyError, ValueError) as fault:
+        LOGGER.error("Test history not available, using default durations: %s", fault)
+        return {}
+    return history_from_rows(rows)
+
+
+def history_from_rows(rows: List[dict]) -> Dict[str, dict]:
+    """
+    Reduce aggregate rows to predicted duration (median) and failure ratio per test.
+    :param rows: List of {_id: test id, durations: [...], results: [...]}
+    :return: Dict of test id: {duration, fail_rate, runs}
+    """
+    history = {}
+    for row in rows:
+        durations = [float(dur) for dur in row.get("durations", []) if dur]
+        results = row.get("results", [])
+        if not durations:
+            continue
+        failed = sum(1 for result in results if str(result).upper() in ("FAIL", "FAILED"))
+        history[row["_id"]] = {"duration": statistics.median(durations),
+                               "fail_rate": failed / len(results) if results else 0.0,
+                               "runs": len(durations)}
+    return history
+
+
+def predict(test: str, history: Dict[str, dict], default: float = DEFAULT_DURATION) -> float:
+    """Predicted duration of a test in seconds."""
+    return history.get(test, {}).get("duration", default)
+
+
+def _ticket(tag: str, parallel: bool, tests: List[str], history: Dict[str, dict],
+            default: float) -> dict:
+    """Build ticket dict with predicted duration and priority."""
+    return {"tag": tag, "parallel": parallel, "tests": tests,
+            "predicted": sum(predict(test, history, default) for test in tests),
+            "fail_rate": max(history.get(test, {}).get("fail_rate", 0.0) for test in tests)}
+
+
+def plan_tickets(selected_tag_map: Dict[str, list], history: Dict[str, dict], runners: int,
+                 default: float = DEFAULT_DURATION,
+                 chunks_per_runner: int = CHUNKS_PER_RUNNER) -> List[dict]:
+    """
+    Split tag groups into tickets of balanced predicted duration.
+    Sequential tests stay one ticket per test. Parallel tests of a tag are packed into
+    ceil(group duration / chunk) tickets using longest processing time first, where chunk
+    is total predicted work / (runners * chunks_per_runner).
+    :param selected_tag_map: tag: [parallel set, sequential set] from develop_execution_plan.
+    :param history: Output of fetch_history.
+    :param runners: Number of test runners.
+    :param default: Duration assumed for tests without history.
+    :param chunks_per_runner: Granularity of parallel tickets.
+    :return: Tickets ordered for dispatch, each a dict with tag, parallel, tests, predicted
+        and fail_rate.
+    """
+    total = sum(predict(test, history, default) for p_set, s_set in selected_tag_map.values()
+                for test in list(p_set) + list(s_set))
+    chunk = max(total / max(runners * chunks_per_runner, 1), 1.0)
+    tickets = []
+    for tag, (p_set, s_set) in selected_tag_map.items():
+        ordered = sorted(p_set, key=lambda test: (-predict(test, history, default), test))
+        if ordered:
+            group = sum(predict(test, history, default) for test in ordered)
+            bins = [(0.0, idx, []) for idx in range(min(len(ordered),
+                                                        max(1, math.ceil(group / chunk))))]
+            for test in ordered:
+                load, idx, tests = heapq.heappop(bins)
+                tests.append(test)
+                heapq.heappush(bins, (load + predict(test, history, default), idx, tests))
+            tickets.extend(_ticket(tag, True, tests, history, default) for _, _, tests in bins)
+        tickets.extend(_ticket(tag, False, [test], history, default) for test in sorted(s_set))
+    return order_tickets(tickets)
+
+
+def order_tickets(tickets: List[dict], fail_priority: float = FAIL_PRIORITY) -> List[dict]:
+    """Historically failing tickets first, then longest predicted duration first."""
+    return sorted(tickets, key=lambda ticket: (ticket["fail_rate"] < fail_priority,
+                                               -ticket["predicted"]))
+
+
+def simulate(tickets: List[dict], runners: int) -> dict:
+    """
+    Simulate dispatch order where the next ticket goes to the first idle runner.
+    :param tickets: Ordered tickets.
+    :param runners: Number of test runners.
+    :return: Dict with makespan, per runner load and total work in seconds.
+    """
+    slots = [(0.0, idx) for idx in range(max(runners, 1))]
+    for ticket in tickets:
+        free_at, idx = heapq.heappop(slots)
+        ticket["runner"] = idx
+        ticket["predicted_start"] = free_at
+        heapq.heappush(slots, (free_at + ticket["predicted"], idx))
+    loads = [load for load, _ in sorted(slots, key=lambda slot: slot[1])]
+    return {"makespan": max(loads), "loads": loads,
+            "work": sum(ticket["predicted"] for ticket in tickets)}
+
+
+class WorkStealingDispatcher:
+    """Feed tickets to partitions whose runners drained their queue."""
+
+    def __init__(self, tickets: List[dict], partitions: int, submit: Callable,
+                 consumed: Callable, **kwargs):
+        """
+        :param tickets: Ordered tickets.
+        :param partitions: Number of partitions, one per test runner.
+        :param submit: Callable(ticket, partition) producing the ticket.
+        :param consumed: Callable() returning dict of partition: tickets consumed by runners.
+        :keyword interval: Seconds between checks of consumed tickets.
+        :keyword timeout: Max seconds to wait for runners to drain partitions.
+        """
+        self.pending = deque(tickets)
+        self.partitions = partitions
+        self.submit = submit
+        self.consumed = consumed
+        self.interval = kwargs.get("interval", 10)
+        self.timeout = kwargs.get("timeout", 48 * 3600)
+        self.sent = [0] * partitions
+        self.dispatched = []
+        self.start = None
+
+    def run(self) -> List[dict]:
+        """
+        Dispatch all tickets, a partition gets the next ticket once its runner consumed all
+        tickets sent to it, i.e. started the last one.
+        :return: Dispatched tickets with partition and dispatch offset in seconds.
+        """
+        self.start = time.monotonic()
+        deadline = self.start + self.timeout
+        while self.pending and time.monotonic() < deadline:
+            consumed = self.consumed()
+            idle = [part for part in range(self.partitions)
+                    if self.sent[part] - consumed.get(part, 0) <= 0]
+            for part in idle:
+                if not self.pending:
+                    break
+                ticket = self.pending.popleft()
+                ticket["partition"] = part
+                ticket["dispatched"] = time.monotonic() - self.start
+                self.submit(ticket, part)
+                self.sent[part] += 1
+                self.dispatched.append(ticket)
+                LOGGER.info("Ticket %s %s (%.0fs predicted) dispatched to partition %s",
+                            ticket["tag"], ticket["tests"], ticket["predicted"], part)
+            if self.pending:
+                time.sleep(self.interval)
+        if self.pending:
+            LOGGER.error("%s tickets not dispatched in %s seconds", len(self.pending),
+                         self.timeout)
+        return self.dispatched
+
+
+def actual_makespan(te_tickets: List[str], build: str, db_user: str, db_pass: str) -> tuple:
+    """
+    Measure actual makespan from report DB entries of the run.
+    :param te_tickets: Test execution tickets of the run.
+    :param build: Build number.
+    :param db_user: Report DB user.
+    :param db_pass: Report DB password.
+    :return: (makespan in seconds or None, number of executed tests)
+    """
+    payload = {"query": {"testExecutionID": {"$in": list(te_tickets)}, "buildNo": build,
+                         "latest": True},
+               "projection": {"testStartTime": True, "testExecutionTime": True},
+               "db_username": db_user, "db_password": db_pass}
+    try:
+        response = requests.request("GET", SEARCH_EP, data=json.dumps(payload),
+                                    headers={"Content-Type": "application/json"}, timeout=120)
+        response.raise_for_status()
+        rows = response.json()["result"]
+    except (requests.exceptions.RequestException, KeyError, ValueError) as fault:
+        LOGGER.error("Unable to read results of the run: %s", fault)
+        return None, 0
+    spans = []
+    for row in rows:
+        try:
+            start = datetime.fromisoformat(row["testStartTime"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            continue
+        spans.append((start, start + float(row.get("testExecutionTime") or 0)))
+    if not spans:
+        return None, 0
+    return max(end for _, end in spans) - min(start for start, _ in spans), len(spans)
+
+
+def makespan_report(tickets: List[dict], simulation: dict, actual: float = None) -> str:
+    """
+    Predicted versus actual makespan summary.
+    :param tickets: Dispatched tickets.
+    :param simulation: Output of simulate.
+    :param actual: Actual makespan in seconds if known.
+    :return: Report text.
+    """
+    lines = [f"Tickets: {len(tickets)} Runners: {len(simulation['loads'])} "
+             f"Work: {simulation['work']:.0f}s",
+             f"Predicted makespan: {simulation['makespan']:.0f}s "
+             f"(ideal {simulation['work'] / max(len(simulation['loads']), 1):.0f}s)"]
+    if actual is not None:
+        error = (actual - simulation["makespan"]) / simulation["makespan"] * 100 \
+            if simulation["makespan"] else 0.0
+        lines.append(f"Actual makespan: {actual:.0f}s ({error:+.1f}% vs predicted)")
+    for ticket in tickets:
+        lines.append(f"  {ticket['tag']:<30} {'P' if ticket['parallel'] else 'S'} "
+                     f"{ticket['predicted']:8.0f}s fail={ticket['fail_rate']:.2f} "
+                     f"partition={ticket.get('partition', '-')} {','.join(ticket['tests'])}")
+    return "\n".join(lines)
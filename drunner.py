@@ -29,7 +29,9 @@
 
 """
 import argparse
+import json
 import sys
+import time
 import os
 import multiprocessing
 import threading
@@ -42,12 +44,18 @@ from typing import Any
 from typing import Dict
 from queue import Queue
 from threading import Thread
+from confluent_kafka import Consumer
+from confluent_kafka import KafkaError
+from confluent_kafka import KafkaException
+from confluent_kafka import TopicPartition
 from confluent_kafka.admin import AdminClient
+from confluent_kafka.admin import NewPartitions
 from confluent_kafka.admin import NewTopic
 from core import rpcserver
 from core import report_rpc
 from core import runner
 from core import producer
+from core import scheduler
 from commons.utils import system_utils
 from commons.utils import jira_utils
 from commons.utils import config_utils
@@ -86,6 +94,11 @@ def parse_args(argv):
                         help="Enable async reporting to Jira and MongoDB")
     parser.add_argument("-c", "--cancel_run", type=bool, default=False,
                         help="Enable Cancel run")
+    parser.add_argument("-r", "--runners", type=int, default=None,
+                        help="Number of test runners, defaults to number of targets")
+    parser.add_argument("-mt", "--makespan_timeout", type=int, default=3600,
+                        help="Seconds to wait for results after last ticket to report "
+                             "actual makespan, 0 to skip")
     return parser.parse_args(args=argv)
 
 
@@ -189,50 +202,88 @@ def run(opts: dict) -> None:
                     test_map, internal_skip_marks)
 
     develop_execution_plan(rev_tag_map, selected_tag_map, skip_test, test_map, tickets)
+    runners = opts.runners or len(targets)
+    db_user, db_pwd = runner.get_db_credential()
+    tests = [test for p_set, s_set in selected_tag_map.values() for test in p_set | s_set]
+    history = scheduler.fetch_history(tests, db_user, db_pwd)
+    plan = scheduler.plan_tickets(selected_tag_map, history, runners)
+    simulation = scheduler.simulate(plan, runners)
+    LOGGER.info("Execution plan:\n%s", scheduler.makespan_report(plan, simulation))
+
     kafka_admin_conf = {"bootstrap.servers": params.BOOTSTRAP_SERVERS}
     kafka_client = AdminClient(kafka_admin_conf)
     delete_topic(client=kafka_client, topics=[params.TEST_EXEC_TOPIC])
     # This topic could be deleted during execution of a distributed execution.
     # Ensure that only 1 execution is run with multiple targets. This will be enhanced
     # when we start running multiple distributed executions for multiple targets.
-    create_topic(kafka_client)
+    create_topic(kafka_client, partitions=runners)
     work_queue = worker.WorkQ(producer.produce, 1024)
-    finish = False  # Use finish to exit loop
     # start kafka producer
     _producer = Thread(target=producer.server,
                        args=(topic, work_queue))  # Use finish in server
     _producer.start()
 
-    # for parallel group create a kafka entry
-    # for each non parallel group item create a kafka entry
-    for tg in selected_tag_map:
-        parallel_set, sequential_set = selected_tag_map[tg]
-        witem = Queue()
-        witem.put(parallel_set)
-        witem.tag = tg
-        witem.parallel = True
-        witem.targets = targets
-        set_t = parallel_set if len(parallel_set) else sequential_set
-        witem.tickets = test_map[next(iter(set_t))][-1]
-        witem.build = opts.build
-        witem.build_type = opts.build_type
-        witem.test_plan = test_plan
-        work_queue.put(witem)
-        for set_item in sequential_set:
-            w_item = Queue()
-            w_item.put([set_item])
-            w_item.tag = tg
-            w_item.parallel = False
-            w_item.targets = targets
-            w_item.tickets = test_map[set_item][-1]
-            w_item.build = opts.build
-            w_item.build_type = opts.build_type
-            w_item.test_plan = test_plan
-            work_queue.put(w_item)
+    def submit(ticket, partition):
+        """Queue a planned ticket to be produced on given partition."""
+        w_item = Queue()
+        w_item.put(ticket["tests"])
+        w_item.tag = ticket["tag"]
+        w_item.parallel = ticket["parallel"]
+        w_item.targets = targets
+        w_item.tickets = test_map[ticket["tests"][0]][-1]
+        w_item.build = opts.build
+        w_item.build_type = opts.build_type
+        w_item.test_plan = test_plan
+        w_item.partition = partition
+        work_queue.put(w_item)
+
+    offsets_consumer = Consumer({"bootstrap.servers": params.BOOTSTRAP_SERVERS,
+                                 "group.id": params.TEST_EXEC_TOPIC,
+                                 "enable.auto.commit": False})
+    dispatcher = scheduler.WorkStealingDispatcher(
+        plan, runners, submit, lambda: consumed_tickets(offsets_consumer, topic, runners))
+    dispatched = dispatcher.run()
+    offsets_consumer.close()
     work_queue.put(None)  # poison
     work_queue.join()
     _producer.join()
 
+    actual = None
+    if opts.makespan_timeout:
+        te_tickets = {str(test_map[ticket["tests"][0]][-1]) for ticket in dispatched}
+        deadline = time.monotonic() + opts.makespan_timeout
+        while True:
+            actual, executed = scheduler.actual_makespan(te_tickets, opts.build, db_user, db_pwd)
+            if executed >= len(tests) or time.monotonic() > deadline:
+                break
+            time.sleep(60)
+    report = scheduler.makespan_report(dispatched, simulation, actual)
+    LOGGER.info("Distributed run schedule:\n%s", report)
+    with open(os.path.join(log_home, 'schedule_plan.json'), 'w') as fptr:
+        json.dump({"simulation": simulation, "actual_makespan": actual,
+                   "tickets": dispatched}, fptr, indent=2)
+
+
+def consumed_tickets(consumer: Consumer, topic: str, partitions: int) -> Dict[int, int]:
+    """
+    Tickets consumed by test runners per partition from committed offsets of runner group.
+    :param consumer: Consumer configured with test runner group id, not subscribed.
+    :param topic: Test execution topic.
+    :param partitions: Number of partitions.
+    :return: Dict of partition: consumed tickets.
+    """
+    consumed = {}
+    try:
+        committed = consumer.committed([TopicPartition(topic, part)
+                                        for part in range(partitions)], timeout=30)
+    except Exception as fault:  # pylint: disable=broad-except
+        LOGGER.warning("Unable to read committed offsets: %s", fault)
+        return consumed
+    for tpart in committed:
+        # Negative offset means nothing committed yet on the partition
+        consumed[tpart.partition] = max(tpart.offset, 0)
+    return consumed
+
 
 def develop_execution_plan(rev_tag_map, selected_tag_map, skip_test, test_map, tickets):
     """Develop Test execution plan to be followed by test runners."""
@@ -389,9 +440,56 @@ def save_to_logdir(test_list: List) -> None:
             write.writerow([test])
 
 
-def create_topic(admin_client: AdminClient):
-    topic_list = [NewTopic(params.TEST_EXEC_TOPIC, 2, 1)]
-    admin_client.create_topics(topic_list)
+def wait_for_topic_deletion(admin_client: AdminClient, topic: str, timeout: int = 60,
+                            step: int = 2) -> bool:
+    """
+    Poll broker metadata till a deleted topic is gone.
+
+    Topic deletion completes in the background on the broker, creating the topic again
+    before it is gone fails with TOPIC_ALREADY_EXISTS and keeps the old partitions.
+    :param admin_client: Kafka admin client.
+    :param topic: Name of the deleted topic.
+    :param timeout: Max seconds to wait.
+    :param step: Seconds between polls.
+    :return: True if topic is gone else False.
+    """
+    end_time = time.time() + timeout
+    while time.time() <= end_time:
+        if topic not in admin_client.list_topics(timeout=step).topics:
+            return True
+        LOGGER.info("Waiting for deletion of topic %s", topic)
+        time.sleep(step)
+    LOGGER.warning("Topic %s still exists after %s seconds", topic, timeout)
+
+    return False
+
+
+def create_topic(admin_client: AdminClient, partitions: int = 2):
+    """
+    Create test execution topic with a partition per test runner.
+
+    If the topic already exists with fewer partitions, partitions are added so that every
+    runner gets one.
+    """
+    wait_for_topic_deletion(admin_client, params.TEST_EXEC_TOPIC)
+    topic_list = [NewTopic(params.TEST_EXEC_TOPIC, partitions, 1)]
+    futures = admin_client.create_topics(topic_list)
+    for topic, future in futures.items():
+        try:
+            future.result()
+            LOGGER.info("Topic %s created with %s partitions", topic, partitions)
+        except KafkaException as error:
+            kafka_error = error.args[0]
+            if kafka_error.code() != KafkaError.TOPIC_ALREADY_EXISTS:
+                LOGGER.error("Failed to create topic %s: %s", topic, kafka_error.str())
+                continue
+            existing = len(admin_client.list_topics(topic=topic).topics[topic].partitions)
+            LOGGER.info("Topic %s already exists with %s partitions", topic, existing)
+            if existing < partitions:
+                for _, part_future in admin_client.create_partitions(
+                        [NewPartitions(topic, partitions)]).items():
+                    part_future.result()
+                LOGGER.info("Topic %s extended to %s partitions", topic, partitions)
 
 
 def delete_topic(client, topics):
@@ -154,12 +154,8 @@ class CortxCliAlerts(CortxCli):
                 "Show alerts comment failed with error: %s", output)
             return False, output
 
-        if output_format == "json":
-            alerts = self.format_str_to_dict(output)
-        elif output_format == "xml":
-            alerts = self.xml_data_parsing(output)
-        else:
-            alerts = self.split_table_response(output)
+        alerts = self.parse_response(
+            output, output_format if output_format in ("json", "xml") else "table")
 
         return True, alerts
 
@@ -265,12 +265,8 @@ class CortxCliCsmUser(CortxCli):
 
             return False, output
 
-        if op_format == "json":
-            output = self.format_str_to_dict(output)
-        if op_format == "xml":
-            output = self.xml_data_parsing(output)
-        if op_format == "table":
-            output = self.split_table_response(output)
+        if op_format in ("json", "xml", "table"):
+            output = self.parse_response(output, op_format)
 
         return True, output
 
@@ -0,0 +1,281 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Typed parsers for CORTX CLI responses.
+
+Interactive CLI output contains the echoed command and the prompt around the payload. The
+parsers below extract JSON, XML, table and key/value payloads from such output and
+optionally validate them against a Schema, so every cli_* library parses the same way.
+"""
+
+import json
+import logging
+import re
+
+import xmltodict
+
+import commons.errorcodes as err
+from commons.exceptions import CTException
+
+LOGGER = logging.getLogger(__name__)
+
+TABLE_BORDER = re.compile(r"^\s*\+[-+=]+\+\s*$")
+OUTPUT_FORMATS = ("json", "xml", "table", "records", "kv")
+
+
+def parse_json(text: str):
+    """
+    Parse JSON object embedded in CLI output.
+
+    :param text: CLI output.
+    :return: Dictionary or None for empty output.
+    :raises ValueError: If output has no valid JSON object, like format_str_to_dict did.
+    """
+    if not text:
+        LOGGER.error("Empty string received!!")
+        return None
+    LOGGER.debug("Data received \n %s", text)
+    start_index = text.find("{")
+    end_index = text.rfind("}") + 1
+    data = json.loads(text[start_index:end_index])
+    LOGGER.debug("JSON output \n %s", data)
+    return data
+
+
+def parse_json_values(text: str) -> list:
+    """
+    Parse every top level JSON object or array embedded in CLI output.
+
+    :param text: CLI output.
+    :return: List of parsed values in order of appearance.
+    """
+    decoder, values, index = json.JSONDecoder(), [], 0
+    text = str(text or "")
+    while True:
+        starts = [pos for pos in (text.find("{", index), text.find("[", index)) if pos >= 0]
+        if not starts:
+            return values
+        index = min(starts)
+        try:
+            value, index = decoder.raw_decode(text, index)
+            values.append(value)
+        except ValueError:
+            index += 1
+
+
+def find_records(data, key: str) -> list:
+    """
+    Find dictionaries having key anywhere in parsed data, outer records first.
+
+    :param data: Parsed JSON data.
+    :param key: Key the records must have e.g. 'health'.
+    :return: List of dictionaries.
+    """
+    records = []
+    if isinstance(data, dict):
+        if key in data:
+            records.append(data)
+        for value in data.values():
+            records.extend(find_records(value, key))
+    elif isinstance(data, list):
+        for value in data:
+            records.extend(find_records(value, key))
+    return records
+
+
+def parse_xml(text: str) -> list:
+    """
+    Parse XML nodes of CLI output, one node per line between the command and the prompt.
+
+    :param text: CLI output.
+    :return: List of dictionaries.
+    """
+    resp_list = []
+    if not text:
+        LOGGER.error("String is empty")
+        return resp_list
+    LOGGER.debug("Data received \n %s", text)
+    formatted_data = text.replace("\n  ", "").replace(
+        "\n", ",").replace(",</", "</").split(",")[1:-1]
+    for node in formatted_data:
+        try:
+            resp_list.append(json.loads(json.dumps(xmltodict.parse(node))))
+        except Exception as error:  # pylint: disable=broad-except
+            raise CTException(err.CLI_ERROR, f"Invalid XML in CLI output: {error}") from error
+    LOGGER.debug("Extracted output \n %s", resp_list)
+    return resp_list
+
+
+def split_table(text: str) -> list:
+    """
+    Split table output into rows of cells, header and borders excluded.
+
+    Kept position based (command, border, header and border lines are dropped at the top and
+    border and prompt at the bottom) for compatibility with existing callers.
+
+    :param text: CLI output.
+    :return: List of rows, each a list of cell values.
+    """
+    response = str(text).split("\n")
+    for i, line in enumerate(response):
+        response[i] = [cell.strip() for cell in line.split("|")][1:-1]
+    response = response[4:len(response) - 2]
+    LOGGER.info(response)
+    return response
+
+
+def parse_table(text: str) -> list:
+    """
+    Parse bordered table output using its header row.
+
+    :param text: CLI output.
+    :return: List of dictionaries keyed by column header.
+    """
+    rows = []
+    for line in str(text).splitlines():
+        if TABLE_BORDER.match(line) or not line.strip().startswith("|"):
+            continue
+        rows.append([cell.strip() for cell in line.strip().strip("|").split("|")])
+    if not rows:
+        return []
+    header, records = rows[0], []
+    for row in rows[1:]:
+        if len(row) != len(header):
+            raise CTException(err.CLI_ERROR, f"Table row {row} does not match header {header}")
+        records.append(dict(zip(header, row)))
+    return records
+
+
+def parse_key_value(text: str, separator: str = ":") -> dict:
+    """
+    Parse 'key<separator> value' lines, other lines are ignored.
+
+    :param text: CLI output.
+    :param separator: Key/value separator.
+    :return: Dictionary.
+    """
+    result = {}
+    for line in str(text).splitlines():
+        key, sep, value = line.partition(separator)
+        if sep and key.strip() and " " not in key.strip().strip("-"):
+            result[key.strip()] = value.strip()
+    return result
+
+
+class Field:
+    """Expected field of a parsed CLI record."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, name: str, ftype: type = str, required: bool = True,
+                 choices: tuple = None):
+        """
+        :param name: Field name.
+        :param ftype: Type the value is coerced to e.g. str, int, float, bool.
+        :param required: Raise if the field is missing.
+        :param choices: Allowed values.
+        """
+        self.name = name
+        self.ftype = ftype
+        self.required = required
+        self.choices = choices
+
+    def coerce(self, value):
+        """Convert value to field type."""
+        if self.ftype is bool and isinstance(value, str):
+            if value.lower() not in ("true", "false", "yes", "no", "1", "0"):
+                raise ValueError(f"{value} is not a boolean")
+            return value.lower() in ("true", "yes", "1")
+        return self.ftype(value)
+
+
+class Schema:
+    """Schema of a CLI record or list of records."""
+
+    def __init__(self, *fields: Field, many: bool = False, key: str = None):
+        """
+        :param fields: Expected fields.
+        :param many: Data is a list of records.
+        :param key: Records are under this key of the parsed dictionary e.g. 'users'.
+        """
+        self.fields = fields
+        self.many = many
+        self.key = key
+
+    def validate_record(self, record: dict) -> dict:
+        """Validate and coerce one record."""
+        if not isinstance(record, dict):
+            raise CTException(err.CLI_ERROR, f"Expected a record, got {record!r}")
+        result = dict(record)
+        for field in self.fields:
+            if field.name not in record or record[field.name] in (None, ""):
+                if field.required:
+                    raise CTException(err.CLI_ERROR,
+                                      f"Field '{field.name}' missing in {record}")
+                continue
+            try:
+                result[field.name] = field.coerce(record[field.name])
+            except (TypeError, ValueError) as error:
+                raise CTException(err.CLI_ERROR, f"Field '{field.name}': {error}") from error
+            if field.choices and result[field.name] not in field.choices:
+                raise CTException(err.CLI_ERROR, f"Field '{field.name}' value "
+                                                 f"{result[field.name]} not in {field.choices}")
+        return result
+
+    def validate(self, data):
+        """
+        Validate parsed data.
+
+        :param data: Output of a parser.
+        :return: Data with coerced field values.
+        """
+        if self.key is not None:
+            if not isinstance(data, dict) or self.key not in data:
+                raise CTException(err.CLI_ERROR, f"Key '{self.key}' missing in {data}")
+            return {**data, self.key: Schema(*self.fields, many=self.many).validate(
+                data[self.key])}
+        if self.many:
+            if not isinstance(data, list):
+                raise CTException(err.CLI_ERROR, f"Expected a list of records, got {data!r}")
+            return [self.validate_record(record) for record in data]
+        return self.validate_record(data)
+
+
+def parse_output(text: str, output_format: str, schema: Schema = None):
+    """
+    Parse CLI output of given format and validate it.
+
+    :param text: CLI output.
+    :param output_format: json, xml, table (rows of cells), records (table as dictionaries)
+        or kv (key/value lines).
+    :param schema: Optional schema validating the parsed data.
+    :return: Parsed data.
+    :raises CTException: If output can not be parsed or does not match the schema.
+    """
+    parsers = {"json": parse_json, "xml": parse_xml, "table": split_table,
+               "records": parse_table, "kv": parse_key_value}
+    if output_format not in parsers:
+        raise CTException(err.CLI_ERROR, f"Unsupported output format {output_format}, "
+                                         f"expected one of {OUTPUT_FORMATS}")
+    try:
+        data = parsers[output_format](text)
+    except ValueError as error:
+        raise CTException(err.CLI_ERROR, f"Invalid {output_format} in CLI output: "
+                                         f"{error}") from error
+    return schema.validate(data) if schema else data
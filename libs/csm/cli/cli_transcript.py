@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Recorded CORTX CLI transcripts.
+
+RecordingSession wraps a live redexpect session and saves every command with the expected
+patterns, matched index and output. TranscriptSession replays such a file with the same
+send/expect/current_output interface, so CLI libraries can run offline by passing it as
+session_obj.
+"""
+
+import json
+import logging
+import os
+
+import commons.errorcodes as err
+from commons.exceptions import CTException
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RecordingSession:
+    """Record commands and responses of a live interactive session."""
+
+    def __init__(self, session_obj, path: str, mask: list = None):
+        """
+        :param session_obj: Live redexpect session.
+        :param path: Transcript JSON file written on every response.
+        :param mask: Strings (e.g. passwords) replaced by '****' in the transcript.
+        """
+        self.session_obj = session_obj
+        self.path = path
+        self.mask = [value for value in (mask or []) if value]
+        self.entries = []
+        self._cmd = None
+
+    def _masked(self, text: str) -> str:
+        """Hide secrets."""
+        for value in self.mask:
+            text = text.replace(value, "****")
+        return text
+
+    def send(self, cmd: str) -> None:
+        """Send command to live session."""
+        self._cmd = cmd
+        self.session_obj.send(cmd)
+
+    def expect(self, re_strings: list, timeout: int = None) -> int:
+        """Expect on live session and record the exchange."""
+        index = self.session_obj.expect(re_strings=re_strings, timeout=timeout)
+        self.entries.append({"cmd": self._masked(self._cmd or "").rstrip("\n"),
+                             "patterns": list(re_strings), "index": index,
+                             "output": self._masked(self.session_obj.current_output)})
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as fptr:
+            json.dump(self.entries, fptr, indent=2)
+        return index
+
+    @property
+    def current_output(self) -> str:
+        """Output of last expect."""
+        return self.session_obj.current_output
+
+    def exit(self) -> None:
+        """Close live session."""
+        self.session_obj.exit()
+
+
+class TranscriptSession:
+    """Replay a recorded transcript in place of a redexpect session."""
+
+    def __init__(self, path: str = None, entries: list = None, strict: bool = True):
+        """
+        :param path: Transcript JSON file.
+        :param entries: Transcript entries, used instead of path.
+        :param strict: Commands must match the recording, '****' in the recording matches any
+            masked value.
+        """
+        if entries is None:
+            with open(path, encoding="utf-8") as fptr:
+                entries = json.load(fptr)
+        self.entries = list(entries)
+        self.strict = strict
+        self.position = 0
+        self.current_output = ""
+        self._cmd = None
+
+    def send(self, cmd: str) -> None:
+        """Accept next command."""
+        self._cmd = cmd.rstrip("\n")
+
+    def expect(self, re_strings: list = None, timeout: int = None) -> int:
+        # pylint: disable=unused-argument
+        """Return recorded index and output of the next exchange."""
+        if self.position >= len(self.entries):
+            raise CTException(err.CLI_ERROR, f"Transcript exhausted at command '{self._cmd}'")
+        entry = self.entries[self.position]
+        if self.strict and entry["cmd"] != "****" and entry["cmd"] != self._cmd:
+            raise CTException(err.CLI_ERROR, f"Transcript expects '{entry['cmd']}' at "
+                                             f"step {self.position}, got '{self._cmd}'")
+        self.position += 1
+        self.current_output = entry["output"]
+        LOGGER.debug("Replaying '%s'", entry["cmd"])
+        return entry["index"]
+
+    @property
+    def exhausted(self) -> bool:
+        """True when every recorded exchange was replayed."""
+        return self.position == len(self.entries)
+
+    def exit(self) -> None:
+        """Nothing to close."""
@@ -23,8 +23,6 @@ across all other libraries and test suites
 
 import platform
 import logging
-import json
-import xmltodict
 
 try:
     if platform.system() == "Linux":
@@ -36,12 +34,18 @@ import commons.errorcodes as err
 from commons import commands
 from commons.exceptions import CTException
 from config import CMN_CFG
+from libs.csm.cli import cli_parser
+from libs.csm.cli.cli_transcript import RecordingSession
 from libs.csm.cli.cortx_cli_client import CortxCliClient
 
 
 class CortxCli(CortxCliClient):
     """This class contains common methods for CORTX CLI derived from cli client lib"""
 
+    # Logged in interactive sessions shared by CortxCli objects created with
+    # shared_session=True, key (host, port, username): {"session": obj, "user": cli user}
+    _shared_sessions = {}
+
     def __init__(
             self,
             # For the stop gap arrangement till we have nodeadmin user
@@ -56,6 +60,9 @@ class CortxCli(CortxCliClient):
         :param str password: password of CSM server
         :keyword object session_obj: session object of host connection if already established
         :keyword int port: port number
+        :keyword bool shared_session: reuse one logged in CLI session across objects and
+            commands, login/logout of the same user become no-ops
+        :keyword str record_transcript: save commands and responses to this json file
         """
         self.log = logging.getLogger(__name__)
         csm = CMN_CFG.get("csm")
@@ -65,12 +72,26 @@ class CortxCli(CortxCliClient):
         password = password if password else nodes[0]["password"] if nodes else None
         session_obj = kwargs.get("session_obj", None)
         port = kwargs.get("port", 22)
+        self.shared_key = (host, port, username) if kwargs.get("shared_session") else None
+        if self.shared_key in self._shared_sessions and not session_obj:
+            session_obj = self._shared_sessions[self.shared_key]["session"]
         super().__init__(
             host=host,
             username=username,
             password=password,
             session_obj=session_obj,
-            port=port)
+            port=port,
+            record_transcript=kwargs.get("record_transcript", None))
+
+    def open_connection(self):
+        """
+        Open the ssh connection with host, or reuse the shared one
+        :return: None
+        """
+        super().open_connection()
+        if self.shared_key:
+            self._shared_sessions.setdefault(self.shared_key,
+                                             {"session": self.session_obj, "user": None})
 
     def execute_cli_commands(
             self,
@@ -133,6 +154,14 @@ class CortxCli(CortxCliClient):
             login_cortxcli = " ".join(
                 [login_cortxcli, "--username", username_param])
 
+        shared = self._shared_sessions.get(self.shared_key) if self.shared_key else None
+        if shared and shared["user"] == username:
+            self.log.info("Reusing CORTX CLI session of user %s", username)
+            return True, shared["output"]
+        if shared and shared["user"]:
+            self._logout(shared)
+        if isinstance(self.session_obj, RecordingSession):
+            self.session_obj.mask.append(password)
         self.log.info("Opening interactive CORTX CLI session....")
         output = self.execute_cli_commands(
             login_cortxcli, patterns=["Username:"])[1]
@@ -150,15 +179,31 @@ class CortxCli(CortxCliClient):
                 if "CORTX Interactive Shell" in output:
                     self.log.info(
                         "Logged in CORTX CLI as user %s successfully", username)
+                    if shared:
+                        shared.update(user=username, output=output)
                     return True, output
 
         return False, output
 
     def logout_cortx_cli(self) -> tuple:
         """
-        This function will be used to logout of CORTX CLI
+        This function will be used to logout of CORTX CLI, shared sessions stay logged in
+        till close_shared_sessions
+        :return: True/False and output
+        """
+        if self.shared_key and self.shared_key in self._shared_sessions:
+            self.log.info("Keeping shared CORTX CLI session logged in")
+            return True, ""
+        return self._logout()
+
+    def _logout(self, shared: dict = None) -> tuple:
+        """
+        Logout of CORTX CLI
+        :param shared: Shared session entry to reset
         :return: True/False and output
         """
+        if shared:
+            shared["user"] = None
         output = self.execute_cli_commands(
             cmd=commands.CMD_HELP_OPTION,
             patterns=["usage: cortxcli"])[1]
@@ -181,15 +226,7 @@ class CortxCli(CortxCliClient):
         :return: Dictionary created from given input string.
         :rtype: dict
         """
-        if not input_str:
-            self.log.error("Empty string received!!")
-            return None
-        self.log.debug("Data received \n %s", input_str)
-        start_index = input_str.find("{")
-        end_index = input_str.rfind("}") + 1
-        json_data = json.loads(input_str[start_index:end_index])
-        self.log.debug("JSON output \n %s", json_data)
-        return json_data
+        return cli_parser.parse_json(input_str)
 
     def xml_data_parsing(self, input_str: str) -> list:
         """
@@ -197,19 +234,7 @@ class CortxCli(CortxCliClient):
         :param str input_str: XML formatted string to be converted
         :return: List of dictionary
         """
-        resp_list = []
-        if not input_str:
-            self.log.error("String is empty")
-            return resp_list
-        self.log.debug("Data received \n %s", input_str)
-        formatted_data = input_str.replace("\n  ", "").replace(
-            "\n", ",").replace(",</", "</").split(",")[1:-1]
-        for node in formatted_data:
-            temp_dict = json.dumps(xmltodict.parse(node))
-            json_format = json.loads(temp_dict)
-            resp_list.append(json_format)
-        self.log.debug("Extracted output \n %s", resp_list)
-        return resp_list
+        return cli_parser.parse_xml(input_str)
 
     def split_table_response(self, ip_response: str) -> list:
         """
@@ -217,23 +242,28 @@ class CortxCli(CortxCliClient):
         :param ip_response: response which is to be split
         :return: List formed after splitting response
         """
-        # Splitting response row-wise
-        response = str(ip_response).split('\n')
-        # Splitting values of each row column-wise
-        for i, string in enumerate(response):
-            response[i] = string.split('|')
-            for j in range(len(response[i])):
-                response[i][j] = response[i][j].strip()
-            response[i] = response[i][1:-1]
-        response = response[4:len(response) - 2]
-        self.log.info(response)
-        return response
+        return cli_parser.split_table(ip_response)
+
+    @staticmethod
+    def parse_response(output: str, output_format: str, schema: cli_parser.Schema = None):
+        """
+        Parse CLI output of given format and validate it against schema
+        :param output: CLI output
+        :param output_format: json/xml/table/records/kv, see cli_parser.parse_output
+        :param schema: Schema of the expected records
+        :return: Parsed response
+        """
+        return cli_parser.parse_output(output, output_format, schema)
 
     def close_connection(self, set_session_obj_none: bool = False):
         """
         This function will close the ssh connection created in init
         :return: None
         """
+        if self.shared_key in self._shared_sessions:
+            if set_session_obj_none:
+                self.session_obj = None
+            return
         try:
             super().close_connection(set_session_obj_none)
         except Exception as error:
@@ -242,3 +272,20 @@ class CortxCli(CortxCliClient):
                 CortxCli.close_connection.__name__,
                 error)
             raise CTException(err.CLI_ERROR, error.args[0]) from error
+
+    @classmethod
+    def close_shared_sessions(cls):
+        """
+        Logout and close all shared CLI sessions, to be called at the end of a test session
+        :return: None
+        """
+        for key, shared in list(cls._shared_sessions.items()):
+            cli_obj = cls(host=key[0], username=key[2], session_obj=shared["session"],
+                          port=key[1])
+            try:
+                if shared["user"]:
+                    cli_obj._logout(shared)  # pylint: disable=protected-access
+                CortxCliClient.close_connection(cli_obj, True)
+            except Exception as error:  # pylint: disable=broad-except
+                cli_obj.log.error("Unable to close shared CLI session %s: %s", key, error)
+            cls._shared_sessions.pop(key, None)
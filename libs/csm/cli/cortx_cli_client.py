@@ -27,6 +27,9 @@ try:
 except ModuleNotFoundError as error:
     logging.error(error)
 
+from libs.csm.cli.cli_transcript import RecordingSession
+
+
 # pylint: disable=too-many-instance-attributes
 class CortxCliClient:
     """
@@ -47,6 +50,7 @@ class CortxCliClient:
         :param str password: password of CSM server
         :keyword object session_obj: session object of host connection if already established
         :keyword int port: port number
+        :keyword str record_transcript: save commands and responses to this json file
         """
         self.log = logging.getLogger(__name__)
         self.host = host
@@ -55,6 +59,7 @@ class CortxCliClient:
         self.session_obj = kwargs.get("session_obj", None)
         self.port = kwargs.get("port", 22)
         self.expect_timeout = kwargs.get("expect_timeout", 300)
+        self.record_transcript = kwargs.get("record_transcript", None)
         self.host_obj = None
 
     def open_connection(self):
@@ -70,6 +75,9 @@ class CortxCliClient:
                 username=self.username,
                 password=self.password,
                 allow_agent=True)
+            if self.record_transcript:
+                self.session_obj = RecordingSession(self.session_obj, self.record_transcript,
+                                                    mask=[self.password])
             self.log.debug("Opened an ssh connection with host: %s", self.host)
 
     def execute_cli_commands(
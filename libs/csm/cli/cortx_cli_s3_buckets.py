@@ -22,6 +22,8 @@ This library contains methods for S3 Bucket operations using CORTX CLI
 
 import logging
 from commons import commands
+from libs.csm.cli.cli_parser import Field
+from libs.csm.cli.cli_parser import Schema
 from libs.csm.cli.cortx_cli import CortxCli
 
 LOGGER = logging.getLogger(__name__)
@@ -97,8 +99,8 @@ class CortxCliS3BucketOperations(CortxCli):
         """
         LOGGER.info("Listing all the buckets")
         resp_json = self.list_buckets_cortx_cli(op_format="json")
-        bucket_list = self.format_str_to_dict(
-            resp_json[1])["buckets"]
+        bucket_list = self.parse_response(resp_json[1], "json", Schema(
+            Field("name"), many=True, key="buckets"))["buckets"]
         response_dict = {"Deleted": [], "CouldNotDelete": []}
         for bucket in bucket_list:
             LOGGER.info("Deleting the bucket %s", bucket)
@@ -22,9 +22,12 @@ This library contains methods for S3 access key operations using CORTX CLI
 
 import logging
 from commons import commands
+from libs.csm.cli.cli_parser import Field
+from libs.csm.cli.cli_parser import Schema
 from libs.csm.cli.cortx_cli import CortxCli
 
 LOGGER = logging.getLogger(__name__)
+ACCESS_KEY_SCHEMA = Schema(Field("Access Key"), Field("Secret Key"), many=True)
 
 
 class CortxCliS3AccessKeys(CortxCli):
@@ -55,9 +58,9 @@ class CortxCliS3AccessKeys(CortxCli):
             response = self.execute_cli_commands(cmd="Y", patterns=["Access Key"])[1]
             if "Access Key" in response:
                 LOGGER.info("Response returned: \n%s", response)
-                response = self.split_table_response(response)
-                response_dict["access_key"] = response[0][0]
-                response_dict["secret_key"] = response[0][1]
+                record = self.parse_response(response, "records", ACCESS_KEY_SCHEMA)[0]
+                response_dict["access_key"] = record["Access Key"]
+                response_dict["secret_key"] = record["Secret Key"]
                 return True, response_dict
 
         return False, response
@@ -78,12 +81,8 @@ class CortxCliS3AccessKeys(CortxCli):
         LOGGER.info("Listing s3 user accesskey of user %s", user_name)
         status, response = self.execute_cli_commands(cmd=command,
                       patterns=["Access Key", "access_keys"])
-        if output_format == "json":
-            response = self.format_str_to_dict(response)
-        if output_format == "xml":
-            response = self.xml_data_parsing(response)
-        if output_format == "table":
-            response = self.split_table_response(response)
+        if output_format in ("json", "xml", "table"):
+            response = self.parse_response(response, output_format)
 
         return status, response
 
@@ -103,9 +102,9 @@ class CortxCliS3AccessKeys(CortxCli):
             response = self.execute_cli_commands(cmd="Y", patterns=["Access Key"])[1]
             if "Access Key" in response:
                 LOGGER.info("Response returned: \n%s", response)
-                response = self.split_table_response(response)
-                response_dict["access_key"] = response[0][0]
-                response_dict["secret_key"] = response[0][1]
+                record = self.parse_response(response, "records", ACCESS_KEY_SCHEMA)[0]
+                response_dict["access_key"] = record["Access Key"]
+                response_dict["secret_key"] = record["Secret Key"]
                 return True, response_dict
 
         return False, response
@@ -149,12 +148,8 @@ class CortxCliS3AccessKeys(CortxCli):
         command = f"{commands.CMD_SHOW_ACCESS_KEY} {user_name} -f {output_format}"
         LOGGER.info("Listing s3accesskey of user %s", user_name)
         response = self.execute_cli_commands(cmd=command, patterns=["Access Key", "access_keys"])[1]
-        if output_format == "json":
-            response = self.format_str_to_dict(response)
-        if output_format == "xml":
-            response = self.xml_data_parsing(response)
-        if output_format == "table":
-            response = self.split_table_response(response)
+        if output_format in ("json", "xml", "table"):
+            response = self.parse_response(response, output_format)
 
         return response
 
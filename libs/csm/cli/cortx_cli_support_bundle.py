@@ -27,12 +27,18 @@ from commons.commands import CMD_GENERATE_SUPPORT_BUNDLE
 from commons.commands import CMD_GENERATE_SUPPORT_BUNDLE_OS
 from commons.commands import CMD_SUPPORT_BUNDLE_STATUS
 from commons import constants as const
+import commons.errorcodes as err
 from commons import commands
+from commons.exceptions import CTException
 from commons.helpers import node_helper
 from commons.utils import system_utils
 from config import CMN_CFG
+from libs.csm.cli.cli_parser import Field
+from libs.csm.cli.cli_parser import Schema
 
 LOGGER = logging.getLogger(__name__)
+SB_STATUS_FIELDS = (Field(const.BUNDLE_ID), Field(const.SB_COMMENT), Field(const.MESSAGE),
+                    Field(const.NODE_NAME), Field(const.RESULT))
 
 
 class CortxCliSupportBundle(CortxCli):
@@ -40,12 +46,13 @@ class CortxCliSupportBundle(CortxCli):
     This class has all support bundle operations
     """
 
-    def __init__(self, session_obj: object = None):
+    def __init__(self, session_obj: object = None, **kwargs):
         """
         This method initializes members of CortxCliSupportBundle
         :param object session_obj: session object of host connection if already established
+        :keyword bool shared_session: reuse one logged in CLI session, see CortxCli
         """
-        super().__init__(session_obj=session_obj)
+        super().__init__(session_obj=session_obj, **kwargs)
 
     def generate_support_bundle(self, comment: str = None) -> Tuple[bool, str]:
         """
@@ -166,78 +173,27 @@ class CortxCliSupportBundle(CortxCli):
                 "Support bundle status failed with error: %s", output)
             return False, output
 
-        if output_format == const.JSON_LIST_FORMAT:
-            json_resp = self.format_str_to_dict(output)
-            if not json_resp:
-                return False, output
-            else:
-                status = json_resp[const.SB_STATUS]
-                for each in status:
-                    if len(each) == 5:
-                        # Verifying keys present in each status of support
-                        # bundle dict
-                        if not (
-                                const.BUNDLE_ID in each and
-                                const.SB_COMMENT in each and
-                                const.MESSAGE in each and
-                                const.NODE_NAME in each and
-                                const.RESULT in each):
-                            LOGGER.error(
-                                "The expected keys in %s response are missing",
-                                const.JSON_LIST_FORMAT)
-                            return False, json_resp
-                    else:
-                        LOGGER.error(
-                            "%s response is not as expected",
-                            const.JSON_LIST_FORMAT)
-                        return False, json_resp
-                output = json_resp
-        elif output_format == const.XML_LIST_FORMAT:
-            xml_out = self.xml_data_parsing(output)
-            if not xml_out:
-                return False, output
-            else:
-                for each in xml_out:
-                    if len(each[const.SB_STATUS]) == 5:
-                        # Verifying keys present in each status of support
-                        # bundle dict
-                        if not (
-                                const.BUNDLE_ID in each[const.SB_STATUS] and
-                                const.SB_COMMENT in each[const.SB_STATUS] and
-                                const.MESSAGE in each[const.SB_STATUS] and
-                                const.NODE_NAME in each[const.SB_STATUS] and
-                                const.RESULT in each[const.SB_STATUS]):
-                            LOGGER.error(
-                                "The expected keys in %s response are missing",
-                                const.XML_LIST_FORMAT)
-                            return False, xml_out
-                    else:
-                        LOGGER.error(
-                            "%s response is not as expected",
-                            const.XML_LIST_FORMAT)
-                        return False, xml_out
+        try:
+            if output_format == const.JSON_LIST_FORMAT:
+                output = self.parse_response(output, "json", Schema(
+                    *SB_STATUS_FIELDS, many=True, key=const.SB_STATUS))
+            elif output_format == const.XML_LIST_FORMAT:
+                xml_out = self.parse_response(output, "xml")
+                Schema(*SB_STATUS_FIELDS, many=True).validate(
+                    [each.get(const.SB_STATUS) for each in xml_out])
                 output = xml_out
-        elif output_format == const.TABLE_LIST_FORMAT:
-            table_data = self.split_table_response(output)
-            status_list = []
-            if not table_data:
-                return False, output
-            else:
-                for each in table_data:
-                    status_data = []
-                    for data in each:
-                        if data:
-                            status_data.append(data)
-                    status_list.append(status_data)
-                for each in status_list:
-                    # Verifying only two elements are present in each support
-                    # bundle status
-                    if len(each) != 5:
-                        LOGGER.error(
-                            "The expected support bundle details"
-                            " in %s response are missing",
-                            const.TABLE_LIST_FORMAT)
-                        return False, table_data
-            output = status_list
+            elif output_format == const.TABLE_LIST_FORMAT:
+                table_data = self.parse_response(output, "table")
+                output = [[data for data in each if data] for each in table_data]
+                # Verifying all support bundle details are present in each status row
+                if any(len(each) != len(SB_STATUS_FIELDS) for each in output):
+                    raise CTException(err.CLI_ERROR, f"Support bundle status rows {output} "
+                                                     f"do not have {len(SB_STATUS_FIELDS)} "
+                                                     f"columns")
+        except CTException as error:
+            LOGGER.error("%s response is not as expected: %s", output_format, error)
+            return False, output
+        if output_format and not output:
+            return False, output
 
         return True, output
@@ -19,10 +19,8 @@
 """
 This library contains methods for S3 Account operations using CORTX CLI
 """
-import json
 import logging
 import platform
-import xmltodict
 try:
     if platform.system() == "Linux":
         import redexpect
@@ -32,6 +30,7 @@ except ModuleNotFoundError as err:
 import commons.errorcodes as err
 from commons.exceptions import CTException
 from config import CMN_CFG
+from libs.csm.cli import cli_parser
 from libs.csm.cli.cortx_cli_client import CortxCliClient
 
 
@@ -129,15 +128,7 @@ class CortxNodeCli(CortxCliClient):
         :param str input_str: Input string which will be converted to dictionary.
         :return: Dictionary created from given input string.
         """
-        if not input_str:
-            self.log.error("Empty string received!!")
-            return None
-        self.log.debug("Data received \n %s", input_str)
-        start_index = input_str.find("{")
-        end_index = input_str.rfind("}") + 1
-        json_data = json.loads(input_str[start_index:end_index])
-        self.log.debug("JSON output \n %s", json_data)
-        return json_data
+        return cli_parser.parse_json(input_str)
 
     def xml_data_parsing(self, input_str: str) -> list:
         """
@@ -145,19 +136,7 @@ class CortxNodeCli(CortxCliClient):
         :param str input_str: XML formatted string to be converted
         :return: List of dictionary
         """
-        resp_list = []
-        if not input_str:
-            self.log.error("String is empty")
-            return resp_list
-        self.log.debug("Data received \n %s", input_str)
-        formatted_data = input_str.replace("\n  ", "").replace(
-            "\n", ",").replace(",</", "</").split(",")[1:-1]
-        for node in formatted_data:
-            temp_dict = json.dumps(xmltodict.parse(node))
-            json_format = json.loads(temp_dict)
-            resp_list.append(json_format)
-        self.log.debug("Extracted output \n %s", resp_list)
-        return resp_list
+        return cli_parser.parse_xml(input_str)
 
     def split_table_response(self, ip_response: str) -> list:
         """
@@ -165,17 +144,18 @@ class CortxNodeCli(CortxCliClient):
         :param ip_response: response which is to be split
         :return: List formed after splitting response
         """
-        # Splitting response row-wise
-        response = str(ip_response).split('\n')
-        # Splitting values of each row column-wise
-        for i, string in enumerate(response):
-            response[i] = string.split('|')
-            for j in range(len(response[i])):
-                response[i][j] = response[i][j].strip()
-            response[i] = response[i][1:-1]
-        response = response[4:len(response) - 2]
-        self.log.info(response)
-        return response
+        return cli_parser.split_table(ip_response)
+
+    @staticmethod
+    def parse_response(output: str, output_format: str, schema: cli_parser.Schema = None):
+        """
+        Parse CLI output of given format and validate it against schema
+        :param output: CLI output
+        :param output_format: json/xml/table/records/kv, see cli_parser.parse_output
+        :param schema: Schema of the expected records
+        :return: Parsed response
+        """
+        return cli_parser.parse_output(output, output_format, schema)
 
     def close_connection(self):
         """
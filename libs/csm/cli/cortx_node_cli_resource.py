@@ -20,9 +20,12 @@
 This library contains methods for resource operations using CORTX CLI
 """
 import logging
+import commons.errorcodes as err
 from commons import commands
+from commons.exceptions import CTException
 from commons.helpers import node_helper
 from config import CMN_CFG
+from libs.csm.cli import cli_parser
 from libs.csm.cli.cortx_node_cli import CortxNodeCli
 
 LOGGER = logging.getLogger(__name__)
@@ -162,37 +165,38 @@ class CortxNodeCLIResourceOps(CortxNodeCli):
                                            patterns=default_patterns, time_out=timeout)
         return res
 
-    def split_str_to_list(self, input_str: str, sep: str):
+    @staticmethod
+    def health_records(input_str: str) -> list:
         """
-        This Function formats the string to list
-        to alternate index value
+        This Function parses the resources having health of resource show --health output
+        :param input_str: resource show --health output
+        :return: list of resource dictionaries with health status and description
         """
-        out = input_str.split(sep)
-        i = 0
-        num = len(out)
-        while i < num - 1:
-            out[i] = out[i] + "}" + "}" + "]" + "}" + "}"
-            result = super().format_str_to_dict(out[i])
-            LOGGER.info(result["health"]["status"])
-            LOGGER.info(result["health"]["description"])
-            i = i + 2
-        return result
+        records = cli_parser.find_records(cli_parser.parse_json_values(input_str), "health")
+        schema = cli_parser.Schema(cli_parser.Field("status"), cli_parser.Field("description"),
+                                   many=True)
+        schema.validate([record["health"] for record in records])
+        if not records:
+            raise CTException(err.CLI_ERROR, f"No resource health in output {input_str}")
+        for record in records:
+            LOGGER.info(record["health"]["status"])
+            LOGGER.info(record["health"]["description"])
+        return records
 
-    def convert_to_list_format(self, input_str: str, sep: str):
+    def split_str_to_list(self, input_str: str, sep: str = None):
         """
-        This Function formats the string
-         to list to index value 1
+        This Function returns the last resource health of resource show --health output
+        :param input_str: resource show --health output
+        :param sep: unused, kept for existing callers
         """
-        out = input_str.split(sep)
-        i = 0
-        num = len(out)
-        while i < num - 1:
-            out[i] = out[i] + "}"
-            result = super().format_str_to_dict(out[i])
-            LOGGER.info(result["health"]["status"])
-            LOGGER.info(result["health"]["description"])
-            i = i + 1
-        result = super().format_str_to_dict(out[i])
-        LOGGER.info(result["health"]["status"])
-        LOGGER.info(result["health"]["description"])
-        return result
+        # pylint: disable=unused-argument
+        return self.health_records(input_str)[-1]
+
+    def convert_to_list_format(self, input_str: str, sep: str = None):
+        """
+        This Function returns the last resource health of resource show --health output
+        :param input_str: resource show --health output
+        :param sep: unused, kept for existing callers
+        """
+        # pylint: disable=unused-argument
+        return self.health_records(input_str)[-1]
@@ -99,12 +99,8 @@ class CortxCliIamUser(CortxCli):
             return True, output
         if not status:
             return False, output
-        if output_format == "json":
-            output = self.format_str_to_dict(output)
-        if output_format == "xml":
-            output = self.xml_data_parsing(output)
-        if output_format == "table":
-            output = self.split_table_response(output)
+        if output_format in ("json", "xml", "table"):
+            output = self.parse_response(output, output_format)
 
         return True, output
 
@@ -29,6 +29,7 @@ from commons.constants import PID_WATCH_LIST, REQUIRED_MODULES
 from commons.helpers.pods_helper import LogicalNode
 from commons.params import LOG_DIR_NAME, LATEST_LOG_FOLDER
 from commons.commands import PROC_CMD
+from libs.dtm.procpath_analysis import ProcPathAnalyser
 
 
 # check and set pytest logging level as Globals.LOG_LEVEL
@@ -160,3 +161,17 @@ class EnableProcPathStatsCollection:
                 LOGGER.info(resp)
                 file_paths[worker] = file_path
         return True, file_paths
+
+    def analyse_stats(self, phases: list = None, **kwargs):
+        """
+        Copy collected stats to local and analyse RSS, CPU and FD trends of all nodes.
+
+        :param phases: List of (phase_name, start_ts, end_ts) of the test.
+        :keyword leak_pvalue: Mann-Kendall p-value below which a trend is significant.
+        :keyword leak_growth_pct: Min RSS growth in % over a segment to report a leak.
+        :return: (passed, verdict dict)
+        """
+        _, file_paths = self.get_stat_files_to_local()
+        db_files = {worker.hostname: path for worker, path in file_paths.items()}
+        analyser = ProcPathAnalyser(db_files, phases, **kwargs)
+        return analyser.generate_report(os.path.join(self.log_path, "analysis"))
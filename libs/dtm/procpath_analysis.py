@@ -0,0 +1,253 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+Procpath time-series analysis for DTM resource monitoring.
+
+Merges the per node procpath SQLite databases collected by EnableProcPathStatsCollection and
+computes RSS, CPU and FD trends per process. Processes are grouped into families by
+(node, comm, cmdline) so that a restarted m0d/radosgw/hax keeps its identity, and every restart
+(pid or start time change) splits the family into segments. A segment is reported as a likely
+memory leak when the Mann-Kendall test finds a significant increasing RSS trend and the linear
+RSS growth over the segment crosses a configurable threshold.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from commons.utils.stats_utils import mann_kendall
+
+LOGGER = logging.getLogger(__name__)
+
+PAGE_SIZE = 4096
+CLK_TCK = 100
+# Mann-Kendall is O(n^2), longer series are evenly down sampled.
+MAX_TREND_SAMPLES = 2000
+
+
+def load_procpath_db(db_path: str, node: str) -> pd.DataFrame:
+    """
+    Load procpath 'record' table of one node.
+
+    :param db_path: Path of procpath SQLite file.
+    :param node: Node name added as column.
+    :return: DataFrame with ts, node, pid, comm, cmdline, rss, cpu_ticks, fds, starttime.
+    """
+    with sqlite3.connect(db_path) as conn:
+        frame = pd.read_sql_query("SELECT * FROM record", conn)
+    fd_cols = [col for col in frame.columns if col.startswith("fd_")]
+    result = pd.DataFrame({
+        "ts": frame["ts"].astype(float),
+        "node": node,
+        "pid": frame["stat_pid"].astype(int),
+        "comm": frame["stat_comm"].astype(str),
+        "cmdline": frame["cmdline"].astype(str) if "cmdline" in frame else "",
+        "rss": frame["stat_rss"].astype(float) * PAGE_SIZE,
+        "cpu_ticks": (frame["stat_utime"] + frame["stat_stime"]).astype(float),
+        "fds": frame[fd_cols].sum(axis=1) if fd_cols else np.nan,
+        "starttime": frame["stat_starttime"] if "stat_starttime" in frame else frame["stat_pid"],
+    })
+
+    return result
+
+
+class ProcPathAnalyser:
+    """Analyse merged procpath databases of all worker nodes."""
+
+    def __init__(self, db_files: dict, phases: list = None, **kwargs):
+        """
+        Load and merge procpath databases.
+
+        :param db_files: Dict of {node_name: sqlite file path}.
+        :param phases: List of (phase_name, start_ts, end_ts) used for per phase statistics.
+        :keyword leak_pvalue: Mann-Kendall p-value below which a trend is significant.
+        :keyword leak_growth_pct: Min RSS growth in % over a segment to report a leak.
+        :keyword min_samples: Min samples in a segment to run trend analysis.
+        """
+        self.phases = phases or []
+        self.leak_pvalue = kwargs.get("leak_pvalue", 0.01)
+        self.leak_growth_pct = kwargs.get("leak_growth_pct", 10)
+        self.min_samples = kwargs.get("min_samples", 10)
+        frames = []
+        for node, db_path in db_files.items():
+            if not os.path.exists(str(db_path)):
+                LOGGER.warning("Procpath database of %s is missing: %s", node, db_path)
+                continue
+            frames.append(load_procpath_db(db_path, node))
+        if not frames:
+            raise FileNotFoundError(f"No procpath database found in {db_files}")
+        self.data = pd.concat(frames, ignore_index=True).sort_values("ts")
+        self.data["family"] = (self.data["node"] + ":" + self.data["comm"] + ":" +
+                               self.data["cmdline"])
+        self.data["segment"] = self.data.groupby("family", group_keys=False).apply(
+            self._segment_ids)
+        self.data["cpu_pct"] = self.data.groupby(["family", "segment"], group_keys=False).apply(
+            self._cpu_percent)
+
+    @staticmethod
+    def _segment_ids(group: pd.DataFrame) -> pd.Series:
+        """Number segments of a process family, a new segment starts on every restart."""
+        key = group["pid"].astype(str) + "-" + group["starttime"].astype(str)
+        return (key != key.shift()).cumsum() - 1
+
+    @staticmethod
+    def _cpu_percent(group: pd.DataFrame) -> pd.Series:
+        """CPU utilisation in percent between consecutive samples."""
+        ticks = group["cpu_ticks"].diff() / CLK_TCK
+        elapsed = group["ts"].diff()
+        return (ticks / elapsed * 100).where(elapsed > 0)
+
+    def restarts(self) -> list:
+        """
+        Restart induced discontinuities per process family.
+
+        :return: List of dicts with family, ts, old/new pid and RSS before and after restart.
+        """
+        events = []
+        for family, group in self.data.groupby("family"):
+            changes = group[group["segment"].diff() > 0]
+            for idx in changes.index:
+                prev = group.loc[:idx].iloc[-2]
+                events.append({"family": family, "ts": float(group.loc[idx, "ts"]),
+                               "old_pid": int(prev["pid"]), "new_pid": int(group.loc[idx, "pid"]),
+                               "rss_before": float(prev["rss"]),
+                               "rss_after": float(group.loc[idx, "rss"])})
+        return events
+
+    def segment_trends(self) -> list:
+        """
+        RSS/FD trend of every process segment.
+
+        :return: List of dicts with slope (bytes/hour), growth %, Mann-Kendall z and p-value and
+            leak flag.
+        """
+        trends = []
+        for (family, segment), group in self.data.groupby(["family", "segment"]):
+            if len(group) < self.min_samples:
+                continue
+            step = max(1, len(group) // MAX_TREND_SAMPLES)
+            sample = group.iloc[::step]
+            hours = (sample["ts"] - sample["ts"].iloc[0]) / 3600.0
+            slope, intercept = np.polyfit(hours, sample["rss"], 1) if hours.iloc[-1] > 0 \
+                else (0.0, float(sample["rss"].iloc[0]))
+            fitted_start = intercept
+            fitted_end = intercept + slope * hours.iloc[-1]
+            growth = (fitted_end - fitted_start) / fitted_start * 100 if fitted_start > 0 else 0.0
+            _, z_score, p_value = mann_kendall(sample["rss"].values)
+            fd_trend = mann_kendall(sample["fds"].values) if sample["fds"].notna().all() \
+                else (0, 0.0, 1.0)
+            leak = bool(p_value < self.leak_pvalue and z_score > 0 and
+                        growth >= self.leak_growth_pct)
+            trends.append({
+                "family": family, "segment": int(segment), "pid": int(group["pid"].iloc[0]),
+                "start": float(group["ts"].iloc[0]), "end": float(group["ts"].iloc[-1]),
+                "samples": len(group), "rss_start": float(group["rss"].iloc[0]),
+                "rss_end": float(group["rss"].iloc[-1]), "rss_max": float(group["rss"].max()),
+                "rss_slope_per_hour": float(slope), "rss_growth_pct": float(growth),
+                "mk_z": float(z_score), "mk_pvalue": float(p_value),
+                "fd_mk_z": float(fd_trend[1]), "fd_mk_pvalue": float(fd_trend[2]),
+                "cpu_pct_mean": float(group["cpu_pct"].mean(skipna=True) or 0.0),
+                "leak": leak})
+        return trends
+
+    def phase_stats(self) -> dict:
+        """
+        Mean/max RSS, CPU and FDs per process family for each test phase.
+
+        :return: Dict of {phase_name: {family: stats}}
+        """
+        stats = {}
+        for name, start, end in self.phases:
+            window = self.data[(self.data["ts"] >= start) & (self.data["ts"] <= end)]
+            agg = window.groupby("family").agg(
+                rss_mean=("rss", "mean"), rss_max=("rss", "max"),
+                cpu_pct_mean=("cpu_pct", "mean"), cpu_pct_max=("cpu_pct", "max"),
+                fds_mean=("fds", "mean"), fds_max=("fds", "max"), samples=("ts", "count"))
+            stats[name] = json.loads(agg.to_json(orient="index"))
+        return stats
+
+    def plot(self, out_dir: str) -> list:
+        """
+        Plot RSS, CPU and FD time series per node.
+
+        :param out_dir: Directory for png files.
+        :return: List of generated files, empty if matplotlib is not available.
+        """
+        try:
+            import matplotlib  # pylint: disable=import-outside-toplevel
+            matplotlib.use("Agg")
+            from matplotlib import pyplot  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            LOGGER.warning("matplotlib not available, skipping plots")
+            return []
+        os.makedirs(out_dir, exist_ok=True)
+        files = []
+        for node, node_data in self.data.groupby("node"):
+            fig, axes = pyplot.subplots(3, 1, sharex=True, figsize=(14, 10))
+            for family, group in node_data.groupby("family"):
+                label = family.split(":", 2)[1] + f" {group['pid'].iloc[-1]}"
+                axes[0].plot(group["ts"], group["rss"] / 2 ** 20, label=label)
+                axes[1].plot(group["ts"], group["cpu_pct"], label=label)
+                axes[2].plot(group["ts"], group["fds"], label=label)
+            for axis, title in zip(axes, ("RSS (MiB)", "CPU (%)", "FDs")):
+                axis.set_ylabel(title)
+                for _, start, end in self.phases:
+                    axis.axvspan(start, end, alpha=0.05)
+            axes[0].legend(fontsize="x-small", ncol=2)
+            axes[0].set_title(node)
+            fpath = os.path.join(out_dir, f"{node}_procpath.png")
+            fig.savefig(fpath)
+            pyplot.close(fig)
+            files.append(fpath)
+        return files
+
+    def verdict(self) -> dict:
+        """
+        Build JSON serialisable verdict.
+
+        :return: Dict with 'passed', 'leaks', 'restarts', 'trends' and 'phases'.
+        """
+        trends = self.segment_trends()
+        leaks = [trend for trend in trends if trend["leak"]]
+        return {"passed": not leaks, "leaks": leaks, "restarts": self.restarts(),
+                "trends": trends, "phases": self.phase_stats()}
+
+    def generate_report(self, out_dir: str) -> tuple:
+        """
+        Write verdict json and plots to out_dir.
+
+        :param out_dir: Report directory.
+        :return: (passed, verdict dict)
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        result = self.verdict()
+        result["plots"] = self.plot(out_dir)
+        with open(os.path.join(out_dir, "procpath_verdict.json"), "w",
+                  encoding="utf-8") as fptr:
+            json.dump(result, fptr, indent=2)
+        LOGGER.info("Procpath analysis: passed=%s leaks=%s restarts=%s", result["passed"],
+                    len(result["leaks"]), len(result["restarts"]))
+
+        return result["passed"], result
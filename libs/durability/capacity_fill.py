@@ -0,0 +1,226 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""
+Closed loop capacity fill engine.
+
+The engine writes user data in phases. Before every phase it reads the actual capacity,
+estimates the user bytes needed to reach the target fill percentage with the measured raw
+bytes consumed per user byte (parity, spare and metadata overhead) and writes a fraction of
+that gap. It stops when the used capacity is within the tolerance of the target, so it
+neither runs into ENOSPC nor stops well short. Written batches are kept in a manifest which
+the read, validate and delete phases reuse.
+"""
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FillManifest:
+    """Batches of written data, each entry usable as s3bench workload info."""
+
+    def __init__(self, path: str = None):
+        """
+        :param path: JSON file the manifest is saved to, loaded if it exists.
+        """
+        self.path = path
+        self.entries = []
+        self.phases = []
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fptr:
+                data = json.load(fptr)
+            self.entries, self.phases = data["entries"], data["phases"]
+
+    @property
+    def bytes_written(self) -> int:
+        """User bytes of all batches."""
+        return sum(each["obj_size"] * each["num_sample"] for each in self.entries)
+
+    def save(self) -> None:
+        """Persist manifest if it has a path."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fptr:
+            json.dump({"entries": self.entries, "phases": self.phases,
+                       "time": datetime.now().isoformat()}, fptr, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def add(self, entry: dict) -> None:
+        """Record a written batch."""
+        self.entries.append(entry)
+        self.save()
+
+    def remove(self, buckets: list) -> list:
+        """Drop batches of deleted buckets, returns the dropped entries."""
+        removed = [each for each in self.entries if each["bucket"] in buckets]
+        self.entries = [each for each in self.entries if each["bucket"] not in buckets]
+        self.save()
+        return removed
+
+
+class CapacityFillEngine:
+    """Converge the used capacity on a fill percentage with adaptive write phases."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, read_capacity, write_batch, obj_sizes: list, **kwargs):
+        """
+        :param read_capacity: Callable returning (total, available, used) capacity in bytes.
+        :param write_batch: Callable(bucket, obj_size, samples, obj_name_pref) writing samples
+            objects of obj_size bytes and returning (bool, workload info dict or error).
+        :param obj_sizes: Object sizes in bytes, every phase is spread over the sizes which fit.
+        :keyword amplification: Initial raw bytes used per user byte, e.g. sum(sns) / data.
+        :keyword tolerance: Accepted distance from the target in percent of total capacity.
+        :keyword max_phases: Upper bound of write phases.
+        :keyword first_step_fraction: Fraction of the gap written before any measurement.
+        :keyword step_fraction: Fraction of the gap written once overhead is measured.
+        :keyword settle_time: Seconds to wait for capacity stats after a phase.
+        :keyword settle_retries: Re-reads of capacity while it shows no change.
+        :keyword bucket_prefix: Prefix of generated bucket names.
+        :keyword bucket_list: Pre-created buckets to write to, one per object size, names are
+            generated if None.
+        :keyword manifest: FillManifest recording the batches.
+        """
+        self.read_capacity = read_capacity
+        self.write_batch = write_batch
+        self.obj_sizes = sorted(obj_sizes)
+        self.amplification = kwargs.get("amplification", 1.0)
+        self.tolerance = kwargs.get("tolerance", 1.0)
+        self.max_phases = kwargs.get("max_phases", 20)
+        self.first_step_fraction = kwargs.get("first_step_fraction", 0.5)
+        self.step_fraction = kwargs.get("step_fraction", 0.9)
+        self.settle_time = kwargs.get("settle_time", 30)
+        self.settle_retries = kwargs.get("settle_retries", 3)
+        self.bucket_prefix = kwargs.get("bucket_prefix", "fill")
+        self.bucket_list = kwargs.get("bucket_list")
+        self.bucket_iter = iter(self.bucket_list or [])
+        self.buckets = {}
+        self.manifest = kwargs.get("manifest") or FillManifest()
+        self.measured = False
+
+    def _settled_capacity(self, previous_used: int) -> tuple:
+        """Capacity after a phase, re-read while the stats do not reflect the writes."""
+        capacity = self.read_capacity()
+        for _ in range(self.settle_retries):
+            if capacity[2] != previous_used:
+                break
+            time.sleep(self.settle_time)
+            capacity = self.read_capacity()
+        return capacity
+
+    def plan_phase(self, total: int, used: int, target: float) -> list:
+        """
+        Batches of the next phase.
+
+        :param total: Total capacity in bytes.
+        :param used: Used capacity in bytes.
+        :param target: Target fill percentage.
+        :return: List of (obj_size, samples), empty if the gap is smaller than an object.
+        """
+        gap_user = (target * total / 100 - used) / self.amplification
+        fraction = self.step_fraction if self.measured else self.first_step_fraction
+        step = gap_user * fraction
+        sizes = [size for size in self.obj_sizes if size <= step / len(self.obj_sizes)] or \
+            [size for size in self.obj_sizes[:1] if size <= step]
+        if not sizes:
+            return []
+        return [(size, int(step / len(sizes) / size)) for size in sizes
+                if int(step / len(sizes) / size) > 0]
+
+    def _bucket(self, obj_size: int) -> str:
+        """
+        Bucket of an object size, all phases write to it with their own object prefix.
+
+        :return: Next pre-created bucket (None if all are used) or a new bucket name.
+        """
+        if obj_size not in self.buckets:
+            self.buckets[obj_size] = next(self.bucket_iter, None) if self.bucket_list else \
+                f"{self.bucket_prefix}-{obj_size}b-{int(time.time())}"
+        return self.buckets[obj_size]
+
+    def fill(self, target: float) -> tuple:
+        """
+        Write until the used capacity is within the tolerance of target percent.
+
+        :param target: Target fill percentage of total capacity.
+        :return: (bool, dict) with status (reached, already_full, overshoot, granularity,
+            max_phases or write_failed), used_percent, amplification, phases and entries
+            (manifest entries of this fill).
+        """
+        start = len(self.manifest.entries)
+        total, _, used = self.read_capacity()
+        result = {"target": target, "phases": [], "status": None}
+        phase = 0
+        while True:
+            used_per = used / total * 100
+            if used_per >= target - self.tolerance:
+                result["status"] = "already_full" if not phase else \
+                    "overshoot" if used_per > target + self.tolerance else "reached"
+                break
+            if phase >= self.max_phases:
+                result["status"] = "max_phases"
+                break
+            batches = self.plan_phase(total, used, target)
+            if not batches:
+                result["status"] = "granularity"
+                break
+            phase += 1
+            LOGGER.info("Fill phase %s: used %.2f%% target %s%%, writing %s", phase, used_per,
+                        target, batches)
+            written = 0
+            for obj_size, samples in batches:
+                bucket = self._bucket(obj_size)
+                resp = self.write_batch(bucket, obj_size, samples,
+                                        f"obj_{obj_size}_p{phase}") if bucket else \
+                    (False, "No pre-created bucket left to write to")
+                if not resp[0]:
+                    result.update(status="write_failed", error=resp[1])
+                    break
+                entry = dict(resp[1], phase=phase)
+                self.manifest.add(entry)
+                written += obj_size * samples
+            if result["status"] == "write_failed":
+                break
+            total, _, new_used = self._settled_capacity(used)
+            if new_used > used and written:
+                observed = (new_used - used) / written
+                self.amplification = observed if not self.measured else \
+                    (self.amplification + observed) / 2
+                self.measured = True
+            record = {"phase": phase, "written": written, "used_before": used,
+                      "used_after": new_used, "amplification": round(self.amplification, 4)}
+            LOGGER.info("Fill phase %s done: %s", phase, record)
+            result["phases"].append(record)
+            self.manifest.phases.append(record)
+            self.manifest.save()
+            used = new_used
+        result.update(used_percent=round(used / total * 100, 3),
+                      amplification=round(self.amplification, 4),
+                      entries=self.manifest.entries[start:])
+        if result["status"] == "overshoot":
+            LOGGER.error("Fill to %s%% overshot the tolerance of %s%%: used %s%% after %s "
+                         "phases, last phase %s", target, self.tolerance, result["used_percent"],
+                         len(result["phases"]), result["phases"][-1])
+        LOGGER.info("Fill to %s%% finished: %s at %s%% in %s phases", target, result["status"],
+                    result["used_percent"], len(result["phases"]))
+        return result["status"] in ("reached", "already_full", "granularity"), result
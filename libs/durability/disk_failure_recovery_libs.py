@@ -29,6 +29,8 @@ from commons import commands as common_cmd
 from commons import constants as common_const
 from commons.helpers.health_helper import Health
 from commons.helpers.pods_helper import LogicalNode
+from libs.durability.sns_progress import SnsProgressTracker
+from libs.durability.sns_progress import parse_sns_status
 from libs.ha.ha_common_libs_k8s import HAK8s
 
 LOGGER = logging.getLogger(__name__)
@@ -107,6 +109,47 @@ class DiskFailureRecoveryLib:
                                                   f" -- {cmd}", decode=True)
         return out
 
+    def get_sns_status(self, pod_obj: LogicalNode, operation: str, pod_name: str) -> dict:
+        """
+        This function will return the sns repair or rebalance status of all ioservices
+        :param pod_obj: Object for master nodes
+        :param operation: repair or rebalance
+        :param pod_name: name of the data pod to query
+        :rtype dict {fid: {"status": idle/started/paused/failed, "progress": int}}
+        """
+        func = self.sns_repair if operation == "repair" else self.sns_rebalance
+        return parse_sns_status(func(pod_obj, "status", pod_name))
+
+    def sns_progress_tracker(self, pod_obj: LogicalNode, health_obj: Health,
+                             operation: str = "repair", pod_list: list = None,
+                             **kwargs) -> SnsProgressTracker:
+        """
+        This function will return a tracker sampling sns repair or rebalance progress.
+        Every sample queries the data pods in turn and uses the first one answering, so
+        the tracker keeps working while a data pod is down.
+        :param pod_obj: Object for master nodes
+        :param health_obj: Health object for master nodes
+        :param operation: repair or rebalance
+        :param pod_list: data pods to query, all data pods if None
+        :param kwargs: SnsProgressTracker arguments (interval, window, stall_after)
+        :rtype SnsProgressTracker, call wait() after starting the operation
+        """
+        pod_list = pod_list or pod_obj.get_all_pods(pod_prefix=common_const.POD_NAME_PREFIX)
+
+        def collect():
+            error = None
+            for pod_name in pod_list:
+                try:
+                    processes = self.get_sns_status(pod_obj, operation, pod_name)
+                    bytecount = health_obj.hctl_status_json(pod_name=pod_name)["bytecount"]
+                    return {"processes": processes, "bytecount": bytecount, "pod": pod_name}
+                except (IOError, ValueError, KeyError) as err:
+                    LOGGER.debug("SNS %s status from %s failed: %s", operation, pod_name, err)
+                    error = err
+            raise IOError(f"No data pod returned {operation} status: {error}")
+
+        return SnsProgressTracker(collect, operation=operation, **kwargs)
+
     @staticmethod
     def retrieve_durability_values(master_obj: LogicalNode, ec_type: str) -> tuple:
         """
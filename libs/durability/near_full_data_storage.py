@@ -21,15 +21,20 @@ disk near full data storage utility methods
 """
 import copy
 import logging
+import os
 import random
 import time
 
 from commons.helpers.health_helper import Health
 from commons.helpers.pods_helper import LogicalNode
 from commons.constants import MB
+from commons.params import LATEST_LOG_FOLDER
+from commons.params import LOG_DIR_NAME
 from config import CMN_CFG
 from config import DURABILITY_CFG
 from config.s3 import S3_CFG
+from libs.durability.capacity_fill import CapacityFillEngine
+from libs.durability.capacity_fill import FillManifest
 from libs.durability.disk_failure_recovery_libs import DiskFailureRecoveryLib
 from scripts.s3_bench import s3bench
 
@@ -107,34 +112,14 @@ class NearFullStorage:
         for obj_size in workload:
             samples = int(each_workload_byte / obj_size)
             if samples > 0:
-                temp_client = client
-                if temp_client > samples:
-                    temp_client = samples
                 bucket_name = f'{bucket_prefix}-{obj_size}b-{int(time.time())}'
                 if bucket_list:
                     bucket_name = next(bucket_iter)
-                obj_name = f'obj_{obj_size}'
-                resp = s3bench.s3bench(s3userinfo['accesskey'],
-                                       s3userinfo['secretkey'],
-                                       bucket=bucket_name,
-                                       num_clients=temp_client,
-                                       num_sample=samples,
-                                       obj_name_pref=obj_name, obj_size=f"{obj_size}b",
-                                       skip_cleanup=True, duration=None,
-                                       log_file_prefix=f"write_workload_{obj_size}b",
-                                       end_point=S3_CFG["s3_url"],
-                                       validate_certs=S3_CFG["validate_certs"])
-                LOGGER.info("Workload: %s objects of %s with %s parallel clients ", samples,
-                            obj_size, temp_client)
-                LOGGER.info("Log Path %s", resp[1])
-                if s3bench.check_log_file_error(resp[1]):
-                    return False, f"S3bench workload for failed for {obj_size}." \
-                                  f" Please read log file {resp[1]}"
-                return_list.append(
-                    {'bucket': bucket_name, 'obj_name_pref': obj_name, 'num_clients': temp_client,
-                     'obj_size': obj_size, 'num_sample': samples})
-            else:
-                continue
+                resp = NearFullStorage.write_batch(s3userinfo, bucket_name, obj_size, samples,
+                                                   client)
+                if not resp[0]:
+                    return resp
+                return_list.append(resp[1])
         return True, return_list
 
     @staticmethod
@@ -173,22 +158,45 @@ class NearFullStorage:
         return True, "S3bench workload successful"
 
     @staticmethod
-    def delete_workload(workload_info_list: list, s3userinfo: dict, delete_percent: int):
+    def fill_manifest_path(name: str) -> str:
+        """
+        Fill manifest path of a test in the latest log folder, a stale manifest is removed.
+        :param name: Test or bucket prefix the manifest belongs to
+        :return : Manifest path to pass to perform_write_to_fill_system_percent/delete_workload
+        """
+        path = os.path.join(LOG_DIR_NAME, LATEST_LOG_FOLDER, f"fill_manifest_{name}.json")
+        if os.path.exists(path):
+            os.remove(path)
+        return path
+
+    @staticmethod
+    def manifest_workload(manifest_path: str) -> list:
+        """
+        Workload info of the data recorded in a fill manifest.
+        :param manifest_path: Fill manifest path
+        :return : Workload info list usable by perform_operations_on_pre_written_data
+        """
+        return FillManifest(manifest_path).entries
+
+    @staticmethod
+    def delete_workload(workload_info_list: list, s3userinfo: dict, delete_percent: int,
+                        manifest_path: str = None):
         """
         Delete specified percent of buckets(with written data) from workload info list.
+        All workload entries of a selected bucket are deleted, a fill writes one bucket per
+        object size over several phases.
         :param workload_info_list: Workload info list returned after write operation
         :param s3userinfo: User info for IAM user
         :param delete_percent: Percentage for deletion
+        :param manifest_path: Fill manifest the deleted buckets are removed from
         :return : Tuple(boolean,str)
         """
-        num_buckets_delete = int(delete_percent * len(workload_info_list) / 100)
-        delete_list = []
+        buckets = list(dict.fromkeys(each['bucket'] for each in workload_info_list))
+        num_buckets_delete = int(delete_percent * len(buckets) / 100)
         LOGGER.info("Delete %s random buckets.", num_buckets_delete)
-
-        for _ in range(num_buckets_delete):
-            bucket_info = workload_info_list[
-                random.SystemRandom().randint(1, len(workload_info_list) - 1)]
-            delete_list.append(bucket_info)
+        delete_buckets = random.SystemRandom().sample(buckets, num_buckets_delete)
+        delete_list = [each for each in workload_info_list if each['bucket'] in delete_buckets]
+        for bucket_info in delete_list:
             workload_info_list.remove(bucket_info)
         LOGGER.info("Deleting buckets : %s", delete_list)
         resp = NearFullStorage.perform_operations_on_pre_written_data(
@@ -199,43 +207,109 @@ class NearFullStorage:
             skipcleanup=False)
 
         if resp[0]:
-            deleted_buckets = [each['bucket'] for each in delete_list]
-            LOGGER.info("Buckets deleted : %s", deleted_buckets)
-            return True, deleted_buckets
+            LOGGER.info("Buckets deleted : %s", delete_buckets)
+            if manifest_path:
+                FillManifest(manifest_path).remove(delete_buckets)
+            return True, delete_buckets
         return resp
 
+    @staticmethod
+    def write_batch(s3userinfo: dict, bucket: str, obj_size: int, samples: int,
+                    client: int = 10, obj_name: str = None) -> tuple:
+        """
+        Write samples objects of obj_size bytes to bucket with s3bench.
+        :param s3userinfo: S3user dictionary with access/secret key
+        :param bucket: Bucket name
+        :param obj_size: Object size in bytes
+        :param samples: Number of objects
+        :param client: Maximum number of client sessions
+        :param obj_name: Object name prefix, obj_<obj_size> if None
+        :return : (boolean, workload info dict or error)
+        """
+        num_clients = min(client, samples)
+        obj_name = obj_name or f'obj_{obj_size}'
+        resp = s3bench.s3bench(s3userinfo['accesskey'], s3userinfo['secretkey'], bucket=bucket,
+                               num_clients=num_clients, num_sample=samples,
+                               obj_name_pref=obj_name, obj_size=f"{obj_size}b",
+                               skip_cleanup=True, duration=None,
+                               log_file_prefix=f"write_workload_{obj_size}b",
+                               end_point=S3_CFG["s3_url"],
+                               validate_certs=S3_CFG["validate_certs"])
+        LOGGER.info("Workload: %s objects of %s with %s parallel clients ", samples, obj_size,
+                    num_clients)
+        LOGGER.info("Log Path %s", resp[1])
+        if s3bench.check_log_file_error(resp[1]):
+            return False, f"S3bench workload for failed for {obj_size}." \
+                          f" Please read log file {resp[1]}"
+        return True, {'bucket': bucket, 'obj_name_pref': obj_name, 'num_clients': num_clients,
+                      'obj_size': obj_size, 'num_sample': samples}
+
+    # pylint: disable=too-many-arguments
+    @staticmethod
+    def fill_to_percent(master_node: LogicalNode, fill_percent: int, s3userinfo: dict,
+                        bucket_prefix: str, clients: int = 10, **kwargs) -> tuple:
+        """
+        Fill the cluster to fill_percent of total capacity with the closed loop fill engine.
+        Capacity is re-read after every write phase, so parity and metadata overhead is
+        measured instead of derived and the fill converges within the configured tolerance.
+        :param master_node: Master node object
+        :param fill_percent: Percentage of total capacity to be used after the fill.
+        :param s3userinfo: User info for IAM user
+        :param bucket_prefix: Bucket prefix to be used for IO operations
+        :param clients: No of clients to be used for IO operations.
+        :keyword bucket_list: List of created buckets.(Used for degraded path)
+        :keyword manifest_path: JSON file recording written data, extended if it exists.
+        :return : Tuple(boolean, dict) with status, used_percent, phases and entries
+                (workload info of the written data)
+        """
+        health_obj = Health(master_node.hostname, master_node.username, master_node.password)
+        durability_values = DiskFailureRecoveryLib.retrieve_durability_values(master_node, 'sns')
+        if not durability_values[0]:
+            LOGGER.error("Error in retrieving SNS values")
+            return durability_values
+        sns_values = {key: int(value) for key, value in durability_values[1].items()}
+        workload = copy.deepcopy(DURABILITY_CFG['full_sys_writes']['vm_workload'])
+        if CMN_CFG["setup_type"] == "HW":
+            workload.extend(DURABILITY_CFG['full_sys_writes']['extended_hw_workload'])
+        engine = CapacityFillEngine(
+            read_capacity=health_obj.get_sys_capacity,
+            write_batch=lambda bucket, obj_size, samples, obj_name: NearFullStorage.write_batch(
+                s3userinfo, bucket, obj_size, samples, clients, obj_name),
+            obj_sizes=[each * MB for each in workload],
+            amplification=sum(sns_values.values()) / sns_values['data'],
+            bucket_prefix=bucket_prefix, bucket_list=kwargs.get('bucket_list'),
+            manifest=FillManifest(kwargs.get('manifest_path')),
+            **DURABILITY_CFG['full_sys_writes']['fill_engine'])
+        return engine.fill(fill_percent)
+
     # pylint: disable=too-many-arguments
     @staticmethod
     def perform_write_to_fill_system_percent(master_node: LogicalNode, write_per: int, s3userinfo,
-                                             bucket_prefix, clients, bucket_list=None):
+                                             bucket_prefix, clients, bucket_list=None,
+                                             manifest_path: str = None):
         """
-        Retrieve user data space to attain specific percent of near full storage.
+        Write data till the cluster attains specific percent of near full storage.
         :param master_node: Master node object
         :param write_per: Percentage of near full storage to be attained.
         :param s3userinfo: User info for IAM user
         :param bucket_prefix: Bucket prefix to be used for IO operations
         :param clients: No of clients to be used for IO operations.
         :param bucket_list: List of created buckets.(Used for degraded path)
-        :return Tuple(boolean,Union(str,dict))
+        :param manifest_path: JSON file recording all written data for later phases.
+        :return Tuple(boolean,Union(str,list))
         """
         LOGGER.info("Perform Write operation to fill %s percent disk capacity", write_per)
-        resp = NearFullStorage.get_user_data_space_in_bytes(master_obj=master_node,
-                                                            memory_percent=write_per)
+        resp = NearFullStorage.fill_to_percent(master_node, write_per, s3userinfo,
+                                               bucket_prefix, clients, bucket_list=bucket_list,
+                                               manifest_path=manifest_path)
         if not resp[0]:
+            if isinstance(resp[1], dict):
+                return False, f"Fill to {write_per} percent failed: {resp[1]['status']} " \
+                              f"{resp[1].get('error', '')} at {resp[1]['used_percent']} percent"
             return resp
-
-        if resp[1] == 0:
+        if not resp[1]["entries"]:
             LOGGER.warning("No bytes to be written to fill %s capacity", write_per)
             return True, None
-
-        resp = NearFullStorage.perform_near_full_sys_writes(
-            s3userinfo=s3userinfo,
-            user_data_writes=resp[1],
-            bucket_prefix=bucket_prefix,
-            clients=clients,
-            bucket_list=bucket_list)
-        if not resp[0]:
-            return resp
         LOGGER.info("Writes Completed.!!")
-        LOGGER.info("Written buckets : %s", resp[1])
-        return True, resp[1]
+        LOGGER.info("Written buckets : %s", resp[1]["entries"])
+        return True, resp[1]["entries"]
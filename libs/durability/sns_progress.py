@@ -0,0 +1,244 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+SNS repair and rebalance progress tracker.
+
+Every sample holds the repair or rebalance status of all ioservices (hctl repair/rebalance
+status) and the hctl byte counters. Bytes still to heal are the sum of the critical,
+damaged and degraded counters. The tracker computes throughput over a sliding window,
+predicts completion, flags stalls and keeps a timeline durability tests can assert on.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+LOGGER = logging.getLogger(__name__)
+
+UNHEALTHY = ("critical", "damaged", "degraded")
+STATUS_RE = re.compile(r"(0x[0-9a-f]+:0x[0-9a-f]+)\s+(?:\w*STATUS_)?(\w+)\s+(\d+)", re.I)
+
+
+def parse_sns_status(output) -> dict:
+    """
+    Parse hctl repair/rebalance status output.
+
+    :param output: JSON list of {"fid", "status", "progress"} or text lines
+        '<fid> <status> <progress>'.
+    :return: {fid: {"status": idle|started|paused|failed, "progress": int}}
+    """
+    if isinstance(output, bytes):
+        output = output.decode(errors="replace")
+    try:
+        entries = json.loads(output) if isinstance(output, str) else output
+        entries = [(each["fid"], each["status"], each.get("progress", 0)) for each in entries]
+    except (ValueError, TypeError, KeyError):
+        entries = STATUS_RE.findall(output or "")
+    return {fid: {"status": str(status).rsplit("_", 1)[-1].lower(), "progress": int(progress)}
+            for fid, status, progress in entries}
+
+
+class SnsProgressTracker:
+    """Sample repair or rebalance state, throughput, ETA and stalls over time."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, collect, operation: str = "repair", interval: float = 30,
+                 window: int = 5, stall_after: float = 600, clock=time.time,
+                 sleep=time.sleep):
+        """
+        :param collect: Callable returning {"bytecount": hctl bytecount dict,
+            "processes": parse_sns_status output}.
+        :param operation: repair or rebalance.
+        :param interval: Seconds between samples in wait().
+        :param window: Samples used for the current throughput.
+        :param stall_after: Seconds without progress while started which count as a stall.
+        :param clock: Time source, epoch seconds.
+        :param sleep: Sleep function.
+        """
+        self.collect = collect
+        self.operation = operation
+        self.interval = interval
+        self.window = window
+        self.stall_after = stall_after
+        self.clock = clock
+        self.sleep = sleep
+        self.timeline = []
+        self.stalls = []
+        self.errors = 0
+        self._last_progress = None
+        self._known_progress = None
+
+    @staticmethod
+    def state(processes: dict) -> str:
+        """Overall state: failed if any failed, started or paused if any is, else idle."""
+        statuses = {each["status"] for each in processes.values()}
+        for state in ("failed", "started", "paused"):
+            if state in statuses:
+                return state
+        return "idle"
+
+    def throughput(self, points: int = None) -> float:
+        """Healed bytes per second over the last points samples (least squares)."""
+        samples = self.timeline[-(points or self.window):]
+        if len(samples) < 2:
+            return 0.0
+        mean_t = sum(each["t"] for each in samples) / len(samples)
+        mean_r = sum(each["remaining"] for each in samples) / len(samples)
+        var = sum((each["t"] - mean_t) ** 2 for each in samples)
+        if not var:
+            return 0.0
+        slope = sum((each["t"] - mean_t) * (each["remaining"] - mean_r)
+                    for each in samples) / var
+        return max(0.0, -slope)
+
+    def sample(self) -> Optional[dict]:
+        """
+        Take one sample.
+
+        Progress counts as moved when bytes left drop or the mean progress grows past the last
+        known one. A sample without any process reported keeps the previous state and is not a
+        move, so a gap in the status output neither resets nor hides a stall.
+
+        :return: Timeline point {t, state, remaining, healthy, progress, bps, eta, stalled},
+            None if collection failed.
+        """
+        now = self.clock()
+        try:
+            data = self.collect()
+        except Exception as error:  # pylint: disable=broad-except
+            self.errors += 1
+            LOGGER.warning("SNS %s status collection failed: %s", self.operation, error)
+            return None
+        processes = data.get("processes", {})
+        bytecount = data.get("bytecount", {})
+        progress = [each["progress"] for each in processes.values()]
+        if processes or not self.timeline:
+            state = self.state(processes)
+        else:
+            state = self.timeline[-1]["state"]
+        point = {"t": now, "state": state,
+                 "remaining": sum(int(bytecount.get(key, 0)) for key in UNHEALTHY),
+                 "healthy": int(bytecount.get("healthy", 0)),
+                 "progress": sum(progress) / len(progress) if progress else None,
+                 "processes": len(processes), "stalled": False}
+        moved = not self.timeline or point["remaining"] < self.timeline[-1]["remaining"] or (
+            None not in (point["progress"], self._known_progress) and
+            point["progress"] > self._known_progress)
+        if point["progress"] is not None:
+            self._known_progress = point["progress"]
+        if moved or point["state"] != "started":
+            self._last_progress = now
+        elif now - self._last_progress >= self.stall_after:
+            point["stalled"] = True
+            if not self.stalls or self.stalls[-1]["end"] is not None:
+                self.stalls.append({"start": self._last_progress, "end": None})
+                LOGGER.warning("SNS %s stalled for %.0fs with %s bytes left", self.operation,
+                               now - self._last_progress, point["remaining"])
+        if not point["stalled"] and self.stalls and self.stalls[-1]["end"] is None:
+            self.stalls[-1]["end"] = now
+        self.timeline.append(point)
+        point["bps"] = self.throughput()
+        point["eta"] = now + point["remaining"] / point["bps"] if point["bps"] else None
+        LOGGER.info("SNS %s %s: %s bytes left, %.0f B/s, eta %s", self.operation,
+                    point["state"], point["remaining"], point["bps"], point["eta"])
+        return point
+
+    def done(self) -> bool:
+        """Finished once started earlier (or nothing to heal) and all are idle again."""
+        if not self.timeline or self.timeline[-1]["state"] != "idle":
+            return False
+        started = any(each["state"] in ("started", "paused") for each in self.timeline)
+        return started or self.timeline[-1]["remaining"] == 0
+
+    def wait(self, timeout: float = 7200) -> tuple:
+        """
+        Sample until the operation finishes, fails or timeout elapses.
+
+        :return: (bool, summary)
+        """
+        deadline = self.clock() + timeout
+        while True:
+            point = self.sample()
+            if point and (point["state"] == "failed" or self.done()):
+                break
+            if self.clock() >= deadline:
+                break
+            self.sleep(self.interval)
+        summary = self.summary()
+        return summary["status"] == "completed", summary
+
+    def summary(self) -> dict:
+        """
+        Summary of the run.
+
+        :return: {operation, status (completed, failed, running), start, end, duration,
+            healed_bytes, mean_bps, min_bps (lowest windowed throughput while started),
+            stalls, samples, errors}
+        """
+        timeline = self.timeline
+        if not timeline:
+            return {"operation": self.operation, "status": "running", "samples": 0,
+                    "errors": self.errors, "stalls": []}
+        active = [each for each in timeline if each["state"] in ("started", "paused")]
+        start = active[0]["t"] if active else timeline[0]["t"]
+        end = timeline[-1]["t"]
+        status = "failed" if timeline[-1]["state"] == "failed" else \
+            "completed" if self.done() else "running"
+        healed = max(0, max(each["remaining"] for each in timeline) - timeline[-1]["remaining"])
+        windowed = [each["bps"] for each in active[self.window - 1:]]
+        return {"operation": self.operation, "status": status, "start": start, "end": end,
+                "duration": end - start, "healed_bytes": healed,
+                "mean_bps": healed / (end - start) if end > start else 0.0,
+                "min_bps": min(windowed) if windowed else None,
+                "remaining": timeline[-1]["remaining"], "stalls": self.stalls,
+                "samples": len(timeline), "errors": self.errors}
+
+    def check(self, min_bps: float = None, max_duration: float = None,
+              allow_stalls: bool = False) -> tuple:
+        """
+        Check the run against limits.
+
+        :param min_bps: Minimum mean healing throughput in bytes per second.
+        :param max_duration: Maximum seconds to heal.
+        :param allow_stalls: Do not fail on detected stalls.
+        :return: (bool, list of violations)
+        """
+        summary = self.summary()
+        violations = []
+        if summary["status"] != "completed":
+            violations.append(f"{self.operation} {summary['status']}")
+        if min_bps is not None and summary.get("mean_bps", 0) < min_bps:
+            violations.append(f"mean throughput {summary.get('mean_bps', 0):.0f} B/s "
+                              f"below {min_bps} B/s")
+        if max_duration is not None and summary.get("duration", 0) > max_duration:
+            violations.append(f"took {summary['duration']:.0f}s, limit {max_duration}s")
+        if summary["stalls"] and not allow_stalls:
+            violations.append(f"{len(summary['stalls'])} stall(s)")
+        return not violations, violations
+
+    def save(self, path: str) -> str:
+        """Write summary and timeline as JSON."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fptr:
+            json.dump({"summary": self.summary(), "timeline": self.timeline}, fptr, indent=1)
+        return path
@@ -0,0 +1,401 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Chaos scheduler applying a timeline of faults while background IO runs.
+
+A timeline is a list of events {"at": offset seconds, "fault": name, "duration": seconds,
+"params": {}, "seed": int}, written by hand or generated from a seed by random_timeline.
+Registered faults wrap the existing injection helpers (HA pod delete and restore, disk
+failure through hctl, S3 and motr data corruption). While the timeline runs, invariants
+are checked periodically, recovering the last active fault is followed by a recovery check
+bounded by an SLA and the whole run is journaled with its seed and timeline so it can be replayed.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+from commons import constants as common_const
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Fault:
+    """Named fault with inject and recover callables."""
+
+    def __init__(self, name: str, inject, recover=None, max_active: int = 1,
+                 params: dict = None, duration: tuple = (30, 120), weight: float = 1):
+        """
+        :param name: Fault name used in timelines.
+        :param inject: Callable (params, rng) returning (bool, state).
+        :param recover: Callable (state, params) returning (bool, resp), None if the fault
+            heals by itself.
+        :param max_active: Maximum overlapping injections of this fault.
+        :param params: Parameter choices for random timelines {name: value or [values]}.
+        :param duration: (min, max) seconds for random timelines.
+        :param weight: Relative probability in random timelines.
+        """
+        self.name = name
+        self.inject = inject
+        self.recover = recover
+        self.max_active = max_active
+        self.params = params or {}
+        self.duration = duration
+        self.weight = weight
+
+
+def random_timeline(faults: list, length: float, seed: int, mean_gap: float = 60,
+                    max_active: int = 1) -> list:
+    """
+    Generate a reproducible timeline, same arguments give the same timeline.
+
+    :param faults: Fault objects to choose from, by weight.
+    :param length: Seconds within which faults are injected.
+    :param seed: Random seed.
+    :param mean_gap: Mean seconds between injections (exponential gaps).
+    :param max_active: Maximum overlapping faults of any kind, e.g. K of the EC config.
+    :return: Sorted list of events.
+    """
+    rng = random.Random(seed)
+    timeline = []
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(1 / mean_gap)
+        if offset >= length:
+            break
+        fault = rng.choices(faults, weights=[each.weight for each in faults])[0]
+        duration = round(rng.uniform(*fault.duration), 1)
+        params = {key: rng.choice(value) if isinstance(value, list) else value
+                  for key, value in sorted(fault.params.items())}
+        event_seed = rng.getrandbits(32)
+        active = [each for each in timeline
+                  if each["at"] <= offset < each["at"] + each["duration"]]
+        if len(active) >= max_active or len(
+                [each for each in active if each["fault"] == fault.name]) >= fault.max_active:
+            continue
+        timeline.append({"at": round(offset, 1), "fault": fault.name, "duration": duration,
+                         "params": params, "seed": event_seed})
+    return timeline
+
+
+def load_run(path: str) -> dict:
+    """
+    Load a saved run to replay it with ChaosScheduler(seed=run["seed"]).run(run["timeline"]).
+
+    :param path: JSON file written by ChaosScheduler.save.
+    :return: Run record.
+    """
+    with open(path, encoding="utf-8") as fptr:
+        return json.load(fptr)
+
+
+class ChaosScheduler:
+    """Apply a fault timeline while background IO runs and invariants are checked."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, faults: list, invariants: dict = None, recovery_check=None,
+                 recovery_sla: float = 600, check_interval: float = 30, seed: int = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        :param faults: Fault objects.
+        :param invariants: {name: callable returning (bool, resp)} checked every
+            check_interval and at the end, e.g. data readable or checksums match.
+        :param recovery_check: Callable returning (bool, resp), polled after each recovery
+            until True, e.g. cluster online.
+        :param recovery_sla: Seconds allowed for recovery_check to pass.
+        :param check_interval: Seconds between invariant checks.
+        :param seed: Seed of the run, random if None.
+        :param clock: Monotonic time source.
+        :param sleep: Sleep function.
+        """
+        self.faults = {fault.name: fault for fault in faults}
+        self.invariants = invariants or {}
+        self.recovery_check = recovery_check
+        self.recovery_sla = recovery_sla
+        self.check_interval = check_interval
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.clock = clock
+        self.sleep = sleep
+        self.timeline = []
+        self.journal = []
+        self.violations = []
+        self._start = 0.0
+
+    def random_timeline(self, length: float, mean_gap: float = 60, max_active: int = 1):
+        """Random timeline of the registered faults from the scheduler seed."""
+        return random_timeline(list(self.faults.values()), length, self.seed, mean_gap,
+                               max_active)
+
+    def _elapsed(self) -> float:
+        return self.clock() - self._start
+
+    def _record(self, kind: str, name: str, result: bool, detail=None, event: int = None):
+        """Add a journal entry, failed ones are violations."""
+        entry = {"t": round(self._elapsed(), 3), "kind": kind, "name": name,
+                 "result": result, "event": event, "detail": str(detail)[:500]}
+        self.journal.append(entry)
+        if not result:
+            self.violations.append(entry)
+            LOGGER.error("Chaos %s %s failed at %.1fs: %s", kind, name, entry["t"], detail)
+        else:
+            LOGGER.info("Chaos %s %s at %.1fs", kind, name, entry["t"])
+        return result
+
+    @staticmethod
+    def _call(func, *args) -> tuple:
+        """Call a fault or check, exceptions become failures."""
+        try:
+            resp = func(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.exception("Chaos step raised")
+            return False, error
+        return resp if isinstance(resp, tuple) else (bool(resp), resp)
+
+    def check_invariants(self) -> bool:
+        """Check all invariants once."""
+        results = [self._record("invariant", name, *self._call(check))
+                   for name, check in self.invariants.items()]
+        return all(results)
+
+    def wait_recovery(self, event: int = None) -> bool:
+        """Poll recovery_check until it passes or the SLA elapses."""
+        if not self.recovery_check:
+            return True
+        deadline = self.clock() + self.recovery_sla
+        while True:
+            result, resp = self._call(self.recovery_check)
+            if result or self.clock() >= deadline:
+                break
+            self.sleep(min(self.check_interval, max(0.0, deadline - self.clock())))
+        return self._record("recovery", f"within {self.recovery_sla}s", result, resp, event)
+
+    def _actions(self, timeline: list) -> list:
+        """Inject and recover actions of a timeline sorted by time."""
+        actions = []
+        for index, event in enumerate(timeline):
+            if event["fault"] not in self.faults:
+                raise ValueError(f"Unknown fault {event['fault']} in event {index}")
+            event.setdefault("params", {})
+            event.setdefault("seed", random.Random(f"{self.seed}-{index}").getrandbits(32))
+            actions.append((event["at"], 1, "inject", index))
+            if event.get("duration") is not None:
+                actions.append((event["at"] + event["duration"], 0, "recover", index))
+        return sorted(actions)
+
+    def _apply(self, kind: str, index: int, states: dict, stop_on_violation: bool) -> bool:
+        """Inject or recover one event, returns False to stop the run."""
+        event = self.timeline[index]
+        fault = self.faults[event["fault"]]
+        if kind == "inject":
+            result, state = self._call(fault.inject, event["params"],
+                                       random.Random(event["seed"]))
+            if result:
+                states[index] = state
+            self._record("inject", fault.name, result, state, index)
+            return result or not stop_on_violation
+        if index not in states:
+            return True
+        state = states.pop(index)
+        if fault.recover:
+            result, resp = self._call(fault.recover, state, event["params"])
+            self._record("recover", fault.name, result, resp, index)
+            if not result and stop_on_violation:
+                return False
+        # Cluster cannot be healthy while an overlapping fault is still active
+        if any(self.timeline[other].get("duration") is not None for other in states):
+            LOGGER.info("Recovery check of event %s deferred, faults %s active", index,
+                        sorted(states))
+            return True
+        return self.wait_recovery(index) or not stop_on_violation
+
+    def run(self, timeline: list, workload=None, stop_on_violation: bool = False) -> dict:
+        """
+        Run a timeline.
+
+        :param timeline: Events, see module doc.
+        :param workload: Callable (stop_event) run in a background thread during the
+            timeline, e.g. put/get/delete loops or s3bench; an exception is a violation
+            recorded when it is noticed.
+        :param stop_on_violation: Stop at the first failure, active faults are still
+            recovered.
+        :return: {seed, timeline, journal, violations, passed, workload}
+        """
+        self.timeline = timeline
+        self.journal, self.violations = [], []
+        actions = self._actions(timeline)
+        stop, states, outcome = threading.Event(), {}, {}
+
+        def _workload():
+            try:
+                outcome["result"] = workload(stop)
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.exception("Chaos workload failed")
+                outcome["error"] = error
+
+        def _workload_failed():
+            if "error" not in outcome or "recorded" in outcome:
+                return False
+            outcome["recorded"] = True
+            return not self._record("workload", "background io", False, outcome["error"])
+
+        thread = None
+        if workload:
+            thread = threading.Thread(target=_workload, name="chaos-io", daemon=True)
+            thread.start()
+        self._start = self.clock()
+        LOGGER.info("Chaos run seed %s with %s events", self.seed, len(timeline))
+        next_check = self.check_interval
+        running = True
+        while actions and running:
+            now = self._elapsed()
+            if _workload_failed():
+                running = not stop_on_violation
+            elif actions[0][0] <= now:
+                _, _, kind, index = actions.pop(0)
+                running = self._apply(kind, index, states, stop_on_violation)
+            elif self.invariants and now >= next_check:
+                running = self.check_invariants() or not stop_on_violation
+                next_check = now + self.check_interval
+            else:
+                wake = min(actions[0][0], next_check if self.invariants else actions[0][0])
+                self.sleep(max(0.0, wake - now))
+        for _, _, kind, index in actions:
+            if kind == "recover":
+                self._apply(kind, index, states, False)
+        self.check_invariants()
+        stop.set()
+        if thread:
+            thread.join()
+            _workload_failed()
+        return {"seed": self.seed, "timeline": timeline, "journal": self.journal,
+                "violations": self.violations, "passed": not self.violations,
+                "workload": outcome.get("result")}
+
+    def save(self, result: dict, path: str) -> str:
+        """
+        Save a run for replay.
+
+        :param result: Output of run().
+        :param path: JSON file.
+        :return: path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fptr:
+            json.dump(dict(result, time=datetime.now().isoformat(), workload=str(
+                result.get("workload"))), fptr, indent=1, default=str)
+        LOGGER.info("Chaos run saved to %s, replay with seed %s", path, result["seed"])
+        return path
+
+
+def checksum_invariant(read_md5, expected: dict, sample: int = 5, seed: int = 0):
+    """
+    Invariant reading a sample of objects written before the run and comparing checksums.
+
+    :param read_md5: Callable (key) returning md5 of the object read back, raising or
+        returning None if unreadable.
+    :param expected: {key: md5} of written objects.
+    :param sample: Objects checked per call.
+    :param seed: Seed of the sample choice.
+    :return: Callable returning (bool, mismatches).
+    """
+    rng = random.Random(seed)
+    keys = sorted(expected)
+
+    def check():
+        mismatches = {}
+        for key in rng.sample(keys, min(sample, len(keys))):
+            try:
+                actual = read_md5(key)
+            except Exception as error:  # pylint: disable=broad-except
+                actual = f"unreadable: {error}"
+            if actual != expected[key]:
+                mismatches[key] = actual
+        return not mismatches, mismatches
+    return check
+
+
+def pod_delete_fault(ha_obj, master_node, health_obj, **kwargs) -> Fault:
+    """
+    Fault deleting pods with HAK8s.delete_kpod_with_shutdown_methods, recovered with
+    HAK8s.restore_pod. Params: pod_prefix (list), kvalue, down_method.
+    """
+    def inject(params, _rng):
+        return ha_obj.delete_kpod_with_shutdown_methods(
+            master_node_obj=master_node, health_obj=health_obj, **params)
+
+    def recover(pod_info, _params):
+        resp = [ha_obj.restore_pod(master_node, info["method"], info)
+                for info in pod_info.values()]
+        return all(each[0] if isinstance(each, tuple) else each for each in resp), resp
+    return Fault("pod_delete", inject, recover, **kwargs)
+
+
+def disk_fail_fault(disk_lib, master_node, worker_nodes: list, pod_name: str,
+                    **kwargs) -> Fault:
+    """
+    Fault failing disks through hctl with DiskFailureRecoveryLib.fail_disk, recovered by
+    marking them online on their data pod. Params: disk_fail_cnt, on_diff_cvg, on_same_cvg.
+    """
+    def inject(params, _rng):
+        return disk_lib.fail_disk(params.get("disk_fail_cnt", 1), master_node, worker_nodes,
+                                  pod_name, on_diff_cvg=params.get("on_diff_cvg", False),
+                                  on_same_cvg=params.get("on_same_cvg", False))
+
+    def recover(disks, _params):
+        result, resp = True, {}
+        for name, (host, _, device) in disks.items():
+            try:
+                resp[name] = disk_lib.change_disk_status_hctl(
+                    master_node, pod_name, common_const.CORTX_DATA_NODE_PREFIX + host, device,
+                    "online")
+            except (ValueError, IOError, RuntimeError) as error:
+                resp[name] = f"{error}"
+                result = False
+                continue
+            # drive-state --json reports a failed change in its error field
+            if resp[name] is None or isinstance(resp[name], dict) and resp[name].get("error"):
+                result = False
+        return result, resp
+    return Fault("disk_fail", inject, recover, **kwargs)
+
+
+def s3_corruption_fault(s3_fi, **kwargs) -> Fault:
+    """Fault enabling S3FailureInjection data block corruption on write for its duration."""
+    def inject(_params, _rng):
+        return bool(s3_fi.enable_data_block_corruption()), None
+
+    def recover(_state, _params):
+        return bool(s3_fi.disable_data_block_corruption()), None
+    return Fault("s3_corruption", inject, recover, **kwargs)
+
+
+def motr_corruption_fault(motr_adapter, **kwargs) -> Fault:
+    """
+    Fault injecting checksum (1) or parity (2) corruption with
+    MotrCorruptionAdapter.inject_fault_k8s. Params: fault_type. Corruption is not undone,
+    the recovery check and invariants verify it is detected or repaired.
+    """
+    def inject(params, _rng):
+        return bool(motr_adapter.inject_fault_k8s(params.get("fault_type", 2))), None
+    return Fault("motr_corruption", inject, None, **kwargs)
@@ -22,26 +22,40 @@ Utility Method for IO stability testing
 """
 import json
 import logging
+import os
 import threading
 import time
 from datetime import datetime, timedelta
 
+from commons import configmanager
 from commons.mail_script_utils import Mail
+from commons.params import LATEST_LOG_FOLDER
+from commons.params import LOG_DIR
 from commons.utils import system_utils
 from config.s3 import S3_CFG
+from libs.iostability.iostability_metrics import IOStabilityMonitor
 from libs.s3 import ACCESS_KEY, SECRET_KEY
 from libs.s3.s3_test_lib import S3TestLib
 from scripts.s3_bench import s3bench
 
+IOSTABILITY_CFG = configmanager.get_config_wrapper(fpath="config/iostability_test.yaml")
+
 
 class IOStabilityLib:
     """
     This class contains common utility methods for IO stability.
     """
 
-    def __init__(cls, access_key=ACCESS_KEY, secret_key=SECRET_KEY):
+    def __init__(cls, access_key=ACCESS_KEY, secret_key=SECRET_KEY, monitor=None):
+        """
+        :param access_key: S3 access key.
+        :param secret_key: S3 secret key.
+        :param monitor: IOStabilityMonitor recording iteration metrics, created from the
+            'metrics' section of iostability_test.yaml if None.
+        """
         cls.log = logging.getLogger(__name__)
         cls.s3t_obj = S3TestLib(access_key=access_key, secret_key=secret_key)
+        cls.monitor = monitor or create_monitor()
 
     def execute_workload_distribution(self, distribution, clients, total_obj,
                                       duration_in_days, log_file_prefix, buckets_created=None):
@@ -79,6 +93,10 @@ class IOStabilityLib:
                 self.log.info("Loop: %s Workload: %s objects of %s with %s parallel clients.",
                               loop, samples, size, clients)
                 self.log.info("Log Path %s", resp[1])
+                if os.path.exists(resp[1]):
+                    results, _ = self.monitor.record_iteration(loop, size, cur_clients,
+                                                               samples, resp[1])
+                    self.log.info("Loop: %s Workload: %s metrics %s", loop, size, results)
                 assert not s3bench.check_log_file_error(resp[1]), \
                     f"S3bench workload failed in loop {loop}. Please read log file {resp[1]}"
                 # delete file if operation successful.
@@ -101,19 +119,41 @@ class IOStabilityLib:
             loop += 1
 
 
+def create_monitor(**kwargs) -> IOStabilityMonitor:
+    """
+    Create IO stability monitor from the 'metrics' section of iostability_test.yaml.
+
+    :keyword db_path: Time-series store, defaults to a store per run in the latest log folder.
+    Other keywords override the config values.
+    :return: IOStabilityMonitor object, close it when the test completes.
+    """
+    params = dict(IOSTABILITY_CFG.get("metrics", {}))
+    params.update(kwargs)
+    db_path = params.pop("db_path", None) or os.path.join(
+        LOG_DIR, LATEST_LOG_FOLDER,
+        f"iostability_metrics_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.db")
+    params.pop("health_interval", None)
+    return IOStabilityMonitor(db_path, **params)
+
+
 class MailNotification(threading.Thread):
     """
     This class contains common utility methods for Mail Notification.
+
+    Cluster health is sampled into the monitor store and mails are sent only when a health,
+    error or degradation threshold is crossed, plus a final mail with the test result.
     """
 
-    # pylint: disable=too-few-public-methods
-    def __init__(self, sender, receiver, test_id, health_obj):
+    # pylint: disable=too-few-public-methods,too-many-arguments
+    def __init__(self, sender, receiver, test_id, health_obj, monitor=None):
         """
         Init method:
         :param sender: sender of mail
         :param receiver: receiver of mail
         :param test_id : Test ID to be sent in subject.
         :param health_obj: Health object to monitor health.
+        :param monitor: IOStabilityMonitor shared with IOStabilityLib, alerts of its iterations
+            are mailed as well.
         """
         threading.Thread.__init__(self)
         self.event_pass = threading.Event()
@@ -121,43 +161,61 @@ class MailNotification(threading.Thread):
         self.mail_obj = Mail(sender=sender, receiver=receiver)
         self.test_id = test_id
         self.health_obj = health_obj
-        self.interval = 4  # Mail to be sent periodically after 4 hours.
+        self.monitor = monitor or create_monitor(dashboard_port=None)
+        self.monitor.alerts.notify = self.send_alert
+        # Health is sampled every health_interval seconds.
+        self.interval = IOSTABILITY_CFG.get("metrics", {}).get("health_interval", 300)
+
+    def send_alert(self, subject, body):
+        """
+        Mail threshold alerts.
+        :param subject: Alert subject.
+        :param body: Alert details.
+        """
+        dashboard = self.monitor.dashboard.url if self.monitor.dashboard else None
+        body = f"{body}\n\nDashboard: {dashboard}\n" if dashboard else body
+        self.mail_obj.send_mail(subject=f"Test {self.test_id} on {self.health_obj.hostname}: "
+                                        f"{subject}", body=body)
 
     def run(self):
         """
-        Send Mail notification periodically.
+        Sample cluster health till the test completes, alerts are mailed on thresholds.
         """
         while not self.event_pass.is_set() and not self.event_fail.is_set():
-            status = json.dumps(self.health_obj.hctl_status_json(), indent=4)
-            subject = f"Test {self.test_id} in progress on {self.health_obj.hostname}"
-            body = f"hctl Status: {status} \n"
-            self.mail_obj.send_mail(subject=subject, body=body)
+            try:
+                self.monitor.record_health(self.health_obj.hctl_status_json())
+            except Exception as error:  # pylint: disable=broad-except
+                logging.getLogger(__name__).error("Health sampling failed: %s", error)
             current_time = time.time()
-            while time.time() < current_time + self.interval * 60 * 60:
+            while time.time() < current_time + self.interval:
                 if self.event_pass.is_set() or self.event_fail.is_set():
                     break
-                time.sleep(60)
+                time.sleep(min(60, self.interval))
         test_status = "Failed"
         if self.event_pass.is_set():
             test_status = "Passed"
         status = json.dumps(self.health_obj.hctl_status_json(), indent=4)
+        alerts = "\n".join(f"{time.ctime(tstamp)} [{severity}] {message}" for
+                           tstamp, _, severity, message in self.monitor.store.alerts())
         subject = f"Test {self.test_id} {test_status} on {self.health_obj.hostname}"
-        body = f"hctl Status: {status} \n"
+        body = f"hctl Status: {status} \nAlerts:\n{alerts or 'None'}\n"
         self.mail_obj.send_mail(subject=subject, body=body)
 
 
-def send_mail_notification(sender_mail_id, receiver_mail_id, test_id, health_obj):
+def send_mail_notification(sender_mail_id, receiver_mail_id, test_id, health_obj, monitor=None):
     """
     Send mail notification
     :param sender_mail_id: Sender Mail ID
     :param receiver_mail_id: Receiver Mail ID
     :param test_id: Test ID
     :param health_obj: Health object.
+    :param monitor: IOStabilityMonitor whose threshold alerts are mailed.
     :return MailNotification Object.
     """
     mail_notify = MailNotification(sender=sender_mail_id,
                                    receiver=receiver_mail_id,
                                    test_id=test_id,
-                                   health_obj=health_obj)
+                                   health_obj=health_obj,
+                                   monitor=monitor)
     mail_notify.start()
     return mail_notify
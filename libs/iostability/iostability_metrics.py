@@ -0,0 +1,491 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+Streaming metrics for long running IO stability tests.
+
+Every s3bench iteration is parsed into throughput, latency percentiles and error counts and
+appended to a local SQLite time-series store together with periodic cluster health samples.
+Degradation trends are checked on every new sample against a baseline of the first iterations
+of the same workload, threshold breaches are handed to a notifier (mail) and an opt-in
+HTML dashboard is served from the store on a local port.
+"""
+
+import html
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from commons.utils.stats_utils import mann_kendall
+
+LOGGER = logging.getLogger(__name__)
+
+OPERATION_PATTERNS = [re.compile(r"Results Summary for (\w+) Operation"),
+                      re.compile(r"^\s*Operation:\s*(\w+)")]
+METRIC_PATTERNS = {
+    "throughput": re.compile(r"Total Throughput(?: \(MB/s\))?:\s*([\d.]+)"),
+    "duration": re.compile(r"Total Duration(?: \(s\))?:\s*([\d.]+)"),
+    "errors": re.compile(r"(?:Number of Errors|Errors Count):\s*(\d+)"),
+    "requests": re.compile(r"Total Requests Count:\s*(\d+)"),
+}
+PERCENTILE_PATTERN = re.compile(
+    r"(?:\w+ times|Duration|(Ttfb))\s+(?:(\d+)(?:st|nd|rd|th)[ -]%?ile|(Max|Min|Avg))"
+    r"(?: \(s\))?:\s*([\d.]+)")
+LATENCY_COLUMNS = ("lat_p50", "lat_p90", "lat_p99", "lat_max", "ttfb_p99")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS iteration (
+    ts REAL, loop INTEGER, size TEXT, operation TEXT, clients INTEGER, samples INTEGER,
+    throughput REAL, duration REAL, errors INTEGER, requests INTEGER,
+    lat_p50 REAL, lat_p90 REAL, lat_p99 REAL, lat_max REAL, ttfb_p99 REAL);
+CREATE INDEX IF NOT EXISTS iteration_workload ON iteration (size, operation, ts);
+CREATE TABLE IF NOT EXISTS health (ts REAL, healthy INTEGER, offline TEXT);
+CREATE TABLE IF NOT EXISTS alert (ts REAL, key TEXT, severity TEXT, message TEXT);
+"""
+
+
+def parse_s3bench_log(log_path: str) -> dict:
+    """
+    Parse s3bench results summary.
+
+    :param log_path: s3bench log file.
+    :return: Dict of {operation: metrics} with throughput (MB/s), duration (s), errors, requests
+        and latency percentiles lat_p50, lat_p90, lat_p99, lat_max and ttfb_p99 in seconds.
+    """
+    results = {}
+    current = None
+    with open(log_path, encoding="utf-8", errors="replace") as fptr:
+        for line in fptr:
+            for pattern in OPERATION_PATTERNS:
+                match = pattern.search(line)
+                if match:
+                    current = results.setdefault(match.group(1).lower(), {})
+                    break
+            if current is None:
+                continue
+            for name, pattern in METRIC_PATTERNS.items():
+                match = pattern.search(line)
+                if match:
+                    current[name] = float(match.group(1)) if name in ("throughput", "duration") \
+                        else int(match.group(1))
+            match = PERCENTILE_PATTERN.search(line)
+            if match:
+                ttfb, pct, extreme, value = match.groups()
+                label = f"p{pct}" if pct else extreme.lower()
+                current[f"{'ttfb' if ttfb else 'lat'}_{label}"] = float(value)
+
+    return results
+
+
+def cluster_health(hctl_status: dict) -> tuple:
+    """
+    Summarise hctl status json.
+
+    :param hctl_status: Output of Health.hctl_status_json.
+    :return: (True if every service is started, list of 'pod:service' not started)
+    """
+    offline = [f"{node.get('name')}:{svc.get('name')}"
+               for node in hctl_status.get("nodes", [])
+               for svc in node.get("svcs", []) if svc.get("status") != "started"]
+    return not offline, offline
+
+
+class MetricsStore:
+    """SQLite time-series store of iteration metrics, health samples and fired alerts."""
+
+    def __init__(self, db_path: str):
+        """
+        :param db_path: SQLite file, created if missing. Use ':memory:' for a transient store.
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def _write(self, query: str, rows: list) -> None:
+        """Append rows in one transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(query, rows)
+
+    def _read(self, query: str, params: tuple = ()) -> list:
+        """Run a select."""
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def record_iteration(self, loop: int, size: str, clients: int, samples: int,
+                         results: dict, tstamp: float = None) -> None:
+        """
+        Append one s3bench iteration.
+
+        :param loop: Loop number.
+        :param size: Object size of the workload e.g. 1Mb.
+        :param clients: Parallel clients.
+        :param samples: Objects per iteration.
+        :param results: Output of parse_s3bench_log.
+        :param tstamp: Epoch of the sample, defaults to now.
+        """
+        tstamp = tstamp or time.time()
+        rows = [(tstamp, loop, size, operation, clients, samples, values.get("throughput"),
+                 values.get("duration"), values.get("errors", 0), values.get("requests"),
+                 *[values.get(column) for column in LATENCY_COLUMNS])
+                for operation, values in results.items()]
+        self._write(f"INSERT INTO iteration VALUES ({', '.join('?' * 15)})", rows)
+
+    def record_health(self, healthy: bool, offline: list, tstamp: float = None) -> None:
+        """Append a cluster health sample."""
+        self._write("INSERT INTO health VALUES (?, ?, ?)",
+                    [(tstamp or time.time(), int(healthy), json.dumps(offline))])
+
+    def record_alert(self, key: str, severity: str, message: str) -> None:
+        """Append a fired alert."""
+        self._write("INSERT INTO alert VALUES (?, ?, ?, ?)",
+                    [(time.time(), key, severity, message)])
+
+    def workloads(self) -> list:
+        """List of (size, operation) present in the store."""
+        return self._read("SELECT DISTINCT size, operation FROM iteration "
+                          "ORDER BY size, operation")
+
+    def series(self, size: str, operation: str, metric: str, limit: int = None,
+               oldest: bool = False) -> list:
+        """
+        Time series of one metric.
+
+        :param size: Object size.
+        :param operation: write/read.
+        :param metric: Column name e.g. throughput, lat_p99, errors.
+        :param limit: Only the latest (or oldest) limit samples.
+        :param oldest: Take the first limit samples instead of the latest.
+        :return: List of (ts, value) ordered by time.
+        """
+        if metric not in ("throughput", "duration", "errors", "requests") + LATENCY_COLUMNS:
+            raise ValueError(f"Unknown metric {metric}")
+        query = f"SELECT ts, {metric} FROM iteration WHERE size = ? AND operation = ? " \
+                f"AND {metric} IS NOT NULL ORDER BY ts {'ASC' if oldest else 'DESC'}"
+        rows = self._read(query + (f" LIMIT {int(limit)}" if limit else ""), (size, operation))
+        return rows if oldest else rows[::-1]
+
+    def count(self, size: str, operation: str) -> int:
+        """Number of iterations of a workload."""
+        return self._read("SELECT COUNT(*) FROM iteration WHERE size = ? AND operation = ?",
+                          (size, operation))[0][0]
+
+    def health(self, limit: int = 100) -> list:
+        """Latest health samples as (ts, healthy, offline list) ordered by time."""
+        rows = self._read("SELECT ts, healthy, offline FROM health ORDER BY ts DESC LIMIT ?",
+                          (limit,))
+        return [(tstamp, bool(healthy), json.loads(offline)) for tstamp, healthy, offline
+                in rows[::-1]]
+
+    def alerts(self, limit: int = 50) -> list:
+        """Latest alerts as (ts, key, severity, message), newest first."""
+        return self._read("SELECT ts, key, severity, message FROM alert ORDER BY ts DESC "
+                          "LIMIT ?", (limit,))
+
+    def close(self) -> None:
+        """Close database."""
+        with self._lock:
+            self._conn.close()
+
+
+class TrendDetector:
+    """Detect throughput and latency degradation of a workload as samples arrive."""
+
+    def __init__(self, store: MetricsStore, **kwargs):
+        """
+        :param store: Metrics store.
+        :keyword baseline: Number of first iterations used as baseline.
+        :keyword window: Number of latest iterations compared with the baseline.
+        :keyword throughput_drop_pct: Alert when window median throughput drops by this %.
+        :keyword latency_rise_pct: Alert when window median p99 latency rises by this %.
+        :keyword trend_pvalue: Mann-Kendall p-value for a significant trend in the window.
+        """
+        self.store = store
+        self.baseline = kwargs.get("baseline", 5)
+        self.window = kwargs.get("window", 10)
+        self.throughput_drop_pct = kwargs.get("throughput_drop_pct", 20)
+        self.latency_rise_pct = kwargs.get("latency_rise_pct", 50)
+        self.trend_pvalue = kwargs.get("trend_pvalue", 0.01)
+        self._baselines = {}
+
+    @staticmethod
+    def _median(values: list) -> float:
+        """Median of a non empty list."""
+        values = sorted(values)
+        mid = len(values) // 2
+        return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+    def _baseline(self, size: str, operation: str, metric: str):
+        """Median of the first baseline samples, frozen once complete."""
+        key = (size, operation, metric)
+        if key not in self._baselines:
+            rows = self.store.series(size, operation, metric, self.baseline, oldest=True)
+            if len(rows) < self.baseline:
+                return None
+            self._baselines[key] = self._median([value for _, value in rows])
+        return self._baselines[key]
+
+    def check(self, size: str, operation: str) -> list:
+        """
+        Compare latest window of a workload with its baseline.
+
+        :param size: Object size.
+        :param operation: write/read.
+        :return: List of alert dicts with key, severity, message and values.
+        """
+        alerts = []
+        if self.store.count(size, operation) < self.baseline + min(self.window, 3):
+            return alerts
+        rules = (("throughput", -1, self.throughput_drop_pct),
+                 ("lat_p99", 1, self.latency_rise_pct))
+        for metric, direction, limit_pct in rules:
+            baseline = self._baseline(size, operation, metric)
+            series = [value for _, value in self.store.series(size, operation, metric,
+                                                              self.window)]
+            if not baseline or not series:
+                continue
+            current = self._median(series)
+            change = (current - baseline) / baseline * 100
+            _, z_score, p_value = mann_kendall(series)
+            trending = p_value < self.trend_pvalue and z_score * direction > 0
+            if change * direction >= limit_pct:
+                alerts.append({
+                    "key": f"{size}:{operation}:{metric}",
+                    "severity": "critical" if trending else "warning",
+                    "message": f"{operation} {size} {metric} {change:+.1f}% vs baseline "
+                               f"({current:.3f} vs {baseline:.3f})"
+                               f"{', still degrading' if trending else ''}",
+                    "baseline": baseline, "current": current, "change_pct": change})
+        return alerts
+
+
+class AlertManager:
+    """Fire threshold alerts once per key with a cooldown instead of on a fixed timer."""
+
+    def __init__(self, store: MetricsStore, notify=None, cooldown: float = 3600):
+        """
+        :param store: Metrics store keeping fired alerts.
+        :param notify: Callable(subject, body) e.g. Mail.send_mail, alerts are only logged if None.
+        :param cooldown: Seconds before an alert with the same key fires again.
+        """
+        self.store = store
+        self.notify = notify
+        self.cooldown = cooldown
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def fire(self, alerts: list, subject: str = "IO stability alert") -> list:
+        """
+        Record and notify alerts out of their cooldown.
+
+        :param alerts: List of alert dicts with key, severity and message.
+        :param subject: Mail subject prefix.
+        :return: Alerts actually fired.
+        """
+        now = time.monotonic()
+        fired = []
+        with self._lock:
+            for alert in alerts:
+                last = self._last.get(alert["key"])
+                if last is not None and now - last < self.cooldown:
+                    continue
+                self._last[alert["key"]] = now
+                fired.append(alert)
+        for alert in fired:
+            LOGGER.warning("[%s] %s", alert["severity"], alert["message"])
+            self.store.record_alert(alert["key"], alert["severity"], alert["message"])
+        if fired and self.notify:
+            severity = "critical" if any(alert["severity"] == "critical" for alert in fired) \
+                else "warning"
+            body = "\n".join(f"[{alert['severity']}] {alert['message']}" for alert in fired)
+            try:
+                self.notify(f"{subject} ({severity})", body)
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.error("Failed to send alert notification: %s", error)
+        return fired
+
+
+def render_dashboard(store: MetricsStore, title: str = "IO stability") -> str:
+    """
+    Render dashboard page with inline SVG charts, no external assets required.
+
+    :param store: Metrics store.
+    :param title: Page title.
+    :return: HTML text.
+    """
+    def chart(points: list, label: str) -> str:
+        if len(points) < 2:
+            return f"<p>{html.escape(label)}: not enough samples</p>"
+        width, height = 480, 120
+        start, end = points[0][0], points[-1][0]
+        high = max(value for _, value in points) or 1
+        coords = " ".join(
+            f"{(tstamp - start) / ((end - start) or 1) * width:.1f},"
+            f"{height - value / high * height:.1f}" for tstamp, value in points)
+        return (f"<div><b>{html.escape(label)}</b> last {points[-1][1]:.3f} max {high:.3f}<br>"
+                f"<svg width='{width}' height='{height}' style='border:1px solid #ccc'>"
+                f"<polyline fill='none' stroke='#1f77b4' points='{coords}'/></svg></div>")
+
+    parts = [f"<html><head><meta http-equiv='refresh' content='60'>"
+             f"<title>{html.escape(title)}</title></head><body><h2>{html.escape(title)}</h2>"]
+    health = store.health(1)
+    if health:
+        tstamp, healthy, offline = health[-1]
+        state = "healthy" if healthy else f"degraded: {', '.join(offline)}"
+        parts.append(f"<p>Cluster {html.escape(state)} at {time.ctime(tstamp)}</p>")
+    alerts = store.alerts(20)
+    if alerts:
+        parts.append("<h3>Alerts</h3><ul>" + "".join(
+            f"<li>{time.ctime(tstamp)} [{severity}] {html.escape(message)}</li>"
+            for tstamp, _, severity, message in alerts) + "</ul>")
+    for size, operation in store.workloads():
+        parts.append(f"<h3>{html.escape(operation)} {html.escape(size)}</h3>")
+        parts.append(chart(store.series(size, operation, "throughput", 500), "Throughput MB/s"))
+        parts.append(chart(store.series(size, operation, "lat_p99", 500), "p99 latency s"))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+class DashboardServer(threading.Thread):
+    """Serve the dashboard and raw metrics json on a local port in a daemon thread."""
+
+    def __init__(self, store: MetricsStore, host: str = "127.0.0.1", port: int = 0,
+                 title: str = "IO stability"):
+        """
+        :param store: Metrics store.
+        :param host: Bind address.
+        :param port: Bind port, 0 picks a free port.
+        :param title: Page title.
+        """
+        super().__init__(daemon=True)
+
+        class Handler(BaseHTTPRequestHandler):
+            """Dashboard request handler."""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Serve / and /metrics.json."""
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps({
+                        f"{size}:{operation}": store.series(size, operation, "throughput")
+                        for size, operation in store.workloads()}).encode()
+                    ctype = "application/json"
+                else:
+                    body = render_dashboard(store, title).encode()
+                    ctype = "text/html"
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Keep request logs out of test logs."""
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_address[1]}/"
+
+    def run(self) -> None:
+        """Serve till stopped."""
+        LOGGER.info("IO stability dashboard available at %s", self.url)
+        self.server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class IOStabilityMonitor:
+    """Glue of store, trend detector, alert manager and dashboard used by IOStabilityLib."""
+
+    def __init__(self, db_path: str, notify=None, **kwargs):
+        """
+        :param db_path: SQLite file of the time-series store.
+        :param notify: Callable(subject, body) used for alerts.
+        :keyword max_errors: Alert when an iteration reports more errors than this.
+        :keyword cooldown: Seconds before the same alert fires again.
+        :keyword dashboard_port: Serve dashboard on this port, disabled if None.
+        :keyword dashboard_host: Dashboard bind address.
+        Other keywords are passed to TrendDetector.
+        """
+        self.store = MetricsStore(db_path)
+        self.max_errors = kwargs.pop("max_errors", 0)
+        self.alerts = AlertManager(self.store, notify, kwargs.pop("cooldown", 3600))
+        port = kwargs.pop("dashboard_port", None)
+        host = kwargs.pop("dashboard_host", "127.0.0.1")
+        self.detector = TrendDetector(self.store, **kwargs)
+        self.dashboard = None
+        if port is not None:
+            try:
+                self.dashboard = DashboardServer(self.store, host, port)
+                self.dashboard.start()
+            except OSError as error:
+                LOGGER.warning("Dashboard not started on %s:%s: %s", host, port, error)
+
+    def record_iteration(self, loop: int, size: str, clients: int, samples: int,
+                         log_path: str) -> tuple:
+        """
+        Parse s3bench log, store metrics and fire alerts.
+
+        :return: (parsed results, fired alerts)
+        """
+        results = parse_s3bench_log(log_path)
+        if not results:
+            LOGGER.warning("No s3bench summary found in %s", log_path)
+            return results, []
+        self.store.record_iteration(loop, size, clients, samples, results)
+        alerts = []
+        for operation, values in results.items():
+            if values.get("errors", 0) > self.max_errors:
+                alerts.append({"key": f"{size}:{operation}:errors:{loop}",
+                               "severity": "critical",
+                               "message": f"{operation} {size} loop {loop} reported "
+                                          f"{values['errors']} errors"})
+            alerts.extend(self.detector.check(size, operation))
+        return results, self.alerts.fire(alerts)
+
+    def record_health(self, hctl_status: dict) -> tuple:
+        """
+        Store health sample and alert on services not started.
+
+        :param hctl_status: Output of Health.hctl_status_json.
+        :return: (healthy, offline services)
+        """
+        healthy, offline = cluster_health(hctl_status)
+        self.store.record_health(healthy, offline)
+        if not healthy:
+            self.alerts.fire([{"key": "health:" + ",".join(sorted(offline)),
+                               "severity": "critical",
+                               "message": f"Services not started: {', '.join(offline)}"}])
+        return healthy, offline
+
+    def close(self) -> None:
+        """Stop dashboard and close store."""
+        if self.dashboard:
+            self.dashboard.stop()
+        self.store.close()
@@ -25,10 +25,13 @@ import os
 import logging
 import re
 import json
+import commons.errorcodes as err
 from commons.commands import JMX_CMD
+from commons.exceptions import CTException
 from commons.utils import system_utils
 from commons.utils import config_utils
 from config import JMETER_CFG, CSM_REST_CFG
+from libs.jmeter import jtl_analyzer
 
 
 class JmeterInt():
@@ -43,6 +46,8 @@ class JmeterInt():
         self.jmx_path = JMETER_CFG["jmx_path"]
         self.jtl_log_path = JMETER_CFG["jtl_log_path"]
         self.test_data_csv = JMETER_CFG["test_data_csv"]
+        self.analysis_cfg = JMETER_CFG.get("jtl_analysis", {})
+        self.last_jtl = None
 
     def append_log(self, log_file: str):
         """Append and verify log to the log file.
@@ -81,6 +86,7 @@ class JmeterInt():
         log_file = jmx_file.split(".")[0] + ".jtl"
         log_file_path = os.path.join(self.jtl_log_path, log_file)
         self.log.info("Log file name : %s ", log_file_path)
+        self.last_jtl = log_file_path
         cmd = JMX_CMD.format(self.jmeter_path, jmx_file_path, log_file_path, self.jtl_log_path)
         self.log.info("Executing JMeter command : %s", cmd)
         result, resp = system_utils.run_local_cmd(cmd, chk_stderr=True)
@@ -165,3 +171,39 @@ class JmeterInt():
         data = config_utils.read_content_json(fpath)
         self.log.debug("Request Statistics : \n%s",json.dumps(data,indent=4, sort_keys=True))
         return int(data["Total"]["errorCount"]), int(data["Total"]["sampleCount"])
+
+    def analyze_jtl(self, jtl_file: str = None, build: str = None, baseline_build: str = None,
+                    sla: dict = None):
+        """Analyse the JTL of a run, check SLA and compare with the report of a base build.
+
+        :param jtl_file: JTL file path, defaults to the JTL of the last run_jmx
+        :param build: Build of the run, the report is saved under this build for later
+            comparisons
+        :param baseline_build: Build whose saved report of the same JTL is the baseline,
+            defaults to config
+        :param sla: SLA limits {label or '*': {metric: limit}}, defaults to config
+        :return [tuple]: boolean (SLA met and no regression), report dict
+        """
+        jtl_file = jtl_file if jtl_file else self.last_jtl
+        if not jtl_file:
+            raise CTException(err.INVALID_PARAMETER,
+                              "No JTL file given and no JMX run to analyse, call run_jmx first")
+        baseline_build = baseline_build or self.analysis_cfg.get("baseline_build")
+        reports_path = self.analysis_cfg.get("reports_path", self.jtl_log_path)
+        name = os.path.splitext(os.path.basename(jtl_file))[0] + ".json"
+        baseline = None
+        if baseline_build:
+            baseline_path = os.path.join(reports_path, baseline_build, name)
+            if os.path.exists(baseline_path):
+                baseline = jtl_analyzer.load_report(baseline_path)
+            else:
+                self.log.warning("No report of build %s at %s", baseline_build, baseline_path)
+        report = jtl_analyzer.build_report(
+            jtl_file, build, interval=self.analysis_cfg.get("timeline_interval", 10),
+            sla=sla if sla is not None else self.analysis_cfg.get("sla", {}),
+            baseline=baseline,
+            threshold=self.analysis_cfg.get("regression_threshold", 10))
+        path = jtl_analyzer.save_report(os.path.join(reports_path, build or "latest", name),
+                                        report)
+        self.log.info("JTL analysis report : %s", path)
+        return report["passed"], report
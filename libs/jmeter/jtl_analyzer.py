@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Ingestion and analysis of JMeter JTL (csv) results.
+
+Samples are reduced to per endpoint (sampler label) latency percentiles, throughput over
+time, error breakdown by response code and SLA compliance. Analyses of two builds are
+compared per endpoint. All results are plain dicts saved as json, so a load regression can
+fail a build automatically.
+"""
+
+import csv
+import json
+import logging
+import math
+import os
+from datetime import datetime
+
+LOGGER = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+ALL_LABELS = "*"
+
+
+def read_jtl(path: str) -> list:
+    """
+    Read samples of a csv JTL file written with the default JMeter csv header.
+
+    :param path: JTL file path.
+    :return: List of sample dicts with timestamp (ms), elapsed (ms), label, code, success,
+        bytes and latency (ms).
+    """
+    samples = []
+    with open(path, newline="", encoding="utf-8") as fptr:
+        for row in csv.DictReader(fptr):
+            try:
+                samples.append({"timestamp": int(row["timeStamp"]),
+                                "elapsed": int(row["elapsed"]),
+                                "label": row["label"],
+                                "code": row.get("responseCode") or "",
+                                "success": row["success"].strip().lower() == "true",
+                                "bytes": int(row.get("bytes") or 0),
+                                "latency": int(row.get("Latency") or 0),
+                                "message": row.get("failureMessage") or ""})
+            except (KeyError, ValueError, AttributeError) as error:
+                LOGGER.warning("Skipping malformed JTL row %s: %s", row, error)
+    LOGGER.info("Read %s samples from %s", len(samples), path)
+    return samples
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest rank percentile of sorted values."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def _stats(samples: list, duration: float) -> dict:
+    """Latency, throughput and error stats of samples."""
+    elapsed = sorted(sample["elapsed"] for sample in samples)
+    errors = sum(1 for sample in samples if not sample["success"])
+    stats = {"samples": len(samples), "errors": errors,
+             "error_pct": round(errors / len(samples) * 100, 3) if samples else 0.0,
+             "throughput": round(len(samples) / duration, 3) if duration else 0.0,
+             "mean": round(sum(elapsed) / len(elapsed), 3) if elapsed else None,
+             "max": elapsed[-1] if elapsed else None}
+    stats.update({f"p{pct}": percentile(elapsed, pct) for pct in PERCENTILES})
+    return stats
+
+
+def analyze(samples: list, interval: int = 10) -> dict:
+    """
+    Analyse samples of a run.
+
+    :param samples: Samples from read_jtl.
+    :param interval: Seconds per throughput timeline bucket.
+    :return: Dict with summary, endpoints ({label: stats}), errors ({label: {code: count}})
+        and timeline (per interval samples, throughput, errors and p95).
+    """
+    if not samples:
+        return {"summary": _stats([], 0), "endpoints": {}, "errors": {}, "timeline": [],
+                "duration": 0}
+    start = min(sample["timestamp"] for sample in samples)
+    end = max(sample["timestamp"] + sample["elapsed"] for sample in samples)
+    duration = max(end - start, 1) / 1000
+    by_label, errors, buckets = {}, {}, {}
+    for sample in samples:
+        by_label.setdefault(sample["label"], []).append(sample)
+        if not sample["success"]:
+            codes = errors.setdefault(sample["label"], {})
+            codes[sample["code"]] = codes.get(sample["code"], 0) + 1
+        buckets.setdefault(int((sample["timestamp"] - start) / 1000 // interval),
+                           []).append(sample)
+    timeline = []
+    for index in range(max(buckets) + 1):
+        bucket = buckets.get(index, [])
+        timeline.append({"start": index * interval, "samples": len(bucket),
+                         "throughput": round(len(bucket) / interval, 3),
+                         "errors": sum(1 for sample in bucket if not sample["success"]),
+                         "p95": percentile(sorted(each["elapsed"] for each in bucket), 95)})
+    return {"summary": _stats(samples, duration),
+            "endpoints": {label: _stats(each, duration)
+                          for label, each in sorted(by_label.items())},
+            "errors": errors, "timeline": timeline, "duration": round(duration, 3)}
+
+
+def check_sla(result: dict, sla: dict) -> list:
+    """
+    Check endpoints against SLA limits.
+
+    :param result: Output of analyze.
+    :param sla: {label or '*': {metric: limit}}, metrics are p50/p90/p95/p99/mean/max
+        (ms, upper limit), error_pct (upper limit) and throughput (lower limit). '*' applies
+        to every endpoint without own limits.
+    :return: List of checks with label, metric, limit, actual and passed.
+    """
+    checks = []
+    for label, stats in result["endpoints"].items():
+        for metric, limit in sla.get(label, sla.get(ALL_LABELS, {})).items():
+            actual = stats.get(metric)
+            if actual is None:
+                passed = False
+            elif metric == "throughput":
+                passed = actual >= limit
+            else:
+                passed = actual <= limit
+            checks.append({"label": label, "metric": metric, "limit": limit, "actual": actual,
+                           "passed": passed})
+            if not passed:
+                LOGGER.error("SLA breach %s %s: %s (limit %s)", label, metric, actual, limit)
+    return checks
+
+
+def compare_runs(baseline: dict, candidate: dict, threshold: float = 10.0) -> list:
+    """
+    Compare analyses of two runs per endpoint.
+
+    :param baseline: Analysis of the base build.
+    :param candidate: Analysis of the new build.
+    :param threshold: Change in percent of p95 latency or throughput flagged as regression
+        or improvement; any new errors on an endpoint without base errors is a regression.
+    :return: Rows with label, base and new p95, throughput and error_pct, deltas and
+        verdict, regressions first.
+    """
+    rows = []
+    base_eps, new_eps = baseline["endpoints"], candidate["endpoints"]
+    for label in sorted(set(base_eps) | set(new_eps)):
+        base, new = base_eps.get(label), new_eps.get(label)
+        row = {"label": label, "base": base, "new": new, "p95_delta_pct": None,
+               "throughput_delta_pct": None}
+        if not base or not new:
+            row["verdict"] = "missing"
+            rows.append(row)
+            continue
+        p95 = (new["p95"] - base["p95"]) / base["p95"] * 100 if base["p95"] else 0.0
+        tput = (new["throughput"] - base["throughput"]) / base["throughput"] * 100 \
+            if base["throughput"] else 0.0
+        row.update(p95_delta_pct=round(p95, 2), throughput_delta_pct=round(tput, 2))
+        if p95 >= threshold or tput <= -threshold or \
+                (new["error_pct"] > base["error_pct"] and not base["errors"]):
+            row["verdict"] = "regression"
+        elif p95 <= -threshold or tput >= threshold:
+            row["verdict"] = "improvement"
+        else:
+            row["verdict"] = "same"
+        rows.append(row)
+    return sorted(rows, key=lambda row: (row["verdict"] != "regression",
+                                         -(row["p95_delta_pct"] or 0.0)))
+
+
+def build_report(jtl_path: str, build: str = None, interval: int = 10, sla: dict = None,
+                 baseline: dict = None, threshold: float = 10.0) -> dict:
+    """
+    Analyse a JTL file, check SLA and compare with a baseline report.
+
+    :param jtl_path: JTL file path.
+    :param build: Build of the run.
+    :param interval: Seconds per timeline bucket.
+    :param sla: SLA limits, see check_sla.
+    :param baseline: Report of the base build.
+    :param threshold: Regression threshold in percent.
+    :return: Report dict with build, analysis, sla, comparison and passed.
+    """
+    report = {"build": build, "jtl": jtl_path, "time": datetime.now().isoformat(),
+              "analysis": analyze(read_jtl(jtl_path), interval)}
+    report["sla"] = check_sla(report["analysis"], sla or {})
+    report["comparison"] = compare_runs(baseline["analysis"], report["analysis"],
+                                        threshold) if baseline else []
+    report["regressions"] = [row["label"] for row in report["comparison"]
+                             if row["verdict"] == "regression"]
+    report["passed"] = all(check["passed"] for check in report["sla"]) \
+        and not report["regressions"]
+    summary = report["analysis"]["summary"]
+    LOGGER.info("JTL %s: %s samples, %s%% errors, p95 %s ms, %s/s, %s SLA breaches, "
+                "%s regressions", jtl_path, summary["samples"], summary["error_pct"],
+                summary["p95"], summary["throughput"],
+                sum(1 for check in report["sla"] if not check["passed"]),
+                len(report["regressions"]))
+    return report
+
+
+def save_report(path: str, report: dict) -> str:
+    """Save report as json."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fptr:
+        json.dump(report, fptr, indent=2)
+    return path
+
+
+def load_report(path: str) -> dict:
+    """Load saved report."""
+    with open(path, encoding="utf-8") as fptr:
+        return json.load(fptr)
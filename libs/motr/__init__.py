@@ -42,6 +42,7 @@ TEMP_128M_FILE_PATH = os.path.join(tempfile.gettempdir(), '128M')
 
 #Read test workload
 WORKLOAD_CFG = config_utils.read_yaml("config/motr/test_workload.yaml")
+M0CRATE_SWEEP_CFG = config_utils.read_yaml("config/motr/m0crate_sweep.yaml")
 
 # Motr configs
 FILE_BLOCK_COUNT = [1,2]
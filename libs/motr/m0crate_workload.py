@@ -0,0 +1,258 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+m0crate workload generator and results analyser.
+
+Workloads are generated from a parameter matrix (block sizes, thread counts, object counts
+and operations) on top of a base m0crate yaml, run as a sweep and reduced to throughput,
+IOPS and estimated latency records. Records of two builds are compared per workload to highlight
+motr level performance changes.
+"""
+
+import copy
+import itertools
+import json
+import logging
+import math
+import os
+import re
+import statistics
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+# m0crate IO workload OPCODE values
+OPCODES = {"write": 2, "write_read": 3}
+SIZE_UNITS = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+WALL_MARKER = "M0CRATE_WALL_NS"
+WALL_RE = re.compile(rf"^{WALL_MARKER} (\d+) (-?\d+)$", re.MULTILINE)
+METRIC_RE = re.compile(r"([A-Za-z][\w/]*)\s*[=:]\s*([0-9]+(?:\.[0-9]+)?)")
+
+
+def to_bytes(size) -> int:
+    """Convert m0crate size like 4k, 16m or 1g to bytes."""
+    size = str(size).strip().lower()
+    if size and size[-1] in SIZE_UNITS:
+        return int(float(size[:-1]) * SIZE_UNITS[size[-1]])
+    return int(size)
+
+
+def workload_matrix(block_sizes: list, threads: list, objects: list, operations: list,
+                    iosize: str = "16m") -> list:
+    """
+    Workload parameters for every combination of the matrix.
+
+    :param block_sizes: Block sizes e.g. ['4k', '1m'].
+    :param threads: Thread counts.
+    :param objects: Object counts.
+    :param operations: Operations, keys of OPCODES.
+    :param iosize: Size of every object.
+    :return: List of parameter dicts with a unique name.
+    """
+    matrix = []
+    for operation, b_size, nr_threads, nr_objs in itertools.product(
+            operations, block_sizes, threads, objects):
+        if operation not in OPCODES:
+            raise ValueError(f"Operation must be one of {list(OPCODES)}")
+        if to_bytes(b_size) > to_bytes(iosize):
+            log.warning("Skipping block size %s bigger than IO size %s", b_size, iosize)
+            continue
+        matrix.append({"name": f"{operation}_bs{b_size}_t{nr_threads}_o{nr_objs}",
+                       "operation": operation, "block_size": b_size, "threads": nr_threads,
+                       "objects": nr_objs, "iosize": iosize})
+    return matrix
+
+
+def build_workload(base_cfg: dict, params: dict, motr_config: dict = None,
+                   source_file: str = None) -> dict:
+    """
+    m0crate configuration of one workload.
+
+    :param base_cfg: Base m0crate yaml content, e.g. config/motr/sample_m0crate.yaml.
+    :param params: Parameters from workload_matrix.
+    :param motr_config: MOTR_CONFIG overrides (endpoints, fids).
+    :param source_file: Source file of the writes, at least iosize big.
+    :return: m0crate yaml content.
+    """
+    cfg = copy.deepcopy(base_cfg)
+    cfg["MOTR_CONFIG"].update(motr_config or {})
+    workload = cfg["WORKLOAD_SPEC"][0]["WORKLOAD"]
+    workload.update(OPCODE=OPCODES[params["operation"]], BLOCK_SIZE=params["block_size"],
+                    NR_THREADS=params["threads"], NR_OBJS=params["objects"],
+                    IOSIZE=params["iosize"], BLOCKS_PER_OP=1, NR_ROUNDS=1)
+    if source_file:
+        workload["SOURCE_FILE"] = source_file
+    cfg["WORKLOAD_SPEC"] = cfg["WORKLOAD_SPEC"][:1]
+    return cfg
+
+
+def m0crate_cmd(remote_file: str) -> str:
+    """m0crate command printing its own wall time and exit code."""
+    return (f"s=$(date +%s%N); m0crate -S {remote_file} 2>&1; rc=$?; "
+            f"echo \"{WALL_MARKER} $(( $(date +%s%N) - s )) $rc\"")
+
+
+def parse_m0crate_output(output: str) -> dict:
+    """
+    Parse output of m0crate_cmd.
+
+    :param output: Combined stdout and stderr.
+    :return: Dict with wall seconds, rc, errors and reported (numeric key=value or
+        key: value pairs of m0crate summary lines).
+    """
+    parsed = {"wall": None, "rc": None, "errors": [], "reported": {}}
+    match = WALL_RE.search(output)
+    if match:
+        parsed["wall"] = int(match.group(1)) / 1e9
+        parsed["rc"] = int(match.group(2))
+    for line in output.splitlines():
+        if line.startswith(WALL_MARKER):
+            continue
+        if "ERROR" in line or "Error" in line or "m0_panic" in line:
+            parsed["errors"].append(line.strip())
+        if "time" in line.lower() or "total" in line.lower():
+            for key, value in METRIC_RE.findall(line):
+                parsed["reported"][key.lower()] = float(value)
+    return parsed
+
+
+def workload_record(params: dict, output: str, wall: float = None) -> dict:
+    """
+    Throughput and latency record of one m0crate run.
+
+    latency_ms_est is an estimate of the mean operation latency with min(threads, objects)
+    operations in flight. It is derived from wall time, which includes m0crate startup and
+    motr client initialisation, so it is an upper bound and not a latency reported by m0crate.
+
+    :param params: Parameters from workload_matrix.
+    :param output: Output of m0crate_cmd.
+    :param wall: Wall seconds measured by the caller, used if output has none.
+    :return: Record dict.
+    """
+    parsed = parse_m0crate_output(output)
+    wall = parsed["wall"] or wall or 0.0
+    passes = 2 if params["operation"] == "write_read" else 1
+    total = to_bytes(params["iosize"]) * params["objects"] * passes
+    ops = params["objects"] * passes * math.ceil(to_bytes(params["iosize"]) /
+                                                  to_bytes(params["block_size"]))
+    record = dict(params, wall=round(wall, 6), bytes=total, ops=ops, rc=parsed["rc"],
+                  errors=parsed["errors"][:10], reported=parsed["reported"])
+    if wall:
+        record.update(throughput_mbps=round(total / wall / SIZE_UNITS["m"], 3),
+                      iops=round(ops / wall, 3),
+                      latency_ms_est=round(wall * min(params["threads"], params["objects"]) /
+                                           ops * 1000, 3))
+    record["status"] = "ok" if wall and not parsed["errors"] and not parsed["rc"] else "failed"
+    return record
+
+
+def run_sweep(matrix: list, run, repeat: int = 1) -> list:
+    """
+    Run every workload of the matrix.
+
+    :param matrix: Output of workload_matrix.
+    :param run: Callable(params) running the workload and returning (output, wall seconds).
+    :param repeat: Runs per workload.
+    :return: Records, one per run.
+    """
+    records = []
+    for params in matrix:
+        for iteration in range(repeat):
+            log.info("Running m0crate workload %s, iteration %s", params["name"], iteration + 1)
+            output, wall = run(params)
+            record = workload_record(params, output, wall)
+            record["iteration"] = iteration + 1
+            log.info("m0crate %s: %s %s MB/s ~%s ms", params["name"], record["status"],
+                     record.get("throughput_mbps"), record.get("latency_ms_est"))
+            records.append(record)
+    return records
+
+
+def save_results(path: str, build: str, records: list) -> str:
+    """Save sweep records of a build as json."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fptr:
+        json.dump({"build": build, "time": datetime.now().isoformat(), "records": records},
+                  fptr, indent=2)
+    return path
+
+
+def load_results(path: str) -> dict:
+    """Load saved sweep results."""
+    with open(path, encoding="utf-8") as fptr:
+        return json.load(fptr)
+
+
+def _medians(records: list) -> dict:
+    """Median throughput and estimated latency of successful runs per workload."""
+    grouped = {}
+    for record in records:
+        if record["status"] == "ok":
+            grouped.setdefault(record["name"], []).append(record)
+    return {name: {"throughput_mbps": statistics.median(rec["throughput_mbps"] for rec in runs),
+                   "latency_ms_est": statistics.median(rec["latency_ms_est"] for rec in runs)}
+            for name, runs in grouped.items()}
+
+
+def compare_results(baseline: dict, candidate: dict, threshold: float = 10.0) -> list:
+    """
+    Compare sweep results of two builds per workload.
+
+    :param baseline: Results of the base build (load_results format).
+    :param candidate: Results of the new build.
+    :param threshold: Throughput change in percent flagged as regression or improvement.
+    :return: Rows with name, base and new throughput and estimated latency, delta_pct and
+        verdict.
+    """
+    base, new = _medians(baseline["records"]), _medians(candidate["records"])
+    names = {record["name"] for record in baseline["records"] + candidate["records"]}
+    rows = []
+    for name in sorted(names):
+        row = {"name": name, "base": base.get(name), "new": new.get(name), "delta_pct": None}
+        if not row["base"] or not row["new"]:
+            row["verdict"] = "missing"
+        else:
+            delta = ((row["new"]["throughput_mbps"] - row["base"]["throughput_mbps"]) /
+                     row["base"]["throughput_mbps"] * 100) if row["base"]["throughput_mbps"] \
+                else 0.0
+            row["delta_pct"] = round(delta, 2)
+            row["verdict"] = "regression" if delta <= -threshold else \
+                "improvement" if delta >= threshold else "same"
+        rows.append(row)
+    return sorted(rows, key=lambda row: (row["verdict"] != "regression",
+                                         row["delta_pct"] if row["delta_pct"] is not None
+                                         else 0.0))
+
+
+def comparison_report(rows: list, base_build: str, new_build: str) -> str:
+    """Text report of compare_results, regressions first."""
+    lines = [f"m0crate comparison {base_build} -> {new_build}",
+             f"{'workload':<36} {'base MB/s':>10} {'new MB/s':>10} {'delta %':>8} "
+             f"{'base ~ms':>9} {'new ~ms':>9} verdict"]
+    for row in rows:
+        base, new = row["base"] or {}, row["new"] or {}
+        delta = f"{row['delta_pct']:+.1f}" if row["delta_pct"] is not None else "-"
+        lines.append(f"{row['name']:<36} {base.get('throughput_mbps', '-'):>10} "
+                     f"{new.get('throughput_mbps', '-'):>10} {delta:>8} "
+                     f"{base.get('latency_ms_est', '-'):>9} {new.get('latency_ms_est', '-'):>9} "
+                     f"{row['verdict']}")
+    regressions = sum(1 for row in rows if row["verdict"] == "regression")
+    lines.append(f"{regressions} regression(s) in {len(rows)} workloads")
+    return "\n".join(lines)
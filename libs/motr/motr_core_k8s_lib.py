@@ -23,17 +23,24 @@ Python library contains methods which provides the services endpoints.
 
 import json
 import logging
-from random import SystemRandom
+import os
+import shlex
+import time
 from string import Template
 
 from libs.motr import TEMP_PATH
 from libs.motr import FILE_BLOCK_COUNT
+from libs.motr import M0CRATE_SWEEP_CFG
+from libs.motr import m0crate_workload
 from libs.motr.layouts import BSIZE_LAYOUT_MAP
+from libs.motr.motr_io_engine import FidAllocator
+from libs.motr.motr_io_engine import MotrIOEngine
 from libs.ha.ha_common_libs_k8s import HAK8s
 from config import CMN_CFG
 from commons.utils import system_utils
 from commons.utils import config_utils
 from commons.utils import assert_utils
+from commons.params import LOG_DIR
 from commons.helpers.pods_helper import LogicalNode
 from commons.helpers.health_helper import Health
 from commons import commands as common_cmd
@@ -71,6 +78,7 @@ class MotrCoreK8s():
         self.node_dict = self._get_cluster_info
         self.node_pod_dict = self.get_node_pod_dict()
         self.ha_obj = HAK8s()
+        self.fid_alloc = FidAllocator()
 
     @property
     def _get_cluster_info(self):
@@ -591,8 +599,7 @@ class MotrCoreK8s():
         try:
             for count in block_count:
                 for b_size in bsize_layout_map.keys():
-                    object_id = str(SystemRandom().randint(1, 9999)) + ":" + \
-                                    str(SystemRandom().randint(1, 9999))
+                    object_id = self.fid_alloc.allocate()
                     object_dict[object_id] = {'block_size' : b_size }
                     object_dict[object_id]['deleted'] = False
                     object_dict[object_id]['count'] = count
@@ -613,6 +620,89 @@ class MotrCoreK8s():
             log.exception("Test has failed with execption: %s", exc)
             raise exc
 
+    def run_m0crate_sweep(self, matrix=None, node=None, **kwargs):
+        """
+        Generate m0crate workloads from a parameter matrix, run them in the hax container of
+        a client pod and parse throughput and latency of every run
+        :param: list matrix: workload parameters from m0crate_workload.workload_matrix,
+                by default the matrix of config/motr/m0crate_sweep.yaml
+        :param: str node: Cortx node on which m0crate runs, primary node by default
+        :keyword str base_file: base m0crate workload yaml
+        :keyword int repeat: runs per workload
+        :keyword str build: build number, results are saved as <LOG_DIR>/m0crate/<build>.json
+        :return: list of records
+        :rtype: list
+        """
+        sweep_cfg = M0CRATE_SWEEP_CFG[1]
+        matrix = matrix if matrix else m0crate_workload.workload_matrix(**sweep_cfg["matrix"])
+        base_cfg = config_utils.read_yaml(kwargs.get("base_file", sweep_cfg["base_file"]))[1]
+        node = node if node else self.get_primary_cortx_node()
+        node_enpts = self.get_cortx_node_endpoints(node)
+        motr_config = {"MOTR_HA_ADDR": node_enpts["hax_ep"], "PROF": self.profile_fid,
+                       "PROCESS_FID": node_enpts[common_const.MOTR_CLIENT][0]["fid"],
+                       "MOTR_LOCAL_ADDR": node_enpts[common_const.MOTR_CLIENT][0]["ep"]}
+        sources = {}
+
+        def run(params):
+            if params["iosize"] not in sources:
+                sources[params["iosize"]] = f'{TEMP_PATH}/m0crate_{params["iosize"]}'
+                self.dd_cmd(params["iosize"].upper(), "1", sources[params["iosize"]], node)
+            workload_file = os.path.join(TEMP_PATH, f'm0crate_{params["name"]}.yaml')
+            config_utils.write_yaml(workload_file, m0crate_workload.build_workload(
+                base_cfg, params, motr_config, sources[params["iosize"]]),
+                                    backup=False, sort_keys=False)
+            for resp in (self.node_obj.copy_file_to_remote(workload_file, workload_file),
+                         self.node_obj.copy_file_to_container(
+                             workload_file, self.node_pod_dict[node], workload_file,
+                             common_const.HAX_CONTAINER_NAME)):
+                assert_utils.assert_true(resp[0], resp[1])
+            start = time.perf_counter()
+            output = self.node_obj.send_k8s_cmd(
+                operation="exec", pod=self.node_pod_dict[node], namespace=common_const.NAMESPACE,
+                command_suffix=f"-c {common_const.HAX_CONTAINER_NAME} -- bash -c "
+                               f"{shlex.quote(m0crate_workload.m0crate_cmd(workload_file))}",
+                decode=True, timeout=kwargs.get("timeout", 3600))
+            return output, time.perf_counter() - start
+
+        records = m0crate_workload.run_sweep(matrix, run,
+                                             kwargs.get("repeat", sweep_cfg.get("repeat", 1)))
+        if kwargs.get("build"):
+            m0crate_workload.save_results(os.path.join(LOG_DIR, "m0crate",
+                                                       f'{kwargs["build"]}.json'),
+                                          kwargs["build"], records)
+        return records
+
+    # pylint: disable=too-many-arguments
+    def run_motr_io_concurrent(self, nodes=None, bsize_layout_map=BSIZE_LAYOUT_MAP,
+                               block_count=FILE_BLOCK_COUNT, run_m0cat=True, delete_objs=True,
+                               **kwargs):
+        """
+        Run m0cp, m0cat, md5sum and m0unlink of all objects concurrently on all client pods,
+        each object pipeline is a single script executed in the hax container
+        :param: list nodes: Cortx nodes, all client nodes by default
+        :param: dict bsize_layout_map: mapping of block size and layout for IOs to run
+        :param: list block_count: List containing the integer values of block counts
+        :param: bool run_m0cat: if True, will also run m0cat and compares the md5sum
+        :param: bool delete_objs: if True, will delete the created objects
+        :keyword int objects_per_size: objects per node for every block size and count
+        :keyword int timeout: max seconds for one object pipeline
+        :keyword bool exc: raise AssertionError if any object failed or is corrupted
+        :return: object dictionary as of run_motr_io with node, client, layout, status,
+                 error, verified, steps and latency per object, and the run summary
+        :rtype: tuple
+        """
+        engine = MotrIOEngine(self, self.fid_alloc, timeout=kwargs.get("timeout", 1200))
+        specs = engine.plan(nodes if nodes else self.cortx_node_list, bsize_layout_map,
+                            block_count, kwargs.get("objects_per_size", 1),
+                            run_m0cat=run_m0cat, delete_objs=delete_objs)
+        results, summary = engine.run(specs)
+        object_dict = {result.pop("obj"): result for result in results}
+        if kwargs.get("exc", True):
+            failed = {obj: res["error"] for obj, res in object_dict.items()
+                      if res["status"] != "ok"}
+            assert_utils.assert_false(failed, f"Motr IO failed for objects {failed}")
+        return object_dict, summary
+
     def run_io_in_parallel(self, node, bsize_layout_map=BSIZE_LAYOUT_MAP,
             block_count=FILE_BLOCK_COUNT, run_m0cat=True, delete_objs=True, return_dict=None):
         """
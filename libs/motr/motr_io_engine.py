@@ -0,0 +1,304 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+"""
+Concurrent motr I/O engine.
+
+Every object runs its whole pipeline (dd, m0cp, m0cat, md5sum, m0unlink) as one script in
+the hax container of a client pod, so an object costs a single kubectl exec round-trip.
+Objects are spread over all client pods and run concurrently, one worker per motr client
+endpoint since an endpoint can be used by only one motr process at a time.
+"""
+
+import logging
+import os
+import queue
+import re
+import shlex
+import statistics
+import threading
+import time
+from itertools import count as counter
+
+from commons import commands as common_cmd
+from commons import constants as common_const
+from commons.helpers.pods_helper import LogicalNode
+from libs.motr import TEMP_PATH
+
+log = logging.getLogger(__name__)
+
+STEP_RE = re.compile(r"^STEP (\S+) (-?\d+) (\d+)$")
+MD5_RE = re.compile(r"^MD5 (in|out) ([0-9a-f]{32})$")
+ERR_RE = re.compile(r"^ERR (\S+) (.*)$")
+
+STEP_FUNC = """step() {
+  n=$1; shift; s=$(date +%s%N)
+  "$@" > $W/$n.log 2>&1; rc=$?
+  [ $rc -eq 0 ] && grep -q ERROR $W/$n.log && rc=1
+  echo "STEP $n $rc $(( ($(date +%s%N) - s) / 1000 ))"
+  if [ $rc -ne 0 ]; then
+    echo "ERR $n $(tail -n 3 $W/$n.log | tr '\\n' ' ')"; rm -rf $W; exit 0
+  fi
+}"""
+
+
+class FidAllocator:
+    """Thread safe allocator of unique motr object ids 'hi:lo'."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, high: int = None):
+        """
+        :param high: High part of the ids, by default milliseconds since epoch combined with
+            the process id so concurrent and later runs never reuse ids.
+        """
+        self.high = high if high else (int(time.time() * 1000) << 16) | (os.getpid() & 0xffff)
+        self._low = counter(1)
+        self._lock = threading.Lock()
+
+    def allocate(self) -> str:
+        """Next object id."""
+        with self._lock:
+            return f"{self.high}:{next(self._low)}"
+
+
+def build_io_script(spec: dict, endpoint: dict, hax_ep: str, profile_fid: str,
+                    workdir: str = TEMP_PATH) -> str:
+    """
+    Shell script running the pipeline of one object and printing parsable step records.
+
+    :param spec: Object spec with obj, block_size, count, layout, run_m0cat and delete.
+    :param endpoint: Motr client endpoint dict with ep and fid.
+    :param hax_ep: Hax endpoint of the node.
+    :param profile_fid: Profile fid of the cluster.
+    :param workdir: Directory in the container for the object files.
+    :return: Script text.
+    """
+    bsize, bcount, obj, layout = (spec["block_size"], spec["count"], spec["obj"],
+                                  spec["layout"])
+    conn = (endpoint["ep"], hax_ep, endpoint["fid"], profile_fid)
+    lines = [f"W={workdir}/motr_io_{obj.replace(':', '_')}", "mkdir -p $W", STEP_FUNC,
+             "step dd " + common_cmd.CREATE_FILE.format("/dev/urandom", "$W/in", bsize,
+                                                        bcount),
+             'echo "MD5 in $(md5sum $W/in | cut -d \' \' -f 1)"',
+             "step m0cp " + common_cmd.M0CP.format(*conn, bsize.lower(), bcount, obj, layout,
+                                                   "$W/in")]
+    if spec.get("run_m0cat", True):
+        lines += ["step m0cat " + common_cmd.M0CAT.format(*conn, bsize.lower(), bcount, obj,
+                                                          layout, "$W/out"),
+                  'echo "MD5 out $(md5sum $W/out | cut -d \' \' -f 1)"']
+    if spec.get("delete", True):
+        lines.append("step m0unlink " + common_cmd.M0UNLINK.format(*conn, obj, layout))
+    lines.append("rm -rf $W")
+    return "\n".join(lines)
+
+
+def parse_io_output(spec: dict, output: str) -> dict:
+    """
+    Structured result of one object from the script output.
+
+    :param spec: Object spec the script was built from.
+    :param output: Script output.
+    :return: Result dict with obj, block_size, count, layout, steps (seconds per step),
+        latency, md5sum, verified, deleted, status (ok, failed or corrupted) and error.
+    """
+    result = {key: spec[key] for key in ("obj", "block_size", "count", "layout")}
+    result.update(node=spec.get("node"), client=spec.get("client"), steps={}, md5={},
+                  error=None)
+    for line in output.splitlines():
+        line = line.strip()
+        step, md5, error = STEP_RE.match(line), MD5_RE.match(line), ERR_RE.match(line)
+        if step:
+            result["steps"][step.group(1)] = int(step.group(3)) / 1e6
+            if int(step.group(2)):
+                result["error"] = result["error"] or f"{step.group(1)} exit {step.group(2)}"
+        elif md5:
+            result["md5"][md5.group(1)] = md5.group(2)
+        elif error:
+            result["error"] = f"{error.group(1)}: {error.group(2).strip()}"
+    result["latency"] = round(sum(result["steps"].values()), 6)
+    result["md5sum"] = result["md5"].get("out", result["md5"].get("in"))
+    result["verified"] = (result["md5"].get("in") == result["md5"].get("out")
+                          if "out" in result["md5"] else None)
+    result["deleted"] = "m0unlink" in result["steps"] and not result["error"]
+    expected = {"dd", "m0cp"} | ({"m0cat"} if spec.get("run_m0cat", True) else set())
+    if not result["error"] and not expected <= set(result["steps"]):
+        result["error"] = "incomplete output: " + output.strip()[-200:]
+    if result["error"]:
+        result["status"] = "failed"
+    elif result["verified"] is False:
+        result["status"] = "corrupted"
+        result["error"] = (f"md5sum mismatch in {result['md5']['in']} "
+                           f"out {result['md5']['out']}")
+    else:
+        result["status"] = "ok"
+    return result
+
+
+def summarize(results: list, wall: float) -> dict:
+    """
+    Aggregate object results of a run.
+
+    :param results: Results from parse_io_output.
+    :param wall: Wall clock seconds of the run.
+    :return: Dict with objects, ok, failed, corrupted, latency p50/p99/max and objects per
+        second.
+    """
+    latencies = sorted(result["latency"] for result in results if result["status"] == "ok")
+    summary = {status: sum(1 for result in results if result["status"] == status)
+               for status in ("ok", "failed", "corrupted")}
+    summary.update(objects=len(results), wall=round(wall, 3),
+                   objects_per_sec=round(len(results) / wall, 3) if wall else 0.0)
+    if latencies:
+        summary.update(latency_p50=round(statistics.median(latencies), 3),
+                       latency_p99=round(latencies[min(len(latencies) - 1,
+                                                       int(len(latencies) * 0.99))], 3),
+                       latency_max=round(latencies[-1], 3))
+    return summary
+
+
+class MotrIOEngine:
+    """Run motr object pipelines concurrently over all client pods."""
+
+    def __init__(self, motr_obj, fid_alloc: FidAllocator = None, **kwargs):
+        """
+        :param motr_obj: MotrCoreK8s object providing cluster endpoints and pods.
+        :param fid_alloc: Allocator of object ids.
+        :keyword workdir: Directory in the containers for object files.
+        :keyword timeout: Seconds allowed for one object pipeline.
+        :keyword execute: Callable(pod, script) returning the script output, by default
+            kubectl exec over a per worker ssh connection to the master node.
+        """
+        self.motr = motr_obj
+        self.fid_alloc = fid_alloc if fid_alloc else FidAllocator()
+        self.workdir = kwargs.get("workdir", TEMP_PATH)
+        self.timeout = kwargs.get("timeout", 1200)
+        self.execute = kwargs.get("execute", None)
+        self._local = threading.local()
+
+    def plan(self, nodes: list, bsize_layout_map: dict, block_count: list,
+             objects_per_size: int = 1, **kwargs) -> list:
+        """
+        Object specs for every block size and count, spread round robin over nodes.
+
+        :param nodes: Cortx client nodes.
+        :param bsize_layout_map: Mapping of block size and layout.
+        :param block_count: Block counts.
+        :param objects_per_size: Objects per node for every block size and count.
+        :keyword run_m0cat: Read back and verify md5sum.
+        :keyword delete_objs: Unlink objects.
+        :return: List of specs.
+        """
+        specs = []
+        for _ in range(objects_per_size):
+            for node in nodes:
+                for b_count in block_count:
+                    for b_size, layout in bsize_layout_map.items():
+                        specs.append({"obj": self.fid_alloc.allocate(), "node": node,
+                                      "block_size": b_size, "count": str(b_count),
+                                      "layout": layout,
+                                      "run_m0cat": kwargs.get("run_m0cat", True),
+                                      "delete": kwargs.get("delete_objs", True)})
+        return specs
+
+    def _execute(self, pod: str, script: str) -> str:
+        """Run script in the hax container over the ssh connection of this worker."""
+        if self.execute:
+            return self.execute(pod, script)
+        if not hasattr(self._local, "node"):
+            self._local.node = LogicalNode(hostname=self.motr.master_node,
+                                           username=self.motr.master_uname,
+                                           password=self.motr.master_passwd)
+        return self.motr_exec(self._local.node, pod, script)
+
+    def motr_exec(self, node_obj, pod: str, script: str) -> str:
+        """kubectl exec of script with bash in the hax container."""
+        return node_obj.send_k8s_cmd(
+            operation="exec", pod=pod, namespace=common_const.NAMESPACE,
+            command_suffix=f"-c {common_const.HAX_CONTAINER_NAME} -- "
+                           f"bash -c {shlex.quote(script)}",
+            decode=True, timeout=self.timeout)
+
+    @staticmethod
+    def failed_result(spec: dict, error: str) -> dict:
+        """Failed result of a spec which could not be run."""
+        result = parse_io_output(spec, "")
+        result["error"] = error
+        return result
+
+    def _worker(self, node: str, client_num: int, pending: queue.Queue, results: list):
+        """Run queued specs of a node on one motr client endpoint."""
+        endpoints = None
+        while True:
+            try:
+                spec = pending.get_nowait()
+            except queue.Empty:
+                return
+            spec["client"] = client_num
+            start = time.perf_counter()
+            try:
+                if endpoints is None:
+                    endpoints = self.motr.get_cortx_node_endpoints(node)
+                script = build_io_script(spec, endpoints[common_const.MOTR_CLIENT][client_num],
+                                         endpoints["hax_ep"], self.motr.profile_fid,
+                                         self.workdir)
+                result = parse_io_output(spec, self._execute(self.motr.node_pod_dict[node],
+                                                             script))
+            except Exception as error:  # pylint: disable=broad-except
+                result = self.failed_result(spec, str(error))
+            result["elapsed"] = round(time.perf_counter() - start, 6)
+            log.info("Object %s %s x %s on %s client %s: %s %.3fs", spec["obj"],
+                     spec["block_size"], spec["count"], node, client_num, result["status"],
+                     result["elapsed"])
+            results.append(result)
+
+    def run(self, specs: list) -> tuple:
+        """
+        Run object specs, every node's queue is drained by one worker per motr client.
+
+        Specs of a node without motr client endpoints are recorded as failed.
+        :param specs: Specs from plan.
+        :return: (results, summary)
+        """
+        queues, results, workers = {}, [], []
+        for spec in specs:
+            queues.setdefault(spec["node"], queue.Queue()).put(spec)
+        start = time.perf_counter()
+        for node, pending in queues.items():
+            try:
+                clients = len(self.motr.get_cortx_node_endpoints(node)[
+                    common_const.MOTR_CLIENT])
+                error = None if clients else f"No motr client endpoints on {node}"
+            except Exception as exc:  # pylint: disable=broad-except
+                clients, error = 0, f"Motr client endpoints of {node} not found: {exc}"
+            if error:
+                log.error(error)
+                while not pending.empty():
+                    results.append(self.failed_result(pending.get_nowait(), error))
+                continue
+            for client_num in range(clients):
+                worker = threading.Thread(target=self._worker, daemon=True,
+                                          name=f"motr-io-{node}-{client_num}",
+                                          args=(node, client_num, pending, results))
+                worker.start()
+                workers.append(worker)
+        for worker in workers:
+            worker.join()
+        summary = summarize(results, time.perf_counter() - start)
+        log.info("Motr IO summary: %s", summary)
+        return results, summary
@@ -26,13 +26,17 @@ import logging
 import os
 import re
 import sys
+import time
 
 import libs.motr as motr_cons
 from commons import commands
 from commons.helpers import node_helper
+from commons.params import LOG_DIR
 from commons.utils import assert_utils
+from commons.utils import config_utils
 from commons.utils import system_utils
 from config import CMN_CFG
+from libs.motr import m0crate_workload
 
 logger = logging.getLogger(__name__)
 
@@ -210,6 +214,52 @@ class MotrTestLib():
         cmd = f'm0crate -S {remote_file_path}'
         return cmd
 
+    def run_m0crate_sweep(self, matrix=None, base_file=None, **kwargs):
+        """
+        Generate m0crate workloads from a parameter matrix, run them on the first node and
+        parse throughput and latency of every run
+        :param matrix: workload parameters from m0crate_workload.workload_matrix, by default
+            the matrix of config/motr/m0crate_sweep.yaml
+        :param base_file: base m0crate workload yaml
+        :keyword repeat: runs per workload
+        :keyword build: build number, results are saved as <LOG_DIR>/m0crate/<build>.json
+        :return: list of records
+        """
+        sweep_cfg = motr_cons.M0CRATE_SWEEP_CFG[1]
+        matrix = matrix if matrix else m0crate_workload.workload_matrix(**sweep_cfg["matrix"])
+        base_cfg = config_utils.read_yaml(base_file if base_file else sweep_cfg["base_file"])[1]
+        ret = self.get_cluster_info(self.host_list[0])
+        assert_utils.assert_true(ret, "Not able to Fetch cluster INFO. Please check cluster status")
+        motr_config = {"MOTR_LOCAL_ADDR": self.local_endpoint, "MOTR_HA_ADDR": self.ha_endpoint,
+                       "PROF": self.profile_fid, "PROCESS_FID": self.process_fid}
+        sources = {}
+
+        def run(params):
+            if params["iosize"] not in sources:
+                sources[params["iosize"]] = f'{motr_cons.TEMP_PATH}/m0crate_{params["iosize"]}'
+                self.utils_obj.execute_cmd(motr_cons.CMD_DD_CREATE_FILE % (
+                    sources[params["iosize"]], params["iosize"].upper(), 1))
+                self.files_to_delete.append(sources[params["iosize"]])
+            workload_file = os.path.join(motr_cons.TEMP_PATH, f'm0crate_{params["name"]}.yaml')
+            config_utils.write_yaml(workload_file, m0crate_workload.build_workload(
+                base_cfg, params, motr_config, sources[params["iosize"]]),
+                                    backup=False, sort_keys=False)
+            self.utils_obj.copy_file_to_remote(workload_file, workload_file)
+            self.files_to_delete.append(workload_file)
+            start = time.perf_counter()
+            result, error, _ = system_utils.run_remote_cmd_wo_decision(
+                m0crate_workload.m0crate_cmd(workload_file), self.host_list[0],
+                self.uname_list[0], self.passwd_list[0])
+            return (result + error).decode("utf-8", "ignore"), time.perf_counter() - start
+
+        records = m0crate_workload.run_sweep(matrix, run,
+                                             kwargs.get("repeat", sweep_cfg.get("repeat", 1)))
+        if kwargs.get("build"):
+            m0crate_workload.save_results(os.path.join(LOG_DIR, "m0crate",
+                                                       f'{kwargs["build"]}.json'),
+                                          kwargs["build"], records)
+        return records
+
     @staticmethod
     def __other_parse_func(cmd_dict):
         """Other command like dd parse function"""
@@ -0,0 +1,427 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+Hardware inventory of worker nodes used for solution file generation.
+
+Disks, sizes, OS disk, NICs, memory and CPUs of all nodes are collected in parallel with a
+single remote command per node into a versioned snapshot which is cached on disk. Requested
+CVG, SNS and DIX layouts are validated against the snapshot before any deployment is
+attempted. The solution file has one storage section for all nodes, so a layout whose CVG
+devices differ between nodes (e.g. the OS on another disk) is rejected, not rendered per node.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from commons import commands as common_cmd
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+# OS disk assumed when lsblk output has no root mount, same as CMD_LIST_DEVICES.
+OS_DISK = "sda"
+SIZE_UNITS = {"": 1, "K": 10 ** 3, "M": 10 ** 6, "G": 10 ** 9, "T": 10 ** 12,
+              "KI": 2 ** 10, "MI": 2 ** 20, "GI": 2 ** 30, "TI": 2 ** 40}
+
+
+def parse_size(size: str) -> int:
+    """
+    Convert k8s quantity like 20Gi or 500G to bytes.
+
+    :param size: Quantity string.
+    :return: Size in bytes.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]i?)?B?\s*", str(size), re.I)
+    if not match:
+        raise ValueError(f"Invalid size {size}")
+    return int(float(match.group(1)) * SIZE_UNITS[(match.group(2) or "").upper()])
+
+
+class Disk:
+    """Block device of a node."""
+
+    def __init__(self, name: str, size: int, rotational: bool = True):
+        """
+        :param name: Kernel name e.g. sdb.
+        :param size: Size in bytes.
+        :param rotational: True for HDD.
+        """
+        self.name = name
+        self.size = size
+        self.rotational = rotational
+
+    @property
+    def path(self) -> str:
+        """Device path used in solution file."""
+        return f"/dev/{self.name}"
+
+    def to_dict(self) -> dict:
+        """JSON serializable dict."""
+        return {"name": self.name, "size": self.size, "rotational": self.rotational}
+
+
+def root_disks(disks: list, parents: dict, mounted: list) -> list:
+    """
+    Disks backing the root filesystem, through partitions, LVM or md devices.
+
+    :param disks: Disk names.
+    :param parents: Dict of {lsblk name: set of parent names}.
+    :param mounted: Names of the devices mounted on /.
+    :return: Sorted disk names.
+    """
+    found = set()
+    seen = set()
+    pending = list(mounted)
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        if name in disks:
+            found.add(name)
+        pending.extend(parents.get(name, ()))
+    return sorted(found)
+
+
+class NodeInventory:
+    """Hardware inventory of one node."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, hostname: str, disks: list, cpus: int, memory: int, nics: dict,
+                 os_disks: list = None):
+        """
+        :param hostname: Node hostname.
+        :param disks: Disk objects in lsblk order.
+        :param cpus: Number of CPUs.
+        :param memory: Memory in bytes.
+        :param nics: Dict of {interface: [ipv4 addresses]}.
+        :param os_disks: Names of disks holding the root filesystem, defaults to OS_DISK.
+        """
+        self.hostname = hostname
+        self.disks = disks
+        self.cpus = cpus
+        self.memory = memory
+        self.nics = nics
+        self.os_disks = list(os_disks or [OS_DISK])
+
+    @property
+    def devices(self) -> list:
+        """Disks available for CORTX, first one is the system disk for local volumes."""
+        return [disk for disk in self.disks if disk.name not in self.os_disks]
+
+    @classmethod
+    def parse(cls, hostname: str, output: str):
+        """
+        Parse CMD_HW_INVENTORY output.
+
+        :param hostname: Node hostname.
+        :param output: Command output.
+        :return: NodeInventory
+        """
+        sections = {}
+        current = None
+        for line in output.splitlines():
+            line = line.strip()
+            if line.startswith("##"):
+                current = sections.setdefault(line[2:], [])
+            elif line and current is not None:
+                current.append(line)
+        disks = []
+        parents = {}
+        mounted = []
+        for line in sections.get("disks", []):
+            fields = dict(token.split("=", 1) for token in shlex.split(line))
+            if fields.get("TYPE") == "disk":
+                disks.append(Disk(fields["NAME"], int(fields["SIZE"]), fields.get("ROTA") == "1"))
+            if fields.get("PKNAME"):
+                parents.setdefault(fields["NAME"], set()).add(fields["PKNAME"])
+            if fields.get("MOUNTPOINT") == "/":
+                mounted.append(fields["NAME"])
+        os_disks = root_disks([disk.name for disk in disks], parents, mounted)
+        if not os_disks:
+            LOGGER.warning("%s: root filesystem disk not found, assuming %s", hostname, OS_DISK)
+        cpus = int(sections["cpus"][0]) if sections.get("cpus") else 0
+        memory = 0
+        if sections.get("memory"):
+            memory = int(sections["memory"][0].split()[1]) * 1024
+        nics = {}
+        for line in sections.get("nics", []):
+            fields = line.split()
+            if len(fields) > 3 and fields[2] == "inet":
+                nics.setdefault(fields[1], []).append(fields[3].split("/")[0])
+        return cls(hostname, disks, cpus, memory, nics, os_disks)
+
+    def to_dict(self) -> dict:
+        """JSON serializable dict."""
+        return {"hostname": self.hostname, "disks": [disk.to_dict() for disk in self.disks],
+                "cpus": self.cpus, "memory": self.memory, "nics": self.nics,
+                "os_disks": self.os_disks}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create NodeInventory from to_dict output."""
+        return cls(data["hostname"], [Disk(**disk) for disk in data["disks"]], data["cpus"],
+                   data["memory"], data["nics"], data["os_disks"])
+
+
+class ClusterInventory:
+    """Versioned hardware snapshot of all worker nodes."""
+
+    def __init__(self, nodes: list, collected_at: float = None):
+        """
+        :param nodes: NodeInventory objects in worker order.
+        :param collected_at: Epoch of collection.
+        """
+        self.nodes = nodes
+        self.collected_at = collected_at or time.time()
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of hardware content, changes whenever any node hardware changes."""
+        content = json.dumps([node.to_dict() for node in self.nodes], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @property
+    def hostnames(self) -> list:
+        """Hostnames in worker order."""
+        return [node.hostname for node in self.nodes]
+
+    @classmethod
+    def collect(cls, node_objs: list, max_workers: int = 16):
+        """
+        Collect inventory of all nodes in parallel, one remote command per node.
+
+        :param node_objs: Node objects supporting execute_cmd.
+        :param max_workers: Max nodes queried concurrently.
+        :return: ClusterInventory
+        """
+        def _collect(node_obj):
+            output = node_obj.execute_cmd(cmd=common_cmd.CMD_HW_INVENTORY, read_lines=True)
+            output = "".join(line if isinstance(line, str) else line.decode() for line in output)
+            return NodeInventory.parse(node_obj.hostname, output)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(node_objs)))) as pool:
+            nodes = list(pool.map(_collect, node_objs))
+        inventory = cls(nodes)
+        LOGGER.info("Collected hardware inventory of %s nodes, fingerprint %s", len(nodes),
+                    inventory.fingerprint[:12])
+        return inventory
+
+    def to_dict(self) -> dict:
+        """JSON serializable snapshot."""
+        return {"version": SCHEMA_VERSION, "collected_at": self.collected_at,
+                "fingerprint": self.fingerprint,
+                "nodes": [node.to_dict() for node in self.nodes]}
+
+    def save(self, path: str) -> None:
+        """Write snapshot to path atomically."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fptr:
+            json.dump(self.to_dict(), fptr, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, hostnames: list = None, max_age: float = None):
+        """
+        Load cached snapshot.
+
+        :param path: Snapshot file.
+        :param hostnames: Expected hostnames in worker order, cache is ignored if different.
+        :param max_age: Max snapshot age in seconds, cache is ignored if older.
+        :return: ClusterInventory or None if cache is missing, stale or of other version.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as fptr:
+            data = json.load(fptr)
+        if data.get("version") != SCHEMA_VERSION:
+            return None
+        inventory = cls([NodeInventory.from_dict(node) for node in data["nodes"]],
+                        data["collected_at"])
+        if hostnames is not None and inventory.hostnames != list(hostnames):
+            return None
+        if max_age is not None and time.time() - inventory.collected_at > max_age:
+            return None
+        if inventory.fingerprint != data.get("fingerprint"):
+            LOGGER.warning("Inventory snapshot %s is corrupted, ignoring it", path)
+            return None
+        return inventory
+
+    @classmethod
+    def get(cls, node_objs: list, path: str, **kwargs):
+        """
+        Return cached snapshot or collect and cache a new one.
+
+        :param node_objs: Node objects.
+        :param path: Snapshot file.
+        :keyword max_age: Max age of cached snapshot in seconds.
+        :keyword refresh: Ignore cache.
+        :keyword max_workers: Max nodes queried concurrently.
+        :return: ClusterInventory
+        """
+        if not kwargs.get("refresh", False):
+            inventory = cls.load(path, [node.hostname for node in node_objs],
+                                 kwargs.get("max_age"))
+            if inventory:
+                LOGGER.info("Using cached hardware inventory %s", path)
+                return inventory
+        inventory = cls.collect(node_objs, kwargs.get("max_workers", 16))
+        inventory.save(path)
+        return inventory
+
+    def system_disks(self) -> dict:
+        """System disk of every node used for local path provisioner."""
+        return {node.hostname: node.devices[0].path for node in self.nodes if node.devices}
+
+
+class SolutionLayout:
+    """Requested CVG, SNS and DIX layout of a solution file."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, cvg_count: int = 2, cvg_type: str = "ios", data_disk_per_cvg: int = 0,
+                 sns: tuple = (1, 0, 0), dix: tuple = (1, 0, 0), **kwargs):
+        """
+        :param cvg_count: CVGs per node.
+        :param cvg_type: ios or cas.
+        :param data_disk_per_cvg: Data disks per CVG, 0 to use all available disks.
+        :param sns: SNS (N, K, S).
+        :param dix: DIX (N, K, S).
+        :keyword size_metadata: Size of metadata disk.
+        :keyword size_data_disk: Size of data disk.
+        """
+        self.cvg_count = cvg_count
+        self.cvg_type = cvg_type
+        self.data_disk_per_cvg = data_disk_per_cvg
+        self.sns = tuple(sns)
+        self.dix = tuple(dix)
+        self.size_metadata = kwargs.get("size_metadata", "20Gi")
+        self.size_data_disk = kwargs.get("size_data_disk", "20Gi")
+
+    def resolve_data_disks(self, inventory: ClusterInventory) -> int:
+        """Data disks per CVG, derived from smallest node when not requested."""
+        if self.data_disk_per_cvg:
+            return self.data_disk_per_cvg
+        available = min(len(node.devices) for node in inventory.nodes) - self.cvg_count - 1
+        return max(available // self.cvg_count, 0)
+
+    def node_devices(self, node: NodeInventory, per_cvg: int) -> tuple:
+        """
+        Assign devices of a node to CVGs, its first device is the system disk.
+
+        :param node: NodeInventory.
+        :param per_cvg: Data disks per CVG.
+        :return: (metadata devices, list of data devices per CVG)
+        """
+        paths = [disk.path for disk in node.devices]
+        metadata = paths[1:self.cvg_count + 1]
+        data = paths[self.cvg_count + 1:]
+        return metadata, [data[i * per_cvg:(i + 1) * per_cvg] for i in range(self.cvg_count)]
+
+    def devices(self, inventory: ClusterInventory) -> dict:
+        """
+        Assign devices of every node to CVGs, used to check they are the same on all nodes.
+
+        :return: {hostname: (metadata devices, list of data devices per CVG)}
+        """
+        per_cvg = self.resolve_data_disks(inventory)
+        return {node.hostname: self.node_devices(node, per_cvg) for node in inventory.nodes}
+
+    # pylint: disable=too-many-locals
+    def validate(self, inventory: ClusterInventory, skip_disk_count_check: bool = False) -> tuple:
+        """
+        Validate layout against inventory, nodes whose CVG devices differ from the first
+        node are errors since the solution storage section is shared.
+
+        :param inventory: ClusterInventory.
+        :param skip_disk_count_check: Skip N+K+S against CVG count check.
+        :return: (True/False, list of errors)
+        """
+        errors = []
+        if not inventory.nodes:
+            return False, ["Inventory has no nodes"]
+        nodes = len(inventory.nodes)
+        if not skip_disk_count_check and sum(self.sns) > self.cvg_count * nodes:
+            errors.append(f"SNS {self.sns} needs {sum(self.sns)} CVGs, only "
+                          f"{self.cvg_count * nodes} are available")
+        if sum(self.dix) > nodes:
+            errors.append(f"DIX {self.dix} needs {sum(self.dix)} nodes, only {nodes} available")
+        per_cvg = self.resolve_data_disks(inventory)
+        if per_cvg < 1:
+            errors.append("No data disk available for CVGs")
+        needed = 1 + self.cvg_count + self.cvg_count * per_cvg
+        size_metadata = parse_size(self.size_metadata)
+        size_data = parse_size(self.size_data_disk)
+        shared = None
+        for node in inventory.nodes:
+            if len(node.devices) < needed:
+                errors.append(f"{node.hostname}: needs {needed} disks, has {len(node.devices)}")
+                continue
+            sizes = {disk.path: disk.size for disk in node.devices}
+            metadata, data = self.node_devices(node, per_cvg)
+            for path in metadata:
+                if sizes[path] < size_metadata:
+                    errors.append(f"{node.hostname}: metadata device {path} smaller than "
+                                  f"{self.size_metadata}")
+            for path in (path for cvg in data for path in cvg):
+                if sizes[path] < size_data:
+                    errors.append(f"{node.hostname}: data device {path} smaller than "
+                                  f"{self.size_data_disk}")
+            # Storage section of the solution file is shared by all nodes
+            if shared is None:
+                shared = (node.hostname, metadata, data)
+            elif (metadata, data) != shared[1:]:
+                errors.append(f"{node.hostname}: CVG devices {metadata + sum(data, [])} differ "
+                              f"from {shared[0]} {shared[1] + sum(shared[2], [])}")
+        for error in errors:
+            LOGGER.error("Invalid layout: %s", error)
+        return not errors, errors
+
+    def storage_section(self, inventory: ClusterInventory) -> dict:
+        """
+        Solution file storage section shared by all nodes.
+
+        :raises ValueError: CVG devices differ across nodes, per node devices are not supported.
+        """
+        layouts = list(self.devices(inventory).values())
+        if any(layout != layouts[0] for layout in layouts):
+            raise ValueError("CVG devices differ across nodes, validate the layout first")
+        metadata, data = layouts[0]
+        storage = {}
+        for cvg in range(self.cvg_count):
+            storage[f"cvg{cvg + 1}"] = {
+                "name": f"cvg-0{cvg + 1}",
+                "type": self.cvg_type,
+                "devices": {
+                    "metadata": {"device": metadata[cvg], "size": self.size_metadata},
+                    "data": {f"d{disk + 1}": {"device": path, "size": self.size_data_disk}
+                             for disk, path in enumerate(data[cvg])}}}
+        return storage
+
+    def durability(self) -> dict:
+        """Solution file durability section."""
+        return {"sns": "+".join(str(each) for each in self.sns),
+                "dix": "+".join(str(each) for each in self.dix)}
@@ -31,7 +31,6 @@ import shutil
 import signal
 import string
 import time
-from threading import Thread
 from typing import List
 from string import Template
 import requests.exceptions
@@ -52,6 +51,10 @@ from config import S3_CFG
 from config import PROV_TEST_CFG
 from config import CMN_CFG
 from libs.csm.rest.csm_rest_s3user import RestS3user
+from libs.prov.prov_inventory import ClusterInventory
+from libs.prov.prov_inventory import SolutionLayout
+from libs.prov.prov_step_graph import StepGraph
+from libs.prov.prov_step_graph import poll
 from libs.prov.provisioner import Provisioner
 from libs.s3 import S3H_OBJ
 from libs.s3.s3_test_lib import S3TestLib
@@ -363,24 +366,6 @@ class ProvDeployK8sCortxLib:
         if len(worker_node_list) == 0:
             return False, "Minimum one worker node needed for deployment"
 
-        def _operation_on_worker_node():
-            for node in worker_node_list:
-                pre_req_resp = self.prereq_vm(node)
-                assert_utils.assert_true(pre_req_resp[0], pre_req_resp[1])
-                system_disk = system_disk_dict[node.hostname]
-                self.prereq_git(node, git_tag)
-                self.copy_sol_file(node, sol_file_path, self.deploy_cfg["k8s_dir"])
-                # system disk will be used mount /mnt/fs-local-volume on worker node
-                self.execute_prereq_cortx(node, self.deploy_cfg["k8s_dir"], system_disk)
-
-            thread_list = []
-            for each in worker_node_list:
-                worker_thread = Thread(target=self.pull_cortx_image, args=(each,))
-                worker_thread.start()
-                thread_list.append(worker_thread)
-            for each in thread_list:
-                each.join()
-
         def _post_deploy_check(resp):
             if not resp[1]:
                 LOGGER.info("Setting the current namespace")
@@ -403,16 +388,87 @@ class ProvDeployK8sCortxLib:
                         lines = file.read()
                         LOGGER.debug(lines)
 
-        _operation_on_worker_node()
-        self.prereq_git(master_node_list[0], git_tag)
-        self.copy_sol_file(master_node_list[0], sol_file_path, self.deploy_cfg["k8s_dir"])
-        pre_check_resp = self.pre_check(master_node_list[0])
-        LOGGER.debug("pre-check result %s", pre_check_resp)
-        deploy_resp = self.deploy_cluster(master_node_list[0], self.deploy_cfg["k8s_dir"])
+        graph = self.deploy_flow(sol_file_path, master_node_list[0], worker_node_list,
+                                 system_disk_dict, git_tag)
+        resp = graph.run(resume=kwargs.get("resume", False))
+        deploy_step = graph.steps["deploy_cluster"]
+        if deploy_step.result is None:
+            LOGGER.error("Deployment not started, failed steps %s", resp[1]["failed"])
+            return False, resp[1]
+        deploy_resp = deploy_step.result
         LOGGER.debug("Deploy script response %s", deploy_resp)
         _post_deploy_check(deploy_resp)
         return deploy_resp
 
+    def flow_graph(self, flow: str) -> StepGraph:
+        """
+        Create step graph for deploy/destroy/upgrade flow.
+        State of completed steps is kept in test data folder to resume a crashed flow.
+        param: flow: Flow name
+        return: StepGraph
+        """
+        if not os.path.exists(self.test_dir_path):
+            system_utils.make_dirs(self.test_dir_path)
+        return StepGraph(flow, max_workers=self.deploy_cfg["flow_max_workers"],
+                         state_file=os.path.join(self.test_dir_path, f"{flow}_flow_state.json"))
+
+    # pylint: disable=too-many-arguments
+    def deploy_flow(self, sol_file_path: str, master_node_obj: LogicalNode,
+                    worker_node_list: list, system_disk_dict: dict, git_tag: str) -> StepGraph:
+        """
+        Build deployment DAG.
+        Prerequisites of every worker run in parallel with other workers, image pull of a worker
+        starts right after its prerequisites and deployment starts once all workers are ready.
+        A pre-check failure aborts the deployment only when pre_check_abort is set in config,
+        otherwise it is logged and deployment continues.
+        param: sol_file_path: Local Solution file path
+        param: master_node_obj: Master node(Logical Node object)
+        param: worker_node_list: List of all worker nodes(Logical Node object)
+        param: system_disk_dict: System disk of each worker node
+        param: git_tag: tag of service repo
+        return: StepGraph
+        """
+        k8s_dir = self.deploy_cfg["k8s_dir"]
+
+        def _pre_check(node_obj):
+            try:
+                return self.pre_check(node_obj)
+            except Exception as error:  # pylint: disable=broad-except
+                if self.deploy_cfg["pre_check_abort"]:
+                    raise
+                LOGGER.warning("Pre-check failed, continuing deployment: %s", error)
+                return True, error
+
+        graph = self.flow_graph("deploy")
+        ready = []
+        for node in worker_node_list:
+            host = node.hostname
+            vm_step = graph.add_step(f"prereq_vm:{host}", self.prereq_vm, node, node=host)
+            git_step = graph.add_step(f"prereq_git:{host}", self.prereq_git, node, git_tag,
+                                      deps=[vm_step], node=host)
+            copy_step = graph.add_step(f"copy_sol_file:{host}", self.copy_sol_file, node,
+                                       sol_file_path, k8s_dir, deps=[git_step], node=host)
+            # system disk will be used mount /mnt/fs-local-volume on worker node
+            prereq_step = graph.add_step(f"execute_prereq_cortx:{host}",
+                                         self.execute_prereq_cortx, node, k8s_dir,
+                                         system_disk_dict[host], deps=[copy_step], node=host)
+            ready.append(prereq_step)
+            ready.append(graph.add_step(f"pull_cortx_image:{host}", self.pull_cortx_image, node,
+                                        deps=[prereq_step], node=host))
+        master = master_node_obj.hostname
+        # Master may be a worker too, its repo must not be re-cloned while prereq is running
+        master_deps = [name for name in ready if name == f"execute_prereq_cortx:{master}"]
+        git_step = graph.add_step(f"prereq_git:master:{master}", self.prereq_git,
+                                  master_node_obj, git_tag, deps=master_deps, node=master)
+        copy_step = graph.add_step(f"copy_sol_file:master:{master}", self.copy_sol_file,
+                                   master_node_obj, sol_file_path, k8s_dir, deps=[git_step],
+                                   node=master)
+        check_step = graph.add_step("pre_check", _pre_check, master_node_obj,
+                                    deps=ready + [copy_step], node=master)
+        graph.add_step("deploy_cluster", self.deploy_cluster, master_node_obj, k8s_dir,
+                       deps=[check_step], node=master)
+        return graph
+
     def checkout_solution_file(self, git_tag):
         """
         Method to checkout solution.yaml file
@@ -426,14 +482,52 @@ class ProvDeployK8sCortxLib:
         shutil.copyfile(self.deploy_cfg["new_file_path"], self.deploy_cfg['solution_file'])
         return self.deploy_cfg["solution_file"]
 
+    def get_hw_inventory(self, worker_obj: list, refresh: bool = False) -> ClusterInventory:
+        """
+        Get hardware inventory of worker nodes, cached snapshot is reused while it is fresh.
+        :Param: worker_obj: list of worker node object
+        :Param: refresh: collect new snapshot even if cached one is fresh
+        returns ClusterInventory
+        """
+        if not os.path.exists(self.test_dir_path):
+            system_utils.make_dirs(self.test_dir_path)
+        return ClusterInventory.get(worker_obj,
+                                    os.path.join(self.test_dir_path, "hw_inventory.json"),
+                                    max_age=self.deploy_cfg["inventory_max_age"],
+                                    refresh=refresh)
+
+    @staticmethod
+    def load_sol_file(filepath: str) -> dict:
+        """
+        Load solution file.
+        :Param: filepath: Filename with complete path
+        returns solution dict
+        """
+        with open(filepath) as soln:
+            return yaml.safe_load(soln)
+
+    @staticmethod
+    def dump_sol_file(conf: dict, filepath: str) -> tuple:
+        """
+        Write solution file.
+        :Param: conf: solution dict
+        :Param: filepath: Filename with complete path
+        returns True, filepath
+        """
+        noalias_dumper = yaml.dumper.SafeDumper
+        noalias_dumper.ignore_aliases = lambda self, data: True
+        with open(filepath, 'w') as soln:
+            yaml.dump(conf, soln, default_flow_style=False,
+                      sort_keys=False, Dumper=noalias_dumper)
+        return True, filepath
+
     # pylint: disable=too-many-locals
-    # pylint: disable=too-many-branches
-    # pylint: disable=too-many-statements
-    # pylint: disable=too-many-return-statements
     def update_sol_yaml(self, worker_obj: list, filepath: str, cortx_image: str,
                         **kwargs):
         """
         This function updates the yaml file
+        Hardware inventory of workers is validated against requested layout and the whole
+        solution file is rendered in one pass.
         :Param: worker_obj: list of worker node object
         :Param: filepath: Filename with complete path
         :Param: cortx_image: this is cortx image name
@@ -454,177 +548,84 @@ class ProvDeployK8sCortxLib:
         :Keyword: cortx_server_image: to provide cortx server image
         :Keyword: service_type: to provide service type as LoadBalancer/NodePort
         :Keyword: namespace: to provide custom namespace
+        :Keyword: refresh_inventory: collect hardware inventory even if cached one is fresh
         returns the status, filepath and system reserved disk
         """
-        cvg_count = kwargs.get("cvg_count", 2)
-        cvg_type = kwargs.get("cvg_type", "ios")
-        data_disk_per_cvg = kwargs.get("data_disk_per_cvg", 0)
-        sns_data = kwargs.get("sns_data", 1)
-        sns_parity = kwargs.get("sns_parity", 0)
-        sns_spare = kwargs.get("sns_spare", 0)
-        dix_data = kwargs.get("dix_data", 1)
-        dix_parity = kwargs.get("dix_parity", 0)
-        dix_spare = kwargs.get("dix_spare", 0)
-        size_metadata = kwargs.get("size_metadata", '20Gi')
-        size_data_disk = kwargs.get("size_data_disk", '20Gi')
+        layout = SolutionLayout(cvg_count=kwargs.get("cvg_count", 2),
+                                cvg_type=kwargs.get("cvg_type", "ios"),
+                                data_disk_per_cvg=kwargs.get("data_disk_per_cvg", 0),
+                                sns=(kwargs.get("sns_data", 1), kwargs.get("sns_parity", 0),
+                                     kwargs.get("sns_spare", 0)),
+                                dix=(kwargs.get("dix_data", 1), kwargs.get("dix_parity", 0),
+                                     kwargs.get("dix_spare", 0)),
+                                size_metadata=kwargs.get("size_metadata", '20Gi'),
+                                size_data_disk=kwargs.get("size_data_disk", '20Gi'))
         skip_disk_count_check = kwargs.get("skip_disk_count_check", False)
         third_party_images_dict = kwargs.get("third_party_images",
                                              self.deploy_cfg['third_party_images'])
         cortx_server_image = kwargs.get("cortx_server_image", None)
         cortx_data_image = kwargs.get("cortx_data_image", None)
         log_path = kwargs.get("log_path", self.deploy_cfg['log_path'])
-        service_type = kwargs.get("service_type", self.deploy_cfg['service_type'])
         namespace = kwargs.get("namespace", self.deploy_cfg['namespace'])
-        nodeport_http = kwargs.get("http_port", self.deploy_cfg['http_port'])
-        nodeport_https = kwargs.get("https_port", self.deploy_cfg['https_port'])
-        control_nodeport_https = kwargs.get("control_https_port",
-                                            self.deploy_cfg['control_port_https'])
         deployment_type = kwargs.get("deployment_type", self.deployment_type)
         client_instance = kwargs.get("client_instance", self.client_instance)
 
-        LOGGER.debug("Service type & Ports are %s\n%s\n%s\n%s", service_type,
-                     nodeport_http, nodeport_https, control_nodeport_https)
-        LOGGER.debug("Client instances are %s", self.client_instance)
-        node_list = len(worker_obj)
-        valid_disk_count = sns_spare + sns_data + sns_parity
-        sys_disk_pernode = {}  # empty dict
-        data_devices = []  # empty list for data disk
-        metadata_devices = []
-        for node_count, node_obj in enumerate(worker_obj, start=1):
-            LOGGER.info(node_count)
-            device_list = node_obj.execute_cmd(cmd=common_cmd.CMD_LIST_DEVICES,
-                                               read_lines=True)[0].split(",")
-            device_list[-1] = device_list[-1].replace("\n", "")
-            metadata_devices = device_list[1:cvg_count + 1]
-            LOGGER.info(metadata_devices)
-            # This will split the metadata disk list
-            # into metadata devices per cvg
-            # 2 is defined the split size based
-            # on disk required for metadata,system
-            device_list_len = len(device_list)
-            new_device_lst_len = (device_list_len - cvg_count - 1)
-            count = cvg_count
-            if data_disk_per_cvg == 0:
-                data_disk_per_cvg = int(len(device_list[cvg_count + 1:]) / cvg_count)
-
-            LOGGER.debug("Data disk per cvg : %s", data_disk_per_cvg)
-            # The condition to validate the config.
-            if not skip_disk_count_check and valid_disk_count > \
-                    (cvg_count * node_list):
-                return False, "The sum of data disks per cvg " \
-                              "is less than N+K+S count"
-
-            if new_device_lst_len < data_disk_per_cvg * cvg_count:
-                return False, "The requested data disk is more than" \
-                              " the data disk available on the system"
-            # This condition validated the total available disk count
-            # and split the disks per cvg.
-            data_devices_f = device_list[cvg_count + 1:]
-            if (data_disk_per_cvg * cvg_count) < new_device_lst_len:
-                count_end = int(data_disk_per_cvg)
-                data_devices.append(data_devices_f[0:count_end])
-                while count:
-                    count = count - 1
-                    new_end = int(count_end + data_disk_per_cvg)
-                    if new_end > new_device_lst_len:
-                        break
-                    data_devices_ad = data_devices_f[count_end:new_end]
-                    count_end = int(count_end + data_disk_per_cvg)
-                    data_devices.append(data_devices_ad)
-            else:
-                LOGGER.debug("Data devices : else : %s", data_devices_f)
-                LOGGER.debug("data disk per cvg : %s", data_disk_per_cvg)
-                data_devices = [data_devices_f[i:i + data_disk_per_cvg]
-                                for i in range(0, len(data_devices_f), data_disk_per_cvg)]
-            # Create dict for host and disk
-            system_disk = device_list[0]
-            schema = {node_obj.hostname: system_disk}
-            sys_disk_pernode.update(schema)
-        LOGGER.info("Metadata disk %s", metadata_devices)
-        LOGGER.info("data disk %s", data_devices)
+        LOGGER.debug("Service type & Ports are %s\n%s\n%s\n%s", self.service_type,
+                     self.nodeport_http, self.nodeport_https, self.control_nodeport_https)
+        LOGGER.debug("Client instances are %s", client_instance)
+        inventory = self.get_hw_inventory(worker_obj, kwargs.get("refresh_inventory", False))
+        resp = layout.validate(inventory, skip_disk_count_check)
+        if not resp[0]:
+            return False, "; ".join(resp[1])
+        sys_disk_pernode = inventory.system_disks()
+        LOGGER.info("Storage layout %s", layout.storage_section(inventory))
+
+        conf = self.load_sol_file(filepath)
         # Update the solution yaml file with service_type,deployment type, ports,namespace
-        resp_passwd = self.update_miscellaneous_param(filepath, log_path,
-                                                      nodeport_http=self.nodeport_http,
-                                                      nodeport_https=self.nodeport_https,
-                                                      control_nodeport_https=
-                                                      self.control_nodeport_https,
-                                                      service_type=self.service_type,
-                                                      deployment_type=deployment_type,
-                                                      namespace=namespace,
-                                                      lb_count=self.lb_count,
-                                                      client_instance=client_instance)
-        if not resp_passwd[0]:
-            return False, "Failed to update service type,deployment type, ports in solution file"
-        # Update resources for third_party
-        resource_resp = self.update_res_limit_third_party(filepath)
-        if not resource_resp:
-            return False, "Failed to update the resources for thirdparty"
-        # Update resources for cortx component
-        cortx_resource_resp = self.update_res_limit_cortx(filepath)
-        if not cortx_resource_resp:
-            return False, "Failed to update the resources for cortx components"
+        self.set_miscellaneous_param(conf, log_path,
+                                     nodeport_http=self.nodeport_http,
+                                     nodeport_https=self.nodeport_https,
+                                     control_nodeport_https=self.control_nodeport_https,
+                                     service_type=self.service_type,
+                                     deployment_type=deployment_type,
+                                     namespace=namespace,
+                                     lb_count=self.lb_count,
+                                     client_instance=client_instance)
+        # Update resources for third_party and cortx component
+        self.set_res_limit_third_party(conf)
+        self.set_res_limit_cortx(conf)
         # Update the solution yaml file with images
-        resp_image = self.update_image_section_sol_file(filepath, third_party_images_dict,
-                                                        cortx_image=cortx_image,
-                                                        cortx_server_image=cortx_server_image,
-                                                        cortx_data_image=cortx_data_image)
-        if not resp_image[0]:
-            return False, "Failed to update images in solution file"
-
+        self.set_image_section(conf, third_party_images_dict, cortx_image=cortx_image,
+                               cortx_server_image=cortx_server_image,
+                               cortx_data_image=cortx_data_image)
         # Update the solution yaml file with cvg
-        resp_cvg = self.update_cvg_sol_file(filepath, metadata_devices,
-                                            data_devices, data_disk_per_cvg,
-                                            cvg_count=cvg_count,
-                                            cvg_type=cvg_type,
-                                            sns_data=sns_data,
-                                            sns_parity=sns_parity,
-                                            sns_spare=sns_spare,
-                                            dix_data=dix_data,
-                                            dix_parity=dix_parity,
-                                            dix_spare=dix_spare,
-                                            size_metadata=size_metadata,
-                                            size_data_disk=size_data_disk)
-        if not resp_cvg[0]:
-            return False, "Fail to update the cvg details in solution file"
-
+        conf['solution']['storage'] = layout.storage_section(inventory)
+        conf['solution']['common']['storage_sets']['durability'].update(layout.durability())
         # Update the solution yaml file with node
-        resp_node = self.update_nodes_sol_file(filepath, worker_obj)
-        if not resp_node[0]:
-            return False, "Failed to update nodes details in solution file"
+        self.set_nodes(conf, inventory.hostnames)
+        self.dump_sol_file(conf, filepath)
         return True, filepath, sys_disk_pernode
 
     @staticmethod
-    def update_nodes_sol_file(filepath, worker_obj):
+    def set_nodes(conf: dict, hostnames: list):
+        """
+        Set nodes section of solution dict.
+        Param: conf: solution dict
+        Param: hostnames: list of worker hostnames
+        """
+        conf['solution']['nodes'] = {f"node{item + 1}": {'name': host}
+                                     for item, host in enumerate(hostnames)}
+
+    def update_nodes_sol_file(self, filepath, worker_obj):
         """
         Method to update the nodes section in solution.yaml
         Param: filepath: Filename with complete path
         Param: worker_obj: list of node object
         :returns the filepath and status True
         """
-        node_list = len(worker_obj)
-        with open(filepath) as soln:
-            conf = yaml.safe_load(soln)
-            node = conf['solution']['nodes']
-            total_nodes = node.keys()
-            # Removing the elements from the node dict
-            for key_count in list(total_nodes):
-                node.pop(key_count)
-            # Updating the node dict
-            for item, host in zip(list(range(node_list)), worker_obj):
-                dict_node = {}
-                name = {'name': host.hostname}
-                dict_node.update(name)
-                new_node = {Template('node$num').substitute(num=item + 1): dict_node}
-                node.update(new_node)
-            conf['solution']['nodes'] = node
-            soln.close()
-        noalias_dumper = yaml.dumper.SafeDumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
-        with open(filepath, 'w') as soln:
-            yaml.dump(conf, soln, default_flow_style=False,
-                      sort_keys=False, Dumper=noalias_dumper)
-            soln.close()
-        return True, filepath
+        conf = self.load_sol_file(filepath)
+        self.set_nodes(conf, [host.hostname for host in worker_obj])
+        return self.dump_sol_file(conf, filepath)
 
     # pylint: disable-msg=too-many-locals
     @staticmethod
@@ -708,15 +709,14 @@ class ProvDeployK8sCortxLib:
             soln.close()
         return True, filepath
 
-    def update_image_section_sol_file(self, filepath, third_party_images_dict,
-                                      **kwargs):
+    def set_image_section(self, conf: dict, third_party_images_dict, **kwargs):
         """
-        Method use to update the Images section in solution.yaml
-        Param: filepath: filename with complete path
-        cortx_image: this is cortx image name
+        Set images section of solution dict.
+        Param: conf: solution dict
         third_party_image: dict of third party image
+        cortx_image: this is cortx image name
         cortx_server_image: cortx_server image name
-        :returns the status, filepath
+        cortx_data_image: cortx_data image name
         """
         cortx_image = kwargs.get("cortx_image")
         cortx_server_image = kwargs.get("cortx_server_image")
@@ -736,42 +736,38 @@ class ProvDeployK8sCortxLib:
             elif self.cortx_data_image and image_key == "cortxclient":
                 cortx_im[image_key] = cortx_data_image
 
-        def _update_file(cortx_im):
-            image_default_dict.update(self.deploy_cfg['third_party_images'])
-            with open(filepath) as soln:
-                conf = yaml.safe_load(soln)
-                parent_key = conf['solution']  # Parent key
-                image = parent_key['images']  # Parent key
-                conf['solution']['images'] = image
-                image.update(cortx_im)
-                for key, value in list(third_party_images_dict.items()):
-                    if key in list(self.deploy_cfg['third_party_images'].keys()):
-                        image.update({key: value})
-                        image_default_dict.pop(key)
-                image.update(image_default_dict)
-                soln.close()
-            LOGGER.debug("Images used for deployment : %s", image)
-            noalias_dumper = yaml.dumper.SafeDumper
-            noalias_dumper.ignore_aliases = lambda self, data: True
-            with open(filepath, 'w') as soln:
-                yaml.dump(conf, soln, default_flow_style=False,
-                          sort_keys=False, Dumper=noalias_dumper)
-                soln.close()
-
-        _update_file(cortx_im)
-        return True, filepath
+        image_default_dict.update(self.deploy_cfg['third_party_images'])
+        image = conf['solution']['images']
+        image.update(cortx_im)
+        for key, value in list(third_party_images_dict.items()):
+            if key in list(self.deploy_cfg['third_party_images'].keys()):
+                image.update({key: value})
+                image_default_dict.pop(key)
+        image.update(image_default_dict)
+        LOGGER.debug("Images used for deployment : %s", image)
 
-    # pylint: disable-msg=too-many-locals
-    def update_miscellaneous_param(self, filepath, log_path,
-                                   **kwargs):
+    def update_image_section_sol_file(self, filepath, third_party_images_dict,
+                                      **kwargs):
         """
-        This Method update the miscellaneous params in solution.yaml file
+        Method use to update the Images section in solution.yaml
         Param: filepath: filename with complete path
+        cortx_image: this is cortx image name
+        third_party_image: dict of third party image
+        cortx_server_image: cortx_server image name
+        :returns the status, filepath
+        """
+        conf = self.load_sol_file(filepath)
+        self.set_image_section(conf, third_party_images_dict, **kwargs)
+        return self.dump_sol_file(conf, filepath)
+
+    def set_miscellaneous_param(self, conf: dict, log_path, **kwargs):
+        """
+        Set the miscellaneous params in solution dict
+        Param: conf: solution dict
         Param: log_path: to change the log path inside pods
         Param: nodeport_http: http Port for node port service for s3
         Param: nodeport_https: https Port for node port service for s3
         Param: control_nodeport_https: https Port for node port service for control
-        :returns the status, filepath
         """
         service_type = kwargs.get('service_type', self.deploy_cfg['service_type'])
         nodeport_http = kwargs.get('nodeport_http', self.deploy_cfg['http_port'])
@@ -782,40 +778,45 @@ class ProvDeployK8sCortxLib:
         deployment_type = kwargs.get('deployment_type', self.deploy_cfg['deployment_type'])
         namespace = kwargs.get('namespace', self.deploy_cfg['namespace'])
         client_instance = kwargs.get('client_instance', self.deploy_cfg['client_instance'])
-        with open(filepath) as soln:
-            conf = yaml.safe_load(soln)
-            parent_key = conf['solution']  # Parent key
-            if deployment_type:
-                parent_key['deployment_type'] = deployment_type
-            parent_key['namespace'] = namespace
-            common = parent_key['common']
-            content = parent_key['secrets']['content']
-            common['storage_provisioner_path'] = self.deploy_cfg['local_path_prov']
-            common['container_path']['log'] = log_path
-            motr_config = common['motr']
-            motr_config['num_client_inst'] = client_instance
-            s3_service = common['external_services']['s3']
-            control_service = common['external_services']['control']
-            s3_service['type'] = service_type
-            control_service['type'] = service_type
-            s3_service['nodePorts']['http'] = nodeport_http
-            s3_service['nodePorts']['https'] = nodeport_https
-            control_service['nodePorts']['https'] = control_nodeport_https
-            common['s3']['max_start_timeout'] = self.deploy_cfg['s3_max_start_timeout']
-            if service_type == "LoadBalancer":
-                s3_service['count'] = lb_count
-            passwd_dict = {}
-            for key, value in self.deploy_cfg['password'].items():
-                passwd_dict[key] = pswdmanager.decrypt(value)
-            content.update(passwd_dict)
-            soln.close()
-        noalias_dumper = yaml.dumper.SafeDumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
-        with open(filepath, 'w') as soln:
-            yaml.dump(conf, soln, default_flow_style=False,
-                      sort_keys=False, Dumper=noalias_dumper)
-            soln.close()
-        return True, filepath
+        parent_key = conf['solution']  # Parent key
+        if deployment_type:
+            parent_key['deployment_type'] = deployment_type
+        parent_key['namespace'] = namespace
+        common = parent_key['common']
+        content = parent_key['secrets']['content']
+        common['storage_provisioner_path'] = self.deploy_cfg['local_path_prov']
+        common['container_path']['log'] = log_path
+        motr_config = common['motr']
+        motr_config['num_client_inst'] = client_instance
+        s3_service = common['external_services']['s3']
+        control_service = common['external_services']['control']
+        s3_service['type'] = service_type
+        control_service['type'] = service_type
+        s3_service['nodePorts']['http'] = nodeport_http
+        s3_service['nodePorts']['https'] = nodeport_https
+        control_service['nodePorts']['https'] = control_nodeport_https
+        common['s3']['max_start_timeout'] = self.deploy_cfg['s3_max_start_timeout']
+        if service_type == "LoadBalancer":
+            s3_service['count'] = lb_count
+        passwd_dict = {}
+        for key, value in self.deploy_cfg['password'].items():
+            passwd_dict[key] = pswdmanager.decrypt(value)
+        content.update(passwd_dict)
+
+    def update_miscellaneous_param(self, filepath, log_path,
+                                   **kwargs):
+        """
+        This Method update the miscellaneous params in solution.yaml file
+        Param: filepath: filename with complete path
+        Param: log_path: to change the log path inside pods
+        Param: nodeport_http: http Port for node port service for s3
+        Param: nodeport_https: https Port for node port service for s3
+        Param: control_nodeport_https: https Port for node port service for control
+        :returns the status, filepath
+        """
+        conf = self.load_sol_file(filepath)
+        self.set_miscellaneous_param(conf, log_path, **kwargs)
+        return self.dump_sol_file(conf, filepath)
 
     @staticmethod
     def deploy_cortx_k8s_re_job(master_node_list: list, worker_node_list: list,
@@ -888,38 +889,55 @@ class ProvDeployK8sCortxLib:
         return False, "Cluster status is not retrieved."
 
     def destroy_setup(self, master_node_obj: LogicalNode, worker_node_obj: list,
-                      custom_repo_path: str = PROV_CFG["k8s_cortx_deploy"]["k8s_dir"]):
+                      custom_repo_path: str = PROV_CFG["k8s_cortx_deploy"]["k8s_dir"],
+                      **kwargs):
         """
-        Method used to run destroy script
+        Method used to run destroy script, workers are cleaned up in parallel once the
+        destroy script completes.
         param: master node obj list
         param: worker node obj list
+        keyword: resume: Skip steps completed by a previous crashed destroy
         """
         destroy_cmd = Template(common_cmd.DESTROY_CLUSTER_CMD).substitute(dir=custom_repo_path)
-        list_etc_3rd_party = Template(common_cmd.LS_LH_CMD).substitute(
-            dir=self.deploy_cfg['3rd_party_dir'])
-        list_data_3rd_party = Template(common_cmd.LS_LH_CMD).substitute(
-            dir=self.deploy_cfg['3rd_party_data_dir'])
-        try:
+
+        def _destroy():
             if not master_node_obj.path_exists(custom_repo_path):
                 raise Exception(f"Repo path {custom_repo_path} does not exist")
             resp = master_node_obj.execute_cmd(cmd=destroy_cmd, recv_ready=True,
                                                timeout=self.deploy_cfg['timeout']['destroy'])
             LOGGER.debug("resp : %s", resp)
-            for worker in worker_node_obj:
-                if worker.path_exists(self.deploy_cfg["mnt_path"]):
-                    resp_mnt = worker.execute_cmd(
-                        common_cmd.CMD_REMOVE_DIR.format(self.deploy_cfg["mnt_path"]))
-                    LOGGER.debug(resp_mnt)
-                if worker.path_exists(self.deploy_cfg['3rd_party_dir']):
-                    resp_ls = worker.execute_cmd(cmd=list_etc_3rd_party, read_lines=True)
-                    LOGGER.debug("resp : %s", resp_ls)
-                if worker.path_exists(self.deploy_cfg['3rd_party_data_dir']):
-                    resp_data = worker.execute_cmd(cmd=list_data_3rd_party, read_lines=True)
-                    LOGGER.debug("resp : %s", resp_data)
-            return True, resp
-        # pylint: disable=broad-except
-        except BaseException as error:
-            return False, error
+            return resp
+
+        graph = self.flow_graph("destroy")
+        destroy_step = graph.add_step("destroy_cluster", _destroy,
+                                      node=master_node_obj.hostname)
+        for worker in worker_node_obj:
+            graph.add_step(f"cleanup_worker:{worker.hostname}", self.cleanup_worker, worker,
+                           deps=[destroy_step], node=worker.hostname)
+        resp = graph.run(resume=kwargs.get("resume", False))
+        if not resp[0]:
+            return False, graph.steps[resp[1]["failed"][0]].error
+        return True, graph.steps["destroy_cluster"].result
+
+    def cleanup_worker(self, worker: LogicalNode):
+        """
+        Remove local path provisioner data and list 3rd party residue on worker node.
+        param: worker: Worker node object
+        """
+        list_etc_3rd_party = Template(common_cmd.LS_LH_CMD).substitute(
+            dir=self.deploy_cfg['3rd_party_dir'])
+        list_data_3rd_party = Template(common_cmd.LS_LH_CMD).substitute(
+            dir=self.deploy_cfg['3rd_party_data_dir'])
+        if worker.path_exists(self.deploy_cfg["mnt_path"]):
+            resp_mnt = worker.execute_cmd(
+                common_cmd.CMD_REMOVE_DIR.format(self.deploy_cfg["mnt_path"]))
+            LOGGER.debug(resp_mnt)
+        if worker.path_exists(self.deploy_cfg['3rd_party_dir']):
+            resp_ls = worker.execute_cmd(cmd=list_etc_3rd_party, read_lines=True)
+            LOGGER.debug("resp : %s", resp_ls)
+        if worker.path_exists(self.deploy_cfg['3rd_party_data_dir']):
+            resp_data = worker.execute_cmd(cmd=list_data_3rd_party, read_lines=True)
+            LOGGER.debug("resp : %s", resp_data)
 
     @staticmethod
     # pylint: disable-msg=too-many-locals
@@ -1232,7 +1250,8 @@ class ProvDeployK8sCortxLib:
             assert_utils.assert_true(resp[0], resp[1])
             if not deploy_resp[1]:
                 LOGGER.info("Step to Check  ALL service status")
-                time.sleep(self.deploy_cfg["sleep_time"])
+                poll(self.check_pods_status, self.deploy_cfg["sleep_time"],
+                     args=(master_node_list[0],))
                 service_status = self.check_service_status(master_node_list[0],
                                                            deployment_type=deployment_type)
                 LOGGER.info("All service resp is %s", service_status)
@@ -1465,23 +1484,19 @@ class ProvDeployK8sCortxLib:
         Function to check s3 server status
         """
         deploy_ff_cfg = PROV_CFG["deploy_ff"]
-        start_time = int(time.time())
-        end_time = start_time + 1800  # 30 mins timeout
-        response = list()
-        while int(time.time()) < end_time:
+
+        def _hctl_status():
             pod_name = master_node_obj.get_pod_name(pod_prefix=pod_prefix)
             assert_utils.assert_true(pod_name[0], pod_name[1])
-            resp = self.get_hctl_status(master_node_obj, pod_name[1])
-            if resp[0]:
-                time_taken = (int(time.time()) - start_time)
-                LOGGER.info("All the services are online. Time Taken : %s", time_taken)
-                response.extend(resp)
-                response.append(time_taken)
-                break
-            time.sleep(deploy_ff_cfg["per_step_delay"])
-        if len(response) == 0:
+            return self.get_hctl_status(master_node_obj, pod_name[1])
+
+        # 30 mins timeout, poll interval backs off up to per_step_delay
+        status, resp, time_taken = poll(_hctl_status, 1800,
+                                        max_interval=deploy_ff_cfg["per_step_delay"])
+        if not status:
             return False, "All Services are not started."
-        return response
+        LOGGER.info("All the services are online. Time Taken : %s", int(time_taken))
+        return list(resp) + [int(time_taken)]
 
     def check_service_status(self, master_node_obj: LogicalNode, **kwargs):
         """
@@ -1822,11 +1837,10 @@ class ProvDeployK8sCortxLib:
         for cvg in prov_deploy_cfg["cvg_config"]:
             if cvg == "cvg1":
                 cvg_key = storage_key[cvg]["devices"]["data"]
-                device_list = master_node_list.execute_cmd(cmd=common_cmd.CMD_LIST_DEVICES,
-                                                           read_lines=True)[0].split(",")
-                device_list[-1] = device_list[-1].replace("\n", "")
                 if data_disk_per_cvg == 0:
-                    data_disk_per_cvg = int(len(device_list[cvg_count + 1:]) / cvg_count)
+                    inventory = self.get_hw_inventory([master_node_list])
+                    data_disk_per_cvg = SolutionLayout(
+                        cvg_count=cvg_count).resolve_data_disks(inventory)
 
                 LOGGER.debug("Data disk per cvg : %s", data_disk_per_cvg)
                 LOGGER.info(len(cvg_key))
@@ -1894,45 +1908,79 @@ class ProvDeployK8sCortxLib:
         LOGGER.info("The string is %s and length is %s", string_alpha, len(string_alpha))
         return string_alpha
 
+    def set_res_limit_third_party(self, conf: dict):
+        """
+        Set the resource limits for third party services in solution dict
+        param: conf: solution dict
+        """
+        resource = conf['solution']['common']['resource_allocation']
+        consul = resource['consul']
+        zookeeper = resource['zookeeper']['resources']
+        kafka = resource['kafka']['resources']
+        type_list = ['requests', 'limits']
+        consul_list = ['server', 'client']
+        third_party_resource = self.deploy_cfg['thirdparty_resource']
+        # updating the consul server /client request and limit resources
+        for res_type in type_list:
+            zookeeper[res_type]['memory'] = \
+                third_party_resource['zookeeper'][res_type]['mem']
+            zookeeper[res_type]['cpu'] = \
+                third_party_resource['zookeeper'][res_type]['cpu']
+            kafka[res_type]['memory'] = third_party_resource['kafka'][res_type]['mem']
+            kafka[res_type]['cpu'] = third_party_resource['kafka'][res_type]['cpu']
+            for elem in consul_list:
+                consul[elem]['resources'][res_type]['memory'] = \
+                    third_party_resource[elem][res_type]['mem']
+                consul[elem]['resources'][res_type]['cpu'] = \
+                    third_party_resource[elem][res_type]['cpu']
+
     def update_res_limit_third_party(self, filepath):
         """
         This Method is used to update the resource limits for third party services
         file: solution.yaml file
         returns True
         """
-
-        with open(filepath) as soln:
-            conf = yaml.safe_load(soln)
-            parent_key = conf['solution']  # Parent key
-            common = parent_key['common']
-            resource = common['resource_allocation']
-            consul = resource['consul']
-            zookeeper = resource['zookeeper']['resources']
-            kafka = resource['kafka']['resources']
-            type_list = ['requests', 'limits']
-            consul_list = ['server', 'client']
-            third_party_resource = self.deploy_cfg['thirdparty_resource']
-            # updating the consul server /client request and limit resources
-            for res_type in type_list:
-                zookeeper[res_type]['memory'] = \
-                    third_party_resource['zookeeper'][res_type]['mem']
-                zookeeper[res_type]['cpu'] = \
-                    third_party_resource['zookeeper'][res_type]['cpu']
-                kafka[res_type]['memory'] = third_party_resource['kafka'][res_type]['mem']
-                kafka[res_type]['cpu'] = third_party_resource['kafka'][res_type]['cpu']
-                for elem in consul_list:
-                    consul[elem]['resources'][res_type]['memory'] = \
-                        third_party_resource[elem][res_type]['mem']
-                    consul[elem]['resources'][res_type]['cpu'] = \
-                        third_party_resource[elem][res_type]['cpu']
-            soln.close()
-        noalias_dumper = yaml.dumper.SafeDumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
-        with open(filepath, 'w') as soln:
-            yaml.dump(conf, soln, default_flow_style=False,
-                      sort_keys=False, Dumper=noalias_dumper)
-            soln.close()
-        return True, filepath
+        conf = self.load_sol_file(filepath)
+        self.set_res_limit_third_party(conf)
+        return self.dump_sol_file(conf, filepath)
+
+    def set_res_limit_cortx(self, conf: dict):
+        """
+        Set the resource limits for cortx services in solution dict
+        param: conf: solution dict
+        """
+        resource = conf['solution']['common']['resource_allocation']
+        hare_hax_res = resource['hare']['hax']['resources']
+        data_res = resource['data']
+        control_res = resource['control']['agent']['resources']
+        server_res = resource['server']['rgw']['resources']
+        ha_res = resource['ha']
+        type_list = ['requests', 'limits']
+        data_list = ['motr', 'confd']
+        ha_list = ['fault_tolerance', 'health_monitor', 'k8s_monitor']
+        cortx_resource = self.deploy_cfg['cortx_resource']
+
+        for res_type in type_list:
+            hare_hax_res[res_type]['memory'] = \
+                cortx_resource['hax'][res_type]['mem']
+            hare_hax_res[res_type]['cpu'] = \
+                cortx_resource['hax'][res_type]['cpu']
+            server_res[res_type]['memory'] = cortx_resource['rgw'][res_type]['mem']
+            server_res[res_type]['cpu'] = cortx_resource['rgw'][res_type]['cpu']
+            control_res[res_type]['memory'] = cortx_resource['agent'][res_type]['mem']
+            control_res[res_type]['cpu'] = cortx_resource['agent'][res_type]['cpu']
+            # updating the motr /confd requests and limits resources
+            for elem in data_list:
+                data_res[elem]['resources'][res_type]['memory'] = \
+                    cortx_resource[elem][res_type]['mem']
+                data_res[elem]['resources'][res_type]['cpu'] = \
+                    cortx_resource[elem][res_type]['cpu']
+            # updating the ha component resources
+            for ha_elem in ha_list:
+                ha_res[ha_elem]['resources'][res_type]['memory'] = \
+                    cortx_resource[ha_elem][res_type]['mem']
+                ha_res[ha_elem]['resources'][res_type]['cpu'] = \
+                    cortx_resource[ha_elem][res_type]['cpu']
 
     def update_res_limit_cortx(self, filepath):
         """
@@ -1940,51 +1988,9 @@ class ProvDeployK8sCortxLib:
         param: filepath: solution.yaml filepath
         returns True, filepath
         """
-
-        with open(filepath) as soln:
-            conf = yaml.safe_load(soln)
-            parent_key = conf['solution']  # Parent key
-            common = parent_key['common']
-            resource = common['resource_allocation']
-            hare_hax_res = resource['hare']['hax']['resources']
-            data_res = resource['data']
-            control_res = resource['control']['agent']['resources']
-            server_res = resource['server']['rgw']['resources']
-            ha_res = resource['ha']
-            type_list = ['requests', 'limits']
-            data_list = ['motr', 'confd']
-            ha_list = ['fault_tolerance', 'health_monitor', 'k8s_monitor']
-            cortx_resource = self.deploy_cfg['cortx_resource']
-
-            for res_type in type_list:
-                hare_hax_res[res_type]['memory'] = \
-                    cortx_resource['hax'][res_type]['mem']
-                hare_hax_res[res_type]['cpu'] = \
-                    cortx_resource['hax'][res_type]['cpu']
-                server_res[res_type]['memory'] = cortx_resource['rgw'][res_type]['mem']
-                server_res[res_type]['cpu'] = cortx_resource['rgw'][res_type]['cpu']
-                control_res[res_type]['memory'] = cortx_resource['agent'][res_type]['mem']
-                control_res[res_type]['cpu'] = cortx_resource['agent'][res_type]['cpu']
-                # updating the motr /confd requests and limits resources
-                for elem in data_list:
-                    data_res[elem]['resources'][res_type]['memory'] = \
-                        cortx_resource[elem][res_type]['mem']
-                    data_res[elem]['resources'][res_type]['cpu'] = \
-                        cortx_resource[elem][res_type]['cpu']
-                # updating the ha component resources
-                for ha_elem in ha_list:
-                    ha_res[ha_elem]['resources'][res_type]['memory'] = \
-                        cortx_resource[ha_elem][res_type]['mem']
-                    ha_res[ha_elem]['resources'][res_type]['cpu'] = \
-                        cortx_resource[ha_elem][res_type]['cpu']
-            soln.close()
-        noalias_dumper = yaml.dumper.SafeDumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
-        with open(filepath, 'w') as soln:
-            yaml.dump(conf, soln, default_flow_style=False,
-                      sort_keys=False, Dumper=noalias_dumper)
-            soln.close()
-        return True, filepath
+        conf = self.load_sol_file(filepath)
+        self.set_res_limit_cortx(conf)
+        return self.dump_sol_file(conf, filepath)
 
     @staticmethod
     def get_default_access_secret_key(filepath):
@@ -124,3 +124,24 @@ class ProvUpgradeK8sCortxLib:
         resp = self.prov_obj.copy_sol_file(master_node_obj, local_sol_path=local_path[1],
                                            remote_code_path=self.prov_obj.deploy_cfg["k8s_dir"])
         assert_utils.assert_true(resp[0], resp[1])
+
+    def prepare_upgrade(self, master_node_obj: LogicalNode, worker_node_list: list,
+                        **kwargs) -> tuple:
+        """
+        Prepare CORTX cluster for upgrade using upgrade flow DAG.
+        New images are pulled on all workers in parallel while the solution file is updated on
+        master, upgrade_software can be started once the flow succeeds.
+        :param master_node_obj: Master node(Logical Node object)
+        :param worker_node_list: List of all worker nodes(Logical Node object)
+        :keyword resume: Skip steps completed by a previous crashed upgrade preparation
+        :keyword: Other keyword arguments of retain_solution_file
+        :return: True/False and flow report
+        """
+        resume = kwargs.pop("resume", False)
+        graph = self.prov_obj.flow_graph("upgrade")
+        for worker in worker_node_list:
+            graph.add_step(f"pull_cortx_image:{worker.hostname}",
+                           self.prov_obj.pull_cortx_image, worker, node=worker.hostname)
+        graph.add_step("retain_solution_file", self.retain_solution_file, master_node_obj,
+                       node=master_node_obj.hostname, **kwargs)
+        return graph.run(resume=resume)
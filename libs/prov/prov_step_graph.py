@@ -0,0 +1,264 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""
+Dependency graph executor for k8s CORTX deploy, destroy and upgrade flows.
+
+Every flow is a DAG of per node steps. Ready steps run concurrently on a bounded thread pool,
+the first failure stops scheduling (fail fast) and the partial state of the flow is reported.
+Completed steps are persisted in a state file so that a crashed flow resumes from the last
+successful step.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+LOGGER = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+RESUMED = "resumed"
+
+
+def poll(func, timeout: float, interval: float = 2, max_interval: float = 30, **kwargs) -> tuple:
+    """
+    Poll func till it returns a truthy value (or (True, resp) tuple) instead of fixed sleeps.
+
+    Poll interval grows exponentially from interval to max_interval.
+
+    :param func: Callable returning bool or (bool, resp) tuple.
+    :param timeout: Max seconds to poll.
+    :param interval: First poll interval in seconds.
+    :param max_interval: Max poll interval in seconds.
+    :keyword args: Positional arguments of func.
+    :return: (True/False, last response, seconds elapsed)
+    """
+    args = kwargs.get("args", ())
+    start = time.monotonic()
+    deadline = start + timeout
+    resp = None
+    while True:
+        resp = func(*args)
+        status = resp[0] if isinstance(resp, tuple) else bool(resp)
+        if status:
+            return True, resp, time.monotonic() - start
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False, resp, time.monotonic() - start
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+class Step:
+    """Single step of a flow, usually one operation on one node."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, name: str, func, args: tuple = (), kwargs: dict = None,
+                 deps: list = None, node: str = None):
+        """
+        :param name: Unique step name e.g. prereq_vm:ssc-vm-1.
+        :param func: Callable, failure is an exception or a False / (False, resp) return value.
+        :param args: Positional arguments of func.
+        :param kwargs: Keyword arguments of func.
+        :param deps: Names of steps which must complete first.
+        :param node: Hostname the step runs on, used in reports.
+        """
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.deps = list(deps or [])
+        self.node = node
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.start = None
+        self.duration = None
+
+    def execute(self) -> bool:
+        """Run step, record result, timing and error."""
+        self.start = time.time()
+        begin = time.monotonic()
+        LOGGER.info("Step %s started", self.name)
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+            if self.result is False or (isinstance(self.result, tuple) and self.result and
+                                        self.result[0] is False):
+                self.error = str(self.result[1] if isinstance(self.result, tuple) and
+                                 len(self.result) > 1 else self.result)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.exception("Step %s failed", self.name)
+            self.error = f"{type(error).__name__}: {error}"
+        self.duration = time.monotonic() - begin
+        self.status = FAILED if self.error else DONE
+        LOGGER.info("Step %s %s in %.1f seconds", self.name, self.status, self.duration)
+        return self.status == DONE
+
+
+class StepGraph:
+    """DAG of steps executed with bounded concurrency, fail fast and resume support."""
+
+    def __init__(self, flow: str, max_workers: int = 8, state_file: str = None):
+        """
+        :param flow: Flow name e.g. deploy, destroy, upgrade.
+        :param max_workers: Max steps running concurrently.
+        :param state_file: JSON file keeping completed steps to resume after a crash.
+        """
+        self.flow = flow
+        self.max_workers = max_workers
+        self.state_file = state_file
+        self.steps = {}
+
+    def add_step(self, name: str, func, *args, deps: list = None, node: str = None,
+                 **kwargs) -> str:
+        """
+        Add step to graph.
+
+        :param name: Unique step name.
+        :param func: Callable executed by the step.
+        :param deps: Names of steps which must complete first.
+        :param node: Hostname the step runs on.
+        :return: Step name, handy to build dependencies.
+        """
+        if name in self.steps:
+            raise ValueError(f"Step {name} already exists in {self.flow} flow")
+        self.steps[name] = Step(name, func, args, kwargs, deps, node)
+        return name
+
+    def validate(self) -> None:
+        """Check unknown dependencies and cycles."""
+        for step in self.steps.values():
+            unknown = set(step.deps) - set(self.steps)
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown steps {unknown}")
+        indegree = {name: len(step.deps) for name, step in self.steps.items()}
+        ready = [name for name, count in indegree.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for step in self.steps.values():
+                if name in step.deps:
+                    indegree[step.name] -= 1
+                    if indegree[step.name] == 0:
+                        ready.append(step.name)
+        if visited != len(self.steps):
+            raise ValueError(f"Cycle found in {self.flow} flow")
+
+    @property
+    def signature(self) -> str:
+        """Hash of graph topology, state of a different graph is never resumed."""
+        topology = sorted((name, sorted(step.deps)) for name, step in self.steps.items())
+        return hashlib.sha256(json.dumps([self.flow, topology]).encode()).hexdigest()
+
+    def _load_state(self) -> set:
+        """Completed steps of a previous run of the same graph."""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return set()
+        with open(self.state_file, encoding="utf-8") as fptr:
+            state = json.load(fptr)
+        if state.get("signature") != self.signature:
+            LOGGER.warning("Ignoring %s, it belongs to a different %s flow", self.state_file,
+                           self.flow)
+            return set()
+        return set(state.get("done", []))
+
+    def _save_state(self) -> None:
+        """Persist completed steps atomically."""
+        if not self.state_file:
+            return
+        done = [name for name, step in self.steps.items() if step.status in (DONE, RESUMED)]
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as fptr:
+            json.dump({"flow": self.flow, "signature": self.signature, "done": done}, fptr)
+        os.replace(tmp_file, self.state_file)
+
+    def run(self, resume: bool = False) -> tuple:
+        """
+        Execute the graph.
+
+        :param resume: Skip steps completed by a previous run recorded in the state file.
+        :return: (True/False, report dict)
+        """
+        self.validate()
+        completed = self._load_state() if resume else set()
+        for name in completed:
+            self.steps[name].status = RESUMED
+        if completed:
+            LOGGER.info("Resuming %s flow, skipping completed steps %s", self.flow,
+                        sorted(completed))
+        start = time.monotonic()
+        failed = False
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=self.flow) as executor:
+            while True:
+                if not failed:
+                    for step in self.steps.values():
+                        if step.status == PENDING and step.name not in running.values() and \
+                                all(self.steps[dep].status in (DONE, RESUMED)
+                                    for dep in step.deps):
+                            running[executor.submit(step.execute)] = step.name
+                if not running:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.result():
+                        self._save_state()
+                    elif not failed:
+                        failed = True
+                        LOGGER.error("Step %s of %s flow failed, not scheduling new steps",
+                                     name, self.flow)
+        for step in self.steps.values():
+            if step.status == PENDING:
+                step.status = SKIPPED
+        report = self.report(time.monotonic() - start)
+        if not failed and self.state_file and os.path.exists(self.state_file):
+            os.remove(self.state_file)
+        return not failed, report
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Partial or complete state of the flow with per step timings.
+
+        :param elapsed: Wall clock seconds of the run.
+        :return: Dict with flow, elapsed, steps, failed and skipped.
+        """
+        steps = {name: {"node": step.node, "status": step.status, "start": step.start,
+                        "duration": step.duration, "error": step.error}
+                 for name, step in self.steps.items()}
+        report = {"flow": self.flow, "elapsed": elapsed, "steps": steps,
+                  "failed": [name for name, step in self.steps.items() if step.status == FAILED],
+                  "skipped": [name for name, step in self.steps.items()
+                              if step.status == SKIPPED]}
+        lines = [f"{name:<45} {value['status']:<8} "
+                 f"{value['duration'] if value['duration'] is not None else 0:8.1f}s"
+                 for name, value in steps.items()]
+        LOGGER.info("%s flow finished in %.1f seconds\n%s", self.flow, elapsed, "\n".join(lines))
+        return report
@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Streaming alert listener used to validate RAS alerts as soon as they arrive."""
+
+import codecs
+import logging
+import threading
+import time
+from collections import deque
+
+from commons.helpers.node_helper import Node
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MultiPatternMatcher:
+    """
+    Aho-Corasick automaton matching all expected patterns in a single pass.
+
+    Text can be fed in arbitrary chunks, the automaton state is kept between feed calls so
+    patterns split across chunks are still found.
+    """
+
+    def __init__(self, patterns: list):
+        """
+        Build automaton for patterns.
+
+        :param patterns: List of literal strings to be matched.
+        """
+        self.patterns = list(dict.fromkeys(patterns))
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern in self.patterns:
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append(pattern)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        self.state = 0
+        self.offset = 0
+        self.matched = {}
+
+    @property
+    def remaining(self) -> list:
+        """Patterns not matched yet."""
+        return [pattern for pattern in self.patterns if pattern not in self.matched]
+
+    @property
+    def all_matched(self) -> bool:
+        """True once every pattern is matched."""
+        return len(self.matched) == len(self.patterns)
+
+    def feed(self, text: str) -> list:
+        """
+        Feed next chunk of text.
+
+        :param text: Text chunk.
+        :return: Patterns matched for the first time in this chunk.
+        """
+        found = []
+        state = self.state
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern in self.output[state]:
+                if pattern not in self.matched:
+                    self.matched[pattern] = self.offset
+                    found.append(pattern)
+            self.offset += 1
+        self.state = state
+
+        return found
+
+    def reset(self) -> None:
+        """Forget matched patterns and automaton state."""
+        self.state = 0
+        self.offset = 0
+        self.matched = {}
+
+
+class AlertStreamListener(threading.Thread):
+    """
+    Tail an alert source on a node and match expected alerts while they arrive.
+
+    The listener stops as soon as all expected patterns are matched or the deadline expires.
+    Start it before the fault injection with from_start False and call mark_fault_injected()
+    at injection time, latency of every pattern is measured from that mark. Latency is None
+    for patterns matched before the mark or when the mark is missing.
+    """
+
+    def __init__(self, host: str, username: str, password: str, source_file: str,
+                 patterns: list, **kwargs):
+        """
+        Initialize listener.
+
+        :param host: Node hostname.
+        :param username: Node username.
+        :param password: Node password.
+        :param source_file: Remote alert source e.g. message bus reader screen log.
+        :param patterns: Expected alert strings.
+        :keyword line_filter: Only lines containing this string are matched.
+        :keyword from_start: Match alerts already present in the source file.
+        :keyword timeout: Max seconds to wait for all alerts.
+        :keyword poll_interval: Seconds to wait when no data is available.
+        """
+        super().__init__(daemon=True)
+        self.node_obj = Node(hostname=host, username=username, password=password)
+        self.source_file = source_file
+        self.matcher = MultiPatternMatcher(patterns)
+        self.line_filter = kwargs.get("line_filter", None)
+        self.from_start = kwargs.get("from_start", False)
+        self.timeout = kwargs.get("timeout", 120)
+        self.poll_interval = kwargs.get("poll_interval", 0.2)
+        self.fault_time = None
+        self.start_time = None
+        self.latency = {}
+        self.error = None
+        self._finished = threading.Event()
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._partial = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def mark_fault_injected(self) -> None:
+        """Mark the fault injection time used as reference for alert latency."""
+        self.fault_time = time.monotonic()
+
+    def _feed(self, data: str) -> None:
+        """Feed received data to matcher honouring line filter."""
+        if self.line_filter is None:
+            found = self.matcher.feed(data)
+        else:
+            lines = (self._partial + data).split("\n")
+            self._partial = lines.pop()
+            found = []
+            for line in lines:
+                if self.line_filter in line:
+                    found.extend(self.matcher.feed(line + "\n"))
+        now = time.monotonic()
+        with self._lock:
+            for pattern in found:
+                if self.fault_time is None:
+                    self.latency[pattern] = None
+                    LOGGER.info("Alert matched '%s', fault injection not marked", pattern)
+                else:
+                    self.latency[pattern] = now - self.fault_time
+                    LOGGER.info("Alert matched '%s' after %.2f seconds", pattern,
+                                self.latency[pattern])
+
+    def run(self) -> None:
+        """Tail the source file until all patterns are matched, deadline or stop."""
+        self.start_time = time.monotonic()
+        deadline = self.start_time + self.timeout
+        cmd = f"tail -n {'+1' if self.from_start else '0'} -F {self.source_file}"
+        channel = None
+        try:
+            self.node_obj.connect()
+            channel = self.node_obj.host_obj.get_transport().open_session()
+            channel.exec_command(cmd)  # nosec
+            LOGGER.info("Listening for alerts on %s:%s", self.node_obj.hostname,
+                        self.source_file)
+            while not self._stop_event.is_set() and time.monotonic() < deadline:
+                if channel.recv_ready():
+                    self._feed(self._decoder.decode(channel.recv(65536)))
+                    if self.matcher.all_matched:
+                        break
+                elif channel.exit_status_ready():
+                    break
+                else:
+                    time.sleep(self.poll_interval)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.error("Error in %s: %s", AlertStreamListener.run.__name__, error)
+            self.error = error
+        finally:
+            if channel is not None:
+                channel.close()
+            self.node_obj.disconnect()
+            self._finished.set()
+
+    def stop(self) -> None:
+        """Stop listening."""
+        self._stop_event.set()
+
+    def wait_for_alerts(self, timeout: float = None) -> tuple:
+        """
+        Wait till all alerts arrive or the listener deadline expires.
+
+        :param timeout: Max seconds to wait, defaults to listener timeout.
+        :return: (True/False, dict with matched, missing, latency and error if the stream
+            consumer failed)
+        """
+        if not self.is_alive() and not self._finished.is_set():
+            self.start()
+        self._finished.wait(self.timeout if timeout is None else timeout)
+        self.stop()
+        with self._lock:
+            result = {"matched": list(self.matcher.matched), "missing": self.matcher.remaining,
+                      "latency": dict(self.latency)}
+        if result["missing"]:
+            LOGGER.info("Match not found : %s", result["missing"])
+        if self.error:
+            result["error"] = str(self.error)
+
+        return not result["missing"], result
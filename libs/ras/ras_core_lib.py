@@ -34,6 +34,8 @@ from commons.helpers.health_helper import Health
 from commons.utils.system_utils import run_remote_cmd
 from config import CMN_CFG
 from config import RAS_VAL
+from libs.ras.alert_listener import AlertStreamListener
+from libs.ras.alert_listener import MultiPatternMatcher
 from libs.s3 import S3H_OBJ
 
 LOGGER = logging.getLogger(__name__)
@@ -549,7 +551,7 @@ class RASCoreLib:
         resp = self.health_obj.pcs_service_status(service)
         return resp
 
-    def alert_validation(self, string_list: list, restart: bool = True) -> \
+    def alert_validation(self, string_list: list, restart: bool = True, **kwargs) -> \
             Tuple[bool, str]:
         """
         Function to verify the alerts generated on specific events.
@@ -559,6 +561,7 @@ class RASCoreLib:
         :type: list
         :param restart: Flag to specify whether to restart the service or not
         :type: Boolean
+        :keyword listener: Listener returned by start_alert_listener before fault injection.
         :return: True/False, Response
         :rtype: Boolean, String
         """
@@ -585,47 +588,82 @@ class RASCoreLib:
             return resp
         LOGGER.info(
             "Verified sspl and kafka services are in running state")
-        time.sleep(common_cfg["sleep_val"])
+        return self.wait_for_alerts(string_list, listener=kwargs.get("listener", None))
 
-        LOGGER.info("Fetching sspl alert response")
-        cmd = common_commands.COPY_FILE_CMD.format(
-            common_cfg["file"]["screen_log"],
-            common_cfg["file"]["alert_log_file"])
+    def wait_for_alerts(self, string_list: list, **kwargs) -> Tuple[bool, Any]:
+        """
+        Stream the message bus screen log and wait till all expected alerts arrive.
 
-        self.node_utils.execute_cmd(
-            cmd=cmd, read_nbytes=cmn_cons.BYTES_TO_READ)
-        LOGGER.info("Successfully fetched the alert response")
-
-        LOGGER.debug("Reading the alert log file")
-        read_resp = self.node_utils.read_file(
-            filename=common_cfg["file"]["alert_log_file"],
-            local_path=common_cfg["file"]["temp_txt_file"])
-        LOGGER.debug(
-            "======================================================")
-        LOGGER.debug(read_resp)
-        LOGGER.debug(
-            "======================================================")
-        LOGGER.info(
-            "Checking if alerts are generated on message bus")
-        cmd = common_commands.EXTRACT_LOG_CMD.format(
-            common_cfg["file"]["alert_log_file"], string_list[0],
-            common_cfg["file"]["extracted_alert_file"])
-        LOGGER.debug(cmd)
-        self.node_utils.execute_cmd(cmd=cmd, read_nbytes=cmn_cons.BYTES_TO_READ)
-
-        resp = self.validate_alert_msg(
-            remote_file_path=common_cfg["file"]["extracted_alert_file"],
-            pattern_lst=string_list)
-        if not resp[0]:
-            return resp
+        Returns as soon as all strings are matched in lines containing string_list[0] or the
+        timeout expires. Without a listener the whole screen log is matched and alert latency
+        is not measured.
+        :param string_list: List of expected strings in alert response having
+        format [resource_type, alert_type, ...]
+        :keyword timeout: Max seconds to wait for alerts, defaults to sleep_val.
+        :keyword listener: Listener returned by start_alert_listener before fault injection.
+        :return: True/False, Response
+        """
+        common_cfg = RAS_VAL["ras_sspl_alert"]
+        listener = kwargs.get("listener", None)
+        if listener is None:
+            listener = self.get_alert_listener(
+                string_list, timeout=kwargs.get("timeout", common_cfg["sleep_val"]),
+                from_start=True)
+        LOGGER.info("Checking if alerts are generated on message bus")
+        result, resp = listener.wait_for_alerts()
+        LOGGER.info("Alert latency: %s", resp["latency"])
+        if not result:
+            msg = f"Alerts not found on message bus: {resp['missing']}"
+            if resp.get("error"):
+                msg = f"{msg}, alert listener error: {resp['error']}"
+            return False, msg
+        if resp.get("error"):
+            LOGGER.warning("Alert listener error after all alerts matched: %s",
+                           resp["error"])
 
         LOGGER.info("Fetched sspl alerts")
         return True, "Fetched alerts successfully"
 
+    def get_alert_listener(self, string_list: list, **kwargs) -> AlertStreamListener:
+        """
+        Create an alert listener on message bus screen log of the node.
+
+        :param string_list: List of expected strings in alert response having
+        format [resource_type, alert_type, ...]
+        :keyword timeout: Max seconds to wait for alerts.
+        :keyword from_start: Match alerts already present in the screen log.
+        :return: AlertStreamListener
+        """
+        common_cfg = RAS_VAL["ras_sspl_alert"]
+        return AlertStreamListener(
+            self.host, self.username, self.pwd, common_cfg["file"]["screen_log"],
+            string_list, line_filter=string_list[0],
+            timeout=kwargs.get("timeout", common_cfg["sleep_val"]),
+            from_start=kwargs.get("from_start", False))
+
+    def start_alert_listener(self, string_list: list, **kwargs) -> AlertStreamListener:
+        """
+        Start listening for new alerts, to be called before the fault is injected.
+
+        Call mark_fault_injected() on the listener right after the fault injection and pass
+        it to alert_validation/wait_for_alerts, latency is measured from that mark.
+        :param string_list: List of expected strings in alert response having
+        format [resource_type, alert_type, ...]
+        :keyword fault_duration: Seconds the fault is held before alerts are validated.
+        :return: Started AlertStreamListener
+        """
+        common_cfg = RAS_VAL["ras_sspl_alert"]
+        listener = self.get_alert_listener(
+            string_list, timeout=kwargs.get("fault_duration", 0) + common_cfg["sleep_val"],
+            from_start=False)
+        listener.start()
+
+        return listener
+
     def validate_alert_msg(self, remote_file_path: str, pattern_lst: list) ->\
             Tuple[bool, str]:
         """
-        Function checks the list of alerts iteratively in the remote file
+        Function checks the list of alerts in the remote file in a single pass
         and return boolean value.
 
         :param str remote_file_path: remote file
@@ -633,24 +671,25 @@ class RASCoreLib:
         :return: Boolean, response
         :rtype: tuple
         """
-        response = None
         local_path = os.path.join(os.getcwd(), 'temp_file')
 
         if os.path.exists(local_path):
             os.remove(local_path)
         _ = self.node_utils.copy_file_to_local(remote_path=remote_file_path,
                                                local_path=local_path)
-        for pattern in pattern_lst:
-            if pattern in open(local_path, encoding="utf-8").read():
-                response = pattern
-            else:
-                LOGGER.info("Match not found : %s", pattern)
-                os.remove(local_path)
-                return False, pattern
-            LOGGER.info("Match found : %s", pattern)
-
+        matcher = MultiPatternMatcher(pattern_lst)
+        with open(local_path, encoding="utf-8") as file_obj:
+            for line in file_obj:
+                matcher.feed(line)
+                if matcher.all_matched:
+                    break
         os.remove(local_path)
-        return True, response
+        for pattern in matcher.remaining:
+            LOGGER.info("Match not found : %s", pattern)
+            return False, pattern
+        LOGGER.info("Match found : %s", pattern_lst)
+
+        return True, pattern_lst[-1] if pattern_lst else None
 
     def check_service_recovery(self, service, delay=40):
         """
@@ -0,0 +1,319 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Bucket purge engine used for S3 test teardown.
+
+Buckets are emptied with paginated listings and batched multi-object deletes (objects, versions
+and delete markers), stale multipart uploads are aborted and several buckets are purged in
+parallel under a concurrency cap. Completed buckets are recorded in an optional state file so an
+interrupted purge can be resumed without re-listing already deleted buckets.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from botocore.exceptions import ClientError
+
+from config.s3 import S3_CFG
+
+LOGGER = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys per request.
+MAX_DELETE_BATCH = 1000
+
+
+class PurgeProgress:
+    """Thread safe counters used to report purge progress across buckets."""
+
+    def __init__(self, report_every: int = 10000, callback=None):
+        """
+        Initialize progress counters.
+
+        :param report_every: Log progress after every 'report_every' deleted entries.
+        :param callback: Optional callable invoked as callback(bucket_name, stats_dict).
+        """
+        self._lock = threading.Lock()
+        self._last_report = 0
+        self.report_every = report_every
+        self.callback = callback
+        self.deleted = 0
+        self.failed = 0
+        self.aborted_uploads = 0
+        self.buckets_done = 0
+
+    def update(self, bucket_name: str, deleted: int = 0, failed: int = 0,
+               aborted_uploads: int = 0) -> None:
+        """Add counts for a bucket and report progress if threshold is crossed."""
+        with self._lock:
+            self.deleted += deleted
+            self.failed += failed
+            self.aborted_uploads += aborted_uploads
+            if self.deleted - self._last_report >= self.report_every:
+                self._last_report = self.deleted
+                LOGGER.info("Purge progress: deleted=%s failed=%s aborted_uploads=%s "
+                            "buckets_done=%s", self.deleted, self.failed,
+                            self.aborted_uploads, self.buckets_done)
+            stats = self.as_dict()
+        if self.callback:
+            self.callback(bucket_name, stats)
+
+    def bucket_done(self) -> None:
+        """Mark one more bucket as completely purged."""
+        with self._lock:
+            self.buckets_done += 1
+
+    def as_dict(self) -> dict:
+        """Return snapshot of counters."""
+        return {"deleted": self.deleted, "failed": self.failed,
+                "aborted_uploads": self.aborted_uploads, "buckets_done": self.buckets_done}
+
+
+class PurgeState:
+    """Persist names of fully purged buckets so that an interrupted purge can be resumed."""
+
+    def __init__(self, state_file: str = None):
+        """
+        Load state from state_file if it exists.
+
+        :param state_file: Path of json state file, state is kept in memory only if None.
+        """
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self.completed = set()
+        if state_file and os.path.exists(state_file):
+            with open(state_file, "r", encoding="utf-8") as fobj:
+                self.completed = set(json.load(fobj).get("completed", []))
+            LOGGER.info("Resuming purge, %s buckets already completed", len(self.completed))
+
+    def is_done(self, bucket_name: str) -> bool:
+        """Check whether bucket was purged in a previous run."""
+        return bucket_name in self.completed
+
+    def mark_done(self, bucket_name: str) -> None:
+        """Record bucket as purged and flush state file."""
+        with self._lock:
+            self.completed.add(bucket_name)
+            if self.state_file:
+                tmp_file = f"{self.state_file}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as fobj:
+                    json.dump({"completed": sorted(self.completed)}, fobj)
+                os.replace(tmp_file, self.state_file)
+
+    def clear(self) -> None:
+        """Forget completed buckets once the purge finished successfully."""
+        self.completed = set()
+        if self.state_file and os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+
+class BucketPurgeLib:
+    """Purge (empty and delete) S3 buckets using paginated listings and batched deletes."""
+
+    def __init__(self, s3_obj, **kwargs):
+        """
+        Initialize purge engine.
+
+        :param s3_obj: Any S3 library object exposing boto3 's3_client' e.g. S3TestLib.
+        :keyword max_workers: Max number of buckets purged concurrently.
+        :keyword page_size: Max keys fetched per listing page (<= 1000).
+        :keyword abort_uploads_older_than: Abort multipart uploads initiated before these many
+            seconds, 0 aborts every in-progress upload.
+        :keyword state_file: Json file used to resume an interrupted purge.
+        :keyword progress_callback: Callable invoked as callback(bucket_name, stats_dict).
+        """
+        purge_cfg = S3_CFG.get("purge", {})
+        self.s3_client = s3_obj.s3_client
+        self.max_workers = kwargs.get("max_workers", purge_cfg.get("max_workers", 8))
+        self.page_size = min(kwargs.get("page_size", purge_cfg.get("page_size", 1000)),
+                             MAX_DELETE_BATCH)
+        self.abort_uploads_older_than = kwargs.get(
+            "abort_uploads_older_than", purge_cfg.get("abort_uploads_older_than", 0))
+        self.state = PurgeState(kwargs.get("state_file", None))
+        self.progress = PurgeProgress(purge_cfg.get("report_every", 10000),
+                                      kwargs.get("progress_callback", None))
+
+    def is_versioned(self, bucket_name: str) -> bool:
+        """Check whether bucket versioning was ever enabled on a bucket."""
+        response = self.s3_client.get_bucket_versioning(Bucket=bucket_name)
+        return response.get("Status") in ("Enabled", "Suspended")
+
+    def iter_object_batches(self, bucket_name: str):
+        """
+        Yield DeleteObjects ready batches of current objects.
+
+        :param bucket_name: Name of the bucket.
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name,
+                                       PaginationConfig={"PageSize": self.page_size}):
+            batch = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            if batch:
+                yield batch
+
+    def iter_version_batches(self, bucket_name: str):
+        """
+        Yield DeleteObjects ready batches of object versions and delete markers.
+
+        :param bucket_name: Name of the bucket.
+        """
+        paginator = self.s3_client.get_paginator("list_object_versions")
+        for page in paginator.paginate(Bucket=bucket_name,
+                                       PaginationConfig={"PageSize": self.page_size}):
+            entries = page.get("Versions", []) + page.get("DeleteMarkers", [])
+            batch = [{"Key": ent["Key"], "VersionId": ent["VersionId"]} for ent in entries]
+            # Versions and delete markers together may exceed the per request limit.
+            for idx in range(0, len(batch), MAX_DELETE_BATCH):
+                yield batch[idx:idx + MAX_DELETE_BATCH]
+
+    def delete_batch(self, bucket_name: str, batch: list) -> tuple:
+        """
+        Delete a batch of keys/versions with a single DeleteObjects request.
+
+        :param bucket_name: Name of the bucket.
+        :param batch: List of {'Key': .., 'VersionId': ..} dicts.
+        :return: (deleted count, list of errors)
+        """
+        response = self.s3_client.delete_objects(
+            Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True})
+        errors = response.get("Errors", [])
+        for error in errors:
+            LOGGER.error("Failed to delete %s/%s(%s): %s", bucket_name, error.get("Key"),
+                         error.get("VersionId"), error.get("Message"))
+
+        return len(batch) - len(errors), errors
+
+    def abort_multipart_uploads(self, bucket_name: str) -> int:
+        """
+        Abort stale multipart uploads of a bucket.
+
+        :param bucket_name: Name of the bucket.
+        :return: Number of aborted uploads.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.abort_uploads_older_than)
+        aborted = 0
+        paginator = self.s3_client.get_paginator("list_multipart_uploads")
+        for page in paginator.paginate(Bucket=bucket_name):
+            for upload in page.get("Uploads", []):
+                initiated = upload.get("Initiated")
+                if self.abort_uploads_older_than and initiated and initiated > cutoff:
+                    continue
+                self.s3_client.abort_multipart_upload(
+                    Bucket=bucket_name, Key=upload["Key"], UploadId=upload["UploadId"])
+                aborted += 1
+        if aborted:
+            LOGGER.info("Aborted %s multipart uploads in bucket %s", aborted, bucket_name)
+
+        return aborted
+
+    def empty_bucket(self, bucket_name: str, abort_uploads: bool = True) -> dict:
+        """
+        Delete all objects, versions, delete markers and stale multipart uploads of a bucket.
+
+        :param bucket_name: Name of the bucket.
+        :param abort_uploads: Abort stale multipart uploads, required to delete the bucket.
+        :return: Dict with deleted, failed and aborted_uploads counts.
+        """
+        stats = {"deleted": 0, "failed": 0, "aborted_uploads": 0}
+        if abort_uploads:
+            aborted = self.abort_multipart_uploads(bucket_name)
+            stats["aborted_uploads"] = aborted
+            self.progress.update(bucket_name, aborted_uploads=aborted)
+        if self.is_versioned(bucket_name):
+            batches = self.iter_version_batches(bucket_name)
+        else:
+            batches = self.iter_object_batches(bucket_name)
+        for batch in batches:
+            deleted, errors = self.delete_batch(bucket_name, batch)
+            stats["deleted"] += deleted
+            stats["failed"] += len(errors)
+            self.progress.update(bucket_name, deleted=deleted, failed=len(errors))
+
+        return stats
+
+    def purge_bucket(self, bucket_name: str, delete_bucket: bool = True) -> tuple:
+        """
+        Empty a bucket and optionally delete it.
+
+        :param bucket_name: Name of the bucket.
+        :param delete_bucket: Delete bucket itself once it is empty.
+        :return: (Boolean, stats dict or error)
+        """
+        if self.state.is_done(bucket_name):
+            LOGGER.info("Bucket %s already purged in previous run, skipping", bucket_name)
+            return True, {"deleted": 0, "failed": 0, "aborted_uploads": 0, "skipped": True}
+        start_time = perf_counter()
+        try:
+            stats = self.empty_bucket(bucket_name)
+            if stats["failed"]:
+                return False, stats
+            if delete_bucket:
+                self.s3_client.delete_bucket(Bucket=bucket_name)
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") != "NoSuchBucket":
+                LOGGER.error("Error in %s: %s", BucketPurgeLib.purge_bucket.__name__, error)
+                return False, error
+            stats = {"deleted": 0, "failed": 0, "aborted_uploads": 0}
+        stats["time"] = perf_counter() - start_time
+        self.progress.bucket_done()
+        if delete_bucket:
+            self.state.mark_done(bucket_name)
+        LOGGER.info("Purged bucket %s: %s", bucket_name, stats)
+
+        return True, stats
+
+    def purge_buckets(self, bucket_list: list, delete_bucket: bool = True) -> tuple:
+        """
+        Purge multiple buckets in parallel.
+
+        :param bucket_list: List of bucket names.
+        :param delete_bucket: Delete buckets once they are empty.
+        :return: (Boolean, {"Deleted": [...], "CouldNotDelete": [...]})
+        """
+        response_dict = {"Deleted": [], "CouldNotDelete": []}
+        if not bucket_list:
+            return True, response_dict
+        workers = max(1, min(self.max_workers, len(bucket_list)))
+        LOGGER.info("Purging %s buckets with %s workers", len(bucket_list), workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.purge_bucket, bucket, delete_bucket): bucket
+                       for bucket in bucket_list}
+            for future in as_completed(futures):
+                bucket = futures[future]
+                try:
+                    status, _ = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    LOGGER.error("Error in %s: %s", BucketPurgeLib.purge_buckets.__name__, error)
+                    status = False
+                if status:
+                    response_dict["Deleted"].append(bucket)
+                else:
+                    response_dict["CouldNotDelete"].append(bucket)
+        LOGGER.info("Purge summary: %s", self.progress.as_dict())
+        if response_dict["CouldNotDelete"]:
+            LOGGER.error("Failed to purge buckets: %s", response_dict["CouldNotDelete"])
+            return False, response_dict
+        self.state.clear()
+
+        return True, response_dict
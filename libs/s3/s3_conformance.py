@@ -0,0 +1,638 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+Cross client S3 conformance differential engine.
+
+One declarative sequence of operations is run through every available client (boto3 of
+S3TestLib, aws cli on AWScliS3api, s3cmd on S3CmdCommandBuilder and minio mc). Every
+response is normalised into a common result (ok, status, error code, ETag, size, content
+type, metadata, listing and body md5) and results of each client are compared with the
+reference client. Fields a client cannot observe are None and not compared. jcloud and s3fs
+are bulk transfer and file system tools without per request results and are not covered.
+
+Sequence steps are dicts, e.g.
+    {"op": "put_object", "bucket": "b1", "key": "dir/obj", "size": 1024,
+     "metadata": {"owner": "qa"}, "content_type": "text/plain"}
+    {"op": "get_object", "bucket": "b1", "key": "missing", "expect": {"error_code": "NoSuchKey"}}
+Operations: create_bucket, head_bucket, delete_bucket (force), put_object, head_object,
+get_object, copy_object (src_key), list_objects (prefix), delete_object. Bucket names are
+logical, every client works in its own real buckets.
+"""
+
+import abc
+import ast
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import shlex
+import shutil
+import time
+from urllib.parse import urlsplit
+
+from botocore.exceptions import ClientError
+
+from config.s3 import S3_CFG
+from commons import commands
+from commons.utils import system_utils
+from libs.s3.s3_awscli import AWScliS3api
+from libs.s3.s3_s3cmd import S3CmdCommandBuilder
+
+LOGGER = logging.getLogger(__name__)
+
+FIELDS = ("ok", "status", "error_code", "etag", "size", "content_type", "metadata", "listing",
+          "body_md5")
+# HTTP status of S3 error codes, for clients reporting only the code
+ERROR_STATUS = {"NoSuchBucket": 404, "NoSuchKey": 404, "NotFound": 404, "AccessDenied": 403,
+                "Forbidden": 403, "BucketNotEmpty": 409, "BucketAlreadyExists": 409,
+                "BucketAlreadyOwnedByYou": 409, "InvalidBucketName": 400, "BadRequest": 400,
+                "InvalidArgument": 400, "NotImplemented": 501}
+STATUS_CODE = {400: "BadRequest", 403: "Forbidden", 404: "NotFound", 409: "Conflict"}
+# Prefix of the exit status echoed after cli commands
+RC_MARKER = "conformance-rc="
+OPERATIONS = ("create_bucket", "head_bucket", "delete_bucket", "put_object", "head_object",
+              "get_object", "copy_object", "list_objects", "delete_object")
+
+
+def new_result(op: str, **kwargs) -> dict:
+    """Common result with every field unobserved."""
+    result = dict.fromkeys(FIELDS)
+    result.update(op=op, **kwargs)
+    return result
+
+
+def normalise_etag(etag) -> str:
+    """ETag without quotes in lower case."""
+    return str(etag).strip().strip('"').lower() if etag else None
+
+
+def normalise_error(code, status: int = None) -> tuple:
+    """(error_code, status) with numeric codes (HEAD errors) mapped to names."""
+    code = str(code).strip() if code else None
+    if code and code.isdigit():
+        status = status or int(code)
+        code = STATUS_CODE.get(int(code), code)
+    return code, status or ERROR_STATUS.get(code)
+
+
+def normalise_metadata(metadata: dict) -> dict:
+    """User metadata with lower case names without the x-amz-meta- prefix."""
+    if metadata is None:
+        return None
+    return {re.sub(r"^x-amz-meta-", "", name.lower()): value
+            for name, value in metadata.items()}
+
+
+def file_md5(path: str) -> str:
+    """md5 of a file."""
+    digest = hashlib.md5()  # nosec
+    with open(path, "rb") as fptr:
+        for chunk in iter(lambda: fptr.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConformanceClient(abc.ABC):
+    """Client adapter running a step and returning a common result."""
+
+    name = None
+
+    def available(self) -> bool:
+        """True if the client can be used on this machine."""
+        return True
+
+    @abc.abstractmethod
+    def run(self, step: dict, bucket: str, data_path: str = None, out_path: str = None) -> dict:
+        """
+        Run one step.
+
+        :param step: Step of the sequence.
+        :param bucket: Real bucket name of the step for this client.
+        :param data_path: File with the object data of put_object.
+        :param out_path: File to download get_object into.
+        :return: Common result.
+        """
+
+
+class Boto3Client(ConformanceClient):
+    """boto3 s3 client of an S3 library object."""
+
+    name = "boto3"
+
+    def __init__(self, s3_obj):
+        """
+        :param s3_obj: S3TestLib or other S3 library object, its s3_client is used.
+        """
+        self.client = s3_obj.s3_client
+
+    @staticmethod
+    def _object(result: dict, resp: dict) -> dict:
+        """Fill object fields of a head/get response."""
+        result.update(etag=normalise_etag(resp.get("ETag")), size=resp.get("ContentLength"),
+                      content_type=resp.get("ContentType"),
+                      metadata=normalise_metadata(resp.get("Metadata", {})))
+        return result
+
+    def _delete_all(self, bucket: str):
+        """Delete every object of bucket."""
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=bucket):
+            for obj in page.get("Contents", []):
+                self.client.delete_object(Bucket=bucket, Key=obj["Key"])
+
+    def run(self, step, bucket, data_path=None, out_path=None):
+        result = new_result(step["op"])
+        try:
+            resp = self._call(step, bucket, data_path, out_path, result)
+            result.update(ok=True, status=resp["ResponseMetadata"]["HTTPStatusCode"])
+        except ClientError as error:
+            code, status = normalise_error(error.response.get("Error", {}).get("Code"),
+                                           error.response.get("ResponseMetadata", {}).get(
+                                               "HTTPStatusCode"))
+            result.update(ok=False, error_code=code, status=status)
+        return result
+
+    # pylint: disable=too-many-arguments
+    def _call(self, step, bucket, data_path, out_path, result):
+        """Call the boto3 api of the step."""
+        oper, key = step["op"], step.get("key")
+        if oper == "create_bucket":
+            return self.client.create_bucket(Bucket=bucket)
+        if oper == "head_bucket":
+            return self.client.head_bucket(Bucket=bucket)
+        if oper == "delete_bucket":
+            if step.get("force"):
+                self._delete_all(bucket)
+            return self.client.delete_bucket(Bucket=bucket)
+        if oper == "put_object":
+            kwargs = {"Metadata": step.get("metadata", {})}
+            if step.get("content_type"):
+                kwargs["ContentType"] = step["content_type"]
+            with open(data_path, "rb") as body:
+                resp = self.client.put_object(Bucket=bucket, Key=key, Body=body, **kwargs)
+            result["etag"] = normalise_etag(resp.get("ETag"))
+            return resp
+        if oper in ("head_object", "get_object"):
+            resp = getattr(self.client, oper)(Bucket=bucket, Key=key)
+            self._object(result, resp)
+            if oper == "get_object":
+                with open(out_path, "wb") as fptr:
+                    for chunk in iter(lambda: resp["Body"].read(1024 * 1024), b""):
+                        fptr.write(chunk)
+                result["body_md5"] = file_md5(out_path)
+            return resp
+        if oper == "copy_object":
+            resp = self.client.copy_object(Bucket=bucket, Key=key, CopySource={
+                "Bucket": bucket, "Key": step["src_key"]})
+            result["etag"] = normalise_etag(resp.get("CopyObjectResult", {}).get("ETag"))
+            return resp
+        if oper == "list_objects":
+            listing, resp = [], None
+            for resp in self.client.get_paginator("list_objects_v2").paginate(
+                    Bucket=bucket, Prefix=step.get("prefix", "")):
+                listing += [{"key": obj["Key"], "size": obj["Size"],
+                             "etag": normalise_etag(obj.get("ETag"))}
+                            for obj in resp.get("Contents", [])]
+            result["listing"] = listing
+            return resp
+        if oper == "delete_object":
+            return self.client.delete_object(Bucket=bucket, Key=key)
+        raise ValueError(f"Unsupported operation {oper}")
+
+
+def local_cmd(cmd: str) -> tuple:
+    """
+    Run a client command with run_local_cmd like the s3 cli wrappers.
+
+    run_local_cmd does not return the exit status, it is echoed after the command and the
+    command succeeds only if it is 0, warnings on stderr do not fail it.
+    :param cmd: Command line.
+    :return: (bool, stdout text on success, stderr text or stdout if stderr is empty on
+        failure)
+    """
+    status, output = system_utils.run_local_cmd(f"{cmd}; echo {RC_MARKER}$?", flg=True)
+    if not status:
+        return False, str(output)
+    stdout, stderr = (each.decode(errors="replace") for each in ast.literal_eval(output))
+    body, marker, ret_code = stdout.rpartition(RC_MARKER)
+    if marker and ret_code.strip() == "0":
+        return True, body
+    LOGGER.debug("Exit status %s of %s", ret_code.strip() if marker else None, cmd)
+    return False, stderr if stderr.strip() else (body if marker else stdout)
+
+
+class CliClient(ConformanceClient):
+    """Base of command line clients run through system_utils.run_local_cmd."""
+
+    binary = None
+
+    def __init__(self, endpoint: str = None, access: str = None, secret: str = None,
+                 **kwargs):
+        """
+        :param endpoint: S3 endpoint url, s3_url of the s3 config if None.
+        :param access: Access key, None uses the credentials configured for the client.
+        :param secret: Secret key.
+        :keyword validate_certs: Verify the endpoint certificate, from the s3 config if
+            not given.
+        :keyword region: Region.
+        """
+        self.endpoint = (endpoint or S3_CFG["s3_url"]).rstrip("/")
+        self.access = access
+        self.secret = secret
+        self.validate_certs = kwargs.get("validate_certs", S3_CFG["validate_certs"])
+        self.region = kwargs.get("region", "us-east-1")
+
+    def available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    def env(self) -> dict:
+        """Environment variables of the commands."""
+        return {}
+
+    def command(self, args: list) -> tuple:
+        """Run the client with args, returns local_cmd output."""
+        return local_cmd(" ".join([f"{name}={shlex.quote(value)}"
+                                   for name, value in self.env().items()] +
+                                  [shlex.quote(str(arg)) for arg in args]))
+
+    @abc.abstractmethod
+    def run(self, step, bucket, data_path=None, out_path=None):
+        """Build the client command of the step, run it and normalise its output."""
+
+
+class AwsCliClient(CliClient, AWScliS3api):
+    """aws cli client on AWScliS3api endpoint options and the CMD_AWSCLI commands."""
+
+    name = "awscli"
+    binary = "aws"
+    ERROR_RE = re.compile(r"An error occurred \((\w+)\)")
+
+    def __init__(self, endpoint: str = None, access: str = None, secret: str = None,
+                 **kwargs):
+        """See CliClient, None access uses the configured aws profile."""
+        AWScliS3api.__init__(self)
+        CliClient.__init__(self, endpoint, access, secret, **kwargs)
+        if endpoint:
+            self.cmd_endpoint_options = f" --endpoint-url {self.endpoint}" \
+                f"{'' if self.validate_certs else ' --no-verify-ssl'}"
+
+    def env(self):
+        if not self.access:
+            return {}
+        return {"AWS_ACCESS_KEY_ID": self.access, "AWS_SECRET_ACCESS_KEY": self.secret,
+                "AWS_DEFAULT_REGION": self.region}
+
+    def aws(self, cmd: str) -> tuple:
+        """Run an aws command with the endpoint options and credentials."""
+        env = " ".join(f"{name}={shlex.quote(value)}" for name, value in self.env().items())
+        return local_cmd(" ".join(filter(None, [env, cmd + self.cmd_endpoint_options])))
+
+    def _command(self, step: dict, bucket: str, out_path: str, data_path: str) -> str:
+        """aws command line of a step."""
+        oper, key = step["op"], step.get("key")
+        if oper == "create_bucket":
+            return commands.CMD_AWSCLI_CREATE_BUCKET.format(bucket)
+        if oper == "delete_bucket":
+            return commands.CMD_AWSCLI_DELETE_BUCKET.format(bucket) + (
+                " --force" if step.get("force") else "")
+        if oper == "head_bucket":
+            return commands.CMD_AWSCLI_HEAD_BUCKET.format(bucket)
+        if oper == "list_objects":
+            return commands.CMD_AWSCLI_LIST_OBJECTS_V2_OPTIONS_BUCKETS.format(
+                bucket, f"--prefix {shlex.quote(step.get('prefix', ''))} --output json")
+        args = []
+        if oper == "put_object":
+            args += ["--body", data_path]
+            if step.get("metadata"):
+                args += ["--metadata", json.dumps(step["metadata"])]
+            if step.get("content_type"):
+                args += ["--content-type", step["content_type"]]
+        elif oper == "get_object":
+            args.append(out_path)
+        elif oper == "copy_object":
+            args += ["--copy-source", f"{bucket}/{step['src_key']}"]
+        return commands.CMD_AWSCLI_S3API_OBJECT.format(
+            oper.replace("_", "-"), bucket, shlex.quote(key)) + "".join(
+                f" {shlex.quote(arg)}" for arg in args + ["--output", "json"])
+
+    def run(self, step, bucket, data_path=None, out_path=None):
+        oper = step["op"]
+        result = new_result(oper)
+        status, output = self.aws(self._command(step, bucket, out_path, data_path))
+        # aws s3 mb/rb report failures like make_bucket failed: s3://bucket An error ...
+        match = self.ERROR_RE.search(output)
+        result["ok"] = status and not match
+        if not result["ok"]:
+            result["error_code"], result["status"] = normalise_error(
+                match.group(1) if match else output.strip().splitlines()[-1:] or None)
+            return result
+        try:
+            out = json.loads(output) if output.strip().startswith("{") else {}
+        except ValueError:
+            out = {}
+        if oper in ("put_object", "copy_object"):
+            result["etag"] = normalise_etag(out.get("ETag") or
+                                            out.get("CopyObjectResult", {}).get("ETag"))
+        elif oper in ("head_object", "get_object"):
+            result.update(etag=normalise_etag(out.get("ETag")), size=out.get("ContentLength"),
+                          content_type=out.get("ContentType"),
+                          metadata=normalise_metadata(out.get("Metadata", {})))
+            if oper == "get_object":
+                result["body_md5"] = file_md5(out_path)
+        elif oper == "list_objects":
+            result["listing"] = [{"key": obj["Key"], "size": obj["Size"],
+                                  "etag": normalise_etag(obj.get("ETag"))}
+                                 for obj in out.get("Contents") or []]
+        return result
+
+
+class S3cmdClient(CliClient):
+    """s3cmd client on S3CmdCommandBuilder options, ETags are not part of its listing."""
+
+    name = "s3cmd"
+    binary = "s3cmd"
+    ERROR_RE = re.compile(r"S3 error: (\d{3})(?: \((\w+)\))?")
+
+    def builder(self) -> S3CmdCommandBuilder:
+        """Command builder with the connection options."""
+        parts = urlsplit(self.endpoint)
+        return S3CmdCommandBuilder(access_key=self.access, secret_key=self.secret,
+                                   ssl=parts.scheme == "https",
+                                   check_certificate=self.validate_certs,
+                                   host_port=parts.netloc, host_bucket=parts.netloc)
+
+    def s3cmd(self, args: list) -> tuple:
+        """Run an s3cmd action with the connection options."""
+        builder = self.builder()
+        return self.command(builder.parent_cmd + builder.build_options() +
+                            [f"--region={self.region}", "--no-preserve"] + args)
+
+    def run(self, step, bucket, data_path=None, out_path=None):
+        oper, key = step["op"], step.get("key")
+        result = new_result(oper)
+        uri = f"s3://{bucket}" + (f"/{key}" if key else "")
+        if oper == "get_object":
+            status, output = self.command(self.builder().build_get_command(out_path, uri) +
+                                          ["--force"])
+        else:
+            args = {"create_bucket": ["mb", uri], "head_bucket": ["info", uri],
+                    "delete_bucket": ["rb", uri] + (["--recursive"] if step.get("force")
+                                                    else []),
+                    "head_object": ["info", uri], "delete_object": ["del", uri],
+                    "list_objects": ["ls", "--recursive", f"{uri}/{step.get('prefix', '')}"],
+                    "copy_object": ["cp", f"s3://{bucket}/{step.get('src_key')}", uri]}.get(oper)
+            if oper == "put_object":
+                args = ["put", data_path, uri] + [f"--add-header=x-amz-meta-{name}:{value}"
+                                                  for name, value in
+                                                  step.get("metadata", {}).items()]
+                if step.get("content_type"):
+                    args.append(f"--mime-type={step['content_type']}")
+                else:
+                    args.append("--no-guess-mime-type")
+            status, output = self.s3cmd(args)
+        match = self.ERROR_RE.search(output)
+        result["ok"] = status and not match
+        if not result["ok"]:
+            if match:
+                result["error_code"], result["status"] = normalise_error(
+                    match.group(2) or match.group(1), int(match.group(1)))
+            elif "does not exist" in output:
+                result["error_code"], result["status"] = normalise_error(
+                    "NoSuchKey" if key else "NoSuchBucket")
+            return result
+        if oper == "head_object":
+            info = dict(re.findall(r"^\s*([\w\- ]+?):\s+(.*?)\s*$", output, re.MULTILINE))
+            result.update(size=int(info["File size"]) if "File size" in info else None,
+                          etag=normalise_etag(info.get("MD5 sum")),
+                          content_type=info.get("MIME type"),
+                          metadata=normalise_metadata({name: value for name, value in
+                                                       info.items() if
+                                                       name.lower().startswith("x-amz-meta-")}))
+        elif oper == "get_object":
+            result["body_md5"] = file_md5(out_path)
+        elif oper == "list_objects":
+            prefix = f"s3://{bucket}/"
+            result["listing"] = [{"key": uri_.replace(prefix, "", 1), "size": int(size),
+                                  "etag": None}
+                                 for size, uri_ in re.findall(r"\s(\d+)\s+(?:\w+\s+)?(s3://\S+)",
+                                                              output)]
+        return result
+
+
+class MinioClient(CliClient):
+    """minio mc client using an alias from the environment, there is no mc wrapper."""
+
+    name = "minio"
+    binary = "mc"
+    alias = "conformance"
+    CODE_RE = re.compile(r'"Code":\s*"(\w+)"')
+
+    def env(self):
+        if not self.access:
+            return {}
+        parts = urlsplit(self.endpoint)
+        return {f"MC_HOST_{self.alias}":
+                f"{parts.scheme}://{self.access}:{self.secret}@{parts.netloc}"}
+
+    def mc(self, args: list) -> tuple:
+        """Run mc with json output, returns (bool, list of json records, raw output)."""
+        status, output = self.command([self.binary, "--json"] +
+                                      ([] if self.validate_certs else ["--insecure"]) + args)
+        records = []
+        for line in output.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return status, records, output
+
+    def run(self, step, bucket, data_path=None, out_path=None):
+        oper, key = step["op"], step.get("key")
+        result = new_result(oper)
+        path = f"{self.alias}/{bucket}" + (f"/{key}" if key else "")
+        attrs = ";".join([f"{name}={value}" for name, value in
+                          step.get("metadata", {}).items()] +
+                         ([f"Content-Type={step['content_type']}"]
+                          if step.get("content_type") else []))
+        args = {"create_bucket": ["mb", path], "head_bucket": ["stat", path],
+                "delete_bucket": ["rb", path] + (["--force"] if step.get("force") else []),
+                "put_object": ["cp", data_path, path] + (["--attr", attrs] if attrs else []),
+                "head_object": ["stat", path], "get_object": ["cp", path, out_path],
+                "delete_object": ["rm", path],
+                "list_objects": ["ls", "--recursive",
+                                 f"{self.alias}/{bucket}/{step.get('prefix', '')}"],
+                "copy_object": ["cp", f"{self.alias}/{bucket}/{step.get('src_key')}",
+                                path]}[oper]
+        status, records, raw = self.mc(args)
+        errors = [each for each in records if each.get("status") == "error"]
+        result["ok"] = status and not errors
+        if not result["ok"]:
+            match = self.CODE_RE.search(raw)
+            result["error_code"], result["status"] = normalise_error(
+                match.group(1) if match else None)
+            return result
+        if oper == "head_object" and records:
+            meta = records[0].get("metadata", {})
+            result.update(etag=normalise_etag(records[0].get("etag")),
+                          size=records[0].get("size"),
+                          content_type=meta.get("Content-Type"),
+                          metadata=normalise_metadata({name: value for name, value in
+                                                       meta.items() if name.lower()
+                                                       .startswith("x-amz-meta-")}))
+        elif oper == "get_object":
+            result["body_md5"] = file_md5(out_path)
+        elif oper == "list_objects":
+            result["listing"] = [{"key": step.get("prefix", "") + each["key"],
+                                  "size": each.get("size"),
+                                  "etag": normalise_etag(each.get("etag"))}
+                                 for each in records if each.get("type") == "file"]
+        return result
+
+
+def compare_field(field: str, reference, value) -> bool:
+    """True if a field of two results agrees, unobserved (None) values always agree."""
+    if reference is None or value is None:
+        return True
+    if field == "listing":
+        fields = [name for name in ("key", "size", "etag")
+                  if all(each.get(name) is not None for each in reference + value)]
+
+        def project(items):
+            return sorted(tuple(each[name] for name in fields) for each in items)
+        return project(reference) == project(value)
+    return reference == value
+
+
+class ConformanceEngine:
+    """Run a sequence through every client and report divergences."""
+
+    def __init__(self, clients: list, workdir: str, bucket_prefix: str = "conf", seed: int = 0):
+        """
+        :param clients: ConformanceClient objects, the first available one is the reference.
+        :param workdir: Directory for object data and downloads.
+        :param bucket_prefix: Prefix of the real bucket names.
+        :param seed: Seed of generated object data.
+        """
+        self.clients = [client for client in clients if client.available()]
+        skipped = [client.name for client in clients if client not in self.clients]
+        if skipped:
+            LOGGER.warning("Clients not available: %s", skipped)
+        if not self.clients:
+            raise ValueError("No s3 client available")
+        self.workdir = workdir
+        self.bucket_prefix = bucket_prefix
+        self.seed = seed
+        self.run_id = format(int(time.time() * 1000) % 0xffffff, "x")
+
+    def bucket(self, client, logical: str) -> str:
+        """Real bucket of a logical bucket for a client."""
+        return f"{self.bucket_prefix}-{client.name}-{logical}-{self.run_id}".lower()[:63]
+
+    def data_file(self, index: int, step: dict) -> str:
+        """Object data of a put_object step, same for every client."""
+        path = os.path.join(self.workdir, f"step{index}.data")
+        if not os.path.exists(path):
+            rng = random.Random(f"{self.seed}-{index}")
+            size = step.get("size", 1024)
+            with open(path, "wb") as fptr:
+                fptr.write(rng.getrandbits(size * 8).to_bytes(size, "little") if size else b"")
+        return path
+
+    def run(self, sequence: list, cleanup: bool = True) -> dict:
+        """
+        Run sequence through every client and compare with the reference client.
+
+        :param sequence: List of steps.
+        :param cleanup: Force delete buckets of the sequence afterwards.
+        :return: Report dict with clients, results ({client: [result]}), divergences,
+            expectation_failures and passed.
+        """
+        for step in sequence:
+            if step.get("op") not in OPERATIONS:
+                raise ValueError(f"Unknown operation in step {step}")
+        os.makedirs(self.workdir, exist_ok=True)
+        report = {"clients": [client.name for client in self.clients], "results": {},
+                  "divergences": [], "expectation_failures": []}
+        for client in self.clients:
+            results = []
+            for index, step in enumerate(sequence):
+                data = self.data_file(index, step) if step["op"] == "put_object" else None
+                out = os.path.join(self.workdir, f"{client.name}-step{index}.out")
+                try:
+                    result = client.run(step, self.bucket(client, step["bucket"]), data, out)
+                except Exception as error:  # pylint: disable=broad-except
+                    LOGGER.exception("%s failed step %s", client.name, step)
+                    result = new_result(step["op"], ok=False, error_code="ClientFailure",
+                                        exception=str(error))
+                results.append(result)
+            report["results"][client.name] = results
+            if cleanup:
+                self.cleanup(client, sequence)
+        reference = self.clients[0].name
+        for index, step in enumerate(sequence):
+            ref = report["results"][reference][index]
+            for field, expected in step.get("expect", {}).items():
+                for client in self.clients:
+                    value = report["results"][client.name][index].get(field)
+                    if value != expected:
+                        report["expectation_failures"].append(
+                            {"step": index, "op": step["op"], "client": client.name,
+                             "field": field, "expected": expected, "value": value})
+            for client in self.clients[1:]:
+                result = report["results"][client.name][index]
+                for field in FIELDS:
+                    if field in step.get("ignore", []):
+                        continue
+                    if not compare_field(field, ref[field], result[field]):
+                        report["divergences"].append(
+                            {"step": index, "op": step["op"], "field": field,
+                             "reference": reference, "reference_value": ref[field],
+                             "client": client.name, "value": result[field]})
+        report["passed"] = not report["divergences"] and not report["expectation_failures"]
+        for each in report["divergences"]:
+            LOGGER.error("Divergence step %s %s %s: %s=%s %s=%s", each["step"], each["op"],
+                         each["field"], reference, each["reference_value"], each["client"],
+                         each["value"])
+        return report
+
+    def cleanup(self, client, sequence: list):
+        """Force delete the buckets of the sequence created by a client."""
+        for logical in sorted({step["bucket"] for step in sequence}):
+            try:
+                client.run({"op": "delete_bucket", "force": True},
+                           self.bucket(client, logical))
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.debug("Cleanup of %s by %s: %s", logical, client.name, error)
+
+
+def report_text(report: dict) -> str:
+    """Text summary of an engine report."""
+    lines = [f"S3 conformance over {', '.join(report['clients'])}: "
+             f"{len(report['divergences'])} divergence(s), "
+             f"{len(report['expectation_failures'])} expectation failure(s)"]
+    for each in report["divergences"]:
+        lines.append(f"  step {each['step']} {each['op']} {each['field']}: "
+                     f"{each['reference']}={each['reference_value']!r} "
+                     f"{each['client']}={each['value']!r}")
+    for each in report["expectation_failures"]:
+        lines.append(f"  step {each['step']} {each['op']} {each['client']} {each['field']}: "
+                     f"expected {each['expected']!r} got {each['value']!r}")
+    return "\n".join(lines)
@@ -29,6 +29,7 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from commons import s3_dns
 from commons.constants import S3_ENGINE_RGW
 from config import S3_CFG, CMN_CFG
 
@@ -56,6 +57,8 @@ class S3Rest:
         :param region: region.
         :param aws_session_token: aws_session_token.
         :param debug: debug mode.
+        :param balancer: s3_dns.EndpointBalancer spreading requests over endpoints, defaults to
+            the shared balancer if configured.
         """
         init_s3_connection = kwargs.get("init_s3_connection", True)
         if S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
@@ -95,6 +98,9 @@ class S3Rest:
                                               region_name=region,
                                               aws_session_token=aws_session_token,
                                               config=config)
+                balancer = kwargs.get("balancer", s3_dns.get_balancer())
+                if balancer and balancer.attach(self.s3_client):
+                    balancer.attach(self.s3_resource.meta.client)
             else:
                 LOGGER.info("Skipped: create s3 client, resource object with boto3.")
         except ClientError as error:
@@ -321,13 +327,11 @@ class S3Lib(S3Rest):
         """
         bucket = self.s3_resource.Bucket(bucket_name)
         if force:
-            self.object_list(bucket_name)
             LOGGER.info("This might cause data loss as you have opted for bucket deletion with "
                         "objects in it")
             response = bucket.objects.all().delete()
             LOGGER.debug("Objects deleted successfully from bucket %s, response: %s",
                          bucket_name, response)
-            self.object_list(bucket_name)
         response = bucket.delete()
         LOGGER.debug("Bucket '%s' deleted successfully. Response: %s", bucket_name, response)
 
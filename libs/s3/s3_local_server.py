@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""
+In-memory S3 stand-in serving path style requests on localhost.
+
+Implements the bucket and object operations used by the conformance engine (create, head,
+delete and list buckets, put, copy, get, head and delete objects) with S3 error codes, so
+s3 clients can be exercised without a cluster. Signatures are not verified.
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+LOGGER = logging.getLogger(__name__)
+
+ERRORS = {"NoSuchBucket": (404, "The specified bucket does not exist"),
+          "NoSuchKey": (404, "The specified key does not exist."),
+          "BucketNotEmpty": (409, "The bucket you tried to delete is not empty"),
+          "BucketAlreadyOwnedByYou": (409, "Your previous request to create the named bucket "
+                                           "succeeded and you already own it."),
+          "NotImplemented": (501, "A header you provided implies functionality that is not "
+                                  "implemented")}
+XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler operating on the buckets of the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        LOGGER.debug("%s %s", self.address_string(), format % args)
+
+    def _parse(self):
+        """Bucket, key and query of the request."""
+        parts = urlsplit(self.path)
+        bucket, _, key = parts.path.lstrip("/").partition("/")
+        return unquote(bucket), unquote(key), parse_qs(parts.query, keep_blank_values=True)
+
+    def _body(self) -> bytes:
+        """Request body, aws-chunked uploads are decoded."""
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if "aws-chunked" in self.headers.get("Content-Encoding", "") or \
+                self.headers.get("x-amz-content-sha256", "").startswith("STREAMING-"):
+            decoded, rest = b"", data
+            while rest:
+                header, _, rest = rest.partition(b"\r\n")
+                size = int(header.split(b";")[0], 16)
+                if not size:
+                    break
+                decoded, rest = decoded + rest[:size], rest[size + 2:]
+            return decoded
+        return data
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None):
+        """Send a response, HEAD responses keep Content-Length but carry no body."""
+        self.send_response(status)
+        headers = headers or {}
+        headers.setdefault("Content-Length", str(len(body)))
+        headers.setdefault("x-amz-request-id", hashlib.md5(  # nosec
+            str(datetime.now().timestamp()).encode()).hexdigest()[:16])
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, code: str, resource: str = ""):
+        """Send an S3 error."""
+        status, message = ERRORS[code]
+        body = (f'<?xml version="1.0" encoding="UTF-8"?><Error><Code>{code}</Code>'
+                f"<Message>{message}</Message><Resource>{escape(resource)}</Resource>"
+                "</Error>").encode()
+        self._send(status, body, {"Content-Type": "application/xml"})
+
+    def _xml(self, body: str):
+        """Send an XML document."""
+        self._send(200, ('<?xml version="1.0" encoding="UTF-8"?>' + body).encode(),
+                   {"Content-Type": "application/xml"})
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """Create bucket, put or copy object."""
+        bucket, key, _ = self._parse()
+        body = self._body()
+        buckets = self.server.buckets
+        with self.server.lock:
+            if not key:
+                if bucket in buckets:
+                    return self._error("BucketAlreadyOwnedByYou", bucket)
+                buckets[bucket] = {}
+                return self._send(200, headers={"Location": f"/{bucket}"})
+            if bucket not in buckets:
+                return self._error("NoSuchBucket", bucket)
+            source = self.headers.get("x-amz-copy-source")
+            if source:
+                src_bucket, _, src_key = unquote(source).lstrip("/").partition("/")
+                if src_bucket not in buckets:
+                    return self._error("NoSuchBucket", src_bucket)
+                if src_key not in buckets[src_bucket]:
+                    return self._error("NoSuchKey", src_key)
+                obj = dict(buckets[src_bucket][src_key], modified=formatdate(usegmt=True))
+                buckets[bucket][key] = obj
+                return self._xml(f'<CopyObjectResult xmlns="{XMLNS}"><ETag>"{obj["etag"]}"'
+                                 "</ETag></CopyObjectResult>")
+            obj = {"data": body, "etag": hashlib.md5(body).hexdigest(),  # nosec
+                   "content_type": self.headers.get("Content-Type", "binary/octet-stream"),
+                   "metadata": {name.lower(): value for name, value in self.headers.items()
+                                if name.lower().startswith("x-amz-meta-")},
+                   "modified": formatdate(usegmt=True)}
+            buckets[bucket][key] = obj
+        return self._send(200, headers={"ETag": f'"{obj["etag"]}"'})
+
+    def _object_headers(self, obj: dict) -> dict:
+        """Headers of an object."""
+        return dict(obj["metadata"], **{"ETag": f'"{obj["etag"]}"',
+                                        "Content-Type": obj["content_type"],
+                                        "Content-Length": str(len(obj["data"])),
+                                        "Last-Modified": obj["modified"]})
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Get object or list objects (v1 and v2)."""
+        bucket, key, query = self._parse()
+        buckets = self.server.buckets
+        with self.server.lock:
+            if not bucket:
+                names = "".join(f"<Bucket><Name>{escape(name)}</Name></Bucket>"
+                                for name in sorted(buckets))
+                return self._xml(f'<ListAllMyBucketsResult xmlns="{XMLNS}"><Buckets>{names}'
+                                 "</Buckets></ListAllMyBucketsResult>")
+            if bucket not in buckets:
+                return self._error("NoSuchBucket", bucket)
+            if key:
+                if key not in buckets[bucket]:
+                    return self._error("NoSuchKey", key)
+                obj = buckets[bucket][key]
+                return self._send(200, obj["data"], self._object_headers(obj))
+            if "location" in query:
+                return self._xml(f'<LocationConstraint xmlns="{XMLNS}"></LocationConstraint>')
+            if set(query) - {"list-type", "prefix", "encoding-type", "delimiter",
+                             "max-keys", "fetch-owner", "marker"}:
+                return self._error("NotImplemented", bucket)
+            prefix = query.get("prefix", [""])[0]
+            items = "".join(f"<Contents><Key>{escape(name)}</Key>"
+                            f"<LastModified>{datetime.utcnow().isoformat()}Z</LastModified>"
+                            f"<ETag>\"{obj['etag']}\"</ETag><Size>{len(obj['data'])}</Size>"
+                            "<StorageClass>STANDARD</StorageClass></Contents>"
+                            for name, obj in sorted(buckets[bucket].items())
+                            if name.startswith(prefix))
+            count = sum(1 for name in buckets[bucket] if name.startswith(prefix))
+        return self._xml(f'<ListBucketResult xmlns="{XMLNS}"><Name>{escape(bucket)}</Name>'
+                         f"<Prefix>{escape(prefix)}</Prefix><KeyCount>{count}</KeyCount>"
+                         f"<MaxKeys>1000</MaxKeys><IsTruncated>false</IsTruncated>{items}"
+                         "</ListBucketResult>")
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        """Head bucket or object."""
+        bucket, key, _ = self._parse()
+        buckets = self.server.buckets
+        with self.server.lock:
+            if bucket not in buckets:
+                return self._error("NoSuchBucket", bucket)
+            if not key:
+                return self._send(200)
+            if key not in buckets[bucket]:
+                return self._error("NoSuchKey", key)
+            obj = buckets[bucket][key]
+        headers = self._object_headers(obj)
+        return self._send(200, obj["data"], headers)
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        """Delete bucket or object."""
+        bucket, key, _ = self._parse()
+        buckets = self.server.buckets
+        with self.server.lock:
+            if bucket not in buckets:
+                return self._error("NoSuchBucket", bucket)
+            if key:
+                buckets[bucket].pop(key, None)
+            elif buckets[bucket]:
+                return self._error("BucketNotEmpty", bucket)
+            else:
+                del buckets[bucket]
+        return self._send(204)
+
+
+class LocalS3Server:
+    """In-memory S3 stand-in running in a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param host: Address to listen on.
+        :param port: Port, a free one if 0.
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.buckets = {}
+        self.httpd.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        """Endpoint url of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def buckets(self) -> dict:
+        """Stored buckets {bucket: {key: object}}."""
+        return self.httpd.buckets
+
+    def start(self):
+        """Serve in a daemon thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True,
+                                        name="local-s3")
+        self._thread.start()
+        LOGGER.info("Local S3 stand-in listening on %s", self.endpoint)
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
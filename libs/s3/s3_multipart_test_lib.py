@@ -22,10 +22,14 @@
 
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from hashlib import md5
 from time import perf_counter_ns
 
 from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+from botocore.exceptions import HTTPClientError
 from numpy.random import permutation
 
 from commons import errorcodes as err
@@ -42,6 +46,27 @@ from libs.s3.s3_multipart import Multipart
 LOGGER = logging.getLogger(__name__)
 
 
+# S3 error codes worth retrying, other client errors (auth, NoSuchUpload, ...) are final.
+TRANSIENT_ERROR_CODES = ("SlowDown", "ServiceUnavailable", "InternalError", "RequestTimeout",
+                         "Throttling", "ThrottlingException", "RequestTimeoutException")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check if a failed S3 request can be retried.
+
+    :param error: ClientError or CTException raised from a boto3 error.
+    :return: True for throttling, server side and connection errors.
+    """
+    cause = error.__cause__ if isinstance(error, CTException) else error
+    if isinstance(cause, ClientError):
+        code = cause.response.get("Error", {}).get("Code")
+        status = cause.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return code in TRANSIENT_ERROR_CODES or status >= 500
+    return isinstance(cause, (BotoConnectionError, HTTPClientError, ConnectionError,
+                              TimeoutError))
+
+
 class S3MultipartTestLib(Multipart):
     """Class initialising s3 connection and including methods for multipart operations."""
 
@@ -230,6 +255,78 @@ class S3MultipartTestLib(Multipart):
             LOGGER.exception(ERR_MSG, S3MultipartTestLib.upload_parts_parallel.__name__, error)
             raise CTException(err.S3_CLIENT_ERROR, error) from error
 
+    def upload_part_with_retry(self, part_source, upload_id: str = None,
+                               bucket_name: str = None, object_name: str = None,
+                               **kwargs) -> dict:
+        """
+        Upload single part from a part source retrying the part on failure.
+
+        :param part_source: PartSource or parts dict {part_number: [data, content_md5]}.
+        :param upload_id: Multipart Upload ID.
+        :param bucket_name: Name of the bucket.
+        :param object_name: Name of the object.
+        :keyword part_number: Part number to be uploaded.
+        :keyword retries: No. of retries for the part.
+        :keyword retry_delay: Initial delay between retries in seconds, doubled after each retry.
+        :return: {"PartNumber": part_number, "ETag": etag}
+        """
+        part_number = kwargs.get("part_number")
+        retries = kwargs.get("retries", 3)
+        retry_delay = kwargs.get("retry_delay", 1)
+        for attempt in range(retries + 1):
+            try:
+                data, content_md5 = part_source[part_number]
+                _, resp = self.upload_part(data, bucket_name, object_name, upload_id=upload_id,
+                                           part_number=part_number, content_md5=content_md5)
+                return {"PartNumber": part_number, "ETag": resp["ETag"]}
+            except (CTException, ClientError) as error:
+                if attempt == retries or not is_transient_error(error):
+                    raise
+                LOGGER.warning("Retrying part %s (%s/%s) after error: %s", part_number,
+                               attempt + 1, retries, error)
+                time.sleep(retry_delay * 2 ** attempt)
+
+    def upload_parts_from_source(self, upload_id: str = None, bucket_name: str = None,
+                                 object_name: str = None, **kwargs) -> tuple:
+        """
+        Upload parts of a lazy part source with bounded parallelism.
+
+        Part data is materialized inside worker threads, so at most parallel_thread parts are
+        resident in memory irrespective of object size.
+        :param upload_id: Multipart Upload ID.
+        :param bucket_name: Name of the bucket.
+        :param object_name: Name of the object.
+        :keyword parts: PartSource or parts dict {part_number: [data, content_md5]}.
+        :keyword parallel_thread: Max parts uploaded in parallel.
+        :keyword retries: No. of retries for an individual part.
+        :return: (Boolean, List of uploaded parts sorted by part number).
+        """
+        parts = kwargs.get("parts")
+        parallel_thread = kwargs.get("parallel_thread", 5)
+        retries = kwargs.get("retries", 3)
+        uploaded_parts = []
+        uploaded_bytes = 0
+        total_bytes = getattr(parts, "total_size", None)
+        try:
+            with ThreadPoolExecutor(max_workers=parallel_thread) as executor:
+                futures = {executor.submit(self.upload_part_with_retry, parts, upload_id,
+                                           bucket_name, object_name, part_number=part_number,
+                                           retries=retries): part_number
+                           for part_number in parts}
+                for future in as_completed(futures):
+                    uploaded_parts.append(future.result())
+                    if total_bytes:
+                        uploaded_bytes += parts.part_size(futures[future])
+                        LOGGER.debug("%s of %s uploaded %.2f%%", uploaded_bytes, total_bytes,
+                                     cal_percent(uploaded_bytes, total_bytes))
+            uploaded_parts = sorted(uploaded_parts, key=lambda x: x["PartNumber"])
+            LOGGER.info("Uploaded %s parts", len(uploaded_parts))
+
+            return True, uploaded_parts
+        except (CTException, ClientError, OSError) as error:
+            LOGGER.exception(ERR_MSG, S3MultipartTestLib.upload_parts_from_source.__name__, error)
+            raise CTException(err.S3_CLIENT_ERROR, str(error)) from error
+
     def upload_parts_sequential(self, upload_id: int = None, bucket_name: str = None,
                                 object_name: str = None, **kwargs) -> tuple:
         """
@@ -64,7 +64,7 @@ class S3CmdCommandBuilder:
         if self.user_opts.get('ssl'):
             self.current_options = self.current_options + ["--ssl"]
         else:
-            self.current_options = self.current_options + ["--no_ssl"]
+            self.current_options = self.current_options + ["--no-ssl"]
 
         if self.user_opts.get('check_certificate'):
             self.current_options = self.current_options + ["--check-certificate"]
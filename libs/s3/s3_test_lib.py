@@ -39,6 +39,7 @@ from commons.utils.system_utils import run_local_cmd
 from config.s3 import S3_CFG
 from libs.s3 import ACCESS_KEY, SECRET_KEY
 from libs.s3.s3_acl_test_lib import S3AclTestLib
+from libs.s3.s3_bucket_purge import BucketPurgeLib
 from libs.s3.s3_bucket_policy_test_lib import S3BucketPolicyTestLib
 from libs.s3.s3_core_lib import S3Lib
 
@@ -450,39 +451,55 @@ class S3TestLib(S3Lib):
 
         return True, response
 
-    def delete_multiple_buckets(self, bucket_list: list = None) -> tuple:
+    def delete_multiple_buckets(self, bucket_list: list = None, **kwargs) -> tuple:
         """
         Delete multiple empty/non-empty buckets.
 
+        Buckets are purged in parallel using paginated listings and batched deletes, buckets
+        which could not be purged are retried with polling e.g. on BucketNotEmpty.
         :param bucket_list: List of bucket names.
+        :keyword max_workers: Max number of buckets purged concurrently.
+        :keyword state_file: Json file used to resume an interrupted purge.
+        :keyword progress_callback: Callable invoked as callback(bucket_name, stats_dict).
         :return: True or False and deleted and non-deleted buckets.
         """
         LOGGER.info("Deleting multiple empty/non-empty buckets")
-        response_dict = {"Deleted": [], "CouldNotDelete": []}
-        for bucket in bucket_list:
-            response = self.delete_bucket(bucket, True)
-            if response[0]:
-                response_dict["Deleted"].append(bucket)
-            else:
-                LOGGER.error(
-                    "Error in %s: %s",
-                    S3TestLib.delete_multiple_buckets.__name__,
-                    response[1])
-                response_dict["CouldNotDelete"].append(bucket)
-        if response_dict["CouldNotDelete"]:
+        start_time = perf_counter()
+        purge = BucketPurgeLib(self, **kwargs)
+        response = purge.purge_buckets(bucket_list)
+        if not response[0]:
+
+            def purge_bucket(bucket_name):
+                """Purge status of a bucket, retried by poll till it is purged."""
+                return purge.purge_bucket(bucket_name)[0]
+
+            for bucket in list(response[1]["CouldNotDelete"]):
+                LOGGER.info("Trying polling mechanism as bucket %s could not be purged.", bucket)
+                if poll(purge_bucket, bucket):
+                    response[1]["CouldNotDelete"].remove(bucket)
+                    response[1]["Deleted"].append(bucket)
+            if not response[1]["CouldNotDelete"]:
+                purge.state.clear()
+                response = True, response[1]
+        LOGGER.info("############# BUCKETS DELETION TIME : %f #############",
+                    (perf_counter() - start_time))
+        if not response[0]:
+            LOGGER.error("Error in %s: %s", S3TestLib.delete_multiple_buckets.__name__,
+                         response[1])
             LOGGER.error("Failed to delete bucket")
-            return False, response_dict
 
-        return True, response_dict
+        return response
 
-    def delete_all_buckets(self) -> tuple:
+    def delete_all_buckets(self, **kwargs) -> tuple:
         """
         Delete all empty/non-empty buckets.
 
+        :keyword max_workers: Max number of buckets purged concurrently.
+        :keyword state_file: Json file used to resume an interrupted purge.
         :return: response from delete_multiple_buckets.
         """
         all_buckets = self.bucket_list()
-        response = self.delete_multiple_buckets(all_buckets[1])
+        response = self.delete_multiple_buckets(all_buckets[1], **kwargs)
 
         return True, response
 
@@ -41,6 +41,7 @@ from commons.utils import s3_utils
 from commons.utils import system_utils
 from config import CMN_CFG
 from config.s3 import S3_CFG
+from libs.s3.s3_bucket_purge import BucketPurgeLib
 from libs.s3.s3_common_test_lib import create_s3_acc
 from libs.s3.s3_multipart_test_lib import S3MultipartTestLib
 from libs.s3.s3_tagging_test_lib import S3TaggingTestLib
@@ -604,19 +605,22 @@ def update_versions_dict_dmo(versions_dict: dict, delete_result: list, is_versio
 
 
 def empty_versioned_bucket(s3_ver_test_obj: S3VersioningTestLib,
-                           bucket_name: str) -> None:
+                           bucket_name: str, abort_uploads: bool = False) -> None:
     """
     Delete all versions and delete markers present in a bucket
 
+    Versions and delete markers are listed page by page and removed with batched
+    multi-object deletes.
     :param s3_ver_test_obj: S3VersioningTestLib instance
     :param bucket_name: Name of the bucket to empty
-    """
-    list_response = s3_ver_test_obj.list_object_versions(bucket_name=bucket_name)
-    to_delete = list_response[1].get("Versions", [])
-    to_delete.extend(list_response[1].get("DeleteMarkers", []))
-    for version in to_delete:
-        s3_ver_test_obj.delete_object_version(bucket=bucket_name, key=version["Key"],
-                                              version_id=version["VersionId"])
+    :param abort_uploads: Also abort in-progress multipart uploads of the bucket
+    """
+    purge_obj = BucketPurgeLib(s3_ver_test_obj)
+    stats = purge_obj.empty_bucket(bucket_name, abort_uploads=abort_uploads)
+    LOG.info("Emptied versioned bucket %s: %s", bucket_name, stats)
+    if stats["failed"]:
+        raise CTException(err.S3_CLIENT_ERROR,
+                          f"Failed to delete {stats['failed']} versions from {bucket_name}")
 
 
 def get_tag_key_val_pair(key_ran: tuple = (1, 128), val_ran: tuple = (0, 256),
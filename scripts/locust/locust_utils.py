@@ -31,6 +31,7 @@ from botocore.client import Config
 from botocore.exceptions import BotoCoreError, ClientError, ConnectionClosedError
 from locust import events
 
+from commons import s3_dns
 from commons.utils import system_utils
 from core.runner import InMemoryDB
 from scripts.locust import LOCUST_CFG
@@ -85,6 +86,13 @@ class LocustUtils:
             aws_secret_access_key=secret_key,
             endpoint_url=endpoint_url,
             config=Config(max_pool_connections=max_pool_connections))
+        endpoints = os.getenv('ENDPOINT_URLS')
+        if endpoints:
+            balancer = s3_dns.configure_balancer(
+                [endpoint_url] + [url for url in endpoints.split(',') if url],
+                os.getenv('ENDPOINT_POLICY', 'least_outstanding'))
+            balancer.attach(self.s3_client)
+            balancer.attach(self.s3_resource.meta.client)
 
     @staticmethod
     def delete_checksum(bucket, object_key):
@@ -30,6 +30,7 @@ from commons import commands
 from commons.errorcodes import error_handler
 from commons.ct_fail_on import CTFailOn
 from config import CMN_CFG
+from libs.csm.cli.cortx_cli import CortxCli
 from libs.csm.cli.cortx_cli_support_bundle import CortxCliSupportBundle
 
 
@@ -44,9 +45,20 @@ class TestCliSupportBundle:
         """
         cls.LOGGER = logging.getLogger(__name__)
         cls.LOGGER.info("STARTED : Setup operations at test suit level")
-        cls.support_bundle_obj = CortxCliSupportBundle()
+        # Tests log in as the same admin user, one CLI session is shared across them
+        cls.support_bundle_obj = CortxCliSupportBundle(shared_session=True)
+        cls.support_bundle_obj.open_connection()
         cls.LOGGER.info("ENDED : Setup operations at test suit level")
 
+    @classmethod
+    def teardown_class(cls):
+        """
+        Log out and close the shared CORTX CLI session.
+        """
+        cls.LOGGER.info("STARTED : Teardown operations at test suit level")
+        CortxCli.close_shared_sessions()
+        cls.LOGGER.info("ENDED : Teardown operations at test suit level")
+
     def setup_method(self):
         """
         Setup all the states required for execution of each test case in this test suite
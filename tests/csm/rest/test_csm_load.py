@@ -79,6 +79,18 @@ class TestCsmLoad():
         if os.path.exists(self.jmx_obj.jtl_log_path):
             shutil.rmtree(self.jmx_obj.jtl_log_path)
 
+    @pytest.fixture(autouse=True)
+    def set_build(self, request):
+        """Build under test, JTL analysis reports are saved under it."""
+        self.build = request.config.option.build
+
+    def check_jtl(self):
+        """Check SLA of the last jmeter run and compare it with the baseline build."""
+        result, report = self.jmx_obj.analyze_jtl(build=self.build)
+        assert result, "JTL analysis failed, SLA breaches: " \
+                       f"{[chk for chk in report['sla'] if not chk['passed']]}, " \
+                       f"regressions: {report['regressions']}"
+
     def teardown_method(self):
         """Teardown method
         """
@@ -103,6 +115,7 @@ class TestCsmLoad():
         self.log.info("Running jmx script: %s", jmx_file)
         resp = self.jmx_obj.run_jmx(jmx_file)
         assert resp, "Jmeter Execution Failed."
+        self.check_jtl()
         self.log.info("##### Test completed -  %s #####", test_case_name)
 
     @pytest.mark.lr
@@ -142,6 +155,7 @@ class TestCsmLoad():
             rampup=test_cfg["rampup"],
             loop=test_cfg["loop"])
         assert resp, "Jmeter Execution Failed."
+        self.check_jtl()
         self.log.info("##### Test completed -  %s #####", test_case_name)
 
     @pytest.mark.lr
@@ -189,6 +203,7 @@ class TestCsmLoad():
             rampup=test_cfg["rampup"],
             loop=loops)
         assert resp, "Jmeter Execution Failed."
+        self.check_jtl()
         self.log.info("##### Test completed -  %s #####", test_case_name)
 
     @pytest.mark.lr
@@ -220,6 +235,7 @@ class TestCsmLoad():
             rampup=test_cfg["rampup"],
             loop=test_cfg["loop"])
         assert resp, "Jmeter Execution Failed."
+        self.check_jtl()
         self.log.info("##### Test completed -  %s #####", test_case_name)
 
     @pytest.mark.lr
@@ -263,6 +279,7 @@ class TestCsmLoad():
                                     rampup=test_cfg["rampup"],
                                     loop=test_cfg["loop"])
         assert resp, "Jmeter Execution Failed."
+        self.check_jtl()
         self.log.info("JMX script execution completed")
 
         self.log.info("\nStep 4: Resolving CPU usage fault. ")
@@ -322,6 +339,7 @@ class TestCsmLoad():
             rampup=test_cfg["rampup"],
             loop=test_cfg["loop"])
         assert resp, "Jmeter Execution Failed."
+        self.check_jtl()
         err_cnt, total_cnt = self.jmx_obj.get_err_cnt(os.path.join(self.jmx_obj.jtl_log_path,
                                                                    "statistics.json"))
         assert err_cnt == 0, f"{err_cnt} of {total_cnt} requests have failed."
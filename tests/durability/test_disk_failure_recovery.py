@@ -537,25 +537,16 @@ class TestDiskFailureRecovery:
                     "are less than K(parity units)")
         users = self.mgnt_ops.create_account_users(nusers=1)
         self.s3_clean = users
-        workload_info = None
         s3userinfo = list(users.values())[0]
 
         LOGGER.info("Step 1: Perform Write operations till overall disk space is filled %s",
                     self.near_full_percent)
-        resp = NearFullStorage.get_user_data_space_in_bytes(self.node_master_list[0],
-                                                            self.near_full_percent)
+        manifest_path = NearFullStorage.fill_manifest_path(self.test_prefix[-1])
+        resp = NearFullStorage.perform_write_to_fill_system_percent(
+            self.node_master_list[0], self.near_full_percent, s3userinfo, self.test_prefix[-1],
+            10, manifest_path=manifest_path)
         assert_utils.assert_true(resp[0], resp[1])
 
-        if not resp[1]:
-            LOGGER.info("Current Memory usage is already more than expected memory usage,"
-                        " skipping write operation")
-        else:
-            resp = NearFullStorage.perform_near_full_sys_writes(s3userinfo=s3userinfo,
-                                                                user_data_writes=resp[1],
-                                                                bucket_prefix=self.test_prefix[-1])
-            assert_utils.assert_true(resp[0], resp[1])
-            workload_info = resp[1]
-
         LOGGER.info("Step 2: Do IOs(Write and Read)")
         self.test_prefix.append('test-36396')
         self.s3_clean = users
@@ -639,6 +630,7 @@ class TestDiskFailureRecovery:
                                                     skipcleanup=True)
         assert_utils.assert_true(resp[0], resp[1])
 
+        workload_info = NearFullStorage.manifest_workload(manifest_path)
         if workload_info:
             LOGGER.info("Step 13: Read data written in step 1")
             NearFullStorage.perform_operations_on_pre_written_data(s3userinfo=s3userinfo,
@@ -661,25 +653,16 @@ class TestDiskFailureRecovery:
 
         users = self.mgnt_ops.create_account_users(nusers=1)
         self.s3_clean = users
-        workload_info = None
         s3userinfo = list(users.values())[0]
 
         LOGGER.info("Step 1: Perform Write operations till overall disk space is filled %s",
                     self.near_full_percent)
-        resp = NearFullStorage.get_user_data_space_in_bytes(self.node_master_list[0],
-                                                            self.near_full_percent)
+        manifest_path = NearFullStorage.fill_manifest_path(self.test_prefix[-1])
+        resp = NearFullStorage.perform_write_to_fill_system_percent(
+            self.node_master_list[0], self.near_full_percent, s3userinfo, self.test_prefix[-1],
+            10, manifest_path=manifest_path)
         assert_utils.assert_true(resp[0], resp[1])
 
-        if not resp[1]:
-            LOGGER.info("Current Memory usage is already more than expected memory usage,"
-                        " skipping write operation")
-        else:
-            resp = NearFullStorage.perform_near_full_sys_writes(s3userinfo=s3userinfo,
-                                                                user_data_writes=resp[1],
-                                                                bucket_prefix=self.test_prefix[-1])
-            assert_utils.assert_true(resp[0], resp[1])
-            workload_info = resp[1]
-
         LOGGER.info("Step 2: Do IOs(Write and Read)")
         self.test_prefix.append('test-36397')
         resp = self.ha_obj.ha_s3_workload_operation(s3userinfo=s3userinfo,
@@ -759,6 +742,7 @@ class TestDiskFailureRecovery:
                                                     skipcleanup=True)
         assert_utils.assert_true(resp[0], resp[1])
 
+        workload_info = NearFullStorage.manifest_workload(manifest_path)
         if workload_info:
             LOGGER.info("Step 13: Read data written in step 1")
             resp = NearFullStorage.perform_operations_on_pre_written_data(s3userinfo=s3userinfo,
@@ -879,25 +863,16 @@ class TestDiskFailureRecovery:
                     "on same cvg are equal to K(parity units)")
         users = self.mgnt_ops.create_account_users(nusers=1)
         self.s3_clean = users
-        workload_info = None
         s3userinfo = list(users.values())[0]
 
         LOGGER.info("Step 1: PerformWrite operations till overall disk space is filled %s",
                     self.near_full_percent)
-        resp = NearFullStorage.get_user_data_space_in_bytes(self.node_master_list[0],
-                                                            self.near_full_percent)
+        manifest_path = NearFullStorage.fill_manifest_path(self.test_prefix[-1])
+        resp = NearFullStorage.perform_write_to_fill_system_percent(
+            self.node_master_list[0], self.near_full_percent, s3userinfo, self.test_prefix[-1],
+            10, manifest_path=manifest_path)
         assert_utils.assert_true(resp[0], resp[1])
 
-        if not resp[1]:
-            LOGGER.info("Current Memory usage is already more than expected memory usage,"
-                        " skipping write operation")
-        else:
-            resp = NearFullStorage.perform_near_full_sys_writes(s3userinfo=s3userinfo,
-                                                                user_data_writes=resp[1],
-                                                                bucket_prefix=self.test_prefix[-1])
-            assert_utils.assert_true(resp[0], resp[1])
-            workload_info = resp[1]
-
         LOGGER.info("Step 2: Do IOs(Write and Read)")
         self.test_prefix.append('test-36399')
         resp = self.ha_obj.ha_s3_workload_operation(s3userinfo=s3userinfo,
@@ -977,6 +952,7 @@ class TestDiskFailureRecovery:
                                                     skipcleanup=True)
         assert_utils.assert_true(resp[0], resp[1])
 
+        workload_info = NearFullStorage.manifest_workload(manifest_path)
         if workload_info:
             LOGGER.info("Step 13: Read data written in step 1")
             resp = NearFullStorage.perform_operations_on_pre_written_data(s3userinfo=s3userinfo,
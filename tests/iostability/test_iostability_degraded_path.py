@@ -110,6 +110,8 @@ class TestIOWorkloadDegradedPath:
             assert_utils.assert_true(resp)
         else:
             self.mail_notify.event_pass.set()
+        # Final status mail reads the monitor store, closed in teardown_class
+        self.mail_notify.join()
         self.log.info("Stop Procpath collection")
         self.proc_path.stop_collection()
         self.log.info("Copy files to client")
@@ -117,6 +119,12 @@ class TestIOWorkloadDegradedPath:
         self.log.debug("Resp : %s", resp)
         self.log.info("Teardown method ended.")
 
+    @classmethod
+    def teardown_class(cls):
+        """Teardown class."""
+        cls.log.info("Close IO stability metrics monitor")
+        cls.iolib.monitor.close()
+
     @pytest.mark.lc
     @pytest.mark.io_stability
     @pytest.mark.tags("TEST-40172")
@@ -126,7 +134,8 @@ class TestIOWorkloadDegradedPath:
                       "S3bench for %s days", self.duration_in_days)
         test_case_name = cortxlogging.get_frame()
         self.mail_notify = send_mail_notification(self.sender_mail_id, self.receiver_mail_id,
-                                                  test_case_name, self.health_obj_list[0])
+                                                  test_case_name, self.health_obj_list[0],
+                                                  monitor=self.iolib.monitor)
 
         self.log.info("Step 1: Create 50 buckets in healthy mode ")
         bucket_creation_healthy_mode = self.test_cfg['bucket_creation_healthy_mode']
@@ -171,7 +180,8 @@ class TestIOWorkloadDegradedPath:
                       "read in degraded cluster in loop for %s days.", self.duration_in_days)
         test_case_name = cortxlogging.get_frame()
         self.mail_notify = send_mail_notification(self.sender_mail_id, self.receiver_mail_id,
-                                                  test_case_name, self.health_obj_list[0])
+                                                  test_case_name, self.health_obj_list[0],
+                                                  monitor=self.iolib.monitor)
 
         bucket_prefix = "testbkt-40173"
         client = len(self.worker_node_list) * self.clients
@@ -238,7 +248,8 @@ class TestIOWorkloadDegradedPath:
             write_percent_per_iter, write_percent_per_iter, delete_percent_per_iter)
 
         self.mail_notify = send_mail_notification(self.sender_mail_id, self.receiver_mail_id,
-                                                  cortxlogging.get_frame(), self.health_obj_list[0])
+                                                  cortxlogging.get_frame(), self.health_obj_list[0],
+                                                  monitor=self.iolib.monitor)
 
         max_percentage = self.test_cfg['nearfull_storage_percentage']
         clients = (len(self.worker_node_list) - 1) * self.clients
@@ -261,17 +272,19 @@ class TestIOWorkloadDegradedPath:
                       write_percent_per_iter)
         write_per = write_percent_per_iter
         workload_info_list = []
+        manifest_path = NearFullStorage.fill_manifest_path("test-40174")
 
         resp = NearFullStorage.perform_write_to_fill_system_percent(self.master_node_list[0],
                                                                     write_per, self.s3userinfo,
                                                                     "test-40174-bkt", clients,
-                                                                    avail_buckets)
+                                                                    avail_buckets,
+                                                                    manifest_path=manifest_path)
 
         assert_utils.assert_true(resp[0], resp[1])
         if resp[1] is not None:
-            for each in resp[1]:
-                avail_buckets.remove(each['bucket'])
-            workload_info_list.extend(resp[1])
+            for bucket in {each['bucket'] for each in resp[1]}:
+                avail_buckets.remove(bucket)
+            workload_info_list = NearFullStorage.manifest_workload(manifest_path)
             self.log.info("Write Completed.")
 
         self.log.info("Step 3 : Perform Single pod shutdown")
@@ -292,12 +305,12 @@ class TestIOWorkloadDegradedPath:
             if write_per < max_percentage:
                 resp = NearFullStorage.perform_write_to_fill_system_percent(
                     self.master_node_list[0], write_per, self.s3userinfo, "test-40174-bkt", clients,
-                    avail_buckets)
+                    avail_buckets, manifest_path=manifest_path)
                 assert_utils.assert_true(resp[0], resp[1])
                 if resp[1] is not None:
-                    for each in resp[1]:
-                        avail_buckets.remove(each['bucket'])
-                    workload_info_list.extend(resp[1])
+                    for bucket in {each['bucket'] for each in resp[1]}:
+                        avail_buckets.remove(bucket)
+                    workload_info_list = NearFullStorage.manifest_workload(manifest_path)
                     self.log.info("Write Completed.")
 
                 if len(workload_info_list) > 0:
@@ -309,10 +322,10 @@ class TestIOWorkloadDegradedPath:
 
                     self.log.info("Delete %s percent of the written data", delete_percent_per_iter)
                     resp = NearFullStorage.delete_workload(workload_info_list, self.s3userinfo,
-                                                           delete_percent_per_iter)
+                                                           delete_percent_per_iter,
+                                                           manifest_path=manifest_path)
                     assert_utils.assert_true(resp[0], resp[1])
-                    for each in resp[1]:
-                        avail_buckets.append(each)
+                    avail_buckets.extend(resp[1])
                 else:
                     self.log.warning("No buckets available to perform read,validate and"
                                      " delete operations %s", workload_info_list)
@@ -321,10 +334,10 @@ class TestIOWorkloadDegradedPath:
                 self.log.info("Write percentage(%s) exceeding the max cluster capacity(%s)",
                               write_per, max_percentage)
                 self.log.info("Deleting all the written data.")
-                resp = NearFullStorage.delete_workload(workload_info_list, self.s3userinfo, 100)
+                resp = NearFullStorage.delete_workload(workload_info_list, self.s3userinfo, 100,
+                                                       manifest_path=manifest_path)
                 assert_utils.assert_true(resp[0], resp[1])
-                for each in workload_info_list:
-                    avail_buckets.append(each['bucket'])
+                avail_buckets.extend(resp[1])
                 self.log.info("Deletion completed.")
 
         self.test_completed = True
@@ -109,6 +109,8 @@ class TestIOWorkload:
             assert_utils.assert_true(resp)
         else:
             self.mail_notify.event_pass.set()
+        # Final status mail reads the monitor store, closed in teardown_class
+        self.mail_notify.join()
         self.log.info("Stop Procpath collection")
         self.proc_path.stop_collection()
         self.log.info("Copy files to client")
@@ -116,6 +118,12 @@ class TestIOWorkload:
         self.log.debug("Resp : %s", resp)
         self.log.info("Teardown method ended.")
 
+    @classmethod
+    def teardown_class(cls):
+        """Teardown class."""
+        cls.log.info("Close IO stability metrics monitor")
+        cls.iolib.monitor.close()
+
     @pytest.mark.lc
     @pytest.mark.io_stability
     @pytest.mark.tags("TEST-40039")
@@ -125,7 +133,8 @@ class TestIOWorkload:
                       "S3bench for %s days", self.duration_in_days)
         test_case_name = cortxlogging.get_frame()
         self.mail_notify = send_mail_notification(self.sender_mail_id, self.receiver_mail_id,
-                                                  test_case_name, self.health_obj_list[0])
+                                                  test_case_name, self.health_obj_list[0],
+                                                  monitor=self.iolib.monitor)
         workload_distribution = self.test_cfg['workloads_distribution']
         total_obj = 10000
         total_clients = len(self.worker_node_list) * self.clients
@@ -151,7 +160,8 @@ class TestIOWorkload:
                       self.duration_in_days)
         test_case_name = cortxlogging.get_frame()
         self.mail_notify = send_mail_notification(self.sender_mail_id, self.receiver_mail_id,
-                                                  test_case_name, self.health_obj_list[0])
+                                                  test_case_name, self.health_obj_list[0],
+                                                  monitor=self.iolib.monitor)
 
         bucket_prefix = "testbkt-40041"
         client = len(self.worker_node_list) * self.clients
@@ -213,7 +223,8 @@ class TestIOWorkload:
 
         test_case_name = cortxlogging.get_frame()
         self.mail_notify = send_mail_notification(self.sender_mail_id, self.receiver_mail_id,
-                                                  test_case_name, self.health_obj_list[0])
+                                                  test_case_name, self.health_obj_list[0],
+                                                  monitor=self.iolib.monitor)
 
         max_cluster_capacity_percent = self.test_cfg['nearfull_storage_percentage']
         clients = len(self.worker_node_list) * self.clients
@@ -223,6 +234,7 @@ class TestIOWorkload:
                       " deletes. Delete all the written data once %s is reached",
                       write_percent_per_iter, delete_percent_per_iter, max_cluster_capacity_percent)
         workload_info_list = []
+        manifest_path = NearFullStorage.fill_manifest_path("test-40042")
         end_time = datetime.now() + timedelta(days=self.duration_in_days)
         write_per = 0
         loop = 1
@@ -235,10 +247,11 @@ class TestIOWorkload:
             if write_per < max_cluster_capacity_percent:
                 # Write data to fill cluster upto "write_per" percent
                 resp = NearFullStorage.perform_write_to_fill_system_percent(
-                    self.master_node_list[0], write_per, self.s3userinfo, bucket_prefix, clients)
+                    self.master_node_list[0], write_per, self.s3userinfo, bucket_prefix, clients,
+                    manifest_path=manifest_path)
                 assert_utils.assert_true(resp[0], resp[1])
                 if resp[1] is not None:
-                    workload_info_list.extend(resp[1])
+                    workload_info_list = NearFullStorage.manifest_workload(manifest_path)
 
                 if len(workload_info_list) > 0:
                     # Read and validate all written data
@@ -250,7 +263,8 @@ class TestIOWorkload:
                     # Delete "delete_percent_per_iter" data of all the written data
                     self.log.info("Delete %s percent of the written data", delete_percent_per_iter)
                     resp = NearFullStorage.delete_workload(workload_info_list, self.s3userinfo,
-                                                           delete_percent_per_iter)
+                                                           delete_percent_per_iter,
+                                                           manifest_path=manifest_path)
                     assert_utils.assert_true(resp[0], resp[1])
 
                 else:
@@ -260,7 +274,8 @@ class TestIOWorkload:
                 self.log.info("Write percentage(%s) exceeding the max cluster capacity(%s)",
                               write_per, max_cluster_capacity_percent)
                 self.log.info("Deleting all the written data.")
-                resp = NearFullStorage.delete_workload(workload_info_list, self.s3userinfo, 100)
+                resp = NearFullStorage.delete_workload(workload_info_list, self.s3userinfo, 100,
+                                                       manifest_path=manifest_path)
                 assert_utils.assert_true(resp[0], resp[1])
                 self.log.info("Deletion completed.")
 
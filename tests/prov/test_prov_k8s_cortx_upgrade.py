@@ -24,7 +24,6 @@ import logging
 import multiprocessing
 import os
 import time
-from threading import Thread
 
 import pytest
 from commons import constants as cons
@@ -71,24 +70,18 @@ class TestK8CortxUpgrade:
                 cls.worker_node_list.append(node_obj)
         resp = cls.upgrade_obj.prov_obj.check_s3_status(cls.master_node_list[0])
         assert_utils.assert_true(resp[0], resp[1])
-        cls.upgrade_obj.retain_solution_file(
-            cls.master_node_list[0], cortx_control_img=cls.cortx_control_image,
-            cortx_data_img=cls.cortx_data_image, cortx_server_img=cls.cortx_server_image)
         LOGGER.info("Get installed version.")
         installed_version = cls.upgrade_obj.prov_obj.get_installed_version(
             cls.master_node_list[0])
         resp = cls.upgrade_obj.prov_obj.generate_and_compare_both_version(
             cls.upgrade_image, installed_version)
         assert_utils.assert_true(resp[0])
-        # Pull upgrade Images on all worker nodes
-        pull_image_thread_list = []
-        for each in cls.worker_node_list:
-            worker_thread = Thread(target=cls.upgrade_obj.prov_obj.pull_cortx_image,
-                                   args=(each,))
-            worker_thread.start()
-            pull_image_thread_list.append(worker_thread)
-        for each in pull_image_thread_list:
-            each.join()
+        # Pull upgrade Images on all worker nodes while solution file is updated
+        resp = cls.upgrade_obj.prepare_upgrade(
+            cls.master_node_list[0], cls.worker_node_list,
+            cortx_control_img=cls.cortx_control_image, cortx_data_img=cls.cortx_data_image,
+            cortx_server_img=cls.cortx_server_image)
+        assert_utils.assert_true(resp[0], resp[1])
         LOGGER.info("Done: Setup operations finished.")
 
     def teardown_class(self):
@@ -235,8 +235,15 @@ class TestServerOS:
         test_cfg = RAS_TEST_CFG["test_21587"]
         self.default_cpu_usage = self.sw_alert_obj.get_conf_store_vals(
             url=cons.SSPL_CFG_URL, field=cons.CONF_CPU_USAGE)
+        listener = None
+        if self.start_msg_bus:
+            listener = self.ras_test_obj.start_alert_listener(
+                [test_cfg["resource_type"], const.AlertType.FAULT],
+                fault_duration=self.cfg["alert_wait_threshold"])
         resp = self.sw_alert_obj.gen_cpu_usage_fault_thres(
             test_cfg["delta_cpu_usage"])
+        if listener:
+            listener.mark_fault_injected()
         assert resp[0], resp[1]
         LOGGER.info("\nStep 1: CPU usage fault is created successfully.\n")
 
@@ -250,7 +257,7 @@ class TestServerOS:
             LOGGER.info("\nChecking the generated alert on SSPL. ")
             alert_list = [test_cfg["resource_type"], const.AlertType.FAULT]
             resp = self.ras_test_obj.alert_validation(
-                string_list=alert_list, restart=False)
+                string_list=alert_list, restart=False, listener=listener)
             assert resp[0], resp[1]
             LOGGER.info("\nVerified the generated alert on the SSPL.\n")
 
@@ -268,8 +275,15 @@ class TestServerOS:
         self.starttime = time.time()
         LOGGER.info("\nStep 4: Resolving CPU usage fault. ")
         LOGGER.info("Updating default CPU usage threshold value")
+        listener = None
+        if self.start_msg_bus:
+            listener = self.ras_test_obj.start_alert_listener(
+                [test_cfg["resource_type"], const.AlertType.RESOLVED],
+                fault_duration=self.cfg["alert_wait_threshold"])
         resp = self.sw_alert_obj.resolv_cpu_usage_fault_thresh(
             self.default_cpu_usage)
+        if listener:
+            listener.mark_fault_injected()
         assert resp[0], resp[1]
         LOGGER.info("\nStep 4: CPU usage fault is resolved.\n")
         self.default_cpu_usage = False
@@ -285,7 +299,7 @@ class TestServerOS:
             LOGGER.info("\nChecking the generated alert on SSPL. ")
             alert_list = [test_cfg["resource_type"], const.AlertType.RESOLVED]
             resp = self.ras_test_obj.alert_validation(
-                string_list=alert_list, restart=False)
+                string_list=alert_list, restart=False, listener=listener)
             assert resp[0], resp[1]
             LOGGER.info("\nVerified the generated alert on the SSPL. \n")
 
@@ -316,8 +330,15 @@ class TestServerOS:
         self.default_mem_usage = self.sw_alert_obj.get_conf_store_vals(
             url=cons.SSPL_CFG_URL, field=cons.CONF_MEM_USAGE)
         LOGGER.info("\nStep 1: Generate memory usage fault.")
+        listener = None
+        if self.start_msg_bus:
+            listener = self.ras_test_obj.start_alert_listener(
+                [test_cfg["resource_type"], const.AlertType.FAULT],
+                fault_duration=self.cfg["alert_wait_threshold"])
         resp = self.sw_alert_obj.gen_mem_usage_fault(
             test_cfg["delta_mem_usage"])
+        if listener:
+            listener.mark_fault_injected()
         assert resp[0], resp[1]
         LOGGER.info("\nStep 1: Memory usage fault is created successfully.\n")
 
@@ -332,7 +353,7 @@ class TestServerOS:
             LOGGER.info("\nChecking the generated alert on SSPL")
             alert_list = [test_cfg["resource_type"], const.AlertType.FAULT]
             resp = self.ras_test_obj.alert_validation(
-                string_list=alert_list, restart=False)
+                string_list=alert_list, restart=False, listener=listener)
             assert resp[0], resp[1]
             LOGGER.info("\nVerified the generated alert on the SSPL\n")
 
@@ -351,7 +372,14 @@ class TestServerOS:
         self.starttime = time.time()
         LOGGER.info("\nStep 4: Resolving Memory usage fault.")
         LOGGER.info("Updating default Memory usage threshold value")
+        listener = None
+        if self.start_msg_bus:
+            listener = self.ras_test_obj.start_alert_listener(
+                [test_cfg["resource_type"], const.AlertType.RESOLVED],
+                fault_duration=self.cfg["alert_wait_threshold"])
         resp = self.sw_alert_obj.resolv_mem_usage_fault(self.default_mem_usage)
+        if listener:
+            listener.mark_fault_injected()
         assert resp[0], resp[1]
         LOGGER.info("\nStep 4: Memory usage fault is resolved.\n")
         self.default_mem_usage = False
@@ -367,7 +395,7 @@ class TestServerOS:
             LOGGER.info("\nChecking the generated alert on SSPL")
             alert_list = [test_cfg["resource_type"], const.AlertType.RESOLVED]
             resp = self.ras_test_obj.alert_validation(
-                string_list=alert_list, restart=False)
+                string_list=alert_list, restart=False, listener=listener)
             assert resp[0], resp[1]
             LOGGER.info("\nVerified the generated alert on the SSPL\n")
 
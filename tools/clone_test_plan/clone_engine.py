@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+"""Parallel, resumable test plan clone engine used by clone_test_plan script."""
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+# Basic algorithm
+#     load journal of the clone (test plan, build, setup type), resume if it exists
+#     create new TP unless journal has it
+#     fetch tests of every TE with a bounded worker pool
+#     fetch details of TEs and tests with chunked JQL searches
+#     create all new TEs with bulk create, journal every created key immediately
+#     add valid tests to every new TE with the worker pool, journal each TE when done
+#     add union of tests to the new TP and all new TEs to the new TP, journal
+# Every step is skipped on rerun when the journal marks it done, so a rerun completes a
+# partial clone instead of duplicating it. The journal lists created keys for undo.
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger('clone_test_plan.engine')
+
+JQL_CHUNK = 100  # Issue keys per JQL search
+BULK_CHUNK = 50  # Issues per bulk create request
+ADD_CHUNK = 200  # Tests per Xray add request
+
+
+class RateLimiter:
+    """Token bucket shared by all threads using a JIRA session."""
+
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Args:
+            rate (float): Requests per second, no limit if 0 or None
+            burst (int): Requests allowed back to back, defaults to rate
+        """
+        self.rate = rate
+        self.capacity = burst if burst else max(1, int(rate or 1))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds waited
+        """
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def chunks(items: list, size: int) -> list:
+    """Split list in chunks of size."""
+    return [items[idx:idx + size] for idx in range(0, len(items), size)]
+
+
+class CloneJournal:
+    """Persistent record of a clone, written atomically after every change."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): JSON journal file, loaded if it exists
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"source_tp": None, "new_tp": None, "tes": {}, "created": [],
+                     "tp_tests_added": False, "tes_linked": False, "undone": []}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fptr:
+                self.data.update(json.load(fptr))
+
+    def save(self) -> None:
+        """Persist journal."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fptr:
+            json.dump(self.data, fptr, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def update(self, **kwargs) -> None:
+        """Update top level fields and persist."""
+        with self.lock:
+            self.data.update(kwargs)
+            self.save()
+
+    def created(self, key: str, kind: str, source: str = None) -> None:
+        """Record created issue and persist."""
+        with self.lock:
+            self.data["created"].append({"key": key, "type": kind, "source": source,
+                                         "time": datetime.utcnow().isoformat()})
+            if kind == "te":
+                self.data["tes"].setdefault(source, {})["new"] = key
+            self.save()
+
+    def te_state(self, source: str) -> dict:
+        """State of a source TE."""
+        return self.data["tes"].setdefault(source, {})
+
+    def mark_te(self, source: str, **kwargs) -> None:
+        """Update state of a source TE and persist."""
+        with self.lock:
+            self.data["tes"].setdefault(source, {}).update(kwargs)
+            self.save()
+
+
+class CloneEngine:
+    """Clone a test plan and its test executions with bulk JIRA requests."""
+
+    def __init__(self, jira, journal: CloneJournal, workers: int = 8):
+        """
+        Args:
+            jira: JiraTask like object
+            journal (CloneJournal): Journal of this clone
+            workers (int): Size of the worker pool
+        """
+        self.jira = jira
+        self.journal = journal
+        self.workers = workers
+        self.details = {}
+
+    def _map(self, func, items: list) -> list:
+        """Run func on items with the bounded worker pool."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(func, items))
+
+    def fetch_details(self, keys: list) -> dict:
+        """Fetch details of issues not cached yet with chunked JQL searches."""
+        missing = sorted(set(keys) - set(self.details))
+        for result in self._map(self.jira.get_issues_details, chunks(missing, JQL_CHUNK)):
+            self.details.update(result)
+        return {key: self.details[key] for key in keys if key in self.details}
+
+    def create_tp(self, test_plan: str, tp_info: dict) -> str:
+        """Create new test plan unless the journal has it."""
+        if self.journal.data["new_tp"]:
+            logger.info("Resuming clone into test plan %s", self.journal.data["new_tp"])
+            tp_info['env'] = self.journal.data["env"]
+            return self.journal.data["new_tp"]
+        new_tp, env_field = self.jira.create_new_test_plan(test_plan, tp_info)
+        if not new_tp:
+            raise RuntimeError('New test plan creation failed')
+        tp_info['env'] = env_field
+        self.journal.update(source_tp=test_plan, new_tp=new_tp, env=env_field)
+        self.journal.created(new_tp, "tp", test_plan)
+        return new_tp
+
+    def create_tes(self, te_keys: list, tp_info: dict, product_family: str) -> None:
+        """Bulk create new TEs for source TEs which have none in the journal."""
+        pending = [te for te in te_keys if not self.journal.te_state(te).get("new")]
+        details = self.fetch_details(pending)
+        for source in [te for te in pending if te not in details]:
+            logger.error("Details of %s not available, not cloned", source)
+        pending = [te for te in pending if te in details]
+        for batch in chunks(pending, BULK_CHUNK):
+            fields = [self.jira.test_exe_fields(details[te], tp_info, product_family)
+                      for te in batch]
+            for source, key in zip(batch, self.jira.create_issues(fields)):
+                if key:
+                    logger.info("Created TE %s from %s", key, source)
+                    self.journal.created(key, "te", source)
+                else:
+                    logger.error("TE creation failed for %s", source)
+
+    def add_tests(self, source: str, tp_info: dict) -> None:
+        """Add valid tests of a source TE to its new TE."""
+        state = self.journal.te_state(source)
+        if not state.get("new") or state.get("tests_added"):
+            return
+        details = self.fetch_details(state["tests"])
+        valid = [test for test in state["tests"]
+                 if test in details and self.jira.is_valid_test(details[test], tp_info)]
+        for batch in chunks(valid, ADD_CHUNK):
+            if not self.jira.add_tests(state["new"], batch, "testexec"):
+                logger.error("Adding tests to TE %s failed", state["new"])
+                return
+        logger.info("Added %s tests to TE %s", len(valid), state["new"])
+        self.journal.mark_te(source, tests_added=True, valid=valid)
+
+    # pylint: disable-msg=too-many-arguments
+    def clone(self, test_plan: str, te_keys: list, tp_info: dict, skip_tes: list,
+              product_family: str) -> dict:
+        """
+        Clone or resume the clone of test plan.
+
+        Args:
+            test_plan (str): Source test plan
+            te_keys (list): Source test executions to clone
+            tp_info (dict): Test plan info from command line
+            skip_tes (list): Source TEs whose new TEs are not listed in the csv
+            product_family (str): LR or K8
+
+        Returns:
+            Summary dictionary with new_tp, tes ({source: new}), skipped, failed and created
+        """
+        new_tp = self.journal.data["new_tp"] if 'env' in tp_info \
+            else self.create_tp(test_plan, tp_info)
+        pending = [te for te in te_keys if "tests" not in self.journal.te_state(te)]
+        for source, tests in zip(pending, self._map(self.jira.get_test_ids_from_te, pending)):
+            self.journal.mark_te(source, tests=tests)
+        empty = [te for te in te_keys if not self.journal.te_state(te)["tests"]]
+        for source in empty:
+            logger.info("Skipping %s as it has no tests", source)
+        to_clone = [te for te in te_keys if te not in empty]
+        self.fetch_details(sorted({test for te in to_clone
+                                   for test in self.journal.te_state(te)["tests"]}))
+        self.create_tes(to_clone, tp_info, product_family)
+        self._map(lambda source: self.add_tests(source, tp_info), to_clone)
+        done = [te for te in to_clone if self.journal.te_state(te).get("tests_added")]
+        new_tes = [self.journal.te_state(te)["new"] for te in done]
+        if done and not self.journal.data["tp_tests_added"]:
+            tests = sorted({test for te in done for test in self.journal.te_state(te)["valid"]})
+            if all(self.jira.add_tests(new_tp, batch, "testplan")
+                   for batch in chunks(tests, ADD_CHUNK)):
+                self.journal.update(tp_tests_added=len(done) == len(to_clone))
+        if new_tes and not self.journal.data["tes_linked"]:
+            if self.jira.add_te_to_tp(new_tes, new_tp):
+                self.journal.update(tes_linked=len(done) == len(to_clone))
+        return {"new_tp": new_tp, "tes": {te: self.journal.te_state(te)["new"] for te in done},
+                "skipped": [self.journal.te_state(te)["new"] for te in done if te in skip_tes],
+                "failed": [te for te in to_clone if te not in done],
+                "created": [each["key"] for each in self.journal.data["created"]]}
+
+    def undo(self) -> list:
+        """
+        Delete issues created by the clone, newest first.
+
+        Returns:
+            Keys which could not be deleted
+        """
+        failed = []
+        for each in reversed(self.journal.data["created"]):
+            if each["key"] in self.journal.data["undone"]:
+                continue
+            if self.jira.delete_issue(each["key"]):
+                logger.info("Deleted %s", each["key"])
+                with self.journal.lock:
+                    self.journal.data["undone"].append(each["key"])
+                    self.journal.save()
+            else:
+                failed.append(each["key"])
+        return failed
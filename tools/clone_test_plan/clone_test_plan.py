@@ -24,15 +24,15 @@ import os
 import sys
 import argparse
 import csv
+import json
+import logging
 from datetime import datetime
 from jira_api import JiraTask
-from multiprocessing import Process, Manager
+from clone_engine import CloneEngine, CloneJournal
 
 # cloned test plan csv name
 CLONED_TP_CSV = 'cloned_tp_info.csv'
 
-jira_task = JiraTask()
-
 # te's to skip for ova
 ova_skip_tes = ['TEST-21365', 'TEST-21133', 'TEST-19721', 'TEST-19720', 'TEST-19719', 'TEST-19717',
                 'TEST-19716', 'TEST-19709', 'TEST-19708', 'TEST-19707', 'TEST-19704', 'TEST-19701']
@@ -40,39 +40,22 @@ ova_skip_tes = ['TEST-21365', 'TEST-21133', 'TEST-19721', 'TEST-19720', 'TEST-19
 vm_hw_skip_tes = ['TEST-19713']
 
 
-def process_te(te, tp_info, skip_tes, new_tp_key, new_skipped_te, new_te_keys, old_tes,
-               product_family):
-    """
-    Process existing te and create new te
-    """
-    # create new te
-    jt = JiraTask()
-    new_te_id, is_te_skipped, test_list = jt.create_new_test_exe(te, tp_info, skip_tes,
-                                                                 product_family)
-    if new_te_id != '':
-        print("New TE created, now add tests to te and tp")
-        response = jt.add_tests_to_te_tp(new_te_id, new_tp_key, tp_info, test_list)
-        if response:
-            print("Tests added to TE {} and TP {}".format(new_te_id, new_tp_key))
-            new_te_keys.append(new_te_id)
-            old_tes.append(te)
-            if is_te_skipped:
-                new_skipped_te.append(new_te_id)
-            response_add = jt.add_te_to_tp([new_te_id], new_tp_key)
-            if response_add:
-                print("TEs are added to TP")
-            else:
-                print("Error while adding TEs to TP")
-        else:
-            print("Error while adding tests to TE {} and TP {}".format(new_te_id, new_tp_key))
-
-
 # pylint: disable-msg=too-many-branches
 def main(args):
     """
     main function to clone test plan
     """
     test_plan = args.test_plan
+    jira_task = JiraTask(workers=args.workers, rate=args.rate)
+    journal = CloneJournal(args.journal or os.path.join(
+        os.getcwd(), "clone_{}_{}_{}.json".format(test_plan, args.build, args.setup_type)))
+    engine = CloneEngine(jira_task, journal, workers=args.workers)
+    if args.undo:
+        failed = engine.undo()
+        if failed:
+            sys.exit("Could not delete {}".format(failed))
+        print("Deleted issues created by clone journal {}".format(journal.path))
+        return
 
     tp_info = dict()
     tp_info['build'] = args.build
@@ -88,12 +71,11 @@ def main(args):
     tp_info['core_category'] = args.core_category
     tp_info['tp_labels'] = args.tp_labels
 
-    new_tp_key, env_field = jira_task.create_new_test_plan(test_plan, tp_info)
-    if new_tp_key == '':
-        sys.exit('New test plan creation failed')
-    else:
-        print("New test plan {} created".format(new_tp_key))
-        tp_info['env'] = env_field
+    try:
+        new_tp_key = engine.create_tp(test_plan, tp_info)
+    except RuntimeError as error:
+        sys.exit(str(error))
+    print("New test plan {} created".format(new_tp_key))
 
     test_executions = jira_task.get_test_executions_from_test_plan(test_plan)
     te_keys_all = [te["key"] for te in test_executions]
@@ -123,37 +105,24 @@ def main(args):
         except Exception as e:
             print(f"Exception {e} in getting processing skip tes")
 
-    prcs = []
-    with Manager() as manager:
-        new_skipped_te = manager.list()
-        new_te_keys = manager.list()
-        old_tes = manager.list()
-        for te in te_keys:
-            p = Process(target=process_te, args=(te, tp_info, skip_tes, new_tp_key,
-                                                 new_skipped_te, new_te_keys, old_tes,
-                                                 args.product_family))
-            p.start()
-            prcs.append(p)
-
-        for prc in prcs:
-            prc.join()
-
-        new_skipped_te = list(new_skipped_te)
-        new_te_keys = list(new_te_keys)
-        old_tes = list(old_tes)
-        print("New Test Plan: {}".format(new_tp_key))
-        with open(os.path.join(os.getcwd(), CLONED_TP_CSV), 'w', newline='') as tp_info_csv:
-            writer = csv.writer(tp_info_csv)
-            for i, te in enumerate(new_te_keys):
-                old_te = old_tes[i]
-                if te not in new_skipped_te:
-                    writer.writerow([new_tp_key.strip(), te.strip(), old_te.strip()])
-
-        if args.comment_jira:
-            current_time_ms = datetime.utcnow().strftime('%Y-%m-%d_%H:%M:%S.%f')
-            comment = ' Build: {}, Setup: {}, Test Plan: {}, Test Executions: {} created on {}'. \
-                format(args.build, args.setup_type, new_tp_key, new_te_keys, current_time_ms)
-            jira_task.add_comment(args.comment_jira, comment)
+    summary = engine.clone(test_plan, te_keys, tp_info, skip_tes, args.product_family)
+    new_te_keys = list(summary["tes"].values())
+    print("New Test Plan: {}".format(new_tp_key))
+    print("Clone summary: {}".format(json.dumps(summary, indent=2)))
+    with open(os.path.join(os.getcwd(), CLONED_TP_CSV), 'w', newline='') as tp_info_csv:
+        writer = csv.writer(tp_info_csv)
+        for old_te, te in summary["tes"].items():
+            if te not in summary["skipped"]:
+                writer.writerow([new_tp_key.strip(), te.strip(), old_te.strip()])
+    if summary["failed"]:
+        sys.exit("Clone incomplete for {}, rerun to resume using journal {}".format(
+            summary["failed"], journal.path))
+
+    if args.comment_jira:
+        current_time_ms = datetime.utcnow().strftime('%Y-%m-%d_%H:%M:%S.%f')
+        comment = ' Build: {}, Setup: {}, Test Plan: {}, Test Executions: {} created on {}'. \
+            format(args.build, args.setup_type, new_tp_key, new_te_keys, current_time_ms)
+        jira_task.add_comment(args.comment_jira, comment)
 
 
 def parse_args():
@@ -194,9 +163,19 @@ def parse_args():
                         help="Space separated labels for test plan")
     parser.add_argument("-cc", "--core_category", type=str, default='NA',
                         help="gold/silver")
+    parser.add_argument("-w", "--workers", type=int, default=8,
+                        help="Parallel JIRA workers")
+    parser.add_argument("-r", "--rate", type=float, default=10,
+                        help="Max JIRA requests per second, 0 for no limit")
+    parser.add_argument("-j", "--journal", type=str,
+                        help="Clone journal, default clone_<tp>_<build>_<setup>.json. "
+                             "Rerun with the same journal resumes a partial clone")
+    parser.add_argument("--undo", action="store_true",
+                        help="Delete issues created by the clone journal")
     return parser.parse_args()
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     opts = parse_args()
     main(opts)
@@ -29,12 +29,16 @@ import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+from clone_engine import RateLimiter
+
 DEFAULT_TIMEOUT = 180  # seconds
+DETAIL_FIELDS = "summary,labels,components,environment,customfield_21006,customfield_22982," \
+                "customfield_21085"
 
 
 class TimeoutHTTPAdapter(HTTPAdapter):
     """
-    Timeout adapater
+    Timeout adapater, optionally rate limited
     """
 
     def __init__(self, *args, **kwargs):
@@ -42,15 +46,18 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         if "timeout" in kwargs:
             self.timeout = kwargs["timeout"]
             del kwargs["timeout"]
+        self.limiter = kwargs.pop("limiter", None)
         super().__init__(*args, **kwargs)
 
     def send(self, request, **kwargs):
         """
-        Set timeout
+        Set timeout and wait for the rate limiter
         """
         timeout = kwargs.get("timeout")
         if timeout is None:
             kwargs["timeout"] = self.timeout
+        if self.limiter:
+            self.limiter.acquire()
         return super().send(request, **kwargs)
 
 
@@ -59,7 +66,12 @@ class JiraTask:
     Jira Task for clone for test plan tool
     """
 
-    def __init__(self):
+    def __init__(self, workers: int = 8, rate: float = 10):
+        """
+        Args:
+            workers (int): Threads sharing the pooled JIRA sessions
+            rate (float): Max JIRA requests per second of all threads, 0 for no limit
+        """
         try:
             self.jira_id = os.environ["JIRA_ID"]
             self.jira_password = os.environ["JIRA_PASSWORD"]
@@ -82,9 +94,15 @@ class JiraTask:
             status_forcelist=[429, 500, 502, 503, 504, 400, 404, 408],
             method_whitelist=["HEAD", "GET", "OPTIONS", "POST"]
         )
+        # One pooled, rate limited adapter for the Xray and the JIRA client sessions
+        self.adapter = TimeoutHTTPAdapter(max_retries=self.retry_strategy,
+                                          pool_connections=2, pool_maxsize=max(workers, 10),
+                                          limiter=RateLimiter(rate))
         self.http = requests.Session()
-        self.http.mount("https://", TimeoutHTTPAdapter(max_retries=self.retry_strategy))
-        self.http.mount("http://", TimeoutHTTPAdapter(max_retries=self.retry_strategy))
+        self.http.mount("https://", self.adapter)
+        self.http.mount("http://", self.adapter)
+        self.auth_jira._session.mount("https://", self.adapter)
+        self.auth_jira._session.mount("http://", self.adapter)
 
     def check_test_environment_platform(self, tests, tp_info):
         """
@@ -92,56 +110,62 @@ class JiraTask:
         If it matches then add test to test plan.
         """
         valid_tests = []
+        for test_id in tests:
+            details = self.get_issue_details(test_id)
+            if details and self.is_valid_test(details, tp_info):
+                valid_tests.append(test_id)
+            else:
+                print("{} is not valid for this test plan".format(test_id))
+        return valid_tests
+
+    @staticmethod
+    def is_valid_test(details, tp_info):
+        """
+        Check environment, core category and platform of test details against test plan.
+        """
         tp_env = tp_info['env']
         tp_platform = tp_info['platform']
         num_nodes = tp_info['nodes']
         core_category = tp_info['core_category']
-        for test_id in tests:
-            is_valid_platform = False
-            is_valid_env = False
-            is_valid_category = False
-            details = self.get_issue_details(test_id)
-            if details:
-                tp_platform = tp_platform.lower()
-                if ('vm' in tp_platform) and ('hw' in tp_platform):
+        is_valid_platform = False
+        is_valid_env = False
+        is_valid_category = False
+        tp_platform = tp_platform.lower()
+        if ('vm' in tp_platform) and ('hw' in tp_platform):
+            is_valid_platform = True
+        else:
+            platform_field = details.fields.customfield_22982
+            if platform_field:
+                platform_field = platform_field[0].lower()
+                if tp_platform.strip() in platform_field.strip():
                     is_valid_platform = True
-                else:
-                    platform_field = details.fields.customfield_22982
-                    if platform_field:
-                        platform_field = platform_field[0].lower()
-                        if tp_platform.strip() in platform_field.strip():
-                            is_valid_platform = True
-                    else:
-                        is_valid_platform = True
-                env_field = details.fields.environment
-                if num_nodes == '':
+            else:
+                is_valid_platform = True
+        env_field = details.fields.environment
+        if num_nodes == '':
+            is_valid_env = True
+        else:
+            if env_field:
+                env_field = env_field.lower()
+                tp_env = tp_env.lower()
+                if env_field.strip() == "multinode":
                     is_valid_env = True
-                else:
-                    if env_field:
-                        env_field = env_field.lower()
-                        tp_env = tp_env.lower()
-                        if env_field.strip() == "multinode":
-                            is_valid_env = True
-                        elif env_field.strip() == "1node" and num_nodes == 1:
-                            is_valid_env = True
-                        elif tp_env.strip() == env_field.strip():
-                            is_valid_env = True
-                    else:
-                        is_valid_env = True
-                if core_category == 'NA':
+                elif env_field.strip() == "1node" and num_nodes == 1:
+                    is_valid_env = True
+                elif tp_env.strip() == env_field.strip():
+                    is_valid_env = True
+            else:
+                is_valid_env = True
+        if core_category == 'NA':
+            is_valid_category = True
+        else:
+            if details.fields.customfield_21085:
+                test_category = details.fields.customfield_21085.value
+                if core_category.lower().strip() in test_category.lower():
                     is_valid_category = True
-                else:
-                    if details.fields.customfield_21085:
-                        test_category = details.fields.customfield_21085.value
-                        if core_category.lower().strip() in test_category.lower():
-                            is_valid_category = True
-                    else:
-                        is_valid_category = True
-            if is_valid_platform and is_valid_env and is_valid_category:
-                valid_tests.append(test_id)
             else:
-                print("{} is not valid for this test plan".format(test_id))
-        return valid_tests
+                is_valid_category = True
+        return is_valid_platform and is_valid_env and is_valid_category
 
     def create_new_test_exe(self, te, tp_info, skip_te, product_family):
         """
@@ -155,43 +179,49 @@ class JiraTask:
             return '', is_te_skipped, ''
         else:
             test_exe_details = self.get_issue_details(te)
-
-            summary = test_exe_details.fields.summary
-            # description = test_plan_details.fields.description
-            description = "Test Execution for Build : {}, Build Branch: {}, Setup type: {}".format(
-                tp_info['build'], tp_info['build_branch'], tp_info['setup_type'])
-            components = []
-            for i in range(len(test_exe_details.fields.components)):
-                d = dict()
-                d['name'] = test_exe_details.fields.components[i].name
-                components.append(d)
-
-            labels = test_exe_details.fields.labels
-            env_field = tp_info['build_branch'] + "_" + tp_info['build']
-            test_eve_labels = test_exe_details.fields.customfield_21006
             if te in skip_te:
                 is_te_skipped = True
-
-            affect_ver = []
-            affect_ver_dict = dict()
-            if product_family == 'LR':
-                affect_ver_dict['name'] = 'LR-R2'
-            else:
-                affect_ver_dict['name'] = 'CORTX-R2'
-            affect_ver.append(affect_ver_dict)
-
-            te_dict = {'project': 'TEST',
-                       'summary': summary,
-                       'description': description,
-                       'issuetype': {'name': 'Test Execution'},
-                       'components': components,
-                       'labels': labels,
-                       'versions': affect_ver,
-                       'environment': env_field,
-                       'customfield_21006': test_eve_labels}
+            te_dict = self.test_exe_fields(test_exe_details, tp_info, product_family)
             issue_key = self.create_issue(te_dict)
             return issue_key, is_te_skipped, test_list
 
+    @staticmethod
+    def test_exe_fields(test_exe_details, tp_info, product_family):
+        """
+        Fields of new test execution cloned from existing te details
+        """
+        summary = test_exe_details.fields.summary
+        # description = test_plan_details.fields.description
+        description = "Test Execution for Build : {}, Build Branch: {}, Setup type: {}".format(
+            tp_info['build'], tp_info['build_branch'], tp_info['setup_type'])
+        components = []
+        for i in range(len(test_exe_details.fields.components)):
+            d = dict()
+            d['name'] = test_exe_details.fields.components[i].name
+            components.append(d)
+
+        labels = test_exe_details.fields.labels
+        env_field = tp_info['build_branch'] + "_" + tp_info['build']
+        test_eve_labels = test_exe_details.fields.customfield_21006
+
+        affect_ver = []
+        affect_ver_dict = dict()
+        if product_family == 'LR':
+            affect_ver_dict['name'] = 'LR-R2'
+        else:
+            affect_ver_dict['name'] = 'CORTX-R2'
+        affect_ver.append(affect_ver_dict)
+
+        return {'project': 'TEST',
+                'summary': summary,
+                'description': description,
+                'issuetype': {'name': 'Test Execution'},
+                'components': components,
+                'labels': labels,
+                'versions': affect_ver,
+                'environment': env_field,
+                'customfield_21006': test_eve_labels}
+
     def create_new_test_plan(self, test_plan, tp_info):
         """
         create new test plan using existing test plan
@@ -294,6 +324,83 @@ class JiraTask:
                 return new_issue_created
         return new_issue_created
 
+    def create_issues(self, issue_dicts):
+        """
+        Create issues with one bulk request, issues failing in bulk are created one by one
+
+        Returns:
+            List of new issue keys in order of issue_dicts, '' for failed creations
+        """
+        keys = [''] * len(issue_dicts)
+        try:
+            results = self.auth_jira.create_issues(field_list=issue_dicts)
+        except Exception as e:
+            print(f"Exception {e} in bulk issue creation")
+            results = [{'status': 'Error'}] * len(issue_dicts)
+        for idx, result in enumerate(results):
+            if result.get('status') == 'Success':
+                keys[idx] = result['issue'].key
+            else:
+                print("Bulk creation failed: {}, retrying".format(result.get('error')))
+                keys[idx] = self.create_issue(issue_dicts[idx])
+        return keys
+
+    def get_issues_details(self, issue_ids):
+        """
+        Get details of many issues with one JQL search
+
+        Returns:
+            Dictionary of issue key: issue details
+        """
+        if not issue_ids:
+            return {}
+        jql = "key in ({})".format(",".join(issue_ids))
+        try:
+            issues = self.auth_jira.search_issues(jql, maxResults=len(issue_ids),
+                                                  fields=DETAIL_FIELDS)
+            return {issue.key: issue for issue in issues}
+        except Exception as e:
+            print(f"Exception {e} in JQL search, fetching issues one by one")
+        details = {}
+        for issue_id in issue_ids:
+            issue = self.get_issue_details(issue_id)
+            if issue:
+                details[issue_id] = issue
+        return details
+
+    def add_tests(self, issue_key, tests, issue_type):
+        """
+        Add tests to a test execution or test plan
+
+        Args:
+            issue_key: test execution or test plan key
+            tests: test keys
+            issue_type: testexec or testplan
+        """
+        try:
+            response = self.http.post(
+                "{}rest/raven/1.0/api/{}/{}/test".format(self.jira_url, issue_type, issue_key),
+                headers={'Content-Type': 'application/json'}, json={"add": tests},
+                auth=(self.jira_id, self.jira_password))
+        except requests.exceptions.RequestException as e:
+            print(f"Exception {e} in adding tests to {issue_key}")
+            return False
+        if response.status_code != HTTPStatus.OK:
+            print("Adding tests to {} failed with {}".format(issue_key, response.status_code))
+            return False
+        return True
+
+    def delete_issue(self, issue_key):
+        """
+        Delete issue
+        """
+        try:
+            self.auth_jira.issue(issue_key).delete()
+        except Exception as e:
+            print(f"Exception {e} in deleting {issue_key}")
+            return False
+        return True
+
     def add_te_to_tp(self, te_list, test_plan):
         """
         add test executiona tp test plan
@@ -16,17 +16,34 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
-"""Data generator by honouring the data distribution."""
-import random
+"""
+Data generator by honouring the data distribution.
+
+Files are generated by all CPU cores from pre-built numpy buffers. Every file gets its own seed
+derived from the dataset seed, so a dataset is reproducible irrespective of number of workers.
+A manifest with size and checksums of each file is written and the objects can optionally be
+streamed straight into an S3 bucket instead of local disk.
+
+Usage (positional arguments are kept compatible with the old generator):
+    python generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth [options]
+"""
+import argparse
+import hashlib
+import io
+import json
 import os
-import sys
+import random
 import string
-from multiprocessing import Process, Value, Lock
-from struct import pack
+import sys
+from multiprocessing import Pool, cpu_count
 from platform import system
-from struct import unpack
 
-randmax = 2147483647 / 256
+import numpy as np
+
+RANDMAX = 2147483647 // 256
+BUFFER_SIZE = 1024 * 1024 * 40
+WRITE_SIZE = 1024 * 1024 * 4
+BUFFER_SEED = 143
 
 fileextbin1k = 646 * ['dat'] + 1074 * ['png'] + 105 * ['sol'] + 89 * ['jpg'] + 72 * ['lex'] + 7739 * ['gif'] + 947 * [
     'cookie'] + 642 * ['aae'] + 324 * ['sth'] + 285 * ['tbl'] + 262 * ['old'] + 248 * ['vcrd'] + 150 * [
@@ -90,8 +107,8 @@ fileextbin10g = ['7z'] + 7 * ['pst'] + ['ost'] + ['old']
 
 fileexttxt10g = []
 
-binary = fileextbin1g + fileextbin10g + fileextbin100m + fileextbin10m + fileextbin1m + fileextbin100k + fileextbin10k + fileextbin1k
-ascii = fileexttxt1g + fileexttxt100m + fileexttxt10m + fileexttxt1m + fileexttxt100k + fileexttxt10k + fileexttxt1k
+binary = set(fileextbin1g + fileextbin10g + fileextbin100m + fileextbin10m + fileextbin1m +
+             fileextbin100k + fileextbin10k + fileextbin1k)
 
 dir_depth_dist = [0.47, 2.85, 1.61, 4.48, 7.91, 20.19, 15.39, 9.94, 6.81, 6.95, 4.31, 4.12, 14.95]
 dir_depth_variation = [1, 4, 3, 3, 4, 5, 4, 5, 3, 4, 2, 2, 3]
@@ -99,226 +116,265 @@ files_depth_dist = [0.01, 1.85, 2.39, 4.97, 7.24, 12.56, 19.25, 14.49, 14.77, 12
 files_depth_variation = [4, 6, 3, 3, 3, 3, 2, 5, 14, 6, 7, 3, 4]
 fileslevel = len(files_depth_dist)
 
-
-def randname(min=4, max=10):
-    a = ''
-    for i in range(random.randrange(min, max)):
-        a = a + random.choice(string.ascii_letters + string.digits)
-    return a
-
-
-def randfilename(size, min=5, max=40):
-    fname = ''
-    for i in range(random.randrange(min, max)):
-        fname += random.choice(string.ascii_letters + string.digits + '_-')
-
-    if size < 1024:
-        ext = random.choice(fileexttxt1k + fileextbin1k)
-    elif (size >= 1024) & (size < 10240):
-        ext = random.choice(fileexttxt10k + fileextbin10k)
-    elif (size >= 10240) & (size < 102400):
-        ext = random.choice(fileexttxt100k + fileextbin100k)
-    elif (size >= 102400) & (size < 1024 * 1024):
-        ext = random.choice(fileexttxt1m + fileextbin1m)
-    elif (size >= 1024 * 1024) & (size < 1024 * 10240):
-        ext = random.choice(fileexttxt10m + fileextbin10m)
-    elif (size >= 1024 * 10240) & (size < 10240 * 10240):
-        ext = random.choice(fileexttxt100m + fileextbin100m)
-    elif (size >= 10240 * 10240) & (size < 1024 * 1024 * 1024):
-        ext = random.choice(fileexttxt1g + fileextbin1g)
-    elif size >= 1024 * 1024 * 1024:
-        ext = random.choice(fileextbin10g)
-    return fname, ext
-
-
-def randtext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
-
-
-def randbytes(bytes):
-    a = ''.join(pack('q', random.randrange(randmax))
-                for _ in range(bytes / 8))
-    if (bytes % 8) == 0:
-        pass
-    else:
-        a += (''.join(pack('q', random.randrange(randmax))))[0:bytes % 8]
-    return a
-
-
-def bufferbin(size):
-    buf = ''
-    for i in range(size / 8):
-        buf = buf + pack('q', random.randrange(randmax))
-    return buf
-
-
-def buffertext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
-
-
-def make_dirs(name, number):
-    dirs = []
-    for i in range(0, number, 1):
-        dirname = randname()
-        path = name + '/' + dirname
-        dirs.append(path)
-    return dirs
-
-
-def make_dirtree(topdir, depth, number):
+SIZE_EXTENSIONS = [
+    (1024, fileexttxt1k + fileextbin1k),
+    (1024 * 10, fileexttxt10k + fileextbin10k),
+    (1024 * 100, fileexttxt100k + fileextbin100k),
+    (1024 * 1024, fileexttxt1m + fileextbin1m),
+    (1024 * 1024 * 10, fileexttxt10m + fileextbin10m),
+    (10240 * 10240, fileexttxt100m + fileextbin100m),
+    (1024 * 1024 * 1024, fileexttxt1g + fileextbin1g),
+]
+
+# Buffers are built once per worker process by init_worker.
+BUFFERS = {}
+
+
+def randname(rng, min_len=4, max_len=10):
+    """Random directory name."""
+    chars = string.ascii_letters + string.digits
+    return ''.join(rng.choice(chars) for _ in range(rng.randrange(min_len, max_len)))
+
+
+def randfilename(rng, size, min_len=5, max_len=40):
+    """Random file name and extension honouring extension distribution of the size bucket."""
+    chars = string.ascii_letters + string.digits + '_-'
+    fname = ''.join(rng.choice(chars) for _ in range(rng.randrange(min_len, max_len)))
+    for limit, extensions in SIZE_EXTENSIONS:
+        if size < limit:
+            return fname, rng.choice(extensions)
+    return fname, rng.choice(fileextbin10g)
+
+
+def bufferbin(size, seed=BUFFER_SEED):
+    """Random binary buffer."""
+    return np.random.default_rng(seed).integers(0, 256, size, dtype=np.uint8).tobytes()
+
+
+def buffertext(size, seed=BUFFER_SEED):
+    """Random text buffer made of 4 printable characters followed by 4 spaces."""
+    printable = np.frombuffer(string.printable.encode(), dtype=np.uint8)
+    rows = -(-size // 8)
+    buf = np.full((rows, 8), ord(' '), dtype=np.uint8)
+    buf[:, :4] = np.random.default_rng(seed).choice(printable, size=(rows, 4))
+    return buf.tobytes()[:size]
+
+
+def init_worker(block=BUFFER_SIZE):
+    """Build shared random buffers in worker process."""
+    BUFFERS["bin"] = memoryview(bufferbin(block))
+    BUFFERS["txt"] = memoryview(buffertext(block))
+
+
+def iter_file_chunks(size, ext, seed):
+    """
+    Yield data of a file as slices of the random buffers at random offsets.
+
+    :param size: Size of the file.
+    :param ext: Extension used to choose binary or text buffer.
+    :param seed: Seed of the file.
+    """
+    if not BUFFERS:
+        init_worker()
+    buf = BUFFERS["bin"] if ext in binary else BUFFERS["txt"]
+    rng = np.random.default_rng(seed)
+    remaining = size
+    while remaining > 0:
+        length = min(remaining, WRITE_SIZE, len(buf))
+        offset = int(rng.integers(0, len(buf) - length + 1))
+        yield buf[offset:offset + length]
+        remaining -= length
+
+
+class GeneratedFileReader(io.RawIOBase):
+    """Read only file like object over generated file data used to stream uploads."""
+
+    def __init__(self, size, ext, seed, digests):
+        super().__init__()
+        self._chunks = iter_file_chunks(size, ext, seed)
+        self._pending = memoryview(b'')
+        self._digests = digests
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            for digest in self._digests:
+                digest.update(chunk)
+            self._pending = chunk
+        length = min(len(buffer), len(self._pending))
+        buffer[:length] = self._pending[:length]
+        self._pending = self._pending[length:]
+        return length
+
+
+def make_dirs(rng, name, number):
+    """Random sub directory names of a directory."""
+    return [name + '/' + randname(rng) for _ in range(number)]
+
+
+def make_dirtree(rng, topdir, depth, number):
+    """Directory list honouring directory and files depth distribution."""
     all_dirs = []
     top = [topdir]
     temp = []
-    if (depth <= fileslevel):
+    if depth <= fileslevel:
         filefact = int(round(1000.0 * files_depth_dist[-depth] / len(top)))
         all_dirs.extend(top * filefact)
     depth -= 1
-    while (depth):
+    while depth:
         variation = dir_depth_variation[-depth]
         nextdirs = int(round((dir_depth_dist[-depth - 1] * number / 100)))
-        if (len(top) > nextdirs):
-            samplesize = nextdirs
-        else:
-            samplesize = len(top)
-
-        for x in random.sample(variation * top, samplesize):
-            numberdirs = int(nextdirs / samplesize)
-            temp.extend(make_dirs(x, numberdirs))
+        samplesize = min(len(top), nextdirs)
+        for parent in rng.sample(variation * top, samplesize):
+            temp.extend(make_dirs(rng, parent, int(nextdirs / samplesize)))
         top = temp
-        print(top)
-
         temp = []
         if depth <= fileslevel:
             filefact = int(round(1000.0 * files_depth_dist[-depth] / len(top)))
             filevariation = files_depth_variation[-depth]
             sampletop = top
-            for it in range(7 * filevariation):
-                sampletop = random.sample(filevariation * sampletop, len(top))
+            for _ in range(7 * filevariation):
+                sampletop = rng.sample(filevariation * sampletop, len(top))
             all_dirs.extend(filefact * (sampletop + top))
-
         depth -= 1
     return all_dirs
 
 
-def create_fileset(fsize_percent, randseed, numfiles, alldirs, lock):
-    mycwd = os.getcwd()
-    isWindows = False
-    if system() == 'Windows':
-        isWindows = True
-    fs = 0
-    random.seed(randseed)
-    block = 1024 * 1024 * 40
-    buftxt = buffertext(block)
-    bufbin = bufferbin(block)
-    for fs_pc in fsize_percent:
-        isize = fs_pc[0] - fs
-        for fno in range(int(round(fs_pc[1] * numfiles / 100))):
-            randno = random.randrange(randmax)
-            if (isize > 1):
-                size = fs + isize * randno / randmax
-            else:
-                size = fs + isize
-            filename, ext = randfilename(size)
-            dira = random.choice(alldirs)
+def read_size_distribution(cfg_file):
+    """Read [[size, percent], ...] from dataset cfg file."""
+    with open(cfg_file, encoding="utf-8") as fobj:
+        return [[float(x) if '.' in x else int(x) for x in line.split()]
+                for line in fobj if line.strip()]
+
+
+def plan_dataset(fsize_percent, numfiles, alldirs, seed):
+    """
+    Plan path, size, extension and seed of every file of the dataset.
+
+    :param fsize_percent: Size distribution read from dataset cfg file.
+    :param numfiles: Number of files.
+    :param alldirs: Directory list from make_dirtree.
+    :param seed: Dataset seed.
+    :return: List of (path, size, ext, file_seed).
+    """
+    rng = random.Random(seed)
+    plan = []
+    lower = 0
+    for upper, percent in fsize_percent:
+        isize = upper - lower
+        for _ in range(int(round(percent * numfiles / 100))):
+            size = lower + int(isize * rng.random()) if isize > 1 else lower + isize
+            filename, ext = randfilename(rng, size)
             if ext:
                 filename = filename + '.' + ext
-            lock.acquire()
-            printstring = (str(dira + '/' + filename), size)
-            print(printstring)
-            lock.release()
-
-            if isWindows:
-                dira = '\\\\?\\' + mycwd + '\\' + dira.replace('/', '\\')
-                filename = dira + '\\' + filename
-            else:
-                filename = dira + '/' + filename
-
-            try:
-                os.makedirs(dira)
-            except:
-                pass
-            f = open(filename, 'wb', 512 * 1024)
-            if (size < 1024):
-                iosize = 128
-            elif (size >= 1024) & (size < 1024 * 1024):
-                iosize = 4096
-            elif (size >= 1024 * 1024):
-                iosize = 1024 * 64
-
-            sizew = size / iosize
-            randn = len(bufbin[:-iosize])
-            for z in range(0, sizew, 1):
-                noff = random.randrange(randn)
-                if ext in binary:
-                    f.write(bufbin[noff:noff + iosize])
-                else:
-                    f.write(buftxt[noff:noff + iosize])
-            x = size - f.tell()
-            if (x > 0):
-                if ext in binary:
-                    f.write(randbytes(x))
-                else:
-                    f.write(randtext(x))
-            f.close()
-        fs = fs_pc[0]
-    return 1
+            path = rng.choice(alldirs) + '/' + filename
+            plan.append((path, size, ext, rng.randrange(RANDMAX)))
+        lower = upper
+    return plan
+
+
+def write_file(path, size, ext, seed, out_dir):
+    """Write one generated file and return its manifest record."""
+    fpath = os.path.join(out_dir, path)
+    if system() == 'Windows':
+        fpath = '\\\\?\\' + os.path.abspath(fpath).replace('/', '\\')
+    os.makedirs(os.path.dirname(fpath), exist_ok=True)
+    md5, sha256 = hashlib.md5(), hashlib.sha256()  # nosec
+    with open(fpath, 'wb', 512 * 1024) as fobj:
+        for chunk in iter_file_chunks(size, ext, seed):
+            md5.update(chunk)
+            sha256.update(chunk)
+            fobj.write(chunk)
+    return {"path": path, "size": size, "md5": md5.hexdigest(), "sha256": sha256.hexdigest()}
+
+
+def upload_file(s3_client, bucket, path, size, ext, seed):
+    """Stream one generated object to S3 and return its manifest record."""
+    md5, sha256 = hashlib.md5(), hashlib.sha256()  # nosec
+    reader = io.BufferedReader(GeneratedFileReader(size, ext, seed, (md5, sha256)),
+                               buffer_size=WRITE_SIZE)
+    s3_client.upload_fileobj(reader, bucket, path)
+    return {"path": path, "size": size, "md5": md5.hexdigest(), "sha256": sha256.hexdigest(),
+            "bucket": bucket}
+
+
+def create_fileset(work):
+    """
+    Worker entry point, generate a slice of the dataset plan.
+
+    :param work: (plan slice, options dict)
+    :return: List of manifest records.
+    """
+    plan, options = work
+    s3_client = None
+    if options.get("endpoint"):
+        import boto3  # pylint: disable=import-outside-toplevel
+        s3_client = boto3.client("s3", endpoint_url=options["endpoint"],
+                                 aws_access_key_id=options["access_key"],
+                                 aws_secret_access_key=options["secret_key"],
+                                 verify=options["verify"])
+    records = []
+    for path, size, ext, seed in plan:
+        if s3_client:
+            records.append(upload_file(s3_client, options["bucket"], path, size, ext, seed))
+        else:
+            records.append(write_file(path, size, ext, seed, options["out_dir"]))
+        print((path, size), flush=True)
+    return records
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate dataset honouring data distribution.")
+    parser.add_argument("cfg", help="Dataset size distribution file e.g. dataset-S.cfg")
+    parser.add_argument("nfiles", type=int, help="Number of files")
+    parser.add_argument("seed", type=int, help="Random seed for data")
+    parser.add_argument("ndirs", type=int, help="Number of directories")
+    parser.add_argument("depth", type=int, help="Directory tree depth")
+    parser.add_argument("--workers", type=int, default=cpu_count(),
+                        help="Number of worker processes, defaults to number of CPUs")
+    parser.add_argument("--out-dir", default=os.getcwd(), help="Directory to create dataset in")
+    parser.add_argument("--manifest", default="manifest.json",
+                        help="Manifest file with size and checksums of generated files")
+    parser.add_argument("--endpoint", help="S3 endpoint, stream objects to S3 instead of disk")
+    parser.add_argument("--bucket", help="S3 bucket used with --endpoint")
+    parser.add_argument("--access-key", default=os.environ.get("AWS_ACCESS_KEY_ID"))
+    parser.add_argument("--secret-key", default=os.environ.get("AWS_SECRET_ACCESS_KEY"))
+    parser.add_argument("--no-verify-ssl", dest="verify", action="store_false")
+    args = parser.parse_args(argv)
+    if args.endpoint and not args.bucket:
+        parser.error("--bucket is required with --endpoint")
+    return args
+
+
+def main(argv=None):
+    """Generate dataset and write manifest."""
+    args = parse_args(argv)
+    fsize_percent = read_size_distribution(args.cfg)
+    rng = random.Random(BUFFER_SEED)
+    topdir = randname(rng)
+    alldirs = make_dirtree(rng, topdir, args.depth, args.ndirs)
+    plan = plan_dataset(fsize_percent, args.nfiles, alldirs, args.seed + 110)
+    # Interleave the plan so that large files are spread across workers.
+    workers = max(1, args.workers)
+    options = {"out_dir": args.out_dir, "endpoint": args.endpoint, "bucket": args.bucket,
+               "access_key": args.access_key, "secret_key": args.secret_key,
+               "verify": args.verify}
+    work = [(plan[idx::workers], options) for idx in range(workers)]
+    with Pool(workers, initializer=init_worker) as pool:
+        manifest = [rec for records in pool.map(create_fileset, work) for rec in records]
+    manifest.sort(key=lambda rec: rec["path"])
+    with open(args.manifest, "w", encoding="utf-8") as fobj:
+        json.dump({"cfg": os.path.basename(args.cfg), "seed": args.seed,
+                   "files": len(manifest), "bytes": sum(rec["size"] for rec in manifest),
+                   "objects": manifest}, fobj, indent=1)
+    print(f"Generated {len(manifest)} files, manifest: {args.manifest}", file=sys.stderr)
 
 
 if __name__ == "__main__":
-    if (len(sys.argv) < 4):
-        print("generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth")
-        exit()
-
-    infile = sys.argv[1]
-    nfiles = int(sys.argv[2])
-    randnew = int(sys.argv[3])
-    ndirs = int(sys.argv[4])
-    depth = int(sys.argv[5])
-    randseed = 143
-
-    percent = []
-    fsize = []
-
-    f = open(infile)
-    fsize_percent = [[float(x) if '.' in x else int(x) for x in line.split()] for line in f]
-
-    print("")
-    print("")
-    print("")
-    print("")
-    random.seed(randseed)
-    # topdira=str(random.randrange(randmax))
-    topdira = randname()
-    try:
-        os.mkdir(topdira)
-    except:
-        pass
-    alldirs = make_dirtree(topdira, depth, ndirs)
-    nthr = 2
-    nf = nfiles / nthr
-    randseed = randnew
-    randseed = randseed + 110
-    lock = Lock()
-    for i in range(nthr):
-        if (i == nthr - 1) & (nf < nfiles):
-            nf = nfiles - (nthr - 1) * nf
-        fileset = Process(target=create_fileset,
-                          args=(fsize_percent, randseed, nf, alldirs, lock))
-        fileset.start()
-        randseed = randseed + 10
+    main()
@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+"""Incremental JIRA to database sync engine used by db_update script."""
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+
+# Basic algorithm
+# for each TP:
+#     high water mark = start time of last successful sync of TP
+#     keep TEs whose JIRA issue was updated after high water mark (all TEs for full sync)
+#     for each kept TE:
+#         keep test runs started/finished after high water mark, and runs with defects
+#         (a defect link updates the TE issue but not the run times)
+#     search latest DB entries of all changed TEs in batches
+#     diff test runs against DB entries:
+#         no entry in DB                 -> create entry
+#         result in DB != result in JIRA -> create entry replacing latest one
+#         FAIL with new defects          -> update issueIDs of latest entry
+#     fetch JIRA details of issues needed for new entries in bulk
+#     apply creates and updates in bulk, then move high water mark
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger('db_update.sync')
+
+CREATE = "create"
+REPLACE = "replace"
+DEFECTS = "defects"
+UNCHANGED = "unchanged"
+
+
+def parse_time(value: str):
+    """
+    Parse JIRA/Xray timestamp e.g. 2021-06-15T10:01:42+05:30 or 2021-06-15T10:01:42+0530.
+
+    Args:
+        value (str): Timestamp string
+
+    Returns:
+        Timezone aware datetime, naive timestamps are considered as UTC
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        fmt = "%Y-%m-%dT%H:%M:%S.%f%z" if "." in value else "%Y-%m-%dT%H:%M:%S%z"
+        parsed = datetime.strptime(value, fmt)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def issue_fields(issue) -> dict:
+    """
+    Extract fields used in DB entries from JIRA issue object.
+
+    Args:
+        issue: Issue as returned by jira_api.get_issue_details
+
+    Returns:
+        JSON serializable dictionary
+    """
+    fields = issue.fields
+    execution_type = getattr(fields, "customfield_20981", None)
+    feature = getattr(fields, "customfield_21087", None)
+    return {
+        "key": issue.key,
+        "summary": fields.summary,
+        "labels": list(getattr(fields, "labels", None) or []),
+        "components": [each.name for each in getattr(fields, "components", None) or []],
+        "executionType": execution_type.value if execution_type else "",
+        "feature": feature.value if feature else "None",
+        "featureID": getattr(fields, "customfield_22881", None) or ["None"],
+        "drID": getattr(fields, "customfield_22882", None) or ["None"],
+    }
+
+
+class SyncState:
+    """High water mark of every test plan persisted in a JSON file."""
+
+    def __init__(self, path: str = None):
+        """
+        Load state file.
+
+        Args:
+            path (str): JSON state file, state is kept in memory only if None
+        """
+        self.path = path
+        self.marks = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fptr:
+                self.marks = json.load(fptr)
+
+    def get(self, tp_key: str):
+        """Return high water mark of test plan as datetime or None."""
+        if tp_key not in self.marks:
+            return None
+        return parse_time(self.marks[tp_key])
+
+    def set(self, tp_key: str, mark: datetime) -> None:
+        """Move high water mark of test plan and persist the state file atomically."""
+        self.marks[tp_key] = mark.isoformat()
+        if self.path:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fptr:
+                json.dump(self.marks, fptr, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+class SyncPlan:
+    """Diff between JIRA and DB of one test plan."""
+
+    def __init__(self, tp_key: str, since, started: datetime):
+        self.tp_key = tp_key
+        self.since = since
+        self.started = started
+        self.create = []
+        self.update = []
+        self.rows = []
+        self.warnings = []
+
+    def add_row(self, action: str, te_key: str, test_key: str, db_value, jira_value) -> None:
+        """Add row to diff report."""
+        self.rows.append({"action": action, "testExecutionID": te_key, "testID": test_key,
+                          "db": db_value, "jira": jira_value})
+
+    def summary(self) -> dict:
+        """Count of report rows per action."""
+        counts = {CREATE: 0, REPLACE: 0, DEFECTS: 0, UNCHANGED: 0}
+        for row in self.rows:
+            counts[row["action"]] += 1
+        return counts
+
+    def report(self) -> str:
+        """Human readable diff report."""
+        since = self.since.isoformat() if self.since else "beginning (full sync)"
+        lines = [f"Test Plan {self.tp_key}: changes since {since}"]
+        for row in self.rows:
+            if row["action"] == UNCHANGED:
+                continue
+            lines.append(f"  {row['action']:<8} {row['testExecutionID']:<12} "
+                         f"{row['testID']:<12} {row['db']} -> {row['jira']}")
+        lines.extend(f"  warning  {warning}" for warning in self.warnings)
+        lines.append(f"  summary  {self.summary()}")
+        return "\n".join(lines)
+
+
+class DbSyncEngine:
+    """
+    Sync JIRA test runs to DB touching only test runs changed since last sync.
+
+    jira source provides test_plan, test_executions, updated, test_runs and issues methods, db sink
+    provides latest_entries and apply methods. JiraRest/DbRest in db_update talk to the real
+    services, RecordedJira/RecordedDb replay recorded fixtures.
+    """
+
+    def __init__(self, jira, db_sink, state: SyncState = None, **kwargs):
+        """
+        Initialize sync engine.
+
+        Args:
+            jira: JIRA source
+            db_sink: DB sink
+            state: High water marks, kept in memory if None
+        Keyword Args:
+            skew (int): Seconds subtracted from high water mark to tolerate clock skew
+            batch_size (int): Max creates plus updates per bulk DB request
+            te_batch_size (int): Max test executions per DB search
+        """
+        self.jira = jira
+        self.db_sink = db_sink
+        self.state = state or SyncState()
+        self.skew = timedelta(seconds=kwargs.get("skew", 300))
+        self.batch_size = kwargs.get("batch_size", 500)
+        self.te_batch_size = kwargs.get("te_batch_size", 50)
+
+    @staticmethod
+    def is_changed(run: dict, since, te_updated=None) -> bool:
+        """
+        Check if test run may have changed after since.
+
+        Args:
+            run (dict): Test run from Xray
+            since: High water mark minus skew, None for full sync
+            te_updated: JIRA updated time of the test execution issue
+
+        Returns:
+            True if run was started or finished after since, or it has defects and its test
+            execution was updated after since (defects linked to a finished run)
+        """
+        if since is None:
+            return True
+        if run.get("defects") and (te_updated is None or te_updated >= since):
+            return True
+        stamps = [parse_time(run[key]) for key in ("startedOn", "finishedOn") if run.get(key)]
+        if not stamps:
+            return True
+        return max(stamps) >= since
+
+    def changed_test_executions(self, tp_key: str, since) -> dict:
+        """Return {TE key: updated time or None} of TEs updated after since."""
+        te_keys = [each["key"] for each in self.jira.test_executions(tp_key)]
+        if since is None:
+            return dict.fromkeys(te_keys)
+        updated = self.jira.updated(te_keys) if te_keys else {}
+        changed = {}
+        for te_key in te_keys:
+            if te_key not in updated:
+                logger.warning("-Test Execution %s: no updated time in JIRA, checking its runs",
+                               te_key)
+                changed[te_key] = None
+            elif parse_time(updated[te_key]) >= since:
+                changed[te_key] = parse_time(updated[te_key])
+        logger.info("%s of %s Test Executions updated since %s", len(changed), len(te_keys),
+                    since.isoformat())
+        return changed
+
+    def changed_runs(self, tp_key: str, since) -> dict:
+        """Return {TE key: [changed test runs]} for test plan."""
+        changed = {}
+        for te_key, te_updated in self.changed_test_executions(tp_key, since).items():
+            runs = [run for run in self.jira.test_runs(te_key)
+                    if run["status"] != "TODO" and self.is_changed(run, since, te_updated)]
+            logger.info("-Test Execution %s: %s changed test runs", te_key, len(runs))
+            if runs:
+                changed[te_key] = runs
+        return changed
+
+    def latest_entries(self, build_no: str, te_keys: list) -> dict:
+        """Return {(TE key, test key): latest DB entry} searching TEs in batches."""
+        latest = {}
+        for i in range(0, len(te_keys), self.te_batch_size):
+            for entry in self.db_sink.latest_entries(build_no, te_keys[i:i + self.te_batch_size]):
+                latest[(entry["testExecutionID"], entry["testID"])] = entry
+        return latest
+
+    # pylint: disable=too-many-locals
+    def plan(self, tp_key: str, full: bool = False) -> SyncPlan:
+        """
+        Diff JIRA test runs changed since the high water mark against DB.
+
+        Args:
+            tp_key (str): Test plan key
+            full (bool): Ignore high water mark and diff all test runs
+
+        Returns:
+            SyncPlan with bulk creates, updates and diff report rows
+        """
+        started = datetime.now(timezone.utc)
+        mark = None if full else self.state.get(tp_key)
+        since = mark - self.skew if mark else None
+        plan = SyncPlan(tp_key, since, started)
+        test_plan = self.jira.test_plan(tp_key)
+        tp_details = test_plan["details"]
+        changed = self.changed_runs(tp_key, since)
+        if not changed:
+            return plan
+        latest = self.latest_entries(tp_details["buildNo"], list(changed))
+
+        actions = []
+        for te_key, runs in changed.items():
+            for run in runs:
+                entry = latest.get((te_key, run["key"]))
+                defects = [defect["key"] for defect in run.get("defects", [])]
+                failed = "fail" in run["status"].lower()
+                if failed and not defects:
+                    plan.warnings.append(f"Failure is not mapped to any BUG in JIRA TEST - "
+                                         f"{run['key']}, Test Execution - {te_key}, "
+                                         f"Test Plan = {tp_key}")
+                if entry is None:
+                    action = CREATE
+                elif entry["testResult"].lower() != run["status"].lower():
+                    action = REPLACE
+                elif failed and defects and sorted(entry.get("issueIDs", [])) != sorted(defects):
+                    action = DEFECTS
+                else:
+                    action = UNCHANGED
+                actions.append((action, te_key, run, entry, defects if failed else []))
+
+        needed = [run["key"] for action, _, run, _, _ in actions if action in (CREATE, REPLACE)]
+        issues = self.jira.issues(list(changed) + needed) if needed else {}
+        for action, te_key, run, entry, defects in actions:
+            db_value = entry["testResult"] if entry else None
+            if action == DEFECTS:
+                plan.update.append({
+                    "filter": {"buildNo": tp_details["buildNo"], "testExecutionID": te_key,
+                               "testID": run["key"], "latest": True},
+                    "update": {"$set": {"issueIDs": defects}}})
+                db_value = entry.get("issueIDs", [])
+            elif action in (CREATE, REPLACE):
+                missing = [key for key in (te_key, run["key"]) if key not in issues]
+                if missing:
+                    plan.warnings.append(f"Skipping TEST - {run['key']}, Test Execution - "
+                                         f"{te_key}: JIRA issues {missing} not found")
+                    continue
+                payload = self.build_entry(tp_key, test_plan, issues[te_key], run,
+                                           issues[run["key"]], entry)
+                if defects:
+                    payload["issueIDs"] = defects
+                plan.create.append(payload)
+            plan.add_row(action, te_key, run["key"], db_value,
+                         defects if action == DEFECTS else run["status"])
+        return plan
+
+    @staticmethod
+    def build_entry(tp_key: str, test_plan: dict, te_issue: dict, run: dict, test_issue: dict,
+                    previous: dict = None) -> dict:
+        """
+        Build DB entry for test run, fields not known to JIRA are taken from previous entry.
+
+        Args:
+            tp_key (str): Test plan key
+            test_plan (dict): Test plan details and label
+            te_issue (dict): Test execution issue fields
+            run (dict): Test run from Xray
+            test_issue (dict): Test issue fields
+            previous (dict): Latest DB entry replaced by this entry
+        """
+        tp_details = test_plan["details"]
+        payload = {
+            # Framework/Unknown data
+            "clientHostname": "",
+            "noOfNodes": 0,
+            "OSVersion": "",
+            "nodesHostname": [""],
+            "testTags": [""],
+            "testType": "",
+            "testExecutionTime": 0,
+            "healthCheckResult": "",
+            # Data from JIRA
+            "testStartTime": run["startedOn"],
+            "logPath": run.get("comment", "None"),
+            "testResult": run["status"],
+            "platformType": tp_details["platformType"],
+            "serverType": tp_details["serverType"],
+            "enclosureType": tp_details["enclosureType"],
+            "testName": test_issue["summary"],
+            "testID": run["key"],
+            "testIDLabels": test_issue["labels"],
+            "testPlanID": tp_key,
+            "testExecutionID": te_issue["key"],
+            "testPlanLabel": test_plan["label"],
+            "testExecutionLabel": te_issue["labels"][0] if te_issue["labels"] else "None",
+            "testTeam": te_issue["components"][0] if te_issue["components"] else "CortxQA",
+            "buildType": tp_details["branch"],
+            "buildNo": tp_details["buildNo"],
+            "executionType": test_issue["executionType"],
+            "feature": test_issue["feature"],
+            "latest": True,
+            "drID": test_issue["drID"],
+            "featureID": test_issue["featureID"],
+        }
+        if previous:
+            # Data from previous database entry
+            for key in ["testTags", "testType", "testName", "testIDLabels", "testPlanLabel",
+                        "testExecutionLabel", "testTeam", "buildType", "executionType",
+                        "feature"]:
+                if key in previous:
+                    payload[key] = previous[key]
+        return payload
+
+    def apply(self, plan: SyncPlan) -> None:
+        """Apply creates and updates of plan in bulk requests of batch_size operations."""
+        operations = [(CREATE, each) for each in plan.create] + \
+                     [(DEFECTS, each) for each in plan.update]
+        for i in range(0, len(operations), self.batch_size):
+            batch = operations[i:i + self.batch_size]
+            self.db_sink.apply([each for kind, each in batch if kind == CREATE],
+                               [each for kind, each in batch if kind == DEFECTS])
+        logger.info("Applied %s creates and %s updates for Test Plan %s", len(plan.create),
+                    len(plan.update), plan.tp_key)
+
+    def sync(self, tp_key: str, dry_run: bool = False, full: bool = False) -> SyncPlan:
+        """
+        Sync test plan and move its high water mark.
+
+        Args:
+            tp_key (str): Test plan key
+            dry_run (bool): Only report the diff, DB and high water mark are not changed
+            full (bool): Ignore high water mark and diff all test runs
+
+        Returns:
+            SyncPlan
+        """
+        logger.info("JIRA DB Sync for Test Plan ID = %s", tp_key)
+        plan = self.plan(tp_key, full=full)
+        for warning in plan.warnings:
+            logger.warning(warning)
+        if dry_run:
+            logger.info("Dry run diff report\n%s", plan.report())
+            return plan
+        self.apply(plan)
+        self.state.set(tp_key, plan.started)
+        logger.info("Sync summary for Test Plan %s: %s", tp_key, plan.summary())
+        return plan
+
+
+class RecordedJira:
+    """JIRA source replaying recorded fixture data."""
+
+    def __init__(self, fixture: dict):
+        """
+        Args:
+            fixture (dict): "jira" section of a recorded fixture with test_plan,
+                test_executions, test_runs and issues keys
+        """
+        self.fixture = fixture
+        self.calls = []
+
+    def test_plan(self, tp_key: str) -> dict:
+        """Test plan details and label."""
+        self.calls.append(("test_plan", tp_key))
+        return self.fixture["test_plan"][tp_key]
+
+    def test_executions(self, tp_key: str) -> list:
+        """Test executions of test plan."""
+        self.calls.append(("test_executions", tp_key))
+        return self.fixture["test_executions"][tp_key]
+
+    def updated(self, keys: list) -> dict:
+        """JIRA updated time of issues."""
+        self.calls.append(("updated", tuple(keys)))
+        return {key: self.fixture["updated"][key] for key in keys
+                if key in self.fixture.get("updated", {})}
+
+    def test_runs(self, te_key: str) -> list:
+        """Test runs of test execution."""
+        self.calls.append(("test_runs", te_key))
+        return self.fixture["test_runs"].get(te_key, [])
+
+    def issues(self, keys: list) -> dict:
+        """Issue fields of keys, unknown keys are left out like in a JQL search."""
+        self.calls.append(("issues", tuple(keys)))
+        return {key: dict(self.fixture["issues"][key], key=key) for key in keys
+                if key in self.fixture["issues"]}
+
+
+class RecordedDb:
+    """In memory DB sink initialized from recorded fixture entries."""
+
+    def __init__(self, entries: list):
+        """
+        Args:
+            entries (list): Recorded DB entries
+        """
+        self.entries = [dict(each) for each in entries]
+        self.requests = []
+
+    def latest_entries(self, build_no: str, te_keys: list) -> list:
+        """Latest entries of test executions."""
+        self.requests.append(("search", tuple(te_keys)))
+        return [each for each in self.entries if each["buildNo"] == build_no and
+                each["testExecutionID"] in te_keys and each["latest"]]
+
+    def apply(self, create: list, update: list) -> None:
+        """Apply bulk request like /reportsdb/bulk."""
+        self.requests.append(("bulk", len(create), len(update)))
+        for data in create:
+            for each in self.entries:
+                if all(each[key] == data[key] for key in
+                       ["testPlanID", "testExecutionID", "testID", "latest"]):
+                    each["latest"] = False
+            self.entries.append(dict(data))
+        for data in update:
+            for each in self.entries:
+                if all(each.get(key) == value for key, value in data["filter"].items()):
+                    each.update(data["update"]["$set"])
+
+
+class Recorder:
+    """Wrap JIRA source and DB sink to record a fixture replayable by RecordedJira/RecordedDb."""
+
+    def __init__(self, jira, db_sink):
+        self.jira = jira
+        self.db_sink = db_sink
+        self.fixture = {"jira": {"test_plan": {}, "test_executions": {}, "updated": {},
+                                 "test_runs": {}, "issues": {}},
+                        "db": {"entries": []}}
+
+    def test_plan(self, tp_key: str) -> dict:
+        """Record test plan."""
+        result = self.jira.test_plan(tp_key)
+        self.fixture["jira"]["test_plan"][tp_key] = result
+        return result
+
+    def test_executions(self, tp_key: str) -> list:
+        """Record test executions."""
+        result = self.jira.test_executions(tp_key)
+        self.fixture["jira"]["test_executions"][tp_key] = result
+        return result
+
+    def updated(self, keys: list) -> dict:
+        """Record updated times."""
+        result = self.jira.updated(keys)
+        self.fixture["jira"]["updated"].update(result)
+        return result
+
+    def test_runs(self, te_key: str) -> list:
+        """Record test runs."""
+        result = self.jira.test_runs(te_key)
+        self.fixture["jira"]["test_runs"][te_key] = result
+        return result
+
+    def issues(self, keys: list) -> dict:
+        """Record issues."""
+        result = self.jira.issues(keys)
+        self.fixture["jira"]["issues"].update(result)
+        return result
+
+    def latest_entries(self, build_no: str, te_keys: list) -> list:
+        """Record DB entries."""
+        result = self.db_sink.latest_entries(build_no, te_keys)
+        self.fixture["db"]["entries"].extend(result)
+        return result
+
+    def apply(self, create: list, update: list) -> None:
+        """Pass bulk request to DB sink."""
+        self.db_sink.apply(create, update)
+
+    def save(self, path: str) -> None:
+        """Write recorded fixture to JSON file."""
+        with open(path, "w", encoding="utf-8") as fptr:
+            json.dump(self.fixture, fptr, indent=2, default=str)
@@ -18,19 +18,8 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 
-# Basic algorithm
-# for each TE:
-#     for each Test in TE:
-#         if test status is TODO
-#             Continue
-#         result = Search DB by ('buildNo', 'testExecutionID', 'testID', 'valid': True)
-#         if no entries in DB :
-#             Create one entry in DB
-#         else :
-#             Patch all present entries to add valid key as false
-#             Insert new entry with latest data from JIRA
-#         if test status if FAIL:
-#             Get bug from JIRA an update in DB
+# Test runs changed since the high water mark of each test plan are synced in bulk,
+# see db_sync module for the algorithm.
 
 import argparse
 import configparser
@@ -42,6 +31,7 @@ from http import HTTPStatus
 
 import requests
 
+from db_sync import DbSyncEngine, RecordedDb, RecordedJira, Recorder, SyncState, issue_fields
 from report import jira_api
 
 headers = {
@@ -76,36 +66,42 @@ except KeyError:
     sys.exit(1)
 
 
-def patch_db_request(payload: dict) -> None:
+def search_db_request(payload: dict):
     """
-    Description: Make a patch request to database using REST API
+    Description: Make a search request to database using REST API
 
     Args:
         payload (dict): Payload data
+
+    Returns:
+        Search result
     """
-    request = "PATCH"
-    endpoint = "update"
+    request = "GET"
+    endpoint = "search"
 
     payload["db_username"] = DB_USERNAME
     payload["db_password"] = DB_PASSWORD
 
     response = requests.request(request, HOSTNAME + endpoint, headers=headers,
                                 data=json.dumps(payload))
-    if response.status_code != HTTPStatus.OK:
-        logger.error('%s on %s failed\nHEADERS=%s\nBODY=%s\nRESPONSE=%s', request, HOSTNAME +
-                     endpoint, response.request.headers, response.request.body, response.text)
-        sys.exit(1)
+    if response.status_code == HTTPStatus.OK:
+        return response.json()["result"]
+    if response.status_code == HTTPStatus.NOT_FOUND and "No results" in response.text:
+        return None
+    logger.error('%s on %s failed\nHEADERS=%s\nBODY=%s\nRESPONSE=%s', request, HOSTNAME +
+                 endpoint, response.request.headers, response.request.body, response.text)
+    sys.exit(1)
 
 
-def create_db_request(payload: dict) -> None:
+def bulk_db_request(payload: dict) -> None:
     """
-    Description: Make a create request to database using REST API
+    Description: Make a bulk create and update request to database using REST API
 
     Args:
-        payload (dict): Payload data
+        payload (dict): Payload data with create and update lists
     """
     request = "POST"
-    endpoint = "create"
+    endpoint = "bulk"
 
     payload["db_username"] = DB_USERNAME
     payload["db_password"] = DB_PASSWORD
@@ -116,33 +112,63 @@ def create_db_request(payload: dict) -> None:
         logger.error('%s on %s failed\nHEADERS=%s\nBODY=%s\nRESPONSE=%s', request, HOSTNAME +
                      endpoint, response.request.headers, response.request.body, response.text)
         sys.exit(1)
+    logger.debug(response.text)
 
 
-def search_db_request(payload: dict):
-    """
-    Description: Make a search request to database using REST API
+class JiraRest:
+    """JIRA source for DbSyncEngine using JIRA and Xray REST APIs."""
 
-    Args:
-        payload (dict): Payload data
+    def __init__(self):
+        self.username, self.password = jira_api.get_username_password()
 
-    Returns:
-        Search result
-    """
-    request = "GET"
-    endpoint = "search"
+    def test_plan(self, tp_key: str) -> dict:
+        """Test plan details and label."""
+        tp_details = jira_api.get_details_from_test_plan(tp_key, self.username, self.password)
+        test_plan_issue = jira_api.get_issue_details(tp_key, self.username, self.password)
+        label = test_plan_issue.fields.labels[0] if test_plan_issue.fields.labels else "None"
+        return {"details": tp_details, "label": label}
 
-    payload["db_username"] = DB_USERNAME
-    payload["db_password"] = DB_PASSWORD
+    def test_executions(self, tp_key: str) -> list:
+        """Test executions of test plan."""
+        return jira_api.get_test_executions_from_test_plan(tp_key, self.username,
+                                                           self.password)
 
-    response = requests.request(request, HOSTNAME + endpoint, headers=headers,
-                                data=json.dumps(payload))
-    if response.status_code == HTTPStatus.OK:
-        return response.json()["result"]
-    if response.status_code == HTTPStatus.NOT_FOUND and "No results" in response.text:
-        return None
-    logger.error('%s on %s failed\nHEADERS=%s\nBODY=%s\nRESPONSE=%s', request, HOSTNAME +
-                 endpoint, response.request.headers, response.request.body, response.text)
-    sys.exit(1)
+    def updated(self, keys: list) -> dict:
+        """JIRA updated time of issues fetched with bulk JQL searches."""
+        issues = jira_api.get_issues_details(keys, self.username, self.password, fields="updated")
+        return {key: issue.fields.updated for key, issue in issues.items()}
+
+    def test_runs(self, te_key: str) -> list:
+        """Test runs of test execution."""
+        return jira_api.get_test_from_test_execution(te_key, self.username, self.password)
+
+    def issues(self, keys: list) -> dict:
+        """Fields of issues fetched with bulk JQL searches."""
+        fields = "summary,labels,components,customfield_20981,customfield_21087," \
+                 "customfield_22881,customfield_22882"
+        issues = jira_api.get_issues_details(keys, self.username, self.password, fields=fields)
+        return {key: issue_fields(issue) for key, issue in issues.items()}
+
+
+class DbRest:
+    """DB sink for DbSyncEngine using reports DB REST server."""
+
+    @staticmethod
+    def latest_entries(build_no: str, te_keys: list) -> list:
+        """Latest entries of test executions with one search request."""
+        query_payload = {
+            "query": {
+                "buildNo": build_no,
+                "testExecutionID": {"$in": te_keys},
+                "latest": True
+            },
+        }
+        return search_db_request(query_payload) or []
+
+    @staticmethod
+    def apply(create: list, update: list) -> None:
+        """Create and update entries with one bulk request."""
+        bulk_db_request({"create": create, "update": update})
 
 
 def get_latest_test_plans_from_db() -> list:
@@ -169,9 +195,19 @@ def parse_argument():
     """Parse arguments"""
     parser = argparse.ArgumentParser(
         description="For syncing a given test plan, pass `only <testplan>` options "
-                    "\nFor syncing latest 5 test plans, no options are needed",
+                    "\nFor syncing latest 5 test plans, no options are needed"
+                    "\nOnly test runs changed since last sync of a test plan are synced, "
+                    "pass --full to sync all test runs",
         formatter_class=RawDescriptionHelpFormatter
     )
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print diff report without updating DB')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore high water mark and diff all test runs')
+    parser.add_argument('--state-file', default='db_update_state.json',
+                        help='File to keep high water mark of each test plan')
+    parser.add_argument('--record', help='Record JIRA and DB responses to fixture file')
+    parser.add_argument('--replay', help='Use recorded fixture file instead of JIRA and DB')
     subparsers = parser.add_subparsers(dest='subcommand')
 
     # sub-parser for only
@@ -181,184 +217,36 @@ def parse_argument():
     args = parser.parse_args()
     if args.subcommand:
         logger.info("Will sync %s test plan from JIRA to DB", args.tp)
-        return [args.tp]
-    logger.info("No options passed. Will sync last 5 test plans.")
-    return None
+        args.tp_keys = [args.tp]
+    else:
+        logger.info("No options passed. Will sync last 5 test plans.")
+        args.tp_keys = None
+    return args
 
 
-# pylint: disable-msg=too-many-locals
-# pylint: disable-msg=too-many-nested-blocks
-# pylint: disable-msg=too-many-statements
-# pylint: disable-msg=too-many-branches
 def main():
     """Update test executions from JIRA to MongoDB."""
     args = parse_argument()
-    if args:
-        tp_keys = args
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as fptr:
+            fixture = json.load(fptr)
+        jira = RecordedJira(fixture["jira"])
+        db_sink = RecordedDb(fixture["db"]["entries"])
+        tp_keys = args.tp_keys or list(fixture["jira"]["test_plan"])
     else:
-        tp_keys = get_latest_test_plans_from_db()
-
+        jira = JiraRest()
+        db_sink = DbRest()
+        tp_keys = args.tp_keys or get_latest_test_plans_from_db()
+    recorder = None
+    if args.record:
+        recorder = Recorder(jira, db_sink)
+        jira = db_sink = recorder
+
+    engine = DbSyncEngine(jira, db_sink, SyncState(None if args.replay else args.state_file))
     for tp_key in tp_keys:
-        logger.info("JIRA DB Sync for Test Plan ID = %s", tp_key)
-        username, password = jira_api.get_username_password()
-        tp_details = jira_api.get_details_from_test_plan(tp_key, username, password)
-        test_executions = jira_api.get_test_executions_from_test_plan(tp_key,
-                                                                      username, password)
-        test_plan_issue = jira_api.get_issue_details(tp_key, username, password)
-        test_plan_label = test_plan_issue.fields.labels[0] if \
-            test_plan_issue.fields.labels else "None"
-
-        # for each TE:
-        for test_execution in test_executions:
-            logger.info("-Test Execution %s", test_execution["key"])
-            test_execution_issue = jira_api.get_issue_details(test_execution["key"],
-                                                              username, password)
-            test_execution_label = test_execution_issue.fields.labels[0] if \
-                test_execution_issue.fields.labels else "None"
-            test_team = test_execution_issue.fields.components[0].name if \
-                test_execution_issue.fields.components else "CortxQA"
-
-            tests = jira_api.get_test_from_test_execution(test_execution["key"],
-                                                          username, password)
-            # for each Test in TE:
-            for test in tests:
-                logger.info("-Test Key %s", test["key"])
-                if test["status"] == "TODO":
-                    continue
-                query_payload = {
-                    "query": {
-                        "buildNo": tp_details["buildNo"],
-                        "testExecutionID": test_execution["key"],
-                        "testID": test["key"],
-                        "latest": True
-                    },
-                }
-
-                test_issue = jira_api.get_issue_details(test["key"], username, password)
-                feature = test_issue.fields.customfield_21087.value if \
-                    test_issue.fields.customfield_21087 else "None"
-                feature_id = test_issue.fields.customfield_22881 if \
-                    test_issue.fields.customfield_22881 else ["None"]
-                dr_id = test_issue.fields.customfield_22882 if \
-                    test_issue.fields.customfield_22882 else ["None"]
-                log_path = test["comment"] if "comment" in test else "None"
-
-                results = search_db_request(query_payload)
-
-                if not results:
-                    logger.debug("DB entry does not exist for build %s TE %s Test %s",
-                                 tp_details["buildNo"], test_execution["key"], test["key"])
-                    # add one entry
-                    payload = {
-                        # Framework/Unknown data
-                        "clientHostname": "",
-                        "noOfNodes": 0,
-                        "OSVersion": "",
-                        "nodesHostname": [""],
-                        "testTags": [""],
-                        "testType": "",
-                        "testExecutionTime": 0,
-                        "healthCheckResult": "",
-                        # Data from JIRA
-                        "testStartTime": test["startedOn"],
-                        "logPath": log_path,
-                        "testResult": test["status"],
-                        "platformType": tp_details["platformType"],
-                        "serverType": tp_details["serverType"],
-                        "enclosureType": tp_details["enclosureType"],
-                        "testName": test_issue.fields.summary,
-                        "testID": test["key"],
-                        "testIDLabels": test_issue.fields.labels,
-                        "testPlanID": tp_key,
-                        "testExecutionID": test_execution["key"],
-                        "testPlanLabel": test_plan_label,
-                        "testExecutionLabel": test_execution_label,
-                        "testTeam": test_team,
-                        "buildType": tp_details["branch"],
-                        "buildNo": tp_details["buildNo"],
-                        "executionType": test_issue.fields.customfield_20981.value,
-                        "feature": feature,
-                        "latest": True,
-                        "drID": dr_id,
-                        "featureID": feature_id
-                    }
-                    create_db_request(payload)
-                    logger.debug("Created an entry in DB.")
-                else:
-                    # if test status in db != in JIRA or no entry in db
-                    if results[0]["testResult"].lower() != test["status"].lower():
-                        logger.debug("Test Result from DB & JIRA are not matching for Test %s",
-                                     test["key"])
-                        feature_id = test_issue.fields.customfield_22881 if \
-                            test_issue.fields.customfield_22881 else ["None"]
-                        dr_id = test_issue.fields.customfield_22882 if \
-                            test_issue.fields.customfield_22882 else ["None"]
-                        # Add valid key in entry false
-                        patch_payload = {
-                            "filter": query_payload["query"],
-                            "update": {
-                                "$set": {"latest": False}
-                            }
-                        }
-                        patch_db_request(patch_payload)
-                        logger.debug("Patched old entries with latest false.")
-                        # Insert new entry with latest data from JIRA
-                        payload = {
-                            # Unknown data
-                            "clientHostname": "",
-                            "noOfNodes": 0,
-                            "OSVersion": "",
-                            "nodesHostname": [""],
-                            "testExecutionTime": 0,
-                            "healthCheckResult": "",
-                            # Data from JIRA
-                            "testStartTime": test["startedOn"],
-                            "logPath": log_path,
-                            "testResult": test["status"],
-                            "platformType": tp_details["platformType"],
-                            "serverType": tp_details["serverType"],
-                            "enclosureType": tp_details["enclosureType"],
-                            "drID": dr_id,
-                            "featureID": feature_id,
-                            # Data from previous database entry
-                            "testTags": results[0]["testTags"],
-                            "testType": results[0]["testType"],
-                            "testName": results[0]["testName"],
-                            "testID": results[0]["testID"],
-                            "testIDLabels": results[0]["testIDLabels"],
-                            "testPlanID": results[0]["testPlanID"],
-                            "testExecutionID": results[0]["testExecutionID"],
-                            "testPlanLabel": results[0]["testPlanLabel"],
-                            "testExecutionLabel": results[0]["testExecutionLabel"],
-                            "testTeam": results[0]["testTeam"],
-                            "buildType": results[0]["buildType"],
-                            "buildNo": tp_details["buildNo"],
-                            "executionType": results[0]["executionType"],
-                            "feature": results[0]["feature"],
-                            "latest": True,
-                        }
-                        create_db_request(payload)
-                        logger.debug("Created new entry with results from JIRA.")
-
-                if "fail" in test["status"].lower():
-                    logger.debug("TEST status is FAIL in JIRA.")
-                    # Get BUG ID from JIRA
-                    if len(test["defects"]) == 0:
-                        logger.warning("Failure is not mapped to any BUG in JIRA TEST - %s, Test "
-                                       "Execution - %s, Test Plan = %s",
-                                       test["key"], test_execution["key"], tp_key)
-                    else:
-                        defects = [defect["key"] for defect in test["defects"]]
-                        if defects:
-                            # PATCH issue in db entry
-                            patch_payload = {
-                                "filter": query_payload["query"],
-                                "update": {
-                                    "$set": {"issueIDs": defects}
-                                }
-                            }
-                            patch_db_request(patch_payload)
-                            logger.debug("Added defects linked in JIRA into DB.")
+        engine.sync(tp_key, dry_run=args.dry_run, full=args.full)
+    if recorder:
+        recorder.save(args.record)
 
 
 if __name__ == '__main__':
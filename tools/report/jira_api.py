@@ -194,6 +194,34 @@ def get_issue_details(issue_id: str, username: str, password: str):
     return auth_jira.issue(issue_id)
 
 
+def get_issues_details(issue_ids: list, username: str, password: str, fields: str = None,
+                       chunk_size: int = 100) -> dict:
+    """
+    Get details of many issues with one JQL search per chunk instead of one request per issue.
+
+    Args:
+        issue_ids (list): Bug IDs or TEST IDs
+        username (str): JIRA Username
+        password (str): JIRA Password
+        fields (str): Comma separated fields to be fetched, all fields by default
+        chunk_size (int): Number of keys per JQL search
+
+    Returns:
+        Dictionary of issue key and issue object as returned by get_issue_details
+    """
+    jira_url = "https://jts.seagate.com/"
+    options = {'server': jira_url}
+    auth_jira = JIRA(options, basic_auth=(username, password))
+    issue_ids = list(dict.fromkeys(issue_ids))
+    issues = {}
+    for i in range(0, len(issue_ids), chunk_size):
+        chunk = issue_ids[i:i + chunk_size]
+        jql = f"key in ({','.join(chunk)})"
+        for issue in auth_jira.search_issues(jql, maxResults=len(chunk), fields=fields):
+            issues[issue.key] = issue
+    return issues
+
+
 def get_defects_from_test_plan(test_plan: str, username: str, password: str) -> set:
     """Get defect list from given test plan."""
     defects = set()
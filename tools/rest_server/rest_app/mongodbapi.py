@@ -19,7 +19,7 @@
 
 from http import HTTPStatus
 
-from pymongo import MongoClient
+from pymongo import InsertOne, MongoClient, UpdateMany
 from pymongo.errors import PyMongoError
 from pymongo.errors import ServerSelectionTimeoutError, OperationFailure
 
@@ -129,6 +129,45 @@ def add_document(data: dict,
         return True, result
 
 
+@pymongo_exception
+def bulk_write(create: list,
+               update: list,
+               uri: str,
+               db_name: str,
+               collection: str
+               ) -> (bool, str):
+    """
+    Add and update documents in MongoDB database in one ordered bulk request
+
+    Every created document replaces the latest entry of the same test plan, test execution and
+    test, so older entries are marked with latest False before the document is inserted.
+
+    Args:
+        create: Documents to be created
+        update: List of {"filter": query, "update": data} dictionaries
+        uri: URI of MongoDB database
+        db_name: Database name
+        collection: Collection name in database
+
+    Returns:
+        On failure returns http status code and message
+        On success returns bulk write result
+    """
+    requests = []
+    for data in create:
+        filter_fields = {each: data[each] for each in ["testPlanID", "testExecutionID", "testID"]}
+        filter_fields["latest"] = True
+        requests.append(UpdateMany(filter_fields, {"$set": {"latest": False}}))
+        requests.append(InsertOne(data))
+    for data in update:
+        requests.append(UpdateMany(data["filter"], data["update"]))
+    with MongoClient(uri) as client:
+        pymongo_db = client[db_name]
+        tests = pymongo_db[collection]
+        result = tests.bulk_write(requests, ordered=True)
+        return True, result
+
+
 @pymongo_exception
 def update_documents(query: dict,
                      data: dict,
@@ -206,6 +206,50 @@ class Update(Resource):
         return flask.Response(status=update_result[1][0], response=update_result[1][1])
 
 
+@api.route("/bulk", doc={"description": "Add and update test execution entries in MongoDB "
+                                        "in one request"})
+@api.response(200, "Success")
+@api.response(400, "Bad Request: Missing parameters. Do not retry.")
+@api.response(401, "Unauthorized: Wrong db_username/db_password.")
+@api.response(403, "Forbidden: User does not have permission for operation.")
+@api.response(503, "Service Unavailable: Unable to connect to mongoDB.")
+class Bulk(Resource):
+    """Bulk endpoint"""
+
+    @staticmethod
+    def post():
+        """Create and update test execution entries."""
+        json_data = flask.request.get_json()
+        if not json_data:
+            return flask.Response(status=HTTPStatus.BAD_REQUEST,
+                                  response="Body is empty")
+        if not validations.check_user_pass(json_data):
+            return flask.Response(status=HTTPStatus.BAD_REQUEST,
+                                  response="db_username/db_password missing in request body")
+
+        validate_result = validations.validate_bulk_request(json_data)
+        if not validate_result[0]:
+            return flask.Response(status=validate_result[1][0],
+                                  response=validate_result[1][1])
+        create = json_data.get("create", [])
+        for entry, start_time in zip(create, validate_result[1]):
+            entry["testStartTime"] = start_time
+
+        # Build MongoDB URI using username and password
+        uri = read_config.MONGODB_URI.format(quote_plus(json_data["db_username"]),
+                                             quote_plus(json_data["db_password"]),
+                                             read_config.db_hostname)
+
+        bulk_result = mongodbapi.bulk_write(create, json_data.get("update", []), uri,
+                                            read_config.db_name, read_config.results_collection)
+        if bulk_result[0]:
+            return flask.Response(status=HTTPStatus.OK,
+                                  response=f"Entries created {bulk_result[1].inserted_count}. "
+                                           f"Matched count {bulk_result[1].matched_count} "
+                                           f"Updated count {bulk_result[1].modified_count}")
+        return flask.Response(status=bulk_result[1][0], response=bulk_result[1][1])
+
+
 @api.route("/distinct", doc={"description": "Get distinct values for given key"})
 @api.response(200, "Success")
 @api.response(400, "Bad Request: Missing parameters. Do not retry.")
@@ -278,6 +278,44 @@ def validate_update_request(json_data: dict) -> (bool, tuple):
     return True, None
 
 
+def validate_bulk_request(json_data: dict) -> (bool, tuple):
+    """
+    Validate format of fields in bulk request
+
+    Args:
+        json_data: Data from request
+
+    Returns:
+        On failure returns http status code and message
+        On success returns list of testStartTime for created entries
+    """
+    for key in ["create", "update"]:
+        if not isinstance(json_data.get(key, []), list):
+            return False, (HTTPStatus.BAD_REQUEST, f"{key} should be list")
+    start_times = []
+    for entry in json_data.get("create", []):
+        if not isinstance(entry, dict):
+            return False, (HTTPStatus.BAD_REQUEST, "create entries should be dictionary")
+        response = check_db_keys(entry)
+        if not response[0]:
+            return False, (HTTPStatus.BAD_REQUEST,
+                           f"Unknown fields given or mandatory fields missing {response[1]}")
+        validate_result = validate_mandatory_db_fields(entry)
+        if not validate_result[0]:
+            return validate_result
+        valid_result = validate_extra_db_fields(entry)
+        if not valid_result[0]:
+            return valid_result
+        start_times.append(validate_result[1])
+    for entry in json_data.get("update", []):
+        if not isinstance(entry, dict):
+            return False, (HTTPStatus.BAD_REQUEST, "update entries should be dictionary")
+        validate_result = validate_update_request(entry)
+        if not validate_result[0]:
+            return validate_result
+    return True, start_times
+
+
 def check_add_cmi_request_fields(json_data: dict):
     """
     Check if all fields present in request
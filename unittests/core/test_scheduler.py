@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test duration aware ticket scheduler of distributed runner."""
+
+from commons.utils import assert_utils
+from core import scheduler
+
+
+class TestScheduler:
+    """Test ticket planning, makespan simulation and work stealing dispatch."""
+
+    @classmethod
+    def setup_class(cls):
+        """Synthetic history, one slow test and one flaky test."""
+        rows = [{"_id": f"TEST-{idx}", "durations": [100, 120, 110], "results":
+                 ["PASS", "PASS", "PASS"]} for idx in range(12)]
+        rows.append({"_id": "TEST-SLOW", "durations": [900, 1000],
+                     "results": ["PASS", "PASS"]})
+        rows.append({"_id": "TEST-FLAKY", "durations": [50], "results": ["FAIL"]})
+        cls.history = scheduler.history_from_rows(rows)
+        cls.tag_map = {"s3_ops": [{f"TEST-{idx}" for idx in range(12)} | {"TEST-SLOW"},
+                                  {"TEST-FLAKY"}]}
+
+    def test_plan_balances_tickets(self):
+        """Parallel group is split, failing test goes first and makespan beats one ticket."""
+        assert_utils.assert_equal(self.history["TEST-SLOW"]["duration"], 950)
+        plan = scheduler.plan_tickets(self.tag_map, self.history, runners=3)
+        assert_utils.assert_equal(plan[0]["tests"], ["TEST-FLAKY"])
+        assert_utils.assert_equal(plan[1]["tests"], ["TEST-SLOW"])
+        tests = sorted(test for ticket in plan for test in ticket["tests"])
+        assert_utils.assert_equal(len(tests), 14)
+        simulation = scheduler.simulate(plan, 3)
+        assert_utils.assert_equal(simulation["work"], 950 + 12 * 110 + 50)
+        assert_utils.assert_equal(simulation["makespan"], 950)
+        assert_utils.assert_in("Predicted makespan: 950s",
+                               scheduler.makespan_report(plan, simulation, 1000))
+
+    def test_work_stealing_dispatch(self):
+        """A partition only gets a new ticket once its runner consumed the previous one."""
+        plan = scheduler.plan_tickets(self.tag_map, self.history, runners=2)
+        consumed = {0: 0, 1: 0}
+        sent = []
+
+        def submit(ticket, partition):
+            sent.append(partition)
+            # runner 0 is stuck on its first ticket, runner 1 takes everything else
+            if partition == 1:
+                consumed[1] += 1
+
+        dispatched = scheduler.WorkStealingDispatcher(
+            plan, 2, submit, lambda: dict(consumed), interval=0).run()
+        assert_utils.assert_equal(len(dispatched), len(plan))
+        assert_utils.assert_equal(sent.count(0), 1)
+        assert_utils.assert_equal(sent.count(1), len(plan) - 1)
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test JMeter JTL analysis."""
+
+import os
+
+from commons.exceptions import CTException
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from libs.jmeter import jtl_analyzer
+from libs.jmeter.jmeter_integration import JmeterInt
+
+HEADER = ("timeStamp,elapsed,label,responseCode,responseMessage,threadName,dataType,success,"
+          "failureMessage,bytes,sentBytes,grpThreads,allThreads,URL,Latency,IdleTime,Connect")
+
+
+def write_jtl(path, login_ms, users_errors=0):
+    """JTL of 20 s run: 100 logins (1..100 x login_ms) and 40 user listings."""
+    rows = [HEADER]
+    start = 1650000000000
+    for idx in range(100):
+        rows.append(f"{start + idx * 200},{(idx + 1) * login_ms},Login,200,OK,t 1-1,text,true,"
+                    f",512,128,25,25,https://csm/api/v2/login,{idx},0,1")
+    for idx in range(40):
+        failed = idx < users_errors
+        code, success = ("503", "false") if failed else ("200", "true")
+        rows.append(f"{start + idx * 500},20,List users,{code},x,t 1-2,text,{success},"
+                    f"{'Service Unavailable' if failed else ''},64,64,25,25,"
+                    f"https://csm/api/v2/users,5,0,1")
+    rows.append("garbage,row")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fptr:
+        fptr.write("\n".join(rows) + "\n")
+    return path
+
+
+class TestJtlAnalyzer:
+    """Test per endpoint stats, SLA checks and build comparison."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestJtlAnalyzer")
+
+    @classmethod
+    def teardown_class(cls):
+        """Remove JTL files and reports, reports of a previous run change the comparison."""
+        if system_utils.path_exists(cls.dpath):
+            system_utils.remove_dirs(cls.dpath)
+
+    def test_analysis_and_sla(self):
+        """Percentiles, timeline, error breakdown and SLA compliance per endpoint."""
+        path = write_jtl(os.path.join(self.dpath, "base.jtl"), 10, users_errors=4)
+        result = jtl_analyzer.analyze(jtl_analyzer.read_jtl(path), interval=5)
+        login = result["endpoints"]["Login"]
+        assert_utils.assert_equal((login["p50"], login["p95"], login["p99"], login["max"]),
+                                  (500, 950, 990, 1000))
+        assert_utils.assert_equal(result["summary"]["samples"], 140)
+        assert_utils.assert_equal(result["duration"], 20.8)
+        assert_utils.assert_equal(result["errors"], {"List users": {"503": 4}})
+        assert_utils.assert_equal(result["endpoints"]["List users"]["error_pct"], 10.0)
+        assert_utils.assert_equal([each["samples"] for each in result["timeline"]],
+                                  [35, 35, 35, 35])
+        checks = jtl_analyzer.check_sla(result, {"*": {"p95": 900, "error_pct": 5},
+                                                 "Login": {"p95": 1000, "throughput": 1}})
+        failed = [(each["label"], each["metric"]) for each in checks if not each["passed"]]
+        assert_utils.assert_equal(failed, [("List users", "error_pct")])
+
+    def test_build_comparison(self):
+        """Slower endpoint of a new build is a regression and fails the report."""
+        base = jtl_analyzer.build_report(write_jtl(os.path.join(self.dpath, "b1.jtl"), 10),
+                                         "b1", sla={"*": {"error_pct": 0}})
+        assert_utils.assert_true(base["passed"], base["sla"])
+        saved = jtl_analyzer.load_report(
+            jtl_analyzer.save_report(os.path.join(self.dpath, "b1", "run.json"), base))
+        new = jtl_analyzer.build_report(
+            write_jtl(os.path.join(self.dpath, "b2.jtl"), 13, users_errors=1), "b2",
+            baseline=saved, threshold=20)
+        verdicts = {row["label"]: row["verdict"] for row in new["comparison"]}
+        assert_utils.assert_equal(verdicts, {"Login": "regression",
+                                             "List users": "regression"})
+        assert_utils.assert_equal(new["comparison"][0]["p95_delta_pct"], 30.0)
+        assert_utils.assert_false(new["passed"])
+        assert_utils.assert_equal(sorted(new["regressions"]), ["List users", "Login"])
+
+    def test_analyze_last_run(self):
+        """The last run is compared with the configured baseline, no run is a clear error."""
+        jmx_obj = JmeterInt()
+        jmx_obj.analysis_cfg = {"reports_path": os.path.join(self.dpath, "reports"),
+                                "baseline_build": "build-1", "sla": {}}
+        try:
+            jmx_obj.analyze_jtl()
+        except CTException as error:
+            assert_utils.assert_in("call run_jmx first", str(error))
+        else:
+            assert_utils.assert_true(False, "CTException not raised")
+        jmx_obj.last_jtl = write_jtl(os.path.join(self.dpath, "jmeter", "CSM_Login.jtl"), 10)
+        result, report = jmx_obj.analyze_jtl(build="build-1")
+        assert_utils.assert_true(result, report)
+        assert_utils.assert_equal(report["comparison"], [])
+        write_jtl(jmx_obj.last_jtl, 13)
+        result, report = jmx_obj.analyze_jtl(build="build-2")
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(report["regressions"], ["Login"])
+        assert_utils.assert_true(os.path.exists(os.path.join(self.dpath, "reports", "build-2",
+                                                             "CSM_Login.json")))
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test procpath time-series analysis module."""
+
+import logging
+import os
+import sqlite3
+from time import perf_counter_ns
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from libs.dtm.procpath_analysis import ProcPathAnalyser
+
+
+class TestProcPathAnalysis:
+    """Test procpath analysis class using synthetic procpath databases."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.log = logging.getLogger(__name__)
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestProcPathAnalysis")
+
+    def setup_method(self):
+        """Pre-requisite will be invoked prior to each test case."""
+        if not system_utils.path_exists(self.dpath):
+            system_utils.make_dirs(self.dpath)
+
+    def teardown_method(self):
+        """Teardown will be invoked after each test case."""
+        if system_utils.path_exists(self.dpath):
+            system_utils.remove_dirs(self.dpath)
+
+    def create_db(self, rows):
+        """Create procpath like sqlite db with (ts, pid, comm, rss_pages, fds) rows."""
+        db_path = os.path.join(self.dpath, f"procpath-{perf_counter_ns()}.sqlite")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE record (record_id INTEGER PRIMARY KEY, ts REAL, "
+                         "cmdline TEXT, stat_pid INTEGER, stat_comm TEXT, stat_utime INTEGER, "
+                         "stat_stime INTEGER, stat_rss INTEGER, stat_starttime INTEGER, "
+                         "fd_reg INTEGER)")
+            for tstamp, pid, comm, rss, fds in rows:
+                conn.execute("INSERT INTO record (ts, cmdline, stat_pid, stat_comm, stat_utime, "
+                             "stat_stime, stat_rss, stat_starttime, fd_reg) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (tstamp, f"/usr/bin/{comm}", pid, comm, tstamp * 10, tstamp * 5,
+                              rss, pid, fds))
+        return db_path
+
+    def test_leak_and_restart_detection(self):
+        """Test leak is reported only for growing process and restart is detected."""
+        rows = []
+        for idx in range(60):
+            tstamp = 1000 + idx * 45
+            rows.append((tstamp, 100, "m0d", 10000 + idx * 200, 50))
+            pid = 200 if idx < 30 else 201
+            rows.append((tstamp, pid, "radosgw", 20000 + (idx % 3), 80))
+        db_path = self.create_db(rows)
+        analyser = ProcPathAnalyser({"node1": db_path},
+                                    phases=[("write", 1000, 2000), ("read", 2000, 3700)])
+        passed, result = analyser.generate_report(os.path.join(self.dpath, "report"))
+        self.log.info(result["leaks"])
+        assert_utils.assert_false(passed, "Leak was not detected")
+        assert_utils.assert_equal([leak["family"].split(":")[1] for leak in result["leaks"]],
+                                  ["m0d"])
+        assert_utils.assert_equal(len(result["restarts"]), 1)
+        assert_utils.assert_equal(result["restarts"][0]["new_pid"], 201)
+        assert_utils.assert_in("write", result["phases"])
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test closed loop capacity fill engine against a simulated cluster."""
+
+import os
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from libs.durability.capacity_fill import CapacityFillEngine
+from libs.durability.capacity_fill import FillManifest
+
+MB = 1024 ** 2
+
+
+class _Cluster:
+    """Capacity of a cluster whose stats lag one read behind the writes."""
+
+    def __init__(self, total, used, amplification, fail_after=None):
+        self.total = total
+        self.used = used
+        self.reported = used
+        self.amplification = amplification
+        self.fail_after = fail_after
+        self.batches = 0
+
+    def read_capacity(self):
+        """(total, available, used) as hctl reports it."""
+        reported, self.reported = self.reported, self.used
+        return self.total, self.total - reported, reported
+
+    def write_batch(self, bucket, obj_size, samples, obj_name_pref):
+        """Write objects, fail once fail_after batches are written."""
+        if self.fail_after is not None and self.batches >= self.fail_after:
+            return False, "ENOSPC"
+        self.batches += 1
+        self.used += int(obj_size * samples * self.amplification)
+        return True, {"bucket": bucket, "obj_name_pref": obj_name_pref,
+                      "num_clients": min(10, samples), "obj_size": obj_size,
+                      "num_sample": samples}
+
+
+class TestCapacityFill:
+    """Test convergence on the fill target and reuse of the manifest."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestCapacityFill")
+        cls.sizes = [size * MB for size in (128, 256, 512, 1024, 2048)]
+
+    def test_converges_with_unknown_overhead(self):
+        """Fill lands within tolerance though overhead is 10% above the SNS estimate."""
+        path = os.path.join(self.dpath, "manifest.json")
+        if os.path.exists(path):
+            os.remove(path)
+        cluster = _Cluster(total=100 * 1024 ** 4, used=5 * 1024 ** 4, amplification=1.65)
+        engine = CapacityFillEngine(cluster.read_capacity, cluster.write_batch, self.sizes,
+                                    amplification=1.5, tolerance=1, settle_time=0,
+                                    bucket_prefix="fill", manifest=FillManifest(path))
+        resp = engine.fill(40)
+        assert_utils.assert_true(resp[0], resp[1])
+        assert_utils.assert_equal(resp[1]["status"], "reached")
+        assert_utils.assert_true(39 <= cluster.used / cluster.total * 100 <= 41, resp[1])
+        assert_utils.assert_true(abs(resp[1]["amplification"] - 1.65) < 0.01, resp[1])
+        assert_utils.assert_true(len(resp[1]["phases"]) <= 4, resp[1]["phases"])
+        batches = [(each["bucket"], each["obj_name_pref"]) for each in resp[1]["entries"]]
+        assert_utils.assert_equal(len(set(batches)), len(batches))
+        assert_utils.assert_equal(len({bucket for bucket, _ in batches}), len(self.sizes))
+        manifest = FillManifest(path)
+        assert_utils.assert_equal(manifest.entries, resp[1]["entries"])
+        written = manifest.bytes_written * 1.65 + 5 * 1024 ** 4
+        assert_utils.assert_true(abs(written - cluster.used) < len(manifest.entries),
+                                 "manifest does not match written data")
+        bucket = manifest.entries[0]["bucket"]
+        removed = manifest.remove([bucket])
+        assert_utils.assert_equal(removed, [each for each in resp[1]["entries"]
+                                            if each["bucket"] == bucket])
+        assert_utils.assert_equal(len(FillManifest(path).entries),
+                                  len(resp[1]["entries"]) - len(removed))
+        resp = engine.fill(30)
+        assert_utils.assert_equal((resp[0], resp[1]["status"], resp[1]["entries"]),
+                                  (True, "already_full", []))
+
+    def test_failed_write_and_bucket_list(self):
+        """Failed writes stop the fill and pre-created buckets are never exceeded."""
+        cluster = _Cluster(total=10 * 1024 ** 4, used=0, amplification=1.5, fail_after=6)
+        engine = CapacityFillEngine(cluster.read_capacity, cluster.write_batch, self.sizes,
+                                    amplification=1.5, settle_time=0)
+        resp = engine.fill(80)
+        assert_utils.assert_false(resp[0], resp[1])
+        assert_utils.assert_equal((resp[1]["status"], resp[1]["error"]),
+                                  ("write_failed", "ENOSPC"))
+        assert_utils.assert_equal(len(resp[1]["entries"]), 6)
+        buckets = ["bkt-1", "bkt-2", "bkt-3"]
+        engine = CapacityFillEngine(cluster.read_capacity, cluster.write_batch, self.sizes,
+                                    amplification=1.5, settle_time=0, bucket_list=buckets)
+        cluster.fail_after = None
+        resp = engine.fill(90)
+        assert_utils.assert_false(resp[0], resp[1])
+        assert_utils.assert_equal([each["bucket"] for each in resp[1]["entries"]], buckets)
+        assert_utils.assert_in("No pre-created bucket", resp[1]["error"])
+        buckets = [f"bkt-{num}" for num in range(5)]
+        cluster = _Cluster(total=10 * 1024 ** 4, used=0, amplification=1.5)
+        engine = CapacityFillEngine(cluster.read_capacity, cluster.write_batch, self.sizes,
+                                    amplification=1.5, settle_time=0, bucket_list=buckets)
+        resp = engine.fill(90)
+        assert_utils.assert_true(resp[0], resp[1])
+        assert_utils.assert_true(len(resp[1]["phases"]) > 1, resp[1]["phases"])
+        assert_utils.assert_equal(sorted({each["bucket"] for each in resp[1]["entries"]}),
+                                  buckets)
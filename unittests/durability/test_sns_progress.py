@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test SNS repair and rebalance progress tracker."""
+
+import json
+import os
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from libs.durability.sns_progress import SnsProgressTracker
+from libs.durability.sns_progress import parse_sns_status
+
+MB = 1024 ** 2
+
+
+class TestSnsProgress:
+    """Test status parsing, throughput, ETA, stalls and limits on a simulated repair."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestSnsProgress")
+
+    def test_parse_sns_status(self):
+        """JSON and text status outputs give the same result."""
+        as_json = json.dumps([
+            {"fid": "0x7200000000000001:0x2c", "status": "M0_SNS_CM_STATUS_STARTED",
+             "progress": 40},
+            {"fid": "0x7200000000000001:0x3c", "status": "M0_SNS_CM_STATUS_IDLE",
+             "progress": 0}])
+        as_text = ("0x7200000000000001:0x2c M0_SNS_CM_STATUS_STARTED 40\n"
+                   "0x7200000000000001:0x3c M0_SNS_CM_STATUS_IDLE 0\n")
+        expected = {"0x7200000000000001:0x2c": {"status": "started", "progress": 40},
+                    "0x7200000000000001:0x3c": {"status": "idle", "progress": 0}}
+        assert_utils.assert_equal(parse_sns_status(as_json), expected)
+        assert_utils.assert_equal(parse_sns_status(as_text.encode()), expected)
+        assert_utils.assert_equal(SnsProgressTracker.state(expected), "started")
+        expected["0x7200000000000001:0x3c"]["status"] = "failed"
+        assert_utils.assert_equal(SnsProgressTracker.state(expected), "failed")
+        assert_utils.assert_equal(parse_sns_status(""), {})
+
+    def test_simulated_repair(self):
+        """10 MB/s repair of 9000 MB with a 200s stall finishes with stats and timeline."""
+        now = [0.0]
+        left = [9000 * MB]
+
+        def collect():
+            elapsed = now[0]
+            if elapsed == 60:
+                raise IOError("data pod not reachable")
+            state = "IDLE" if elapsed < 30 or not left[0] else "STARTED"
+            if state == "STARTED" and not 600 <= elapsed < 800:
+                left[0] = max(0, left[0] - 10 * MB * 30)
+            return {"processes": {"0x72:0x1": {"status": state.lower(), "progress": 0}},
+                    "bytecount": {"critical": 0, "damaged": left[0] // 2,
+                                  "degraded": left[0] - left[0] // 2, "healthy": 10 ** 12}}
+
+        def sleep(secs):
+            now[0] += secs
+
+        tracker = SnsProgressTracker(collect, interval=30, window=4, stall_after=120,
+                                     clock=lambda: now[0], sleep=sleep)
+        result, summary = tracker.wait(timeout=3600)
+        assert_utils.assert_true(result, summary)
+        assert_utils.assert_equal((summary["status"], summary["remaining"], summary["errors"]),
+                                  ("completed", 0, 1))
+        assert_utils.assert_equal(summary["healed_bytes"], 9000 * MB)
+        assert_utils.assert_equal(summary["min_bps"], 0.0)
+        assert_utils.assert_equal([(stall["start"], stall["end"]) for stall in
+                                   summary["stalls"]], [(570, 810)])
+        steady = [point for point in tracker.timeline if 180 <= point["t"] <= 570]
+        assert_utils.assert_true(all(point["bps"] == 10 * MB for point in steady), steady)
+        assert_utils.assert_true(all(point["eta"] == 930 for point in steady), steady)
+        result, violations = tracker.check(min_bps=8 * MB, max_duration=900)
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(violations, ["mean throughput 8278232 B/s below 8388608 B/s",
+                                               "took 1140s, limit 900s", "1 stall(s)"])
+        assert_utils.assert_true(tracker.check(min_bps=5 * MB, max_duration=1200,
+                                               allow_stalls=True)[0])
+        with open(tracker.save(os.path.join(self.dpath, "repair.json")),
+                  encoding="utf-8") as fptr:
+            assert_utils.assert_equal(len(json.load(fptr)["timeline"]), len(tracker.timeline))
+
+    def test_collection_failures(self):
+        """Failed collections are counted and skipped, no sample leaves the run running."""
+        now = [0.0]
+
+        def collect():
+            raise IOError("hctl not reachable")
+
+        def sleep(secs):
+            now[0] += secs
+
+        tracker = SnsProgressTracker(collect, interval=30, clock=lambda: now[0], sleep=sleep)
+        assert_utils.assert_equal(tracker.sample(), None)
+        result, summary = tracker.wait(timeout=90)
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(summary, {"operation": "repair", "status": "running",
+                                            "samples": 0, "errors": 5, "stalls": []})
+        assert_utils.assert_equal(tracker.check(), (False, ["repair running"]))
+
+    def test_stall_with_missing_progress(self):
+        """Samples without processes neither reset nor hide a stall."""
+        now = [0.0]
+
+        def collect():
+            # status is reported on alternate samples, progress is stuck at 40 till 180s
+            processes = {"0x72:0x1": {"status": "started",
+                                      "progress": 50 if now[0] >= 180 else 40}} \
+                if not now[0] % 60 else {}
+            return {"processes": processes, "bytecount": {"degraded": 100 * MB}}
+
+        tracker = SnsProgressTracker(collect, stall_after=120, clock=lambda: now[0])
+        for _ in range(8):
+            tracker.sample()
+            now[0] += 30
+        assert_utils.assert_equal([(point["state"], point["progress"]) for point in
+                                   tracker.timeline[:3]],
+                                  [("started", 40), ("started", None), ("started", 40)])
+        assert_utils.assert_equal([point["t"] for point in tracker.timeline
+                                   if point["stalled"]], [120, 150])
+        assert_utils.assert_equal(tracker.stalls, [{"start": 0, "end": 180}])
@@ -0,0 +1,254 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test chaos scheduler timelines, invariants and replay."""
+
+import hashlib
+import os
+import threading
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from libs.ha import chaos_scheduler
+from libs.ha.chaos_scheduler import ChaosScheduler
+from libs.ha.chaos_scheduler import Fault
+
+
+class FakeCluster:
+    """Cluster whose pods go offline, with objects corrupted while a fault is active."""
+
+    def __init__(self, now):
+        """Cluster on the virtual clock now, all pods online."""
+        self.now = now
+        self.offline = {}
+        self.corrupt = False
+        self.objects = {f"obj-{num}": f"data-{num}".encode() for num in range(20)}
+        self.calls = []
+
+    def kill(self, params, rng):
+        """Take one of params["pods"] offline until it is restored."""
+        pod = rng.choice(params["pods"])
+        self.calls.append(("kill", pod))
+        self.offline[pod] = float("inf")
+        return True, pod
+
+    def restore(self, pod, _params):
+        """Restore a killed pod, it comes back 40s later."""
+        self.calls.append(("restore", pod))
+        self.offline[pod] = self.now[0] + 40
+        return True, pod
+
+    def online(self):
+        """Recovery check, fails while any pod is offline."""
+        pending = [pod for pod, until in self.offline.items() if until > self.now[0]]
+        return not pending, pending
+
+    def read_md5(self, key):
+        """Checksum of an object read back, wrong while corruption is active."""
+        data = self.objects[key] + (b"x" if self.corrupt else b"")
+        return hashlib.md5(data).hexdigest()  # nosec
+
+
+class TestChaosScheduler:
+    """Test random timelines, recovery SLA and invariants on virtual time."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestChaosScheduler")
+
+    def setup_method(self):
+        """Virtual clock advanced by sleep."""
+        self.now = [0.0]
+        self.cluster = FakeCluster(self.now)
+
+    def sleep(self, secs):
+        """Advance virtual time."""
+        self.now[0] += secs
+
+    def scheduler(self, seed, sla=60):
+        """Scheduler with pod kill and corruption faults on the fake cluster."""
+        cluster = self.cluster
+
+        def corrupt(_params, _rng):
+            cluster.corrupt = True
+            return True, None
+
+        def uncorrupt(_state, _params):
+            cluster.corrupt = False
+            return True, None
+
+        faults = [Fault("pod_kill", cluster.kill, cluster.restore, max_active=2,
+                        params={"pods": ["data-0", "data-1", "data-2"]}, duration=(20, 90)),
+                  Fault("corrupt", corrupt, uncorrupt, duration=(10, 20), weight=0.5)]
+        expected = {key: hashlib.md5(data).hexdigest()  # nosec
+                    for key, data in cluster.objects.items()}
+        invariants = {"checksums": chaos_scheduler.checksum_invariant(
+            cluster.read_md5, expected, sample=3, seed=seed)}
+        return ChaosScheduler(faults, invariants, recovery_check=cluster.online,
+                              recovery_sla=sla, check_interval=15, seed=seed,
+                              clock=lambda: self.now[0], sleep=self.sleep)
+
+    def test_random_timeline_and_replay(self):
+        """Seeded timelines are reproducible and replaying a saved run repeats it."""
+        scheduler = self.scheduler(seed=7)
+        timeline = scheduler.random_timeline(1800, mean_gap=120, max_active=2)
+        assert_utils.assert_equal(timeline, self.scheduler(seed=7).random_timeline(
+            1800, mean_gap=120, max_active=2))
+        assert_utils.assert_not_equal(timeline, self.scheduler(seed=8).random_timeline(
+            1800, mean_gap=120, max_active=2))
+        assert_utils.assert_true(len(timeline) > 5, timeline)
+        for event in timeline:
+            overlapping = [each for each in timeline
+                           if each["at"] <= event["at"] < each["at"] + each["duration"]]
+            assert_utils.assert_true(len(overlapping) <= 2, overlapping)
+        workload_stops = []
+        result = scheduler.run(timeline, workload=workload_stops.append)
+        assert_utils.assert_equal(len(workload_stops), 1)
+        assert_utils.assert_true(workload_stops[0].is_set())
+        path = scheduler.save(result, os.path.join(self.dpath, "run.json"))
+        saved = chaos_scheduler.load_run(path)
+        first_calls = list(self.cluster.calls)
+        self.setup_method()
+        replay = self.scheduler(seed=saved["seed"]).run(saved["timeline"])
+        assert_utils.assert_equal(self.cluster.calls, first_calls)
+        assert_utils.assert_equal([(each["kind"], each["name"], each["result"])
+                                   for each in replay["journal"]],
+                                  [(each["kind"], each["name"], each["result"])
+                                   for each in saved["journal"]])
+
+    def test_invariant_and_sla_violations(self):
+        """Corruption breaks checksums, a slow recovery breaks the SLA."""
+        timeline = [{"at": 10, "fault": "corrupt", "duration": 30},
+                    {"at": 100, "fault": "pod_kill", "duration": 20,
+                     "params": {"pods": ["data-1"]}}]
+        result = self.scheduler(seed=1, sla=30).run(timeline)
+        assert_utils.assert_false(result["passed"])
+        assert_utils.assert_equal(sorted({(each["kind"], each["name"])
+                                          for each in result["violations"]}),
+                                  [("invariant", "checksums"), ("recovery", "within 30s")])
+        assert_utils.assert_equal(self.cluster.calls, [("kill", "data-1"),
+                                                       ("restore", "data-1")])
+        self.setup_method()
+        result = self.scheduler(seed=1, sla=60).run(timeline[1:])
+        assert_utils.assert_true(result["passed"], result["violations"])
+        recovery = [each for each in result["journal"] if each["kind"] == "recovery"]
+        assert_utils.assert_equal([each["t"] for each in recovery], [165.0])
+        stopped = self.scheduler(seed=1, sla=30).run(timeline, stop_on_violation=True)
+        assert_utils.assert_equal([(each["kind"], each["name"]) for each in stopped["journal"]],
+                                  [("inject", "corrupt"), ("invariant", "checksums"),
+                                   ("recover", "corrupt"), ("recovery", "within 30s"),
+                                   ("invariant", "checksums")])
+
+    def test_overlapping_faults(self):
+        """Recovery of a fault overlapped by another is checked once both are recovered."""
+        timeline = [{"at": 10, "fault": "pod_kill", "duration": 100,
+                     "params": {"pods": ["data-0"]}},
+                    {"at": 50, "fault": "pod_kill", "duration": 20,
+                     "params": {"pods": ["data-1"]}}]
+        result = self.scheduler(seed=3, sla=60).run(timeline)
+        assert_utils.assert_true(result["passed"], result["violations"])
+        assert_utils.assert_equal(self.cluster.calls, [("kill", "data-0"), ("kill", "data-1"),
+                                                       ("restore", "data-1"),
+                                                       ("restore", "data-0")])
+        recovery = [(each["t"], each["event"]) for each in result["journal"]
+                    if each["kind"] == "recovery"]
+        assert_utils.assert_equal(recovery, [(155.0, 0)])
+        # A fault without duration stays active and does not defer the recovery check
+        self.setup_method()
+        timeline = [{"at": 10, "fault": "pod_kill", "duration": None,
+                     "params": {"pods": ["data-0"]}}, timeline[1]]
+        result = self.scheduler(seed=3, sla=30).run(timeline)
+        assert_utils.assert_equal([(each["kind"], each["t"]) for each in result["violations"]],
+                                  [("recovery", 100.0)])
+
+    def test_io_failure_during_fault(self):
+        """Background IO failing while a fault is active is a violation noticed at once."""
+        cluster = self.cluster
+        injected = threading.Event()
+
+        def workload(stop):
+            if injected.wait(5) and not stop.is_set():
+                raise OSError("read obj-1 failed: pod data-0 offline")
+
+        def kill(params, rng):
+            resp = cluster.kill(params, rng)
+            injected.set()
+            # Let the IO thread fail before the timeline goes on
+            for thread in threading.enumerate():
+                if thread.name == "chaos-io":
+                    thread.join(5)
+            return resp
+
+        timeline = [{"at": 10, "fault": "pod_kill", "duration": 30,
+                     "params": {"pods": ["data-0"]}},
+                    {"at": 100, "fault": "pod_kill", "duration": 20,
+                     "params": {"pods": ["data-1"]}}]
+        scheduler = self.scheduler(seed=5, sla=60)
+        scheduler.faults["pod_kill"].inject = kill
+        result = scheduler.run(timeline, workload=workload, stop_on_violation=True)
+        assert_utils.assert_false(result["passed"])
+        assert_utils.assert_equal([(each["kind"], each["t"]) for each in result["violations"]],
+                                  [("workload", 10.0)])
+        assert_utils.assert_in("pod data-0 offline", result["violations"][0]["detail"])
+        # Run stops, the active fault is still recovered
+        assert_utils.assert_equal(self.cluster.calls, [("kill", "data-0"),
+                                                       ("restore", "data-0")])
+        assert_utils.assert_equal([(each["kind"], each["name"]) for each in result["journal"]],
+                                  [("inject", "pod_kill"), ("workload", "background io"),
+                                   ("recover", "pod_kill"), ("recovery", "within 60s"),
+                                   ("invariant", "checksums")])
+
+    def test_disk_fail_fault(self):
+        """Disks failed by fail_disk are brought online on their data pod, errors fail."""
+        calls = []
+
+        class DiskLib:
+            """DiskFailureRecoveryLib recording hctl drive state changes."""
+
+            def __init__(self, responses):
+                """Responses of hctl drive-state in call order."""
+                self.responses = list(responses)
+
+            @staticmethod
+            def fail_disk(disk_fail_cnt, *_args, **_kwargs):
+                """Fail disk_fail_cnt disks like fail_disk, marking them failed in hctl."""
+                disks = {f"disk{num}": (f"ssc-vm-{num}", "cvg-1", f"/dev/sd{'cd'[num]}")
+                         for num in range(disk_fail_cnt)}
+                calls.extend(("failed",) + disk for disk in disks.values())
+                return True, disks
+
+            def change_disk_status_hctl(self, _master, _pod, host, device, status):
+                """Record state change, return next response."""
+                calls.append((status, host, device))
+                return self.responses.pop(0)
+
+        fault = chaos_scheduler.disk_fail_fault(DiskLib([{}, {"error": "no such drive"}]),
+                                                "master", ["ssc-vm-0", "ssc-vm-1"], "data-pod")
+        result, disks = fault.inject({"disk_fail_cnt": 2}, None)
+        assert_utils.assert_true(result, disks)
+        result, resp = fault.recover(disks, {})
+        assert_utils.assert_false(result, resp)
+        prefix = chaos_scheduler.common_const.CORTX_DATA_NODE_PREFIX
+        assert_utils.assert_equal(calls, [("failed", "ssc-vm-0", "cvg-1", "/dev/sdc"),
+                                          ("failed", "ssc-vm-1", "cvg-1", "/dev/sdd"),
+                                          ("online", prefix + "ssc-vm-0", "/dev/sdc"),
+                                          ("online", prefix + "ssc-vm-1", "/dev/sdd")])
+        fault = chaos_scheduler.disk_fail_fault(DiskLib([{}]), "master", ["ssc-vm-0"],
+                                                "data-pod")
+        assert_utils.assert_true(fault.recover(fault.inject({}, None)[1], {})[0])
@@ -0,0 +1,211 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test enclosure CLI parsers, ssh transport and controller simulator."""
+
+import shlex
+
+from commons import commands as common_cmd
+from commons import errorcodes as cterr
+from commons.helpers import enclosure_cli
+from commons.helpers.enclosure_cli import EnclosureCli
+from commons.helpers.enclosure_cli import EnclosureSimulator
+from commons.helpers.enclosure_cli import SshTransport
+from commons.utils import assert_utils
+
+
+class FakeNode:
+    """Node recording commands and answering enclosure ssh commands from a simulator."""
+
+    def __init__(self, simulator):
+        """
+        :param simulator: EnclosureSimulator answering the enclosure commands.
+        """
+        self.simulator = simulator
+        self.commands = []
+        self.failures = {}
+        self.error = None
+
+    def execute_cmd(self, cmd, **_kwargs):
+        """
+        Record cmd and answer it, other node commands return no output.
+
+        Enclosure commands in failures get an error response with the given message,
+        error is raised for ssh commands like a failed connection. Text echoed into ssh is
+        the answer to the confirmation prompt.
+        """
+        self.commands.append(cmd)
+        if "sshpass -p" not in cmd:
+            return b""
+        if self.error:
+            raise self.error
+        stdin, _, ssh = cmd.rpartition(" | ")
+        encl_cmd = shlex.split(ssh)[-1]
+        answer = shlex.split(stdin)[1] if stdin else None
+        if encl_cmd in self.failures:
+            output = self.simulator.response(encl_cmd, error=self.failures[encl_cmd])
+        else:
+            output = self.simulator.run(encl_cmd, answer)
+        return ("Welcome\n" + output).encode()
+
+
+class TestEnclosureCli:
+    """Test parsing and a drive removal and reconstruction flow without hardware."""
+
+    def setup_method(self):
+        """Simulator on a virtual clock."""
+        self.now = [0.0]
+        self.simulator = EnclosureSimulator(drives=12, groups=2, group_size=5,
+                                            recon_seconds=300, clock=lambda: self.now[0])
+        self.cli = EnclosureCli(self.simulator, clock=lambda: self.now[0], sleep=self.sleep)
+
+    def sleep(self, secs):
+        """Advance virtual time."""
+        self.now[0] += secs
+
+    def test_parsers_and_transport(self):
+        """Each show command parses to keyed dicts, also through the ssh transport."""
+        node = FakeNode(self.simulator)
+        cli = EnclosureCli(SshTransport(node, "10.0.0.2", "manage", "pass'word"))
+        disks = cli.show_disks()
+        assert_utils.assert_equal(len(disks), 12)
+        assert_utils.assert_equal({key: disks["disk_01.05"][key] for key in
+                                   ("location", "usage", "disk_group", "health")},
+                                  {"location": "0.5", "usage": "LINEAR POOL",
+                                   "disk_group": "dg02", "health": "OK"})
+        assert_utils.assert_equal(disks, EnclosureCli(EnclosureSimulator()).show_disks())
+        assert_utils.assert_equal(cli.group_drives("dg01"), [f"0.{num}" for num in range(5)])
+        groups = cli.show_disk_groups()
+        assert_utils.assert_equal(sorted(groups), ["dg01", "dg02"])
+        assert_utils.assert_equal((groups["dg01"]["raidtype"], groups["dg01"]["health"]),
+                                  ("RAID6", "OK"))
+        assert_utils.assert_not_in("job", groups["dg01"])
+        volumes = cli.show_volumes()
+        assert_utils.assert_equal(volumes["dg02"]["vol-dg02"]["health"], "OK")
+        phys = cli.show_expander_status()
+        assert_utils.assert_equal(sorted(phys), ["A", "B"])
+        assert_utils.assert_equal(sorted(phys["A"]), list(range(12)))
+        assert_utils.assert_equal(phys["B"][3]["disabled"], "Enabled")
+        ssh = [cmd for cmd in node.commands if "sshpass -p" in cmd]
+        assert_utils.assert_equal(len(node.commands), len(ssh) + 1)
+        assert_utils.assert_in("-o ControlMaster=auto", ssh[0])
+        assert_utils.assert_in("sshpass -p 'pass'\"'\"'word'", ssh[0])
+        assert_utils.assert_equal(cli.execute("show nothing")[0], False)
+        result, resp = cli.clear_metadata("0.1")
+        assert_utils.assert_false(result)
+        assert_utils.assert_in("in use by disk group dg01", resp)
+        try:
+            enclosure_cli.parse_response("Permission denied")
+        except enclosure_cli.CTException as error:
+            assert_utils.assert_in("No XML response", str(error))
+        else:
+            assert_utils.assert_true(False, "CTException not raised")
+
+    def test_drive_removal_and_reconstruction(self):
+        """Removing drives degrades the group, adding a spare rebuilds it over time."""
+        assert_utils.assert_true(self.cli.remove_drive("0.2")[0])
+        groups = self.cli.show_disk_groups()
+        assert_utils.assert_equal(groups["dg01"]["health"], "Degraded")
+        assert_utils.assert_equal(groups["dg02"]["health"], "OK")
+        assert_utils.assert_not_in("0.2", self.cli.group_drives("dg01"))
+        phys = self.cli.show_expander_status()
+        assert_utils.assert_equal((phys["A"][2]["disabled"], phys["B"][2]["disabled"]),
+                                  ("Disabled", "Disabled"))
+        self.cli.remove_drive("0.3")
+        assert_utils.assert_equal(self.cli.show_disk_groups()["dg01"]["health"], "Fault")
+        assert_utils.assert_equal(self.cli.show_volumes()["dg01"]["vol-dg01"]["health"],
+                                  "Degraded")
+        # Drive 0.2 comes back with leftover metadata, add_spares clears it first
+        self.cli.insert_drive("0.2")
+        usage = {disk["location"]: disk["usage"] for disk in self.cli.show_disks().values()}
+        assert_utils.assert_equal((usage["0.2"], usage["0.10"]), ("LEFTOVR", "AVAIL"))
+        result, resp = self.cli.add_spares(["0.2", "0.10"], "dg01")
+        assert_utils.assert_true(result, resp)
+        assert_utils.assert_in("clear disk-metadata 0.2", self.simulator.commands)
+        self.sleep(60)
+        group = self.cli.show_disk_groups()["dg01"]
+        assert_utils.assert_equal((group["job"], group["job_percent"]), ("RCON", 20))
+        result, group = self.cli.poll_recon("dg01", percent=50, interval=30)
+        assert_utils.assert_true(result, group)
+        assert_utils.assert_equal((group["job_percent"], self.now[0]), (50, 150.0))
+        result, group = self.cli.poll_recon("dg01", timeout=60, interval=30)
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(group["job_percent"], 70)
+        result, group = self.cli.poll_recon("dg01", interval=30)
+        assert_utils.assert_true(result, group)
+        assert_utils.assert_equal((group["health"], self.now[0]), ("OK", 300.0))
+        assert_utils.assert_equal(self.cli.group_drives("dg01"),
+                                  ["0.0", "0.1", "0.10", "0.2", "0.4"])
+        result, resp = self.cli.add_spares(["0.3"], "dg01")
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(resp, "Drive 0.3 not found")
+
+    def test_command_failures(self):
+        """Error responses fail the action without changes, ssh failures raise."""
+        node = FakeNode(self.simulator)
+        cli = EnclosureCli(SshTransport(node, "10.0.0.2", "manage", "!manage"))
+        result, resp = cli.remove_drive("0.40")
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(resp, "Error: No phy 40 on controller a")
+        assert_utils.assert_equal(len([cmd for cmd in self.simulator.commands
+                                       if cmd.startswith("set expander-phy")]), 1)
+        result, resp = cli.add_spares(["0.10"], "dg09")
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(resp, "Error: Disk group dg09 not found")
+        assert_utils.assert_equal(cli.show_disk_groups()["dg01"]["health"], "OK")
+
+        node.failures[common_cmd.SHOW_DISKS_CMD] = "Error: The system is busy."
+        for action in (cli.show_disks, lambda: cli.add_spares(["0.10"], "dg01")):
+            try:
+                action()
+            except enclosure_cli.CTException as error:
+                assert_utils.assert_equal(error.ct_error, cterr.CONTROLLER_ERROR)
+                assert_utils.assert_in("show disks: Error: The system is busy.", str(error))
+            else:
+                assert_utils.assert_true(False, "CTException not raised")
+        assert_utils.assert_not_in("add spares 0.10 disk-group dg01", self.simulator.commands)
+
+        node.failures.clear()
+        node.error = IOError("Connection reset by peer")
+        try:
+            cli.clear_metadata("0.10")
+        except enclosure_cli.CTException as error:
+            assert_utils.assert_equal(error.ct_error, cterr.CONTROLLER_ERROR)
+            assert_utils.assert_in("Connection reset by peer", str(error))
+        else:
+            assert_utils.assert_true(False, "CTException not raised")
+        assert_utils.assert_equal(self.simulator.drives["0.10"]["usage"], "AVAIL")
+
+    def test_confirmation_prompt(self):
+        """Disabling a phy prompts on the controller, the transport confirms it."""
+        cmd = common_cmd.SET_DRIVE_STATUS_CMD.format("0", "a", "4", "disabled")
+        output = self.simulator.run(cmd)
+        assert_utils.assert_in(enclosure_cli.CONFIRM_PROMPT, output)
+        assert_utils.assert_equal(enclosure_cli.parse_response(output)[1]["response"],
+                                  "Error: The command was canceled.")
+        assert_utils.assert_equal(self.simulator.phys_disabled, set())
+        assert_utils.assert_false(enclosure_cli.needs_confirmation(
+            common_cmd.SET_DRIVE_STATUS_CMD.format("0", "a", "4", "enabled")))
+        node = FakeNode(self.simulator)
+        cli = EnclosureCli(SshTransport(node, "10.0.0.2", "manage", "!manage"))
+        assert_utils.assert_true(cli.remove_drive("0.4")[0])
+        assert_utils.assert_equal(self.simulator.phys_disabled, {"A:4", "B:4"})
+        assert_utils.assert_true(cli.insert_drive("0.4")[0])
+        ssh = [cmd for cmd in node.commands if "sshpass -p" in cmd]
+        assert_utils.assert_equal([cmd.startswith("echo y | sshpass") for cmd in ssh],
+                                  [True, True, False, False])
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test background multi pod resource sampler."""
+
+import csv
+import json
+import os
+import stat
+import subprocess
+
+import pytest
+
+from commons.helpers import resource_sampler
+from commons.helpers.resource_sampler import ResourceSampler
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+
+FAKE_KUBECTL = """#!/bin/sh
+# kubectl stand-in: two pods with two containers, exec runs the command locally
+case "$1" in
+  get) if [ "$2" = "pods" ]; then printf 'cortx-data-0\\ncortx-data-1\\nother-0\\n';
+       else echo "motr hax"; fi ;;
+  exec) while [ "$1" != "--" ]; do shift; done; shift; exec "$@" ;;
+esac
+"""
+
+
+class TestResourceSampler:
+    """Test batched collection script, rates, statistics and export."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestResourceSampler")
+        os.makedirs(cls.dpath, exist_ok=True)
+
+    def test_collect_script(self):
+        """One script samples every container of the matching pods."""
+        kubectl = os.path.join(self.dpath, "kubectl")
+        with open(kubectl, "w", encoding="utf-8") as fptr:
+            fptr.write(FAKE_KUBECTL)
+        os.chmod(kubectl, os.stat(kubectl).st_mode | stat.S_IEXEC)
+        env = dict(os.environ, PATH=f"{self.dpath}:{os.environ['PATH']}")
+        try:
+            output = subprocess.run(
+                ["bash", "-c", resource_sampler.collect_script("cortx", "cortx-data")],
+                env=env, capture_output=True, text=True, timeout=60, check=True).stdout
+        except (FileNotFoundError, subprocess.SubprocessError) as error:
+            pytest.skip(f"bash not usable: {error}")
+        samples = resource_sampler.parse_samples(output)
+        assert_utils.assert_equal(sorted(samples), [("cortx-data-0", "hax"),
+                                                    ("cortx-data-0", "motr"),
+                                                    ("cortx-data-1", "hax"),
+                                                    ("cortx-data-1", "motr")])
+        counters = samples[("cortx-data-0", "hax")]
+        assert_utils.assert_equal(sorted(counters), sorted(["cpu_usec", "mem_bytes", "fds",
+                                                            "net_rx", "net_tx", "disk_read",
+                                                            "disk_write"]))
+        assert_utils.assert_true(counters["fds"] > 0, counters)
+
+    def test_series_statistics_and_export(self):
+        """Counters become rates in bounded series with peak, mean and slope."""
+        now = [1000.0]
+        tick = [0]
+
+        def collect():
+            tick[0] += 1
+            lines = []
+            for pod, leak in (("cortx-data-0", 0), ("cortx-server-0", 1024 ** 2)):
+                lines.append(f"SAMPLE {pod} motr cpu_usec={tick[0] * 5000000} "
+                             f"mem_bytes={100 * 1024 ** 2 + tick[0] * leak} fds=40 "
+                             f"net_rx={tick[0] * 10000} net_tx=0 disk_read=0 "
+                             f"disk_write={tick[0] * 20000}")
+            if tick[0] == 3:
+                raise IOError("ssh dropped")
+            return "\n".join(lines) + "\nnoise"
+
+        def clock():
+            now[0] += 10
+            return now[0]
+
+        sampler = ResourceSampler(collect, interval=10, max_points=5, clock=clock)
+        for _ in range(8):
+            sampler.sample_once()
+        assert_utils.assert_equal((sampler.ticks, sampler.errors), (7, 1))
+        points = sampler.points("mem_bytes", pod="cortx-server")
+        assert_utils.assert_equal(len(points[("cortx-server-0", "motr")]), 5)
+        cpu = sampler.stat("cpu_pct", "mean")
+        assert_utils.assert_equal(round(cpu[("cortx-data-0", "motr")], 3), 50.0)
+        assert_utils.assert_equal(sampler.stat("disk_write_bps", "peak")[
+            ("cortx-data-0", "motr")], 2000.0)
+        slopes = sampler.stat("mem_bytes", "slope")
+        assert_utils.assert_equal(round(slopes[("cortx-server-0", "motr")]), 6 * 1024 ** 2)
+        assert_utils.assert_equal(slopes[("cortx-data-0", "motr")], 0.0)
+        result, offenders = sampler.check("mem_bytes", "slope", 1024 ** 2)
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(list(offenders), [("cortx-server-0", "motr")])
+        sampler.assert_within("mem_bytes", "slope", 1024 ** 2, pod="cortx-data")
+        with pytest.raises(AssertionError):
+            sampler.assert_within("mem_bytes", "slope", 1024 ** 2)
+        csv_path = sampler.export(os.path.join(self.dpath, "samples.csv"))
+        with open(csv_path, encoding="utf-8") as fptr:
+            rows = list(csv.DictReader(fptr))
+        json_path = sampler.export(os.path.join(self.dpath, "samples.json"))
+        with open(json_path, encoding="utf-8") as fptr:
+            assert_utils.assert_equal(len(json.load(fptr)), len(rows))
+        assert_utils.assert_equal(len(rows), 2 * 7 * 5)
@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test IO stability metrics store, trend detection and alerts."""
+
+import logging
+import os
+import urllib.request
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from libs.iostability.iostability_metrics import IOStabilityMonitor
+from libs.iostability.iostability_metrics import parse_s3bench_log
+
+S3BENCH_SUMMARY = """
+Results Summary for Write Operation(s)
+Total Transferred: 4.000 MB
+Total Throughput:  {throughput} MB/s
+Total Duration:    42.434 s
+Number of Errors:  {errors}
+------------------------------------
+Write times Max:       16.102 s
+Write times 99th %ile: {p99} s
+Write times 90th %ile: 9.124 s
+Write times 50th %ile: 2.441 s
+Write times Min:       0.411 s
+
+Results Summary for Read Operation(s)
+Total Throughput:  1.20 MB/s
+Number of Errors:  0
+Read times 99th %ile: 1.250 s
+"""
+
+
+class TestIOStabilityMetrics:
+    """Test IO stability monitor with synthetic s3bench logs."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.log = logging.getLogger(__name__)
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestIOStabilityMetrics")
+
+    def setup_method(self):
+        """Pre-requisite will be invoked prior to each test case."""
+        if not system_utils.path_exists(self.dpath):
+            system_utils.make_dirs(self.dpath)
+        self.mails = []
+        self.monitor = IOStabilityMonitor(os.path.join(self.dpath, "metrics.db"),
+                                          notify=lambda *mail: self.mails.append(mail),
+                                          baseline=3, window=3, dashboard_port=0)
+
+    def teardown_method(self):
+        """Teardown will be invoked after each test case."""
+        self.monitor.close()
+        if system_utils.path_exists(self.dpath):
+            system_utils.remove_dirs(self.dpath)
+
+    def write_log(self, throughput=0.36, errors=0, p99=15.589):
+        """Write s3bench like log."""
+        log_path = os.path.join(self.dpath, "s3bench.log")
+        with open(log_path, "w", encoding="utf-8") as fptr:
+            fptr.write(S3BENCH_SUMMARY.format(throughput=throughput, errors=errors, p99=p99))
+        return log_path
+
+    def test_parse_and_dashboard(self):
+        """Parse s3bench summary, store it and serve it on the dashboard."""
+        results = parse_s3bench_log(self.write_log())
+        assert_utils.assert_equal(sorted(results), ["read", "write"])
+        assert_utils.assert_equal(results["write"]["throughput"], 0.36)
+        assert_utils.assert_equal(results["write"]["lat_p99"], 15.589)
+        assert_utils.assert_equal(results["write"]["lat_max"], 16.102)
+        assert_utils.assert_equal(results["read"]["errors"], 0)
+        for loop in range(2):
+            self.monitor.record_iteration(loop, "1Mb", 10, 100, self.write_log())
+        assert_utils.assert_equal(len(self.monitor.store.series("1Mb", "write", "lat_p99")), 2)
+        with urllib.request.urlopen(self.monitor.dashboard.url) as resp:  # nosec
+            page = resp.read().decode()
+        assert_utils.assert_in("write 1Mb", page)
+        assert_utils.assert_in("<polyline", page)
+
+    def test_threshold_alerts(self):
+        """Errors, degradation and unhealthy cluster fire alerts once per cooldown."""
+        for loop in range(3):
+            _, fired = self.monitor.record_iteration(loop, "1Mb", 10, 100, self.write_log())
+            assert_utils.assert_equal(fired, [])
+        for loop in range(3, 6):
+            _, fired = self.monitor.record_iteration(
+                loop, "1Mb", 10, 100, self.write_log(throughput=0.1, p99=40.0))
+        keys = {key for _, key, _, _ in self.monitor.store.alerts()}
+        assert_utils.assert_in("1Mb:write:throughput", keys)
+        assert_utils.assert_in("1Mb:write:lat_p99", keys)
+        assert_utils.assert_equal(len(keys), 2)
+        _, fired = self.monitor.record_iteration(6, "1Mb", 10, 100, self.write_log(errors=3))
+        assert_utils.assert_equal([alert["key"] for alert in fired], ["1Mb:write:errors:6"])
+        status = {"nodes": [{"name": "data-0", "svcs": [{"name": "ioservice",
+                                                         "status": "offline"}]}]}
+        healthy, offline = self.monitor.record_health(status)
+        assert_utils.assert_false(healthy)
+        assert_utils.assert_equal(offline, ["data-0:ioservice"])
+        assert_utils.assert_equal(len(self.mails), 3)
@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test m0crate workload generator and results analyser."""
+
+import os
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import config_utils
+from libs.motr import m0crate_workload
+
+
+class TestM0crateWorkload:
+    """Test workload matrix, output parsing and build comparison."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestM0crateWorkload")
+        cls.base_cfg = config_utils.read_yaml("config/motr/sample_m0crate.yaml")[1]
+        cls.matrix = m0crate_workload.workload_matrix(["4k", "1m", "32m"], [1, 8], [16],
+                                                      ["write", "write_read"], "16m")
+
+    def test_matrix_and_records(self):
+        """Matrix expands to m0crate configs and output is reduced to records."""
+        assert_utils.assert_equal(len(self.matrix), 8)
+        params = self.matrix[3]
+        assert_utils.assert_equal(params["name"], "write_bs1m_t8_o16")
+        cfg = m0crate_workload.build_workload(self.base_cfg, params, {"PROF": "0x70:0x1"},
+                                              "/tmp/m0crate_16m")
+        workload = cfg["WORKLOAD_SPEC"][0]["WORKLOAD"]
+        assert_utils.assert_equal((workload["OPCODE"], workload["BLOCK_SIZE"],
+                                   workload["NR_THREADS"], workload["NR_OBJS"]),
+                                  (2, "1m", 8, 16))
+        assert_utils.assert_equal(cfg["MOTR_CONFIG"]["PROF"], "0x70:0x1")
+        assert_utils.assert_equal(self.base_cfg["MOTR_CONFIG"]["PROF"], "0x7000000000000001:0xfe")
+        output = ("I/O workload started\nTotal: time=1.9 ops=256\n"
+                  f"{m0crate_workload.WALL_MARKER} 2000000000 0\n")
+        record = m0crate_workload.workload_record(params, output, 2.5)
+        assert_utils.assert_equal(record["status"], "ok")
+        assert_utils.assert_equal(record["wall"], 2.0)
+        assert_utils.assert_equal(record["throughput_mbps"], 128.0)
+        assert_utils.assert_equal(record["ops"], 256)
+        assert_utils.assert_equal(record["latency_ms_est"], 62.5)
+        assert_utils.assert_equal(record["reported"], {"time": 1.9, "ops": 256.0})
+        failed = m0crate_workload.workload_record(
+            params, f"m0_panic: motr/io.c\n{m0crate_workload.WALL_MARKER} 10 134\n")
+        assert_utils.assert_equal((failed["status"], failed["rc"]), ("failed", 134))
+
+    def test_sweep_comparison(self):
+        """Builds are compared per workload and regressions reported first."""
+        def run(build):
+            def _run(params):
+                wall = 1.0 if build == "base" or params["threads"] == 1 else 2.0
+                return f"{m0crate_workload.WALL_MARKER} {int(wall * 1e9)} 0", wall
+            return _run
+
+        paths = {build: m0crate_workload.save_results(
+            os.path.join(self.dpath, f"{build}.json"), build,
+            m0crate_workload.run_sweep(self.matrix, run(build), repeat=2))
+                 for build in ("base", "new")}
+        base = m0crate_workload.load_results(paths["base"])
+        new = m0crate_workload.load_results(paths["new"])
+        assert_utils.assert_equal(len(new["records"]), 16)
+        new["records"] = [rec for rec in new["records"] if rec["name"] != "write_bs4k_t1_o16"]
+        rows = m0crate_workload.compare_results(base, new, threshold=10)
+        verdicts = [row["verdict"] for row in rows]
+        assert_utils.assert_equal(verdicts.count("regression"), 4)
+        assert_utils.assert_equal(verdicts[:4], ["regression"] * 4)
+        assert_utils.assert_equal(rows[0]["delta_pct"], -50.0)
+        assert_utils.assert_in("missing", verdicts)
+        report = m0crate_workload.comparison_report(rows, "base", "new")
+        assert_utils.assert_in("4 regression(s) in 8 workloads", report)
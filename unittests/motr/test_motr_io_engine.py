@@ -0,0 +1,160 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test concurrent motr IO engine with local stand-ins of the motr utilities."""
+
+import os
+import shutil
+import stat
+import subprocess
+import threading
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from libs.motr.motr_io_engine import FidAllocator
+from libs.motr.motr_io_engine import MotrIOEngine
+
+# m0cp/m0cat/m0unlink stand-ins keep objects as files named after the -o object id
+FAKE_UTILS = {
+    "m0cp": 'while [ $# -gt 1 ]; do [ "$1" = -o ] && o=$2; shift; done\n'
+            '[ -e "$STORE/fail_$o" ] && echo "m0cp ERROR: no space" && exit 0\n'
+            'cp "$1" "$STORE/$o"\n',
+    "m0cat": 'while [ $# -gt 1 ]; do [ "$1" = -o ] && o=$2; shift; done\n'
+             'cp "$STORE/$o" "$1"\n[ -e "$STORE/corrupt_$o" ] && echo x >> "$1"\nexit 0\n',
+    "m0unlink": 'while [ $# -gt 0 ]; do [ "$1" = -o ] && o=$2; shift; done\n'
+                'rm "$STORE/$o"\n',
+}
+
+
+class _Cluster:
+    """Two client nodes with two motr clients each."""
+
+    profile_fid = "0x7000000000000001:0x0"
+
+    def __init__(self):
+        self.node_pod_dict = {"client-1": "pod-1", "client-2": "pod-2"}
+        self.cortx_node_list = list(self.node_pod_dict)
+
+    @staticmethod
+    def get_cortx_node_endpoints(node):
+        """Endpoints of node."""
+        return {"hax_ep": f"inet:tcp:{node}@22001", "motr_client": [
+            {"ep": f"inet:tcp:{node}@21501", "fid": "0x7200000000000001:0x1"},
+            {"ep": f"inet:tcp:{node}@21502", "fid": "0x7200000000000001:0x2"}]}
+
+
+class TestMotrIOEngine:
+    """Test object id allocation, pipeline scripts and result parsing."""
+
+    @classmethod
+    def setup_class(cls):
+        """Create directory with motr utility stand-ins."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestMotrIOEngine")
+        cls.bin = os.path.join(cls.dpath, "bin")
+        cls.store = os.path.join(cls.dpath, "store")
+        os.makedirs(cls.bin, exist_ok=True)
+        os.makedirs(cls.store, exist_ok=True)
+        for name, body in FAKE_UTILS.items():
+            path = os.path.join(cls.bin, name)
+            with open(path, "w", encoding="utf-8") as fptr:
+                fptr.write("#!/bin/bash\n" + body)
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        cls.env = dict(os.environ, PATH=f"{cls.bin}:{os.environ['PATH']}", STORE=cls.store)
+
+    @classmethod
+    def teardown_class(cls):
+        """Remove test data."""
+        shutil.rmtree(cls.dpath, ignore_errors=True)
+
+    def _execute(self, pod, script):  # pylint: disable=unused-argument
+        """Run the pod script locally."""
+        return subprocess.run(["bash", "-c", script], env=self.env, check=True,
+                              capture_output=True, text=True).stdout
+
+    def test_fid_allocation(self):
+        """Ids stay unique across threads and allocators."""
+        first, second, ids = FidAllocator(), FidAllocator(high=7), []
+        threads = [threading.Thread(target=lambda: ids.extend(
+            first.allocate() for _ in range(500))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_utils.assert_equal(len(set(ids)), 2000)
+        assert_utils.assert_equal(second.allocate(), "7:1")
+        assert_utils.assert_not_in(second.allocate(), ids)
+
+    def test_concurrent_pipeline(self):
+        """Objects run on all nodes and clients with verified checksums and latencies."""
+        engine = MotrIOEngine(_Cluster(), FidAllocator(high=11), workdir=self.dpath,
+                              execute=self._execute)
+        specs = engine.plan(["client-1", "client-2"], {"4k": 1, "8k": 2}, [1, 2],
+                            objects_per_size=2)
+        assert_utils.assert_equal(len(specs), 16)
+        corrupt = specs[3]["obj"]
+        open(os.path.join(self.store, f"corrupt_{corrupt}"), "w").close()
+        results, summary = engine.run(specs)
+        assert_utils.assert_equal(summary["objects"], 16)
+        assert_utils.assert_equal(summary["ok"], 15)
+        assert_utils.assert_equal(summary["corrupted"], 1)
+        by_obj = {result["obj"]: result for result in results}
+        assert_utils.assert_false(by_obj[corrupt]["verified"])
+        good = by_obj[specs[0]["obj"]]
+        assert_utils.assert_true(good["verified"] and good["deleted"])
+        assert_utils.assert_equal(set(good["steps"]), {"dd", "m0cp", "m0cat", "m0unlink"})
+        assert_utils.assert_equal({result["client"] for result in results}, {0, 1})
+        assert_utils.assert_equal(os.listdir(self.store), [f"corrupt_{corrupt}"])
+        open(os.path.join(self.store, "fail_11:999"), "w").close()
+        failed, _ = MotrIOEngine(_Cluster(), workdir=self.dpath, execute=self._execute).run(
+            [dict(specs[0], obj="11:999")])
+        assert_utils.assert_equal(failed[0]["status"], "failed")
+        assert_utils.assert_in("m0cp: m0cp ERROR: no space", failed[0]["error"])
+        assert_utils.assert_false(failed[0]["deleted"])
+
+    def test_failed_setup(self):
+        """Specs are recorded as failed when a node has no clients or its setup raises."""
+        cluster = _Cluster()
+        cluster.node_pod_dict["client-3"] = "pod-3"
+        endpoints = cluster.get_cortx_node_endpoints
+
+        calls = []
+
+        def get_endpoints(node):
+            """No motr clients on client-2, client-3 endpoints fail after the first call."""
+            if node == "client-2":
+                return {"hax_ep": "", "motr_client": []}
+            if node == "client-3":
+                calls.append(node)
+                if len(calls) > 1:
+                    raise RuntimeError("hare config not found")
+            return endpoints(node)
+
+        cluster.get_cortx_node_endpoints = get_endpoints
+        engine = MotrIOEngine(cluster, FidAllocator(high=13), workdir=self.dpath,
+                              execute=self._execute)
+        specs = engine.plan(["client-1", "client-2", "client-3"], {"4k": 1}, [1])
+        results, summary = engine.run(specs)
+        by_node = {result["node"]: result for result in results}
+        assert_utils.assert_equal((summary["objects"], summary["ok"], summary["failed"]),
+                                  (3, 1, 2))
+        assert_utils.assert_equal(by_node["client-1"]["status"], "ok")
+        assert_utils.assert_equal(by_node["client-2"]["error"],
+                                  "No motr client endpoints on client-2")
+        assert_utils.assert_equal(by_node["client-3"]["error"], "hare config not found")
+        assert_utils.assert_in(by_node["client-3"]["client"], (0, 1))
+        assert_utils.assert_equal(by_node["client-2"]["client"], None)
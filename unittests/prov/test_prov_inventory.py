@@ -0,0 +1,161 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test hardware inventory and solution layout validation."""
+
+import logging
+import os
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from libs.prov.prov_inventory import ClusterInventory
+from libs.prov.prov_inventory import SolutionLayout
+
+INVENTORY_OUTPUT = """##disks
+NAME="sda" SIZE="53687091200" TYPE="disk" ROTA="1" MOUNTPOINT="" PKNAME=""
+NAME="sda1" SIZE="1073741824" TYPE="part" ROTA="1" MOUNTPOINT="/boot" PKNAME="sda"
+NAME="sda2" SIZE="52612300800" TYPE="part" ROTA="1" MOUNTPOINT="" PKNAME="sda"
+NAME="centos-root" SIZE="52612300800" TYPE="lvm" ROTA="1" MOUNTPOINT="/" PKNAME="sda2"
+NAME="sdb" SIZE="26843545600" TYPE="disk" ROTA="1"
+NAME="sdc" SIZE="26843545600" TYPE="disk" ROTA="1"
+NAME="sdd" SIZE="26843545600" TYPE="disk" ROTA="1"
+NAME="sde" SIZE="26843545600" TYPE="disk" ROTA="1"
+NAME="sdf" SIZE="26843545600" TYPE="disk" ROTA="1"
+NAME="sdg" SIZE="26843545600" TYPE="disk" ROTA="0"
+NAME="sdh" SIZE="26843545600" TYPE="disk" ROTA="0"
+NAME="sr0" SIZE="1073741312" TYPE="rom" ROTA="1"
+##cpus
+8
+##memory
+MemTotal:       16266480 kB
+##nics
+1: lo    inet 127.0.0.1/8 scope host lo\\       valid_lft forever preferred_lft forever
+2: eth0    inet 10.230.1.2/21 brd 10.230.7.255 scope global dynamic eth0
+"""
+
+
+class FakeNode:
+    """Node returning recorded inventory output."""
+
+    def __init__(self, hostname, output=INVENTORY_OUTPUT):
+        """Keep hostname and the output of the inventory command."""
+        self.hostname = hostname
+        self.output = output
+        self.calls = 0
+
+    def execute_cmd(self, cmd, read_lines=False):
+        """Return recorded output."""
+        self.calls += 1
+        return self.output.splitlines(keepends=True) if read_lines else self.output
+
+
+class TestProvInventory:
+    """Test ClusterInventory and SolutionLayout."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.log = logging.getLogger(__name__)
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestProvInventory")
+        cls.cache = os.path.join(cls.dpath, "hw_inventory.json")
+
+    def setup_method(self):
+        """Pre-requisite will be invoked prior to each test case."""
+        if not system_utils.path_exists(self.dpath):
+            system_utils.make_dirs(self.dpath)
+        self.nodes = [FakeNode(f"ssc-vm-{idx}") for idx in range(3)]
+
+    def teardown_method(self):
+        """Teardown will be invoked after each test case."""
+        if system_utils.path_exists(self.dpath):
+            system_utils.remove_dirs(self.dpath)
+
+    def test_collect_and_cache(self):
+        """Test inventory is parsed, cached and reused."""
+        inventory = ClusterInventory.get(self.nodes, self.cache, max_age=60)
+        node = inventory.nodes[0]
+        assert_utils.assert_equal([disk.name for disk in node.devices],
+                                  ["sdb", "sdc", "sdd", "sde", "sdf", "sdg", "sdh"])
+        assert_utils.assert_equal((node.cpus, node.memory), (8, 16266480 * 1024))
+        assert_utils.assert_equal(node.nics, {"lo": ["127.0.0.1"], "eth0": ["10.230.1.2"]})
+        assert_utils.assert_equal(inventory.system_disks()["ssc-vm-1"], "/dev/sdb")
+        cached = ClusterInventory.get(self.nodes, self.cache, max_age=60)
+        assert_utils.assert_equal(cached.fingerprint, inventory.fingerprint)
+        assert_utils.assert_equal([node.calls for node in self.nodes], [1, 1, 1])
+        assert_utils.assert_equal(ClusterInventory.load(self.cache, ["other-node"]), None)
+
+    def test_layout_validation(self):
+        """Test layout is rendered and invalid layouts are reported before deploy."""
+        inventory = ClusterInventory.collect(self.nodes)
+        layout = SolutionLayout(cvg_count=2, sns=(4, 2, 0), dix=(1, 2, 0))
+        status, errors = layout.validate(inventory)
+        assert_utils.assert_true(status, errors)
+        storage = layout.storage_section(inventory)
+        assert_utils.assert_equal(storage["cvg2"]["devices"]["metadata"]["device"], "/dev/sdd")
+        assert_utils.assert_equal(list(storage["cvg2"]["devices"]["data"].values()),
+                                  [{"device": "/dev/sdg", "size": "20Gi"},
+                                   {"device": "/dev/sdh", "size": "20Gi"}])
+        assert_utils.assert_equal(layout.durability(), {"sns": "4+2+0", "dix": "1+2+0"})
+        status, errors = SolutionLayout(cvg_count=2, data_disk_per_cvg=3, sns=(8, 2, 0),
+                                        size_data_disk="30Gi").validate(inventory)
+        self.log.info(errors)
+        assert_utils.assert_false(status, errors)
+        assert_utils.assert_equal(len(errors), 4)
+
+    def test_os_disk_per_node(self):
+        """Test OS disk is detected per node and differing CVG devices are reported."""
+        output = INVENTORY_OUTPUT.replace('PKNAME="sda2"', 'PKNAME="sdb"')
+        self.nodes[2] = FakeNode("ssc-vm-2", output)
+        inventory = ClusterInventory.collect(self.nodes)
+        assert_utils.assert_equal([node.os_disks for node in inventory.nodes],
+                                  [["sda"], ["sda"], ["sdb"]])
+        assert_utils.assert_equal(inventory.nodes[2].devices[0].name, "sda")
+        assert_utils.assert_equal(inventory.system_disks(),
+                                  {"ssc-vm-0": "/dev/sdb", "ssc-vm-1": "/dev/sdb",
+                                   "ssc-vm-2": "/dev/sda"})
+        layout = SolutionLayout(cvg_count=2, sns=(4, 2, 0), dix=(1, 2, 0))
+        devices = layout.devices(inventory)
+        assert_utils.assert_equal(devices["ssc-vm-0"][0], ["/dev/sdc", "/dev/sdd"])
+        assert_utils.assert_equal(devices["ssc-vm-2"][0], ["/dev/sdc", "/dev/sdd"])
+        assert_utils.assert_equal(devices["ssc-vm-2"][1], [["/dev/sde", "/dev/sdf"],
+                                                           ["/dev/sdg", "/dev/sdh"]])
+        status, errors = layout.validate(inventory)
+        assert_utils.assert_true(status, errors)
+
+        # OS on a data disk of one node moves its CVG devices
+        self.nodes[2] = FakeNode("ssc-vm-2", output.replace('PKNAME="sdb"', 'PKNAME="sde"'))
+        inventory = ClusterInventory.collect(self.nodes)
+        status, errors = layout.validate(inventory)
+        assert_utils.assert_false(status, errors)
+        assert_utils.assert_equal(len(errors), 1)
+        assert_utils.assert_in("ssc-vm-2: CVG devices", errors[0])
+        try:
+            layout.storage_section(inventory)
+        except ValueError as error:
+            assert_utils.assert_in("differ across nodes", str(error))
+        else:
+            assert_utils.assert_true(False, "ValueError not raised")
+
+        # Without a root mount the OS disk defaults to sda
+        output = "\n".join(line for line in INVENTORY_OUTPUT.splitlines()
+                           if "centos-root" not in line)
+        node = ClusterInventory.collect([FakeNode("ssc-vm-0", output)]).nodes[0]
+        assert_utils.assert_equal(node.os_disks, ["sda"])
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test dependency graph executor of provisioner flows."""
+
+import logging
+import os
+import threading
+import time
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from libs.prov.prov_step_graph import StepGraph
+
+
+class TestStepGraph:
+    """Test StepGraph with local callables."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.log = logging.getLogger(__name__)
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestStepGraph")
+        cls.state_file = os.path.join(cls.dpath, "deploy_flow_state.json")
+
+    def setup_method(self):
+        """Pre-requisite will be invoked prior to each test case."""
+        if not system_utils.path_exists(self.dpath):
+            system_utils.make_dirs(self.dpath)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def teardown_method(self):
+        """Teardown will be invoked after each test case."""
+        if system_utils.path_exists(self.dpath):
+            system_utils.remove_dirs(self.dpath)
+
+    def step(self, name, delay=0.0, result=True):
+        """Step function recording its name."""
+        time.sleep(delay)
+        with self.lock:
+            self.calls.append(name)
+        return result
+
+    def build(self, fail_on=None):
+        """Build deploy like graph of 4 workers and one master step."""
+        graph = StepGraph("deploy", max_workers=4, state_file=self.state_file)
+        ready = []
+        for idx in range(4):
+            prereq = graph.add_step(f"prereq:{idx}", self.step, f"prereq:{idx}", 0.2,
+                                    node=f"node{idx}")
+            ready.append(graph.add_step(f"pull:{idx}", self.step, f"pull:{idx}",
+                                        0.2 if fail_on == idx else 0.0,
+                                        (False, "pull failed") if fail_on == idx else True,
+                                        deps=[prereq], node=f"node{idx}"))
+        graph.add_step("deploy", self.step, "deploy", deps=ready, node="master")
+        return graph
+
+    def test_parallel_run(self):
+        """Test independent steps run in parallel and dependencies are honoured."""
+        start = time.monotonic()
+        status, report = self.build().run()
+        elapsed = time.monotonic() - start
+        self.log.info(report)
+        assert_utils.assert_true(status, report)
+        assert_utils.assert_true(elapsed < 0.6, f"Steps did not run in parallel {elapsed}")
+        assert_utils.assert_equal(self.calls[-1], "deploy")
+        assert_utils.assert_false(os.path.exists(self.state_file))
+
+    def test_fail_fast_and_resume(self):
+        """Test failure stops the flow and resume skips completed steps."""
+        status, report = self.build(fail_on=2).run()
+        assert_utils.assert_false(status, report)
+        assert_utils.assert_equal(report["failed"], ["pull:2"])
+        assert_utils.assert_in("deploy", report["skipped"])
+        assert_utils.assert_true(os.path.exists(self.state_file))
+        self.calls = []
+        status, report = self.build().run(resume=True)
+        assert_utils.assert_true(status, report)
+        assert_utils.assert_equal(self.calls, ["pull:2", "deploy"])
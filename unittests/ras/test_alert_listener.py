@@ -0,0 +1,172 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test streaming alert matching and alert latency without a node."""
+
+from libs.ras import alert_listener
+from libs.ras.alert_listener import AlertStreamListener
+from libs.ras.alert_listener import MultiPatternMatcher
+from commons.utils import assert_utils
+
+
+class FakeChannel:
+    """Channel returning queued chunks of the tailed file."""
+
+    def __init__(self, chunks, error=None):
+        """Queue chunks, error is raised once they are consumed."""
+        self.chunks = list(chunks)
+        self.error = error
+        self.command = None
+        self.closed = False
+
+    def exec_command(self, cmd):
+        """Record the tail command."""
+        self.command = cmd
+
+    def recv_ready(self):
+        """Data is ready while chunks are queued."""
+        if not self.chunks and self.error:
+            raise self.error
+        return bool(self.chunks)
+
+    def recv(self, _nbytes):
+        """Return next chunk, a callable chunk is run and returns the data."""
+        chunk = self.chunks.pop(0)
+        return chunk() if callable(chunk) else chunk
+
+    def exit_status_ready(self):
+        """Tail exits once chunks are consumed."""
+        return not self.chunks
+
+    def close(self):
+        """Mark channel closed."""
+        self.closed = True
+
+
+class FakeNode:
+    """Node exposing the fake channel through host_obj.get_transport().open_session()."""
+
+    def __init__(self, channel):
+        """Keep channel."""
+        self.hostname = "srvnode-1"
+        self.channel = channel
+        self.host_obj = self
+        self.connected = False
+
+    def connect(self):
+        """Connect."""
+        self.connected = True
+
+    def disconnect(self):
+        """Disconnect."""
+        self.connected = False
+
+    def get_transport(self):
+        """Return self as transport."""
+        return self
+
+    def open_session(self):
+        """Return the fake channel."""
+        return self.channel
+
+
+class TestAlertListener:
+    """Test pattern matching across chunks, line filter, latency and consumer errors."""
+
+    def setup_method(self):
+        """Virtual monotonic clock."""
+        self.now = [100.0]
+        self.monotonic = alert_listener.time.monotonic
+        alert_listener.time.monotonic = lambda: self.now[0]
+
+    def teardown_method(self):
+        """Restore clock."""
+        alert_listener.time.monotonic = self.monotonic
+
+    def listener(self, channel, patterns, **kwargs):
+        """Listener reading from channel."""
+        listener = AlertStreamListener("srvnode-1", "root", "pwd", "/var/log/screen.log",
+                                       patterns, poll_interval=0, **kwargs)
+        listener.node_obj = FakeNode(channel)
+        return listener
+
+    def advance(self, secs, data):
+        """Chunk advancing the clock by secs when it is received."""
+        def chunk():
+            self.now[0] += secs
+            return data.encode()
+        return chunk
+
+    def test_matcher(self):
+        """Overlapping and duplicate patterns are matched once with offsets across chunks."""
+        matcher = MultiPatternMatcher(["fault", "cpu", "ault", "cpu", "host:cpu_usage"])
+        assert_utils.assert_equal(matcher.patterns, ["fault", "cpu", "ault", "host:cpu_usage"])
+        assert_utils.assert_equal(matcher.feed("alert_type: fa"), [])
+        assert_utils.assert_equal(matcher.feed("ult, host:cp"), ["fault", "ault"])
+        assert_utils.assert_false(matcher.all_matched)
+        assert_utils.assert_equal(matcher.remaining, ["cpu", "host:cpu_usage"])
+        assert_utils.assert_equal(matcher.feed("u_usage cpu"), ["cpu", "host:cpu_usage"])
+        assert_utils.assert_true(matcher.all_matched)
+        assert_utils.assert_equal(matcher.matched, {"fault": 16, "ault": 16, "cpu": 26,
+                                                    "host:cpu_usage": 32})
+        assert_utils.assert_equal(matcher.feed("fault cpu"), [])
+        matcher.reset()
+        assert_utils.assert_equal((matcher.matched, matcher.remaining[0]), ({}, "fault"))
+
+    def test_latency_from_fault_mark(self):
+        """Only filtered lines match, latency is taken from mark_fault_injected."""
+        channel = FakeChannel([
+            b"host:cpu_usage fault before mark\n",
+            self.advance(0, ""),
+            self.advance(3, "other: fault\nhost:cpu_"),
+            self.advance(2, "usage, alert_type: fa"),
+            self.advance(4, "ult\n")])
+        listener = self.listener(channel, ["host:cpu_usage", "fault"],
+                                 line_filter="host:cpu_usage", timeout=60)
+        channel.chunks[1] = lambda: listener.mark_fault_injected() or b""
+        result, resp = listener.wait_for_alerts()
+        assert_utils.assert_true(result, resp)
+        assert_utils.assert_equal(channel.command, "tail -n 0 -F /var/log/screen.log")
+        # the stale line before the mark matches without latency
+        assert_utils.assert_equal(resp["latency"], {"host:cpu_usage": None, "fault": None})
+
+        channel = FakeChannel([
+            self.advance(3, "other: fault\nhost:cpu_"),
+            self.advance(2, "usage, alert_type: fa"),
+            self.advance(4, "ult\n")])
+        listener = self.listener(channel, ["host:cpu_usage", "fault"],
+                                 line_filter="host:cpu_usage", from_start=True, timeout=60)
+        listener.mark_fault_injected()
+        result, resp = listener.wait_for_alerts()
+        assert_utils.assert_true(result, resp)
+        assert_utils.assert_equal(channel.command, "tail -n +1 -F /var/log/screen.log")
+        assert_utils.assert_equal(resp["latency"], {"host:cpu_usage": 9.0, "fault": 9.0})
+        assert_utils.assert_true(channel.closed)
+        assert_utils.assert_false(listener.node_obj.connected)
+
+    def test_missing_alerts_and_consumer_error(self):
+        """All missing patterns and the consumer error are reported."""
+        channel = FakeChannel([b"host:cpu_usage fault\n"], error=OSError("Socket is closed"))
+        channel.exit_status_ready = lambda: False
+        listener = self.listener(channel, ["host:cpu_usage", "resolved", "critical"],
+                                 timeout=60)
+        result, resp = listener.wait_for_alerts()
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(resp["matched"], ["host:cpu_usage"])
+        assert_utils.assert_equal(resp["missing"], ["resolved", "critical"])
+        assert_utils.assert_equal(resp["error"], "Socket is closed")
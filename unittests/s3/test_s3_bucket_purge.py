@@ -0,0 +1,209 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test bucket purge engine with an in-memory s3 client."""
+
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from libs.s3.s3_bucket_purge import BucketPurgeLib
+
+
+class _Paginator:
+    """Paginator over a listing function of the fake client."""
+
+    def __init__(self, pages):
+        """Keep listing function."""
+        self.pages = pages
+
+    def paginate(self, Bucket, PaginationConfig=None):  # pylint: disable=invalid-name
+        """Yield pages of the bucket listing."""
+        return self.pages(Bucket, (PaginationConfig or {}).get("PageSize", 1000))
+
+
+class _S3Client:
+    """In-memory s3 client with buckets of versions, delete markers and uploads."""
+
+    def __init__(self):
+        """Start without buckets."""
+        self.buckets = {}
+        self.requests = []
+        self.fail_keys = set()
+        self._lock = threading.Lock()
+
+    def add_bucket(self, name, versions=0, markers=0, uploads=(), versioned=True):
+        """Bucket with versions, delete markers and uploads initiated seconds ago."""
+        now = datetime.now(timezone.utc)
+        self.buckets[name] = {
+            "versioned": versioned,
+            "entries": [(f"obj-{num}", f"v{num}", False) for num in range(versions)] +
+                       [(f"obj-{num}", f"dm{num}", True) for num in range(markers)],
+            "uploads": [{"Key": f"mpu-{num}", "UploadId": f"id-{num}",
+                         "Initiated": now - timedelta(seconds=age)}
+                        for num, age in enumerate(uploads)]}
+
+    def bucket(self, name, operation):
+        """Bucket by name, NoSuchBucket like s3 for a missing one."""
+        if name not in self.buckets:
+            raise ClientError({"Error": {"Code": "NoSuchBucket"}}, operation)
+        return self.buckets[name]
+
+    def get_bucket_versioning(self, Bucket):  # pylint: disable=invalid-name
+        """Versioning status."""
+        return {"Status": "Enabled"} if self.bucket(Bucket, "GetBucketVersioning")[
+            "versioned"] else {}
+
+    def get_paginator(self, name):
+        """Paginator of a listing operation."""
+        return _Paginator(getattr(self, f"_{name}"))
+
+    def _list_object_versions(self, bucket, size):
+        """Pages with up to size versions and delete markers together."""
+        entries = list(self.bucket(bucket, "ListObjectVersions")["entries"])
+        for idx in range(0, len(entries), size):
+            page = entries[idx:idx + size]
+            yield {"Versions": [{"Key": key, "VersionId": vid}
+                                for key, vid, marker in page if not marker],
+                   "DeleteMarkers": [{"Key": key, "VersionId": vid}
+                                     for key, vid, marker in page if marker]}
+
+    def _list_objects_v2(self, bucket, size):
+        """Pages of current objects."""
+        keys = sorted({key for key, _, marker in self.bucket(bucket, "ListObjectsV2")["entries"]
+                       if not marker})
+        for idx in range(0, len(keys), size):
+            yield {"Contents": [{"Key": key} for key in keys[idx:idx + size]]}
+
+    def _list_multipart_uploads(self, bucket, _size):
+        """Single page of uploads."""
+        yield {"Uploads": list(self.bucket(bucket, "ListMultipartUploads")["uploads"])}
+
+    def delete_objects(self, Bucket, Delete):  # pylint: disable=invalid-name
+        """Delete keys/versions, keys in fail_keys return errors."""
+        objects = Delete["Objects"]
+        assert_utils.assert_true(len(objects) <= 1000, len(objects))
+        errors = [{"Key": obj["Key"], "VersionId": obj.get("VersionId"),
+                   "Message": "Access Denied"} for obj in objects
+                  if obj["Key"] in self.fail_keys]
+        removed = {(obj["Key"], obj.get("VersionId")) for obj in objects
+                   if obj["Key"] not in self.fail_keys}
+        with self._lock:
+            self.requests.append(("delete_objects", Bucket, len(objects)))
+            bucket = self.buckets[Bucket]
+            bucket["entries"] = [entry for entry in bucket["entries"]
+                                 if (entry[0], entry[1]) not in removed
+                                 and (entry[0], None) not in removed]
+        return {"Errors": errors} if errors else {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):  # pylint: disable=invalid-name
+        """Abort an upload."""
+        with self._lock:
+            self.requests.append(("abort", Bucket, Key))
+            self.buckets[Bucket]["uploads"] = [upload for upload in
+                                               self.buckets[Bucket]["uploads"]
+                                               if upload["UploadId"] != UploadId]
+
+    def delete_bucket(self, Bucket):  # pylint: disable=invalid-name
+        """Delete an empty bucket."""
+        bucket = self.bucket(Bucket, "DeleteBucket")
+        if bucket["entries"] or bucket["uploads"]:
+            raise ClientError({"Error": {"Code": "BucketNotEmpty"}}, "DeleteBucket")
+        with self._lock:
+            del self.buckets[Bucket]
+
+
+class _S3Obj:
+    """S3 library object exposing the fake client."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, client):
+        """Keep client."""
+        self.s3_client = client
+
+
+class TestBucketPurge:
+    """Test batched deletes, multipart upload handling, failures and resume."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestBucketPurge")
+
+    def setup_method(self):
+        """Fresh client and state directory."""
+        shutil.rmtree(self.dpath, ignore_errors=True)
+        os.makedirs(self.dpath)
+        self.client = _S3Client()
+
+    def teardown_method(self):
+        """Remove state directory."""
+        shutil.rmtree(self.dpath, ignore_errors=True)
+
+    def test_empty_versioned_bucket_uploads_opt_in(self):
+        """Versions and markers are deleted in batches, uploads only when asked and stale."""
+        self.client.add_bucket("ver-bkt", versions=1500, markers=700, uploads=(10, 7200))
+        purge = BucketPurgeLib(_S3Obj(self.client), page_size=1000,
+                               abort_uploads_older_than=3600)
+        stats = purge.empty_bucket("ver-bkt", abort_uploads=False)
+        assert_utils.assert_equal(stats, {"deleted": 2200, "failed": 0, "aborted_uploads": 0})
+        assert_utils.assert_equal([req[2] for req in self.client.requests],
+                                  [1000, 1000, 200])
+        assert_utils.assert_equal(len(self.client.buckets["ver-bkt"]["uploads"]), 2)
+        stats = purge.empty_bucket("ver-bkt")
+        assert_utils.assert_equal(stats["aborted_uploads"], 1)
+        assert_utils.assert_equal([upload["Key"] for upload in
+                                   self.client.buckets["ver-bkt"]["uploads"]], ["mpu-0"])
+        stats = BucketPurgeLib(_S3Obj(self.client),
+                               abort_uploads_older_than=0).empty_bucket("ver-bkt")
+        assert_utils.assert_equal(stats["aborted_uploads"], 1)
+        assert_utils.assert_equal(purge.progress.as_dict()["deleted"], 2200)
+
+    def test_purge_failures_and_resume(self):
+        """Failed deletes keep the bucket, a rerun skips buckets completed before."""
+        for num in range(4):
+            self.client.add_bucket(f"bkt-{num}", versions=30, uploads=(5,),
+                                   versioned=num % 2 == 0)
+        self.client.fail_keys.add("obj-3")
+        state_file = os.path.join(self.dpath, "purge_state.json")
+        purge = BucketPurgeLib(_S3Obj(self.client), max_workers=3, page_size=10,
+                               state_file=state_file)
+        buckets = ["bkt-0", "bkt-1", "bkt-2", "bkt-3", "missing-bkt"]
+        result, resp = purge.purge_buckets(buckets)
+        assert_utils.assert_false(result)
+        assert_utils.assert_equal(sorted(resp["CouldNotDelete"]), buckets[:4])
+        assert_utils.assert_equal(resp["Deleted"], ["missing-bkt"])
+        assert_utils.assert_equal(sorted(self.client.buckets), buckets[:4])
+        assert_utils.assert_true(all(len(bucket["entries"]) == 1 and not bucket["uploads"]
+                                     for bucket in self.client.buckets.values()))
+
+        self.client.fail_keys.clear()
+        self.client.requests.clear()
+        del self.client.buckets["bkt-3"]["entries"][:]
+        resumed = BucketPurgeLib(_S3Obj(self.client), state_file=state_file)
+        assert_utils.assert_true(resumed.state.is_done("missing-bkt"))
+        result, resp = resumed.purge_buckets(buckets)
+        assert_utils.assert_true(result, resp)
+        assert_utils.assert_equal(self.client.buckets, {})
+        assert_utils.assert_equal(len(self.client.requests), 3)
+        assert_utils.assert_false(os.path.exists(state_file))
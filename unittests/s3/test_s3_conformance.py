@@ -0,0 +1,192 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test cross client S3 conformance engine against the local S3 stand-in."""
+
+import hashlib
+import os
+import shlex
+
+import botocore.session
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from libs.s3 import s3_conformance
+from libs.s3.s3_local_server import LocalS3Server
+
+SEQUENCE = [
+    {"op": "create_bucket", "bucket": "b1"},
+    {"op": "create_bucket", "bucket": "b1", "expect": {"error_code": "BucketAlreadyOwnedByYou"}},
+    {"op": "put_object", "bucket": "b1", "key": "dir/one", "size": 2048,
+     "metadata": {"owner": "qa"}, "content_type": "text/plain"},
+    {"op": "put_object", "bucket": "b1", "key": "two", "size": 0},
+    {"op": "head_object", "bucket": "b1", "key": "dir/one"},
+    {"op": "get_object", "bucket": "b1", "key": "dir/one"},
+    {"op": "copy_object", "bucket": "b1", "key": "dir/copy", "src_key": "dir/one"},
+    {"op": "list_objects", "bucket": "b1", "prefix": "dir/"},
+    {"op": "get_object", "bucket": "b1", "key": "missing",
+     "expect": {"error_code": "NoSuchKey", "status": 404}},
+    {"op": "head_object", "bucket": "b1", "key": "missing",
+     "expect": {"error_code": "NotFound", "status": 404}},
+    {"op": "delete_bucket", "bucket": "b1", "expect": {"error_code": "BucketNotEmpty"}},
+    {"op": "delete_object", "bucket": "b1", "key": "two"},
+]
+
+
+class _S3Obj:
+    """S3 library object exposing a botocore client."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, client):
+        """Keep client."""
+        self.s3_client = client
+
+
+class _DroppingMetadata(s3_conformance.Boto3Client):
+    """Client which loses user metadata on put."""
+
+    name = "dropmeta"
+
+    def run(self, step, bucket, data_path=None, out_path=None):
+        return super().run(dict(step, metadata={}), bucket, data_path, out_path)
+
+
+class TestS3Conformance:
+    """Test differential runs and normalisation of cli outputs."""
+
+    @classmethod
+    def setup_class(cls):
+        """Start local S3 stand-in."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestS3Conformance")
+        cls.server = LocalS3Server().start()
+
+    @classmethod
+    def teardown_class(cls):
+        """Stop local S3 stand-in."""
+        cls.server.stop()
+
+    def s3_obj(self):
+        """S3 library object with a botocore client of the stand-in."""
+        return _S3Obj(botocore.session.get_session().create_client(
+            "s3", region_name="us-east-1", endpoint_url=self.server.endpoint,
+            aws_access_key_id="AK", aws_secret_access_key="SK"))
+
+    def test_divergence_against_stand_in(self):
+        """Same sequence through two clients, only the lost metadata diverges."""
+        missing = s3_conformance.AwsCliClient(self.server.endpoint, "AK", "SK")
+        missing.binary = "aws-cli-not-installed"
+        engine = s3_conformance.ConformanceEngine(
+            [s3_conformance.Boto3Client(self.s3_obj()), missing,
+             _DroppingMetadata(self.s3_obj())], self.dpath)
+        assert_utils.assert_equal([client.name for client in engine.clients],
+                                  ["boto3", "dropmeta"])
+        report = engine.run(SEQUENCE)
+        results = report["results"]["boto3"]
+        with open(os.path.join(self.dpath, "step2.data"), "rb") as fptr:
+            md5 = hashlib.md5(fptr.read()).hexdigest()  # nosec
+        assert_utils.assert_equal((results[4]["etag"], results[4]["size"],
+                                   results[4]["content_type"], results[4]["metadata"]),
+                                  (md5, 2048, "text/plain", {"owner": "qa"}))
+        assert_utils.assert_equal(results[5]["body_md5"], md5)
+        assert_utils.assert_equal([each["key"] for each in results[7]["listing"]],
+                                  ["dir/copy", "dir/one"])
+        assert_utils.assert_equal(report["expectation_failures"], [])
+        assert_utils.assert_equal([(each["step"], each["field"], each["value"])
+                                   for each in report["divergences"]],
+                                  [(4, "metadata", {}), (5, "metadata", {})])
+        assert_utils.assert_false(report["passed"])
+        assert_utils.assert_in("2 divergence(s)", s3_conformance.report_text(report))
+        assert_utils.assert_equal(self.server.buckets, {})
+
+    def test_cli_normalisation(self):
+        """Outputs of aws cli, s3cmd and mc normalise to the same results."""
+        etag = "9e107d9d372bb6826bd81d3542a419d6"
+        warning = "InsecureRequestWarning: Unverified HTTPS request is being made.\n"
+        # (exit status, stdout, stderr) of every client
+        outputs = {
+            "aws": (0, '{"ContentLength": 10, "ETag": "\\"%s\\"", '
+                       '"ContentType": "text/plain", "Metadata": {"owner": "qa"}}' % etag,
+                    warning),
+            "s3cmd": (0, "s3://b/k (object):\n   File size: 10\n   MIME type: text/plain\n"
+                         f"   MD5 sum:   {etag}\n   x-amz-meta-owner: qa\n", ""),
+            "mc": (0, '{"status":"success","name":"k","size":10,"etag":"%s","type":"file",'
+                      '"metadata":{"Content-Type":"text/plain","X-Amz-Meta-Owner":"qa"}}'
+                   % etag, "")}
+        errors = {
+            "aws": (254, "", warning + "An error occurred (NoSuchKey) when calling the "
+                                       "GetObject operation: The specified key does not exist."),
+            "s3cmd": (12, "", "ERROR: S3 error: 404 (NoSuchKey): The specified key does not "
+                              "exist."),
+            "mc": (1, '{"status":"error","error":{"message":"Object does not exist.",'
+                      '"cause":{"error":{"Code":"NoSuchKey","Message":"The specified key '
+                      'does not exist."}}}}', "")}
+        calls = []
+
+        def run_local_cmd(table):
+            def _run(cmd, flg=False):
+                assert_utils.assert_true(flg)
+                cmd, echo = cmd.rsplit("; ", 1)
+                assert_utils.assert_equal(echo, f"echo {s3_conformance.RC_MARKER}$?")
+                calls.append(cmd)
+                binary = [arg for arg in shlex.split(cmd) if "=" not in arg][0]
+                ret_code, stdout, stderr = table[binary]
+                # run_local_cmd(flg=True) returns str() of the (stdout, stderr) bytes
+                return True, str(((stdout + f"{s3_conformance.RC_MARKER}{ret_code}\n")
+                                  .encode(), stderr.encode()))
+            return _run
+
+        run_cmd = system_utils.run_local_cmd
+        try:
+            for table, step, expected in (
+                    (outputs, {"op": "head_object", "key": "k 1"},
+                     {"ok": True, "etag": etag, "size": 10, "content_type": "text/plain",
+                      "metadata": {"owner": "qa"}}),
+                    (errors, {"op": "get_object", "key": "k 1"},
+                     {"ok": False, "error_code": "NoSuchKey", "status": 404})):
+                system_utils.run_local_cmd = run_local_cmd(table)
+                for cls in (s3_conformance.AwsCliClient, s3_conformance.S3cmdClient,
+                            s3_conformance.MinioClient):
+                    client = cls("https://s3.seagate.com", "AK", "SK", validate_certs=False)
+                    result = client.run(step, "b", out_path=os.devnull)
+                    assert_utils.assert_equal({key: result[key] for key in expected},
+                                              expected, f"{client.name}: {result}")
+        finally:
+            system_utils.run_local_cmd = run_cmd
+        assert_utils.assert_equal(shlex.split(calls[0]), [
+            "AWS_ACCESS_KEY_ID=AK", "AWS_SECRET_ACCESS_KEY=SK", "AWS_DEFAULT_REGION=us-east-1",
+            "aws", "s3api", "head-object", "--bucket", "b", "--key", "k 1", "--output", "json",
+            "--endpoint-url", "https://s3.seagate.com", "--no-verify-ssl"])
+        s3cmd = shlex.split(calls[1])
+        assert_utils.assert_equal((s3cmd[0], s3cmd[-2:]), ("s3cmd", ["info", "s3://b/k 1"]))
+        for option in ("--access_key=AK", "--ssl", "--no-check-certificate",
+                       "--host=s3.seagate.com"):
+            assert_utils.assert_in(option, s3cmd)
+        assert_utils.assert_equal(shlex.split(calls[2])[:3], [
+            "MC_HOST_conformance=https://AK:SK@s3.seagate.com", "mc", "--json"])
+        assert_utils.assert_in("get 's3://b/k 1' /dev/null --force", calls[4])
+
+    def test_clients_are_abstract(self):
+        """Test a client must implement run."""
+        for cls in (s3_conformance.ConformanceClient, s3_conformance.CliClient):
+            try:
+                cls()
+            except TypeError as error:
+                assert_utils.assert_in("run", str(error))
+            else:
+                assert_utils.assert_true(False, f"{cls.__name__} without run was created")
@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test health aware s3 endpoint balancer."""
+
+from collections import Counter
+
+import botocore.session
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+
+from commons.s3_dns import EndpointBalancer
+from commons.utils import assert_utils
+
+LIST_BUCKETS = (b'<?xml version="1.0" encoding="UTF-8"?><ListAllMyBucketsResult>'
+                b'<Buckets></Buckets></ListAllMyBucketsResult>')
+
+
+class _Raw:
+    """Raw http response body."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):  # pylint: disable=unused-argument
+        """Body chunks."""
+        yield self.body
+
+
+class TestS3EndpointBalancer:
+    """Test policies, ejection and re-probe, and botocore client routing."""
+
+    def setup_method(self):
+        """Fake clock and endpoints."""
+        self.now = [0.0]
+        self.urls = ["https://s3.node1", "https://s3.node2", "https://s3.node3"]
+
+    def test_policies_eject_and_reprobe(self):
+        """Failing endpoint is ejected, skipped by every policy and restored by a probe."""
+        balancer = EndpointBalancer(self.urls, "round_robin", eject_failures=3, cooldown=10,
+                                    clock=lambda: self.now[0])
+        assert_utils.assert_equal([balancer.choose() for _ in range(4)],
+                                  self.urls + self.urls[:1])
+        for _ in range(3):
+            balancer.release(self.urls[1], 0.1, False)
+        assert_utils.assert_true(balancer.snapshot()[1]["ejected"])
+        picks = Counter(balancer.choose() for _ in range(10))
+        assert_utils.assert_not_in(self.urls[1], picks, "ejected endpoint picked")
+        self.now[0] = 11
+        assert_utils.assert_equal(balancer.acquire(), self.urls[1])
+        assert_utils.assert_not_in(self.urls[1], [balancer.acquire() for _ in range(4)],
+                                   "endpoint probed twice")
+        balancer.release(self.urls[1], 0.1, False)
+        assert_utils.assert_equal(balancer.snapshot()[1]["ejections"], 2)
+        self.now[0] = 11 + 20
+        assert_utils.assert_equal(balancer.probe_ejected(lambda url: True), {self.urls[1]: True})
+        assert_utils.assert_false(balancer.snapshot()[1]["ejected"])
+
+        least = EndpointBalancer(self.urls, "least_outstanding")
+        held = [least.acquire() for _ in range(3)]
+        least.release(held[2], 0.01)
+        assert_utils.assert_equal(least.acquire(), self.urls[2])
+        weighted = EndpointBalancer(self.urls, "latency_weighted", seed=7)
+        for url, latency in zip(self.urls, (0.01, 0.1, 1.0)):
+            weighted.release(url, latency)
+        picks = Counter(weighted.choose() for _ in range(1000))
+        assert_utils.assert_true(picks[self.urls[0]] > picks[self.urls[1]] > picks[self.urls[2]],
+                                 picks)
+
+    def test_botocore_client_routing(self):
+        """Attempts of a client are spread over endpoints and 5xx retries move away."""
+        balancer = EndpointBalancer(self.urls, "round_robin", eject_failures=2)
+        client = botocore.session.get_session().create_client(
+            "s3", region_name="us-east-1", endpoint_url=self.urls[0],
+            aws_access_key_id="AK", aws_secret_access_key="SK",
+            config=Config(retries={"max_attempts": 3, "mode": "legacy"}))
+        sent = []
+
+        def send(request, **kwargs):  # pylint: disable=unused-argument
+            sent.append(request.url)
+            status = 503 if "node2" in request.url else 200
+            return AWSResponse(request.url, status, {}, _Raw(LIST_BUCKETS))
+
+        client.meta.events.register("before-send.s3", send)
+        assert_utils.assert_false(
+            EndpointBalancer(["https://other"]).attach(client), "foreign client attached")
+        assert_utils.assert_true(balancer.attach(client))
+        for _ in range(6):
+            client.list_buckets()
+        hosts = Counter(url.split("/")[2] for url in sent)
+        assert_utils.assert_equal(hosts["s3.node2"], 2, hosts)
+        assert_utils.assert_equal(hosts["s3.node1"] + hosts["s3.node3"], 6, hosts)
+        stats = {each["url"]: each for each in balancer.snapshot()}
+        assert_utils.assert_true(stats[self.urls[1]]["ejected"])
+        assert_utils.assert_equal(sum(each["inflight"] for each in stats.values()), 0)
+        assert_utils.assert_true(stats[self.urls[0]]["latency"] is not None)
+        url = client.generate_presigned_url("get_object", Params={"Bucket": "b", "Key": "k"})
+        assert_utils.assert_in(url.split("/")[2], ["s3.node1", "s3.node3"])
+        assert_utils.assert_equal(sum(each["inflight"] for each in balancer.snapshot()), 0)
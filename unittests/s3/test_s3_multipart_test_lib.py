@@ -24,8 +24,11 @@ import os
 import shutil
 import logging
 import pytest
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionClosedError
 
 from commons import error_messages as errmsg
+from commons import errorcodes as err
 from commons.exceptions import CTException
 from commons.utils.system_utils import create_file, remove_file
 from libs.s3 import iam_test_lib, s3_test_lib, s3_multipart_test_lib
@@ -300,3 +303,23 @@ class TestS3MultipartTestLib:
                 0, 5)
         except CTException as error:
             assert errmsg.NO_BUCKET_OBJ_ERR_KEY in str(error.message), error.message
+
+    @pytest.mark.s3unittest
+    def test_08_transient_part_errors(self):
+        """Test only throttling, server and connection errors of a part are retried."""
+        def wrapped(error):
+            try:
+                raise CTException(err.S3_CLIENT_ERROR, error.args[0]) from error
+            except CTException as ct_error:
+                return ct_error
+        slow_down = ClientError({"Error": {"Code": "SlowDown"},
+                                 "ResponseMetadata": {"HTTPStatusCode": 503}}, "UploadPart")
+        no_upload = ClientError({"Error": {"Code": "NoSuchUpload"},
+                                 "ResponseMetadata": {"HTTPStatusCode": 404}}, "UploadPart")
+        denied = ClientError({"Error": {"Code": "AccessDenied"},
+                              "ResponseMetadata": {"HTTPStatusCode": 403}}, "UploadPart")
+        closed = ConnectionClosedError(endpoint_url="http://s3.seagate.com")
+        for error, transient in ((slow_down, True), (no_upload, False), (denied, False),
+                                 (closed, True), (ValueError("bad part"), False)):
+            assert s3_multipart_test_lib.is_transient_error(wrapped(error)) is transient, error
+        assert s3_multipart_test_lib.is_transient_error(slow_down)
@@ -0,0 +1,152 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test asynchronous, structured and correlated logging of cortxlogging."""
+
+import glob
+import logging
+import os
+import shutil
+import threading
+
+from commons import cortxlogging
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+
+
+class TestCortxLogging:
+    """Test queue logging, background compression and log queries."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestCortxLogging")
+
+    def setup_method(self):
+        """Create empty log dir."""
+        shutil.rmtree(self.dpath, ignore_errors=True)
+        os.makedirs(self.dpath)
+
+    def teardown_method(self):
+        """Reset test id."""
+        cortxlogging.set_test_id(None)
+
+    def test_async_correlated_records(self):
+        """Records of threads and hosts are sliced out by test id and operation id."""
+        path = os.path.join(self.dpath, "session.jsonl")
+        handler = cortxlogging.CortxRotatingFileHandler(path, maxBytes=4096, backupCount=50)
+        handler.setFormatter(cortxlogging.JsonFormatter())
+        log = logging.getLogger("cortxlogging.async")
+        log.setLevel(logging.DEBUG)
+        log.propagate = False
+        listener = cortxlogging.start_async_logging(log, [handler])
+        cortxlogging.set_test_id("TEST-1")
+
+        def io_worker(count):
+            for num in range(count):
+                log.info("io %s", num)
+
+        with cortxlogging.log_context(op_id="op-write") as op_id:
+            workers = [threading.Thread(target=cortxlogging.bind_context(io_worker),
+                                        args=(20,), name=f"io-{num}") for num in range(3)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            log.debug("Executing ls", extra={"host": "srvnode-1"})
+        log.info("outside operation")
+        unbound = threading.Thread(target=io_worker, args=(5,), name="unbound")
+        unbound.start()
+        unbound.join()
+        cortxlogging.set_test_id("TEST-2")
+        for num in range(100):
+            log.warning("next test %s", num)
+        cortxlogging.stop_async_logging(listener)
+        assert_utils.assert_true(glob.glob(f"{path}-*.gz"), os.listdir(self.dpath))
+        assert_utils.assert_false(glob.glob(f"{path}*.pending") + glob.glob(f"{path}*.part"))
+        records = list(cortxlogging.query_logs(path, op_id=op_id))
+        assert_utils.assert_equal(len(records), 61)
+        assert_utils.assert_equal({record["test_id"] for record in records}, {"TEST-1"})
+        assert_utils.assert_equal(sorted({record["thread"] for record in records}),
+                                  ["MainThread", "io-0", "io-1", "io-2"])
+        hosts = list(cortxlogging.query_logs(path, test_id="TEST-1", host="srvnode-1"))
+        assert_utils.assert_equal([record["msg"] for record in hosts], ["Executing ls"])
+        test_one = list(cortxlogging.query_logs(path, test_id="TEST-1"))
+        assert_utils.assert_equal(len(test_one), 67)
+        assert_utils.assert_equal(
+            [record["msg"] for record in cortxlogging.query_logs(path, test_id="TEST-2")],
+            [f"next test {num}" for num in range(100)])
+        assert_utils.assert_equal(len(list(cortxlogging.query_logs(
+            path, level="WARNING"))), 100)
+
+    def test_rollover_compresses_in_background(self):
+        """Logging thread only renames the rotated log, compression runs elsewhere."""
+        path = os.path.join(self.dpath, "plain.jsonl")
+        handler = cortxlogging.CortxRotatingFileHandler(path, maxBytes=1000, backupCount=5)
+        handler.setFormatter(cortxlogging.JsonFormatter())
+        handler.addFilter(cortxlogging.ContextFilter())
+        release = threading.Event()
+        threads = []
+        compress = handler.compress
+
+        def slow_compress(source, dest, compresslevel):
+            threads.append(threading.current_thread().name)
+            release.wait(10)
+            compress(source, dest, compresslevel)
+
+        handler.compress = slow_compress
+        log = logging.getLogger("cortxlogging.rollover")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        log.addHandler(handler)
+        cortxlogging.set_test_id("TEST-3")
+        for num in range(5):
+            log.info("record %s", "x" * 100 + str(num))
+        assert_utils.assert_equal(threads, ["log-compressor"])
+        assert_utils.assert_true(glob.glob(f"{path}-*.gz.pending"))
+        pending = list(cortxlogging.query_logs(path, test_id="TEST-3"))
+        release.set()
+        log.removeHandler(handler)
+        handler.close()
+        assert_utils.assert_false(glob.glob(f"{path}-*.gz.pending"))
+        assert_utils.assert_equal(len(pending), 5)
+        assert_utils.assert_equal(cortxlogging.main([path, "--test-id", "TEST-3"]), 5)
+
+    def test_library_records_on_root_logger(self):
+        """Handlers installed on the root logger get JSON records of library loggers."""
+        root = logging.getLogger()
+        level, cwd = root.level, os.getcwd()
+        os.chdir(self.dpath)
+        try:
+            listener = cortxlogging.init_loghandler(root, async_mode=True, structured=True,
+                                                    console=False)
+            cortxlogging.set_test_id("TEST-4")
+            with cortxlogging.log_context(op_id="op-lib", host="srvnode-1"):
+                logging.getLogger("libs.s3.s3_test_lib").info("bucket created")
+            cortxlogging.stop_async_logging(listener)
+        finally:
+            os.chdir(cwd)
+            root.setLevel(level)
+        assert_utils.assert_not_in(listener.queue_handler, root.handlers)
+        records = list(cortxlogging.query_logs(
+            os.path.join(self.dpath, "log", "latest", cortxlogging.JSON_LOG_FILE),
+            test_id="TEST-4"))
+        assert_utils.assert_equal(
+            [(record["logger"], record["host"], record["op_id"], record["msg"])
+             for record in records],
+            [("libs.s3.s3_test_lib", "srvnode-1", "op-lib", "bucket created")])
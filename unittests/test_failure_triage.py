@@ -0,0 +1,161 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test failure signature extraction, clustering and triage reports."""
+
+import os
+import shutil
+
+from commons import failure_triage
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+
+BUCKET_FAILURE = """self = <tests.s3.test_bucket.TestBucket object at 0x7f3a2c1d9e80>
+
+    def test_create(self):
+>       resp = self.s3_obj.create_bucket(bucket)
+
+tests/s3/test_bucket.py:{line}:
+libs/s3/s3_test_lib.py:88: in create_bucket
+    raise CTException(err.S3_CLIENT_ERROR, error.args[0])
+E   commons.exceptions.CTException: CTException: EOS Error: S3 Client Error: Bucket {bucket} \
+not reachable on {ip} at 2022-05-1{day} 10:2{day}:11,345 request {uuid}
+
+libs/s3/s3_test_lib.py:88: CTException
+"""
+
+TIMEOUT_FAILURE = """Traceback (most recent call last):
+  File "/root/cortx-test/libs/ha/ha_common_libs.py", line {line}, in poll_pods
+    raise TimeoutError(f"pod {pod} not online in {secs}s")
+TimeoutError: pod cortx-data-{pod} not online in {secs}s
+"""
+
+ASSERT_FAILURE = """    def test_health(self):
+>       assert resp[0], resp[1]
+E       AssertionError: False
+E       assert False
+
+tests/ha/test_health.py:{line}: AssertionError
+"""
+
+
+class TestFailureTriage:
+    """Test signatures, clusters, history matching and reports."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestFailureTriage")
+        cls.history = os.path.join(cls.dpath, "history.json")
+
+    def setup_method(self):
+        """Start without history."""
+        shutil.rmtree(self.dpath, ignore_errors=True)
+
+    def bucket_failure(self, num):
+        """Same bucket failure with volatile tokens varying by num."""
+        return BUCKET_FAILURE.format(line=100 + num, bucket=f"test-bkt-{1650000000 + num}",
+                                     ip=f"10.230.{num}.1{num}", day=num,
+                                     uuid=f"4f0c1b2a-9d3e-4c5b-8a7f-0e1d2c3b4a5{num}")
+
+    def test_signature_and_clusters(self):
+        """Volatile tokens are masked and similar failures cluster together."""
+        signature = failure_triage.extract_signature(self.bucket_failure(1))
+        assert_utils.assert_equal(signature["exc_type"], "CTException")
+        assert_utils.assert_equal(
+            signature["message"], "CTException: EOS Error: S3 Client Error: Bucket "
+                                  "test-bkt-<N> not reachable on <IP> at <TS> request <UUID>")
+        assert_utils.assert_equal(signature["frames"], ["test_bucket.py",
+                                                        "s3_test_lib.py:create_bucket",
+                                                        "s3_test_lib.py"])
+        timeout = failure_triage.extract_signature(TIMEOUT_FAILURE.format(
+            line=10, pod=2, secs=600))
+        assert_utils.assert_equal((timeout["exc_type"], timeout["message"], timeout["frames"]),
+                                  ("TimeoutError", "pod cortx-data-<N> not online in <N>s",
+                                   ["ha_common_libs.py:poll_pods"]))
+        triage = failure_triage.FailureTriage()
+        for num in range(1, 6):
+            triage.add(f"TEST-{num}", self.bucket_failure(num))
+        triage.add("TEST-6", self.bucket_failure(6).replace("not reachable", "not reachable "
+                                                                              "yet"))
+        for num in range(2):
+            triage.add(f"TEST-{7 + num}", TIMEOUT_FAILURE.format(line=20, pod=num, secs=300))
+        triage.add("TEST-9", ASSERT_FAILURE.format(line=30),
+                   log_tail="INFO start\nERROR Cluster is not healthy: 2 pods offline\nINFO x")
+        triage.add("TEST-10", ASSERT_FAILURE.format(line=30),
+                   log_tail="ERROR S3 server pod restarted at 2022-05-12 10:11:12")
+        clusters = triage.clusters()
+        assert_utils.assert_equal([(cluster["tests"], cluster["count"]) for cluster in clusters],
+                                  [([f"TEST-{num}" for num in range(1, 7)], 6),
+                                   (["TEST-7", "TEST-8"], 2), (["TEST-9"], 1),
+                                   (["TEST-10"], 1)])
+        assert_utils.assert_equal(len(clusters[0]["keys"]), 2)
+        assert_utils.assert_equal(clusters[2]["log"],
+                                  ["ERROR Cluster is not healthy: <N> pods offline"])
+
+    def test_history_defects_and_report(self):
+        """Clusters recurring across runs keep first seen build and linked defect."""
+        known = [{"defect": "CORTX-100", "pattern": r"^TimeoutError: pod cortx-data"}]
+        first = failure_triage.FailureTriage(self.history, known_defects=known)
+        first.add("TEST-1", self.bucket_failure(1))
+        first.add("TEST-2", TIMEOUT_FAILURE.format(line=20, pod=1, secs=300))
+        report = first.report("build-1")
+        assert_utils.assert_equal([(cluster["new"], cluster["defect"])
+                                   for cluster in report["clusters"]],
+                                  [(True, None), (True, "CORTX-100")])
+        first.save_history(report)
+        assert_utils.assert_true(first.link_defect(report["clusters"][0]["key"], "CORTX-200"))
+        assert_utils.assert_false(first.link_defect("unknown", "CORTX-300"))
+
+        second = failure_triage.FailureTriage(self.history, known_defects=known)
+        second.add("TEST-1", self.bucket_failure(7))
+        second.add("TEST-3", ASSERT_FAILURE.format(line=1))
+        second.add("TEST-4", ASSERT_FAILURE.format(line=1))
+        report = second.report("build-2")
+        assert_utils.assert_equal(
+            [(cluster["rank"], cluster["tests"], cluster["new"], cluster["defect"],
+              cluster["first_seen"]) for cluster in report["clusters"]],
+            [(1, ["TEST-3", "TEST-4"], True, None, "build-2"),
+             (2, ["TEST-1"], False, "CORTX-200", "build-1")])
+        history = second.save_history(report)
+        assert_utils.assert_equal(len(history), 3)
+        recurring = history[report["clusters"][1]["history_key"]]
+        assert_utils.assert_equal((recurring["builds"], recurring["count"]),
+                                  (["build-1", "build-2"], 2))
+        json_path, text_path = failure_triage.write_report(report, self.dpath)
+        assert_utils.assert_true(os.path.exists(json_path))
+        with open(text_path, encoding="utf-8") as fptr:
+            text = fptr.read()
+        assert_utils.assert_in("Failure triage of build build-2: 3 failure(s) in 2 cluster(s)",
+                               text)
+        assert_utils.assert_in("seen since build-1 defect=CORTX-200", text)
+
+    def test_merge_worker_failures(self):
+        """Failures dumped by xdist workers are reported once by the controller."""
+        paths = []
+        for num, worker in enumerate(("gw0", "gw1")):
+            triage = failure_triage.FailureTriage()
+            triage.add(f"TEST-{num}", self.bucket_failure(num))
+            paths.append(triage.dump_failures(os.path.join(self.dpath, f"triage_{worker}.json")))
+        controller = failure_triage.FailureTriage(self.history)
+        controller.add("TEST-9", ASSERT_FAILURE.format(line=1))
+        assert_utils.assert_equal(controller.merge_failures(paths), 2)
+        report = controller.report("build-1")
+        assert_utils.assert_equal(report["failures"], 3)
+        assert_utils.assert_equal([cluster["tests"] for cluster in report["clusters"]],
+                                  [["TEST-0", "TEST-1"], ["TEST-9"]])
@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Test opt-in pytest profiler plugin."""
+import json
+import os
+import time
+
+import pytest
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from commons.utils import system_utils
+from commons.pytest_profiler import ProfilerPlugin
+
+INNER_TESTS = '''
+import time
+import pytest
+
+
+@pytest.fixture
+def slow_fixture():
+    time.sleep(0.2)
+    yield
+    time.sleep(0.1)
+
+
+def test_sleepy(slow_fixture):
+    time.sleep(0.3)
+'''
+
+
+class TestPytestProfiler:
+    """Run an inner pytest session with the profiler plugin."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestPytestProfiler")
+
+    def setup_method(self):
+        """Create inner test module."""
+        system_utils.make_dirs(self.dpath)
+        with open(os.path.join(self.dpath, "inner_test.py"), "w") as fptr:
+            fptr.write(INNER_TESTS)
+
+    def teardown_method(self):
+        """Remove test data."""
+        if system_utils.path_exists(self.dpath):
+            system_utils.remove_dirs(self.dpath)
+
+    def test_breakdown_and_summary(self):
+        """Sleep in fixture and call is reported as waiting with phases and stacks."""
+        out_dir = os.path.join(self.dpath, "profile")
+        plugin = ProfilerPlugin(out_dir)
+        ret = pytest.main([os.path.join(self.dpath, "inner_test.py"), "-q", "-c", os.devnull,
+                           "--noconftest", "-p", "no:cacheprovider", "--rootdir", self.dpath],
+                          plugins=[plugin])
+        assert_utils.assert_equal(int(ret), 0)
+        assert_utils.assert_false(hasattr(time.sleep, "__wrapped__"))
+        with open(os.path.join(out_dir, "tests.json")) as fptr:
+            tests = json.load(fptr)
+        record = tests["inner_test.py::test_sleepy"]
+        assert_utils.assert_true(0.55 < record["waiting"] <= record["wall"])
+        assert_utils.assert_true(record["fixtures"]["slow_fixture"] >= 0.2)
+        assert_utils.assert_true(record["phases"]["call"] >= 0.3)
+        with open(os.path.join(out_dir, "profile.folded")) as fptr:
+            stacks = fptr.read()
+        assert_utils.assert_in(
+            "inner_test.py::test_sleepy;setup;fixture:slow_fixture;time.sleep ", stacks)
+        with open(os.path.join(out_dir, "summary.json")) as fptr:
+            summary = json.load(fptr)
+        assert_utils.assert_equal(summary[0]["helper"], "time.sleep")
+        assert_utils.assert_equal(summary[0]["calls"], 3)
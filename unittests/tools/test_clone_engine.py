@@ -0,0 +1,162 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test resumable test plan clone engine against an in-memory JIRA."""
+
+import os
+import threading
+import time
+from collections import Counter
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from tools.clone_test_plan.clone_engine import CloneEngine
+from tools.clone_test_plan.clone_engine import CloneJournal
+from tools.clone_test_plan.clone_engine import RateLimiter
+
+
+class _MemoryJira:
+    """JiraTask stand-in keeping issues in memory and counting calls."""
+
+    def __init__(self, te_tests, fail_adds=()):
+        self.te_tests = te_tests
+        self.fail_adds = set(fail_adds)
+        self.calls = Counter()
+        self.issues = {}
+        self.members = {}
+        self.lock = threading.Lock()
+        self.next_key = 5000
+
+    def _new_key(self):
+        with self.lock:
+            self.next_key += 1
+            return f"TEST-{self.next_key}"
+
+    def create_new_test_plan(self, test_plan, tp_info):  # pylint: disable=unused-argument
+        """Create TP."""
+        self.calls["create_tp"] += 1
+        key = self._new_key()
+        self.issues[key] = "tp"
+        return key, "3Node"
+
+    def get_test_ids_from_te(self, te_key):
+        """Tests of source TE."""
+        self.calls["get_tests"] += 1
+        return list(self.te_tests[te_key])
+
+    def get_issues_details(self, keys):
+        """One JQL search."""
+        self.calls["search"] += 1
+        return {key: {"key": key, "valid": not key.endswith("9")} for key in keys}
+
+    @staticmethod
+    def is_valid_test(details, tp_info):  # pylint: disable=unused-argument
+        """Tests ending with 9 are not valid for the plan."""
+        return details["valid"]
+
+    @staticmethod
+    def test_exe_fields(details, tp_info, product_family):  # pylint: disable=unused-argument
+        """Fields of new TE."""
+        return {"summary": details["key"]}
+
+    def create_issues(self, issue_dicts):
+        """Bulk create."""
+        self.calls["bulk_create"] += 1
+        keys = [self._new_key() for _ in issue_dicts]
+        self.issues.update(dict.fromkeys(keys, "te"))
+        return keys
+
+    def add_tests(self, key, tests, issue_type):  # pylint: disable=unused-argument
+        """Add tests, failing once for keys in fail_adds."""
+        self.calls["add_tests"] += 1
+        if key in self.fail_adds:
+            self.fail_adds.discard(key)
+            return False
+        self.members.setdefault(key, set()).update(tests)
+        return True
+
+    def add_te_to_tp(self, te_list, test_plan):
+        """Link TEs."""
+        self.calls["link"] += 1
+        self.members.setdefault(test_plan, set()).update(te_list)
+        return True
+
+    def delete_issue(self, key):
+        """Delete issue."""
+        return self.issues.pop(key, None) is not None
+
+
+class TestCloneEngine:
+    """Test bulk clone, resume of a partial clone and undo."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestCloneEngine")
+        os.makedirs(cls.dpath, exist_ok=True)
+        cls.te_tests = {f"TEST-{te}": [f"TEST-{te}{idx}" for idx in range(10)]
+                        for te in range(100, 140)}
+        cls.te_tests["TEST-140"] = []
+
+    def setup_method(self):
+        """Fresh journal for every test."""
+        self.journal_path = os.path.join(self.dpath, "clone.json")
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def test_resume_and_undo(self):
+        """Partial clone is completed on rerun without duplicates and then undone."""
+        jira = _MemoryJira(self.te_tests, fail_adds=["TEST-5005"])
+        engine = CloneEngine(jira, CloneJournal(self.journal_path), workers=4)
+        te_keys = sorted(self.te_tests)
+        summary = engine.clone("TEST-1", te_keys, {}, ["TEST-100"], "K8")
+        assert_utils.assert_equal(len(summary["tes"]), 39)
+        assert_utils.assert_equal(len(summary["failed"]), 1)
+        assert_utils.assert_equal(jira.calls["bulk_create"], 1)
+        assert_utils.assert_equal(jira.calls["search"], 5)
+        assert_utils.assert_equal(summary["skipped"], [summary["tes"]["TEST-100"]])
+        rerun = CloneEngine(jira, CloneJournal(self.journal_path), workers=4)
+        summary = rerun.clone("TEST-1", te_keys, {}, [], "K8")
+        assert_utils.assert_equal(summary["failed"], [])
+        assert_utils.assert_equal(len(summary["tes"]), 40)
+        assert_utils.assert_equal(jira.calls["create_tp"], 1)
+        assert_utils.assert_equal(jira.calls["bulk_create"], 1)
+        assert_utils.assert_equal(jira.calls["get_tests"], 41)
+        assert_utils.assert_equal(len(jira.issues), 41)
+        tp_key = summary["new_tp"]
+        assert_utils.assert_equal(len(jira.members[tp_key]), 40 * 9 + 40)
+        assert_utils.assert_equal(len(jira.members[summary["tes"]["TEST-105"]]), 9)
+        failed = rerun.undo()
+        assert_utils.assert_equal(failed, [])
+        assert_utils.assert_equal(jira.issues, {})
+        assert_utils.assert_equal(CloneJournal(self.journal_path).data["undone"][-1], tp_key)
+
+    def test_rate_limiter(self):
+        """Rate limiter bounds the request rate of all threads."""
+        limiter = RateLimiter(rate=50, burst=5)
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(10)])
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+        assert_utils.assert_true(0.45 <= elapsed < 2, f"30 requests took {elapsed}")
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test incremental JIRA to DB sync engine against recorded fixtures."""
+
+import json
+import logging
+import os
+
+from commons.utils import assert_utils
+from tools.db_sync import DbSyncEngine
+from tools.db_sync import RecordedDb
+from tools.db_sync import RecordedJira
+from tools.db_sync import SyncState
+from tools.db_sync import parse_time
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "db_sync_fixture.json")
+
+
+class TestDbSync:
+    """Test DbSyncEngine using recorded JIRA and DB data."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.log = logging.getLogger(__name__)
+        with open(FIXTURE, encoding="utf-8") as fptr:
+            cls.fixture = json.load(fptr)
+        cls.tp_key = "TEST-1000"
+
+    def setup_method(self):
+        """Create recorded JIRA source and DB sink."""
+        self.jira = RecordedJira(self.fixture["jira"])
+        self.db_sink = RecordedDb(self.fixture["db"]["entries"])
+
+    def latest(self, test_key):
+        """Return latest DB entries of test."""
+        return [each for each in self.db_sink.entries
+                if each["testID"] == test_key and each["latest"]]
+
+    def test_full_sync(self):
+        """Test full sync diff is applied with one search and one bulk request."""
+        engine = DbSyncEngine(self.jira, self.db_sink)
+        plan = engine.sync(self.tp_key, full=True)
+        self.log.info(plan.report())
+        assert_utils.assert_equal(plan.summary(),
+                                  {"create": 1, "replace": 1, "defects": 1, "unchanged": 1})
+        assert_utils.assert_equal(self.db_sink.requests,
+                                  [("search", ("TEST-2000", "TEST-3000")), ("bulk", 2, 1)])
+        issue_calls = [call for call in self.jira.calls if call[0] == "issues"]
+        assert_utils.assert_equal(len(issue_calls), 1)
+        replaced = self.latest("TEST-2")
+        assert_utils.assert_equal(len(replaced), 1)
+        assert_utils.assert_equal(replaced[0]["testResult"], "FAIL")
+        assert_utils.assert_equal(replaced[0]["issueIDs"], ["EOS-11"])
+        assert_utils.assert_equal(replaced[0]["testTags"], ["sanity"])
+        assert_utils.assert_equal(self.latest("TEST-3")[0]["issueIDs"], ["EOS-12"])
+        created = self.latest("TEST-5")[0]
+        assert_utils.assert_equal(created["logPath"], "/logs/TEST-5")
+        assert_utils.assert_equal(created["testTeam"], "CortxQA")
+        assert_utils.assert_equal(self.latest("TEST-4"), [])
+        assert_utils.assert_equal(engine.state.get(self.tp_key), plan.started)
+
+    def test_incremental_dry_run(self):
+        """Test only runs changed after high water mark are diffed and dry run changes nothing."""
+        state = SyncState()
+        mark = parse_time("2022-05-12T06:00:00+00:00")
+        state.set(self.tp_key, mark)
+        engine = DbSyncEngine(self.jira, self.db_sink, state)
+        plan = engine.sync(self.tp_key, dry_run=True)
+        self.log.info(plan.report())
+        assert_utils.assert_equal([row["testID"] for row in plan.rows], ["TEST-5"])
+        assert_utils.assert_equal(self.db_sink.requests, [("search", ("TEST-3000",))])
+        assert_utils.assert_equal([call for call in self.jira.calls if call[0] == "test_runs"],
+                                  [("test_runs", "TEST-3000")])
+        assert_utils.assert_equal(len(self.db_sink.entries), 3)
+        assert_utils.assert_equal(state.get(self.tp_key), mark)
+
+    def test_incremental_defect_link_and_missing_issue(self):
+        """Test a defect linked to an old run after the mark is synced, missing issues skipped."""
+        fixture = json.loads(json.dumps(self.fixture["jira"]))
+        fixture["updated"]["TEST-2000"] = "2022-05-13T09:00:00.000+0530"
+        del fixture["issues"]["TEST-5"]
+        self.jira = RecordedJira(fixture)
+        state = SyncState()
+        state.set(self.tp_key, parse_time("2022-05-12T06:00:00+00:00"))
+        engine = DbSyncEngine(self.jira, self.db_sink, state)
+        plan = engine.sync(self.tp_key)
+        self.log.info(plan.report())
+        assert_utils.assert_equal([(row["action"], row["testID"]) for row in plan.rows],
+                                  [("replace", "TEST-2"), ("defects", "TEST-3")])
+        assert_utils.assert_equal(self.latest("TEST-3")[0]["issueIDs"], ["EOS-12"])
+        assert_utils.assert_equal(self.latest("TEST-5"), [])
+        assert_utils.assert_equal(len(plan.warnings), 1)
+        assert_utils.assert_in("TEST - TEST-5, Test Execution - TEST-3000", plan.warnings[0])
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test dataset generator size distribution, file naming and manifest checksums."""
+
+import hashlib
+import json
+import os
+import random
+import re
+import shutil
+import string
+
+from commons.params import TEST_DATA_FOLDER
+from commons.utils import assert_utils
+from tools.datagen import generate_dataset as datagen
+
+DATAGEN_DIR = os.path.dirname(datagen.__file__)
+
+
+class _S3Client:
+    """S3 client stand-in reading uploaded streams into memory."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        """Start without objects."""
+        self.objects = {}
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        """Read stream in small parts like a multipart upload would."""
+        data = b""
+        while True:
+            part = fileobj.read(1000)
+            if not part:
+                break
+            data += part
+        self.objects[(bucket, key)] = data
+
+
+class TestGenerateDataset:
+    """Test dataset planning, naming and generated data with its manifest."""
+
+    @classmethod
+    def setup_class(cls):
+        """Initialize variables."""
+        cls.dpath = os.path.join(TEST_DATA_FOLDER, "TestGenerateDataset")
+        cls.cfg = os.path.join(cls.dpath, "dataset-T.cfg")
+        cls.distribution = [[1024, 50.0], [10240, 30.0], [102400, 20.0]]
+
+    def setup_method(self):
+        """Create dataset cfg file."""
+        shutil.rmtree(self.dpath, ignore_errors=True)
+        os.makedirs(self.dpath)
+        with open(self.cfg, "w", encoding="utf-8") as fobj:
+            fobj.write("".join(f"{size}    {percent}\n" for size, percent in self.distribution))
+
+    def teardown_method(self):
+        """Remove generated dataset."""
+        shutil.rmtree(self.dpath, ignore_errors=True)
+
+    def test_size_distribution_and_naming(self):
+        """Files per size bucket follow the cfg, names use the bucket extensions."""
+        assert_utils.assert_equal(datagen.read_size_distribution(self.cfg), self.distribution)
+        small = datagen.read_size_distribution(os.path.join(DATAGEN_DIR, "dataset-S.cfg"))
+        assert_utils.assert_equal(len(small), 8)
+        assert_utils.assert_equal(round(sum(percent for _, percent in small)), 100)
+        assert_utils.assert_equal(small[0], [1024, 26.79])
+
+        rng = random.Random(datagen.BUFFER_SEED)
+        alldirs = datagen.make_dirtree(rng, datagen.randname(rng), 4, 20)
+        assert_utils.assert_true(alldirs)
+        plan = datagen.plan_dataset(self.distribution, 200, alldirs, 550)
+        assert_utils.assert_equal(plan, datagen.plan_dataset(self.distribution, 200, alldirs,
+                                                             550))
+        assert_utils.assert_not_equal(plan, datagen.plan_dataset(self.distribution, 200,
+                                                                 alldirs, 551))
+        buckets = {1024: [], 10240: [], 102400: []}
+        lower = 0
+        for upper in buckets:
+            buckets[upper] = [entry for entry in plan if lower <= entry[1] < upper]
+            lower = upper
+        assert_utils.assert_equal([len(entries) for entries in buckets.values()],
+                                  [100, 60, 40])
+        extensions = dict(datagen.SIZE_EXTENSIONS)
+        for upper, entries in buckets.items():
+            for path, _, ext, seed in entries:
+                assert_utils.assert_in(ext, extensions[upper])
+                dirname, filename = path.rsplit("/", 1)
+                assert_utils.assert_in(dirname, alldirs)
+                name = filename[:-len(ext) - 1] if ext else filename
+                assert_utils.assert_true(re.fullmatch(r"[\w-]{5,39}", name), filename)
+                assert_utils.assert_true(0 <= seed < datagen.RANDMAX)
+        assert_utils.assert_in(datagen.randfilename(rng, 20 * 1024 ** 3)[1],
+                               datagen.fileextbin10g)
+
+    def test_checksum_output(self):
+        """Manifest checksums match the files, the dataset does not depend on workers."""
+        manifests = []
+        for workers in (1, 3):
+            out_dir = os.path.join(self.dpath, f"out-{workers}")
+            manifest = os.path.join(self.dpath, f"manifest-{workers}.json")
+            datagen.main([self.cfg, "30", "440", "20", "4", "--workers", str(workers),
+                          "--out-dir", out_dir, "--manifest", manifest])
+            with open(manifest, encoding="utf-8") as fobj:
+                manifests.append(json.load(fobj))
+            for record in manifests[-1]["objects"]:
+                with open(os.path.join(out_dir, record["path"]), "rb") as fobj:
+                    data = fobj.read()
+                assert_utils.assert_equal(len(data), record["size"])
+                assert_utils.assert_equal(hashlib.md5(data).hexdigest(),  # nosec
+                                          record["md5"])
+                assert_utils.assert_equal(hashlib.sha256(data).hexdigest(), record["sha256"])
+        assert_utils.assert_equal(manifests[0], manifests[1])
+        manifest = manifests[0]
+        assert_utils.assert_equal((manifest["cfg"], manifest["seed"], manifest["files"]),
+                                  ("dataset-T.cfg", 440, 30))
+        assert_utils.assert_equal(manifest["bytes"],
+                                  sum(record["size"] for record in manifest["objects"]))
+        paths = [record["path"] for record in manifest["objects"]]
+        assert_utils.assert_equal(paths, sorted(paths))
+
+        text = [record for record in manifest["objects"]
+                if record["size"] > 8 and not any(record["path"].endswith("." + ext)
+                                                  for ext in datagen.binary)]
+        assert_utils.assert_true(text)
+        with open(os.path.join(self.dpath, "out-1", text[0]["path"]), "rb") as fobj:
+            data = fobj.read()
+        assert_utils.assert_true(set(data.decode()) <= set(string.printable))
+
+        client = _S3Client()
+        path, size, ext, seed = "dir/obj.pdf", 5 * datagen.WRITE_SIZE // 2, "pdf", 7
+        record = datagen.upload_file(client, "bkt", path, size, ext, seed)
+        written = datagen.write_file(path, size, ext, seed, self.dpath)
+        assert_utils.assert_equal(record, dict(written, bucket="bkt"))
+        assert_utils.assert_equal(hashlib.sha256(client.objects[("bkt", path)]).hexdigest(),
+                                  written["sha256"])
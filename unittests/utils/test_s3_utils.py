@@ -119,3 +119,40 @@ class TestS3Utils:
         resp = s3_utils.get_unaligned_parts(self.fpath, total_parts=total_parts, random=True)
         self.log.info(resp.keys())
         self.log.info("ENDED: get aligned parts.")
+
+    @pytest.mark.parametrize("total_parts", [1, 10])
+    def test_get_lazy_parts(self, total_parts):
+        """Test lazy memory-mapped parts match eagerly read parts."""
+        self.log.info("STARTED: get lazy parts.")
+        resp = system_utils.create_file(self.fpath, count=100)
+        assert_utils.assert_true(resp[0], resp[1])
+        parts = s3_utils.get_aligned_parts(self.fpath, total_parts=total_parts)
+        with s3_utils.get_aligned_parts(self.fpath, total_parts=total_parts,
+                                        lazy=True) as lazy_parts:
+            assert_utils.assert_equal(list(parts.keys()), list(lazy_parts.keys()))
+            for part_number, part in parts.items():
+                assert_utils.assert_equal(part[1], lazy_parts[part_number][1])
+            assert_utils.assert_equal(s3_utils.get_multipart_etag(parts),
+                                      lazy_parts.multipart_etag())
+        self.log.info("ENDED: get lazy parts.")
+
+    def test_get_generated_parts(self):
+        """Test generated parts are deterministic for a seed."""
+        self.log.info("STARTED: get generated parts.")
+        part_list = [{"part_size": 5, "count": 2}, {"part_size": 1.5, "count": 1}]
+        parts1 = s3_utils.get_generated_parts(part_list, seed=1)
+        parts2 = s3_utils.get_generated_parts(part_list, seed=1)
+        assert_utils.assert_equal(parts1.total_size, 11.5 * 1048576)
+        assert_utils.assert_equal(parts1.multipart_etag(), parts2.multipart_etag())
+        assert_utils.assert_equal(parts1.part_checksums(3)["md5"],
+                                  md5(parts2[3][0]).hexdigest())
+        self.log.info("ENDED: get generated parts.")
+
+    def test_part_source_is_abstract(self):
+        """Test a part source must implement part_view."""
+        try:
+            s3_utils.PartSource([(1, 0, 10)])
+        except TypeError as error:
+            assert_utils.assert_in("part_view", str(error))
+        else:
+            assert_utils.assert_true(False, "PartSource without part_view was created")
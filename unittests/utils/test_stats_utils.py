@@ -0,0 +1,37 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Test statistical helpers."""
+
+from commons.utils import assert_utils
+from commons.utils.stats_utils import mann_kendall
+
+
+class TestStatsUtils:
+    """Test trend detection used by the procpath and IO stability analysers."""
+
+    def test_mann_kendall(self):
+        """Increasing, decreasing, flat, tied and short series."""
+        _, z_score, p_value = mann_kendall(range(50))
+        assert_utils.assert_true(z_score > 0 and p_value < 0.01, (z_score, p_value))
+        stat, z_score, p_value = mann_kendall([10, 9, 9, 7, 6, 6, 4, 3])
+        assert_utils.assert_true(stat < 0 and z_score < 0 and p_value < 0.05,
+                                 (stat, z_score, p_value))
+        _, _, p_value = mann_kendall([5] * 50)
+        assert_utils.assert_equal(p_value, 1.0)
+        assert_utils.assert_equal(mann_kendall([1, 2]), (0, 0.0, 1.0))